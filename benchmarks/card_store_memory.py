@@ -0,0 +1,83 @@
+# benchmarks/card_store_memory.py
+"""
+Память на карточку: словарь dataclass Card против колоночного CardStore
+
+Запуск: python -m benchmarks.card_store_memory
+"""
+
+import datetime
+import gc
+import tracemalloc
+
+from srs.card_ids import CardCodec
+from srs.card_store import CardStore
+from srs.models import Card
+
+VERB_COUNT = 100
+TENSES = ['presente', 'indefinido', 'subjuntivo', 'imperfecto']
+PRONOUN_COUNT = 6
+USERS = 20
+
+CODEC = CardCodec([f"verb{verb_index}" for verb_index in range(VERB_COUNT)], TENSES)
+
+
+def make_cards():
+    """Колода одного пользователя в продакшн-масштабе (100 x 4 x 6)"""
+    today = datetime.date.today()
+    for verb_index in range(VERB_COUNT):
+        verb = f"verb{verb_index}"
+        for tense in TENSES:
+            for pronoun_index in range(PRONOUN_COUNT):
+                interval = (verb_index + pronoun_index) % 30 + 1
+                yield Card(
+                    verb=verb,
+                    pronoun_index=pronoun_index,
+                    tense=tense,
+                    easiness_factor=2.6,
+                    interval=interval,
+                    repetitions=3,
+                    next_review_date=(today + datetime.timedelta(days=interval)).isoformat(),
+                    last_review_date=today.isoformat(),
+                    total_reviews=5,
+                    correct_reviews=4
+                )
+
+
+def build_dict_deck():
+    """Прежний формат: строковый ключ -> dataclass Card"""
+    return {f"{card.verb}_{card.pronoun_index}_{card.tense}": card for card in make_cards()}
+
+
+def build_card_store():
+    store = CardStore()
+    for card in make_cards():
+        store.add(CODEC.encode(card.verb, card.pronoun_index, card.tense), card)
+    return store
+
+
+def measure(build) -> float:
+    """Байт на карточку для USERS колод, построенных функцией build"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    decks = [build() for _ in range(USERS)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    cards = sum(len(deck) for deck in decks)
+    return (after - before) / cards
+
+
+def main():
+    cards_per_user = VERB_COUNT * len(TENSES) * PRONOUN_COUNT
+    print(f"{USERS} users x {cards_per_user} cards")
+
+    dict_bytes = measure(build_dict_deck)
+    store_bytes = measure(build_card_store)
+    print(f"dict of Card:  {dict_bytes:8.1f} bytes/card")
+    print(f"CardStore:     {store_bytes:8.1f} bytes/card")
+    print(f"ratio:         {dict_bytes / store_bytes:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
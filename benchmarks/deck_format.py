@@ -0,0 +1,114 @@
+# benchmarks/deck_format.py
+"""
+Двоичный формат колод и журналов: размер и скорость против JSON
+
+Round-trip и разбор испорченных файлов проверяет tests/test_deck_format.py.
+
+Запуск: python -m benchmarks.deck_format
+"""
+
+import json
+import random
+import time
+from dataclasses import asdict
+
+from srs.card_ids import CardCodec
+from srs.card_store import CardStore
+from srs.models import Card, day_to_iso
+from srs.review_log import ReviewLog
+from storage.deck_format import (
+    COMPRESSION_NONE, COMPRESSION_ZLIB, COMPRESSION_ZSTD, decode_deck, decode_log, encode_deck, encode_log, zstandard
+)
+
+TENSES = ['presente', 'indefinido', 'subjuntivo', 'imperfecto']
+CODEC = CardCodec([f"verb{verb_index}" for verb_index in range(100)], TENSES)
+ALL_IDS = [
+    CODEC.encode(verb, pronoun_index, tense)
+    for verb in CODEC.verbs for tense in TENSES for pronoun_index in range(6)
+]
+DECK_SIZE = len(ALL_IDS)  # 2 400 карточек - полная колода
+LOG_SIZE = 100_000
+REPEATS = 5
+
+
+def random_deck(rng: random.Random, card_ids) -> CardStore:
+    store = CardStore()
+    start_day = 738_000
+    for card_id in card_ids:
+        verb, pronoun_index, tense = CODEC.decode(card_id)
+        last_day = start_day + rng.randrange(1000)
+        interval = rng.randrange(1, 400)
+        store.add_row(
+            card_id, verb, pronoun_index, tense,
+            rng.randrange(26, 61) / 20, interval, rng.randrange(10),
+            last_day + interval, last_day, rng.randrange(50), rng.randrange(25)
+        )
+    return store
+
+
+def random_log(rng: random.Random, count: int) -> ReviewLog:
+    log = ReviewLog(first_seq=rng.randrange(1, 1000))
+    timestamp = 1_700_000_000.0
+    for _ in range(count):
+        timestamp += rng.random() * 60
+        log.append(rng.choice(ALL_IDS), rng.randrange(4), timestamp, rng.randrange(400), rng.randrange(26, 61) / 20)
+    return log
+
+
+def compressions():
+    return [COMPRESSION_NONE, COMPRESSION_ZLIB] + ([COMPRESSION_ZSTD] if zstandard else [])
+
+
+def deck_to_json(deck: CardStore) -> bytes:
+    """Наивный вариант: словарь ключ -> asdict(Card) с ISO-датами"""
+    return json.dumps({
+        CODEC.to_legacy_key(card_id): asdict(card.to_card()) for card_id, card in deck.items()
+    }).encode('utf-8')
+
+
+def deck_from_json(data: bytes) -> CardStore:
+    store = CardStore()
+    for key, fields in json.loads(data).items():
+        store.add(CODEC.from_legacy_key(key), Card(**fields))
+    return store
+
+
+def log_to_json(log: ReviewLog) -> bytes:
+    return json.dumps([
+        {**event.__dict__, 'review_date': day_to_iso(event.review_day)} for event in log
+    ]).encode('utf-8')
+
+
+def best_of(action, repeats: int = REPEATS) -> float:
+    """Лучшее время из нескольких запусков, мс"""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        action()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def report(name: str, encode, decode) -> None:
+    data = encode()
+    print(f"  {name:<12} {len(data):>10,} bytes | encode {best_of(encode):8.2f} ms | "
+          f"decode {best_of(lambda: decode(data)):8.2f} ms")
+
+
+def main():
+    rng = random.Random(0)
+    deck = random_deck(rng, ALL_IDS)
+    print(f"deck, {DECK_SIZE:,} cards:")
+    report('json', lambda: deck_to_json(deck), deck_from_json)
+    for compression in compressions():
+        report(compression, lambda: encode_deck(deck, compression), decode_deck)
+
+    log = random_log(rng, LOG_SIZE)
+    print(f"review log, {LOG_SIZE:,} events:")
+    report('json', lambda: log_to_json(log), json.loads)
+    for compression in compressions():
+        report(compression, lambda: encode_log(log, compression), decode_log)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/deck_repository.py
+"""
+Задержка загрузки и сохранения колод через DeckRepository
+
+Запуск: python -m benchmarks.deck_repository [DATABASE_URL]
+(по умолчанию - временный файл SQLite)
+"""
+
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+from srs.card_ids import CardCodec
+from srs.card_store import CardStore
+from storage.database import create_database_engine
+from storage.repository import DeckCoverage, DeckRepository
+
+TENSES = ['presente', 'indefinido', 'subjuntivo', 'imperfecto']
+DECK_SIZES = (2_400, 100_000)
+CHANGED_CARDS = 50
+# Частичная загрузка при входе: одно время и уровень словаря 30
+PARTIAL_TENSES = ['presente']
+PARTIAL_VERBS = 30
+REPEATS = 5
+
+
+def make_deck(codec: CardCodec, size: int) -> CardStore:
+    store = CardStore()
+    today = datetime.date.today().toordinal()
+    for card_id in range(size):
+        # Плотные id: перебираем местоимения, времена и глаголы подряд
+        verb_ordinal, rest = divmod(card_id, len(TENSES) * 6)
+        tense_ordinal, pronoun_index = divmod(rest, 6)
+        packed = codec.encode(codec.verbs[verb_ordinal], pronoun_index, TENSES[tense_ordinal])
+        store.add_row(packed, codec.verbs[verb_ordinal], pronoun_index, TENSES[tense_ordinal],
+                      2.5, card_id % 30 + 1, 2, today + card_id % 30, today, 4, 3)
+    return store
+
+
+def best_of(action, repeats: int = REPEATS) -> float:
+    """Лучшее время из нескольких запусков, мс"""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        action()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main():
+    if len(sys.argv) > 1:
+        url = sys.argv[1]
+    else:
+        url = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+
+    verb_count = max(DECK_SIZES) // (len(TENSES) * 6) + 1
+    codec = CardCodec([f"verb{verb_index}" for verb_index in range(verb_count)], TENSES)
+    repository = DeckRepository(create_database_engine(url), codec)
+    repository.create_schema()
+    print(f"database: {repository.engine.url.render_as_string(hide_password=True)}")
+
+    for size in DECK_SIZES:
+        user_id = f"bench-{size}"
+        deck = make_deck(codec, size)
+        changed = deck.keys()[:CHANGED_CARDS]
+
+        full_save = best_of(lambda: repository.save_deck(user_id, deck), repeats=1)
+        load = best_of(lambda: repository.load_deck(user_id))
+        ranges = DeckCoverage().missing(PARTIAL_TENSES, PARTIAL_VERBS)
+        partial = best_of(lambda: repository.load_partitions(user_id, ranges))
+        delta_save = best_of(lambda: repository.save_cards(user_id, deck, changed))
+
+        print(f"{size:>7,} cards: load {load:8.1f} ms | partial load {partial:6.1f} ms | "
+              f"save {CHANGED_CARDS} changed {delta_save:6.1f} ms | full save {full_save:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/due_queries.py
+"""
+Карточки к повторению в SQL: скорость count_due против загрузки колоды в DueIndex
+
+Миграции, совпадение с DueIndex и план запроса (EXPLAIN QUERY PLAN)
+проверяет tests/test_due_queries.py.
+
+Запуск: python -m benchmarks.due_queries
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from srs.card_ids import CardCodec
+from srs.card_store import CardStore
+from srs.due_index import DueIndex
+from srs.models import day_to_iso
+from storage.database import create_database_engine
+from storage.repository import DeckRepository
+
+TENSES = ['presente', 'indefinido', 'subjuntivo', 'imperfecto']
+CODEC = CardCodec([f"verb{verb_index}" for verb_index in range(100)], TENSES)
+USERS = 50
+TODAY = 739_000
+REPEATS = 20
+
+
+def random_deck(rng: random.Random) -> CardStore:
+    store = CardStore()
+    for verb in CODEC.verbs:
+        for tense in TENSES:
+            for pronoun_index in range(6):
+                if rng.random() < 0.6:
+                    interval = rng.randrange(1, 60)
+                    next_day = TODAY + rng.randrange(-30, 30)
+                    store.add_row(CODEC.encode(verb, pronoun_index, tense), verb, pronoun_index, tense,
+                                  2.5, interval, 2, next_day, next_day - interval, 3, 2)
+    return store
+
+
+def best_of(action, repeats: int = REPEATS) -> float:
+    """Лучшее время из нескольких запусков, мс"""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        action()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    repository = DeckRepository(create_database_engine('sqlite:///' + os.path.join(directory, 'due.db')), CODEC)
+    repository.create_schema()
+
+    rng = random.Random(0)
+    decks = {f"user-{index}": random_deck(rng) for index in range(USERS)}
+    for user_id, deck in decks.items():
+        repository.save_deck(user_id, deck)
+    with repository.engine.begin() as connection:
+        connection.exec_driver_sql('ANALYZE')
+
+    def load_and_count():
+        due_index = DueIndex()
+        due_index.rebuild(repository.load_deck('user-0'))
+        return due_index.count_due(day_to_iso(TODAY), ['presente'], frozenset(CODEC.verbs[:30]))
+
+    print(f"count due, {USERS} users x ~{len(decks['user-0']):,} cards: "
+          f"SQL {best_of(lambda: repository.count_due('user-0', TODAY, ['presente'], 30)):.2f} ms | "
+          f"load deck + DueIndex {best_of(load_and_count, repeats=3):.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+# benchmarks/engine_pool.py
+"""
+Нагрузочная проверка общего пула соединений: 200 одновременных сессий
+
+Каждая сессия - поток, который входит (частичная загрузка колоды) и затем
+несколько раз сбрасывает пачку ответов, как WriteBuffer. Все потоки делят
+один движок. В конце колоды сверяются с ожидаемыми, а пул должен вернуть
+все соединения.
+
+Запуск: python -m benchmarks.engine_pool [DATABASE_URL]
+(по умолчанию - временный файл SQLite)
+"""
+
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from srs.card_ids import CardCodec
+from srs.card_store import CardStore
+from srs.models import Card, Difficulty
+from srs.review_log import ReviewLog
+from srs.scheduler import SRSManager
+from storage.database import PoolSettings, create_database_engine
+from storage.repository import DeckCoverage, DeckRepository
+
+TENSES = ['presente', 'indefinido', 'subjuntivo', 'imperfecto']
+CODEC = CardCodec([f"verb{verb_index}" for verb_index in range(100)], TENSES)
+SESSIONS = 200
+FLUSHES_PER_SESSION = 5
+ANSWERS_PER_FLUSH = 10
+POOL = PoolSettings(size=5, max_overflow=10, timeout=60.0)
+
+
+def run_session(repository: DeckRepository, user_id: str, start: threading.Barrier, errors: list, results: dict):
+    rng = random.Random(user_id)
+    try:
+        start.wait()
+        store = CardStore()
+        coverage = DeckCoverage()
+        ranges = coverage.missing(['presente'], 30)
+        repository.load_partitions(user_id, ranges, store)
+        coverage.extend(ranges)
+
+        log = ReviewLog(first_seq=repository.last_event_seq(user_id) + 1)
+        flushed_seq = log.first_seq - 1
+        for _ in range(FLUSHES_PER_SESSION):
+            for _ in range(ANSWERS_PER_FLUSH):
+                verb = CODEC.verbs[rng.randrange(30)]
+                card_id = CODEC.encode(verb, rng.randrange(6), 'presente')
+                if card_id not in store:
+                    store.add(card_id, Card(verb=verb, pronoun_index=CODEC.decode(card_id)[1], tense='presente'))
+                card = store[card_id]
+                grade = rng.choice(list(Difficulty))
+                log.append(card_id, grade.value, time.time(), card.interval, card.easiness_factor)
+                SRSManager.update_card(card, grade)
+                time.sleep(rng.random() * 0.002)  # пользователь думает
+
+            card_ids = store.dirty_ids()
+            repository.write(
+                repository.card_rows(user_id, store, card_ids),
+                repository.event_rows(user_id, log.since(flushed_seq))
+            )
+            store.clear_dirty()
+            flushed_seq = log.last_seq
+        results[user_id] = store
+    except Exception as e:  # noqa: BLE001 - собираем любые ошибки потоков
+        errors.append((user_id, e))
+
+
+def run_sessions(repository: DeckRepository, sessions: int) -> float:
+    """
+    Запускает sessions одновременных сессий и сверяет их колоды с базой
+
+    Returns:
+        Время работы сессий, секунд
+    """
+    start = threading.Barrier(sessions)
+    errors, results = [], {}
+    threads = [
+        threading.Thread(target=run_session, args=(repository, f"user-{index}", start, errors, results))
+        for index in range(sessions)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    assert not errors, errors[:3]
+    assert len(results) == sessions
+    for user_id, store in results.items():
+        saved = repository.load_deck(user_id)
+        assert {card_id: card.to_card() for card_id, card in saved.items()} == \
+               {card_id: card.to_card() for card_id, card in store.items()}, user_id
+        assert repository.last_event_seq(user_id) == FLUSHES_PER_SESSION * ANSWERS_PER_FLUSH, user_id
+    return elapsed
+
+
+def main():
+    if len(sys.argv) > 1:
+        url = sys.argv[1]
+    else:
+        url = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'pool.db')
+
+    engine = create_database_engine(url, POOL)
+    repository = DeckRepository(engine, CODEC)
+    repository.create_schema()
+    print(f"database: {engine.url.render_as_string(hide_password=True)}, "
+          f"pool {POOL.size}+{POOL.max_overflow}, {SESSIONS} sessions")
+
+    elapsed = run_sessions(repository, SESSIONS)
+
+    stats = engine.pool.stats()
+    assert stats.in_use == 0, stats
+    transactions = SESSIONS * (FLUSHES_PER_SESSION + 2)
+    print(f"all {SESSIONS} decks and logs match; {transactions / elapsed:,.0f} transactions/s")
+    print(f"checkouts {stats.checkouts:,} | connects {stats.connects} | peak in use {stats.peak_in_use} | "
+          f"waited {stats.waits:,} | timeouts {stats.timeouts}")
+    print(f"wait mean {stats.wait_mean * 1000:.2f} ms | wait max {stats.wait_max * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
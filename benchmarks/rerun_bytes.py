@@ -0,0 +1,81 @@
+# benchmarks/rerun_bytes.py
+"""
+Объем разметки, которую сервер отправляет браузеру за один перезапуск
+
+Считается размер protobuf всех элементов страницы после перезапуска через
+AppTest (без обертки ForwardMsg и сжатия websocket) - этого достаточно,
+чтобы сравнить версии скрипта между собой:
+1. Первый запуск сессии (вместе со стилями).
+2. Повторный перезапуск на странице с вопросом.
+3. Перезапуск после показа ответа.
+
+Карточки показываются кнопками Streamlit (CLIENT_SIDE_CARDS=0), чтобы
+разметка карточки приходила с сервера. Замеры повторяются с одним
+выбранным временем (по умолчанию) и со всеми временами сразу.
+
+Запуск: python -m benchmarks.rerun_bytes [SCRIPT ...]
+(SCRIPT - другая версия spanish_verbs_srs.py для сравнения, рядом с оригиналом)
+"""
+
+import logging
+import os
+import sys
+import tempfile
+
+from streamlit.testing.v1 import AppTest
+
+from srs.catalog import CONJUGATIONS
+
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'spanish_verbs_srs.py')
+
+
+def page_bytes(node) -> int:
+    """Суммарный размер protobuf элементов и блоков дерева страницы"""
+    proto = getattr(node, 'proto', None)
+    size = proto.ByteSize() if hasattr(proto, 'ByteSize') else 0
+    return size + sum(page_bytes(child) for child in getattr(node, 'children', {}).values())
+
+
+def measure(script: str, all_tenses: bool = False) -> None:
+    app = AppTest.from_file(script, default_timeout=60)
+    app.session_state['authenticated'] = True
+    app.session_state['user_info'] = {'name': 'bench', 'email': 'bench@example.com'}
+    if all_tenses:
+        app.session_state['settings'] = {
+            'new_cards_per_day': 10,
+            'review_cards_per_day': 50,
+            'selected_tenses': list(CONJUGATIONS),
+            'auto_save': True,
+            'vocabulary_size': 30
+        }
+
+    app.run()
+    assert not app.exception, app.exception
+    first = page_bytes(app._tree)
+
+    app.run()
+    question = page_bytes(app._tree)
+
+    show_answer = [button for button in app.button if button.proto.type == 'primary']
+    assert show_answer, 'на странице нет карточки'
+    show_answer[0].click().run()
+    assert not app.exception, app.exception
+    assert app.session_state['is_revealed']
+    revealed = page_bytes(app._tree)
+
+    tenses = 'all tenses' if all_tenses else 'one tense'
+    print(f"{os.path.basename(script)} ({tenses}): first run {first:,} B | "
+          f"question rerun {question:,} B | answer rerun {revealed:,} B")
+
+
+def main():
+    logging.disable(logging.WARNING)
+    os.environ['CLIENT_SIDE_CARDS'] = '0'
+    os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'rerun.db'))
+    for script in [APP_SCRIPT] + sys.argv[1:]:
+        for all_tenses in (False, True):
+            measure(os.path.abspath(script), all_tenses)
+
+
+if __name__ == '__main__':
+    main()
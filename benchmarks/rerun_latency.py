@@ -0,0 +1,76 @@
+# benchmarks/rerun_latency.py
+"""
+Задержка перезапуска скрипта Streamlit: каталог в коде скрипта против общего каталога
+
+1. Стоимость каталога на один перезапуск: выполнение литералов VERBS,
+   CONJUGATIONS и т.д. (так было, пока каталог жил в скрипте) против
+   вызова get_catalog() через st.cache_resource.
+2. Полный перезапуск приложения через AppTest на странице с карточкой.
+
+Запуск: python -m benchmarks.rerun_latency [SCRIPT]
+(SCRIPT - другая версия spanish_verbs_srs.py для сравнения, рядом с оригиналом)
+"""
+
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from srs import catalog
+from srs.catalog import build_catalog
+
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'spanish_verbs_srs.py')
+CATALOG_CALLS = 2000
+RERUNS = 30
+
+
+def mean_us(action, repeats: int = CATALOG_CALLS) -> float:
+    """Среднее время вызова, мкс"""
+    started = time.perf_counter()
+    for _ in range(repeats):
+        action()
+    return (time.perf_counter() - started) / repeats * 1e6
+
+
+def catalog_cost() -> None:
+    with open(catalog.__file__, encoding='utf-8') as source:
+        code = compile(source.read(), catalog.__file__, 'exec')
+    get_catalog = st.cache_resource(show_spinner=False)(build_catalog)
+    get_catalog()
+
+    print(f"catalog per rerun: literals {mean_us(lambda: exec(code, {}), 200):,.1f} us | "
+          f"cached get_catalog() {mean_us(get_catalog):,.1f} us")
+
+
+def rerun_latency(script: str) -> None:
+    os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'rerun.db'))
+    app = AppTest.from_file(script, default_timeout=60)
+    app.session_state['authenticated'] = True
+    app.session_state['user_info'] = {'name': 'bench', 'email': 'bench@example.com'}
+    app.run()
+    assert not app.exception, app.exception
+
+    timings = []
+    for _ in range(RERUNS):
+        started = time.perf_counter()
+        app.run()
+        timings.append(time.perf_counter() - started)
+        assert not app.exception, app.exception
+    print(f"{os.path.basename(script)}: rerun median {statistics.median(timings) * 1000:.1f} ms | "
+          f"min {min(timings) * 1000:.1f} ms over {RERUNS} reruns")
+
+
+def main():
+    logging.disable(logging.WARNING)
+    catalog_cost()
+    for script in [APP_SCRIPT] + sys.argv[1:]:
+        rerun_latency(os.path.abspath(script))
+
+
+if __name__ == '__main__':
+    main()
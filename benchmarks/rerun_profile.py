@@ -0,0 +1,64 @@
+# benchmarks/rerun_profile.py
+"""
+Профиль перезапусков приложения по точкам входа (RERUN_PROFILING=1)
+
+Через AppTest проходит серию карточек кнопками Streamlit: показать ответ,
+оценить. В конце печатает p50/p99 по точкам входа из профиля сессии
+и показатели из того же дампа, что скачивается с панели ?debug=profile.
+
+Запуск: python -m benchmarks.rerun_profile [CARDS] [--json]
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+from typing import Dict, Tuple
+
+from streamlit.testing.v1 import AppTest
+
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'spanish_verbs_srs.py')
+GRADE_KEYS = ('good', 'hard', 'easy', 'again')
+
+
+def run(cards: int) -> Tuple[Dict, str]:
+    """(сводка профиля сессии, показатели с панели в JSON)"""
+    app = AppTest.from_file(APP_SCRIPT, default_timeout=60)
+    app.session_state['authenticated'] = True
+    app.session_state['user_info'] = {'name': 'bench', 'email': 'bench@example.com'}
+    app.query_params['debug'] = 'profile'
+    app.run()
+    assert not app.exception, app.exception
+
+    for answered in range(cards):
+        show_answer = [button for button in app.button if button.proto.type == 'primary']
+        if not show_answer:
+            break
+        show_answer[0].click().run()
+        app.button(key=GRADE_KEYS[answered % len(GRADE_KEYS)]).click().run()
+        assert not app.exception, app.exception
+
+    # Тот же дамп, что отдает панель
+    return app.session_state['rerun_profile'].summary(), app.get('json')[0].value
+
+
+def main():
+    logging.disable(logging.WARNING)
+    os.environ['RERUN_PROFILING'] = '1'
+    os.environ['CLIENT_SIDE_CARDS'] = '0'
+    os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'profile.db'))
+    args = [arg for arg in sys.argv[1:] if arg != '--json']
+    summary, gauges = run(int(args[0]) if args else 10)
+
+    if '--json' in sys.argv:
+        print(json.dumps({'session': summary, 'gauges': json.loads(gauges)}, indent=2))
+        return
+    for name, entry in summary.items():
+        print(f"{name:24} n={entry['count']:4} p50 {entry['p50_ms']:8.2f} ms | "
+              f"p99 {entry['p99_ms']:8.2f} ms | p50 blocks {entry['p50_blocks']:+}")
+    print('gauges', gauges)
+
+
+if __name__ == '__main__':
+    main()
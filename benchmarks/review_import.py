@@ -0,0 +1,129 @@
+# benchmarks/review_import.py
+"""
+Импорт истории повторений: строк в секунду
+
+Импортирует большую историю в CSV и NDJSON с выводом прогресса. Сверка
+с поштучным update_card (scalar_import) - в tests/test_review_import.py.
+
+Запуск: python -m benchmarks.review_import [DATABASE_URL] [ROWS]
+(по умолчанию - временный файл SQLite; для Postgres импорт идет через COPY)
+"""
+
+import csv
+import datetime
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+
+from srs.card_ids import CardCodec
+from srs.card_store import CardStore
+from srs.models import Card, Difficulty
+from srs.scheduler import SRSManager
+from storage.database import create_database_engine
+from storage.repository import DeckRepository
+from storage.review_import import FORMAT_CSV, FORMAT_NDJSON, ReviewMapper, import_history
+
+TENSES = ['presente', 'indefinido', 'subjuntivo', 'imperfecto']
+CODEC = CardCodec([f"verb{verb_index}" for verb_index in range(100)], TENSES)
+PRONOUNS = ['yo', 'tú', 'él/ella', 'nosotros', 'vosotros', 'ellos/ellas']
+FIELDS = ['verb', 'tense', 'pronoun', 'grade', 'timestamp']
+
+# Как пишут поля другие программы
+TENSE_NAMES = {
+    'presente': ['presente', 'Present', 'Presente de indicativo'],
+    'indefinido': ['indefinido', 'Preterite', 'Pretérito indefinido'],
+    'subjuntivo': ['subjuntivo', 'Subjunctive', 'presente de subjuntivo'],
+    'imperfecto': ['imperfecto', 'Imperfect', 'Pretérito imperfecto'],
+}
+PRONOUN_NAMES = [['yo', '0'], ['tú', 'tu', '1'], ['él', 'ella', 'usted'], ['nosotros', 'nosotras'],
+                 ['vosotros', 'vosotras'], ['ellos', 'ellas', 'ustedes']]
+GRADE_NAMES = [['0', 'again'], ['1', 'Hard'], ['2', 'good'], ['3', 'EASY']]
+# Частые "again" и "hard" держат интервалы в пределах календаря при сотнях ответов на карточку
+GRADE_WEIGHTS = [5, 3, 1, 1]
+BAD_ROWS = [
+    {'verb': 'hablarse', 'tense': 'presente', 'pronoun': 'yo', 'grade': '2', 'timestamp': '1700000000'},
+    {'verb': 'verb1', 'tense': 'futuro', 'pronoun': 'yo', 'grade': '2', 'timestamp': '1700000000'},
+    {'verb': 'verb1', 'tense': 'presente', 'pronoun': 'vos', 'grade': '2', 'timestamp': '1700000000'},
+    {'verb': 'verb1', 'tense': 'presente', 'pronoun': 'yo', 'grade': '7', 'timestamp': '1700000000'},
+    {'verb': 'verb1', 'tense': 'presente', 'pronoun': 'yo', 'grade': '2', 'timestamp': 'yesterday'},
+]
+
+
+def random_history(rng: random.Random, count: int):
+    """Записи истории в случайном порядке и с разным написанием полей, плюс несколько плохих строк"""
+    start = datetime.datetime(2021, 1, 1).timestamp()
+    records = []
+    for _ in range(count):
+        verb = rng.choice(CODEC.verbs)
+        tense = rng.choice(TENSES)
+        timestamp = start + rng.random() * 3 * 365 * 86400
+        records.append({
+            'verb': verb if rng.random() < 0.9 else verb.upper(),
+            'tense': rng.choice(TENSE_NAMES[tense]),
+            'pronoun': rng.choice(rng.choice(PRONOUN_NAMES)),
+            'grade': rng.choice(rng.choices(GRADE_NAMES, GRADE_WEIGHTS)[0]),
+            'timestamp': timestamp if rng.random() < 0.5
+            else datetime.datetime.fromtimestamp(round(timestamp)).isoformat(),
+        })
+    return records + BAD_ROWS
+
+
+def to_csv(records) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, FIELDS)
+    writer.writeheader()
+    writer.writerows(records)
+    return buffer.getvalue()
+
+
+def to_ndjson(records) -> str:
+    return ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+
+
+def scalar_import(records):
+    """Эталон: те же ответы по одному через update_card в порядке времени"""
+    mapper = ReviewMapper(CODEC, PRONOUNS)
+    answers = []
+    for record in records:
+        try:
+            answers.append(mapper.map(record))
+        except ValueError:
+            pass
+    answers.sort(key=lambda answer: answer[2])
+
+    store, events = CardStore(), []
+    for card_id, grade, timestamp in answers:
+        if card_id not in store:
+            verb, pronoun_index, tense = CODEC.decode(card_id)
+            store.add(card_id, Card(verb=verb, pronoun_index=pronoun_index, tense=tense))
+        card = store[card_id]
+        events.append((card_id, grade, timestamp, card.interval, card.easiness_factor))
+        SRSManager.update_card(card, Difficulty(grade), review_date=datetime.date.fromtimestamp(timestamp))
+    return {card_id: card.to_card() for card_id, card in store.items()}, events
+
+
+def print_progress(stage: str, rows: int, rate: float) -> None:
+    print(f"\r  {stage:<8} {rows:>12,} rows | {rate:>12,.0f} rows/s", end='', flush=True)
+
+
+def main():
+    url = sys.argv[1] if len(sys.argv) > 1 else 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'import.db')
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+
+    repository = DeckRepository(create_database_engine(url), CODEC)
+    repository.create_schema()
+    print(f"database: {repository.engine.url.render_as_string(hide_password=True)}")
+
+    records = random_history(random.Random(0), rows)
+    for fmt, text in ((FORMAT_CSV, to_csv(records)), (FORMAT_NDJSON, to_ndjson(records))):
+        print(f"{fmt}, {len(records):,} rows ({len(text.encode('utf-8')) / 2 ** 20:.1f} MiB):")
+        report = import_history(repository, f"bulk-{fmt}", io.StringIO(text), fmt, PRONOUNS, print_progress)
+        print(f"\r  imported {report.imported:,} events, {report.cards:,} cards in {report.seconds:.2f} s "
+              f"({report.rows_per_second:,.0f} rows/s); skipped {report.skipped}")
+
+
+if __name__ == '__main__':
+    main()
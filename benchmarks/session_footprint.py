@@ -0,0 +1,96 @@
+# benchmarks/session_footprint.py
+"""
+Память st.session_state по ключам для нескольких пользователей и вкладок
+
+Через AppTest открывает по TABS вкладок для USERS пользователей, в
+каждой отвечает на CARDS карточек (все времена, полный словарь) и
+считает глубокий размер каждого ключа session_state. Для версии с общим
+хранилищем колод печатает и строку скрытой панели ?debug=footprint:
+сколько занимают сами колоды.
+
+Запуск: python -m benchmarks.session_footprint [SCRIPT ...]
+(SCRIPT - другая версия spanish_verbs_srs.py для сравнения, рядом с оригиналом)
+"""
+
+import logging
+import os
+import sys
+import tempfile
+
+from streamlit.testing.v1 import AppTest
+
+from srs.catalog import CONJUGATIONS
+from ui.footprint import session_footprint
+
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'spanish_verbs_srs.py')
+USERS = 4
+TABS = 2
+CARDS = 30
+TOP_KEYS = 8
+
+
+def open_tab(script: str, user: int) -> AppTest:
+    app = AppTest.from_file(script, default_timeout=60)
+    app.session_state['authenticated'] = True
+    # Движок БД закэширован на процесс: у каждой версии скрипта свои пользователи
+    name = f'{os.path.splitext(os.path.basename(script))[0]}-user{user}'
+    app.session_state['user_info'] = {'name': name, 'email': f'{name}@example.com'}
+    app.session_state['settings'] = {
+        'new_cards_per_day': 1000,
+        'review_cards_per_day': 1000,
+        'selected_tenses': list(CONJUGATIONS),
+        'auto_save': True,
+        'vocabulary_size': 100
+    }
+    app.query_params['debug'] = 'footprint'
+    app.run()
+    assert not app.exception, app.exception
+    return app
+
+
+def answer_cards(app: AppTest, cards: int) -> None:
+    for answered in range(cards):
+        show_answer = [button for button in app.button if button.proto.type == 'primary']
+        if not show_answer:
+            break
+        show_answer[0].click().run()
+        app.button(key=('good', 'again', 'easy')[answered % 3]).click().run()
+        assert not app.exception, app.exception
+
+
+def measure(script: str) -> None:
+    tabs = []
+    for user in range(USERS):
+        for _ in range(TABS):
+            app = open_tab(script, user)
+            answer_cards(app, CARDS)
+            tabs.append(app)
+
+    report = session_footprint(app.session_state._state.filtered_state for app in tabs)
+    print(f"{os.path.basename(script)}: {report['sessions']} sessions | "
+          f"session state {report['total_bytes']:,} B | max per session {report['max_session_bytes']:,} B")
+    for key, entry in list(report['keys'].items())[:TOP_KEYS]:
+        print(f"  {key:22} total {entry['total_bytes']:>10,} B | max {entry['max_bytes']:>9,} B")
+
+    # Строка панели: размер общего хранилища колод (есть только в версии с ним).
+    # Панель требует RERUN_PROFILING - включаем его только сейчас, чтобы
+    # буфер замеров не попал в размеры выше
+    os.environ['RERUN_PROFILING'] = '1'
+    tabs[-1].run()
+    del os.environ['RERUN_PROFILING']
+    captions = [caption.value for caption in tabs[-1].caption if 'shared decks' in caption.value]
+    if captions:
+        print('  panel:', captions[0])
+
+
+def main():
+    logging.disable(logging.WARNING)
+    os.environ['CLIENT_SIDE_CARDS'] = '0'
+    os.environ.pop('RERUN_PROFILING', None)
+    os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'footprint.db'))
+    for script in [APP_SCRIPT] + sys.argv[1:]:
+        measure(os.path.abspath(script))
+
+
+if __name__ == '__main__':
+    main()
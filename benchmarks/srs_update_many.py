@@ -0,0 +1,58 @@
+# benchmarks/srs_update_many.py
+"""
+Пакетное SM-2: пропускная способность update_many против update_card
+
+Совпадение с поштучным update_card проверяет tests/test_scheduler.py.
+
+Запуск: python -m benchmarks.srs_update_many
+"""
+
+import datetime
+import time
+
+import numpy as np
+
+from srs.card_store import CardStore
+from srs.models import Card, Difficulty
+from srs.scheduler import SRSManager
+
+
+def make_simulation_store(cards: int) -> CardStore:
+    """Синтетическая колода офлайн-симуляции (id не привязаны к каталогу)"""
+    store = CardStore()
+    for card_id in range(cards):
+        store.add(card_id, Card(verb='hablar', pronoun_index=card_id % 6, tense='presente'))
+    return store
+
+
+def measure_throughput(reviews: int = 2_000_000, cards: int = 500_000) -> None:
+    # ~4 ответа на карточку: длинные серии подряд верных ответов
+    # увели бы интервалы SM-2 за пределы календаря
+    rng = np.random.default_rng(0)
+    ids = rng.integers(0, cards, size=reviews)
+    grades = rng.integers(0, 4, size=reviews)
+    days = np.sort(rng.integers(0, 3650, size=reviews)) + datetime.date(2020, 1, 1).toordinal()
+
+    store = make_simulation_store(cards)
+    started = time.perf_counter()
+    SRSManager.update_many(store, ids, grades, days)
+    elapsed = time.perf_counter() - started
+
+    scalar_count = 50_000
+    scalar = make_simulation_store(cards)
+    review_dates = [datetime.date.fromordinal(day) for day in days[:scalar_count].tolist()]
+    started = time.perf_counter()
+    for card_id, grade, review_date in zip(ids[:scalar_count].tolist(), grades[:scalar_count].tolist(), review_dates):
+        SRSManager.update_card(scalar[card_id], Difficulty(grade), review_date=review_date)
+    scalar_elapsed = time.perf_counter() - started
+
+    print(f"update_many: {reviews / elapsed:12,.0f} reviews/s ({reviews:,} reviews over {cards:,} cards)")
+    print(f"update_card: {scalar_count / scalar_elapsed:12,.0f} reviews/s")
+
+
+def main():
+    measure_throughput()
+
+
+if __name__ == '__main__':
+    main()
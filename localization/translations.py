@@ -21,6 +21,7 @@ TRANSLATIONS = {
         'logout': '🚪 Выйти',
         'sync': '💾 Синхронизация',
         'synced': '✅ Синхронизировано!',
+        'sync_error': '❌ Ошибка синхронизации',
         
         # Основной интерфейс
         'show_answer': '🔍 Показать ответ',
@@ -133,6 +134,7 @@ TRANSLATIONS = {
         'logout': '🚪 Logout',
         'sync': '💾 Sync',
         'synced': '✅ Synced!',
+        'sync_error': '❌ Sync error',
         
         # Main interface
         'show_answer': '🔍 Show answer',
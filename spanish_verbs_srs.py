@@ -1,23 +1,48 @@
 # main.py - Основной файл с расширенной базой глаголов (100 глаголов)
 
 import streamlit as st
+import streamlit.components.v1 as components
 import os
 import requests
 from urllib.parse import urlencode
 import base64
 import datetime
+import functools
+import json
 import time
-import random
-import math
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass, asdict
-from enum import Enum
+import textwrap
+from typing import Callable, Dict, FrozenSet, Iterator, List, Tuple, Optional
+from dataclasses import asdict
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from streamlit.errors import StreamlitAPIException
 
 # Импортируем систему переводов
 from localization.translations import (
     get_text, get_grammar_rule, get_available_languages, 
     get_current_language, set_language, t, get_verb_translation
 )
+from srs.card_batch import CardBatch
+from srs.catalog import Catalog, build_catalog
+from srs.models import Card, Difficulty
+from srs.card_store import CardStore
+from srs.card_ids import CardCodec
+from srs.scheduler import SRSManager
+from srs.review_log import ReviewLog
+from srs.prefetch import CardQueue
+from storage.database import create_database_engine
+from storage.local_cache import LocalCache, get_local_cache_dir
+from storage.repository import DeckCoverage, DeckRepository
+from storage.session_decks import DeckRegistry, UserDeck, get_deck_limits
+from storage.write_behind import DURABILITY_IMMEDIATE, FlushWorker, WriteBuffer, get_durability_mode
+from srs.new_cards import NewCardStream, seed_for_user
+from srs.stats import DeckStats
+from srs.vocabulary import Partitions, VocabularyLevels
+from ui.card_component import card_batch
+from ui.footprint import deep_size, live_session_states, session_footprint
+from ui.profiling import ProcessProfile, RerunProfile, measure, profile_dump
+from ui.styles import APP_CSS, APP_STYLESHEET, stylesheet_injector
+from ui.templates import CardTemplate, compile_card_template
 
 # Конфигурация
 st.set_page_config(
@@ -36,662 +61,127 @@ GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/auth"
 GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
 GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
 
-# CSS стили
-st.markdown("""
-<style>
-    .main > div {
-        max-width: 1200px;
-        padding-left: 2rem;
-        padding-right: 2rem;
-    }
-    
-    .main-content {
-        max-width: 600px;
-        margin: 0 auto;
-        padding: 0 1rem;
-    }
-    
-    .verb-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 3rem 2rem;
-        border-radius: 1rem;
-        text-align: center;
-        margin: 2rem 0;
-        box-shadow: 0 12px 40px rgba(102, 126, 234, 0.3);
-        transition: all 0.3s ease;
-        cursor: pointer;
-    }
-    
-    .verb-card:hover {
-        transform: translateY(-3px);
-        box-shadow: 0 15px 45px rgba(102, 126, 234, 0.4);
-    }
-    
-    .verb-card.revealed {
-        background: linear-gradient(135deg, #48ca8b 0%, #2dd4bf 100%);
-        box-shadow: 0 12px 40px rgba(72, 202, 139, 0.3);
-    }
-    
-    .verb-title {
-        font-size: 3.5rem;
-        font-weight: bold;
-        margin-bottom: 0.5rem;
-    }
-    
-    .verb-translation {
-        font-size: 1.4rem;
-        opacity: 0.9;
-        margin-bottom: 1.5rem;
-    }
-    
-    .pronoun-display {
-        font-size: 2.2rem;
-        font-weight: bold;
-        margin: 1.5rem 0;
-        background: rgba(255,255,255,0.2);
-        padding: 1rem 2rem;
-        border-radius: 0.5rem;
-        display: inline-block;
-    }
-    
-    .answer-display {
-        font-size: 2.8rem;
-        font-weight: bold;
-        background: rgba(255,255,255,0.9);
-        color: #2d5e3e;
-        padding: 1.5rem 2rem;
-        border-radius: 0.5rem;
-        margin: 1.5rem 0;
-        display: inline-block;
-    }
-    
-    .user-panel {
-        background: rgba(255,255,255,0.1);
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin-bottom: 1rem;
-        text-align: center;
-    }
-    
-    .click-hint {
-        font-size: 1.2rem;
-        margin-top: 1rem;
-        opacity: 0.8;
-        animation: pulse-gentle 2s infinite;
-    }
-    
-    @keyframes pulse-gentle {
-        0% { opacity: 0.6; }
-        50% { opacity: 1; }
-        100% { opacity: 0.6; }
-    }
-    
-    .vocab-size-info {
-        background: #f0f9ff;
-        border: 1px solid #0ea5e9;
-        border-radius: 0.5rem;
-        padding: 0.75rem;
-        margin: 0.5rem 0;
-        font-size: 0.9rem;
-        color: #0c4a6e;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# Перечисления для SRS
-class Difficulty(Enum):
-    AGAIN = 0  # Повторить снова
-    HARD = 1   # Сложно
-    GOOD = 2   # Хорошо
-    EASY = 3   # Легко
-
-# Структура данных для карточки
-@dataclass
-class Card:
-    verb: str
-    pronoun_index: int
-    tense: str
-    easiness_factor: float = 2.5
-    interval: int = 1
-    repetitions: int = 0
-    next_review_date: str = ""
-    last_review_date: str = ""
-    total_reviews: int = 0
-    correct_reviews: int = 0
-    
-    def __post_init__(self):
-        if not self.next_review_date:
-            self.next_review_date = datetime.date.today().isoformat()
-
-# Расширенная база данных глаголов (100 самых популярных)
-VERBS = {
-    # Топ 30 - самые основные
-    'ser': {'type': 'irregular', 'level': 1, 'difficulty': 'hard'},
-    'estar': {'type': 'irregular', 'level': 1, 'difficulty': 'hard'},
-    'tener': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
-    'hacer': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
-    'decir': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
-    'ir': {'type': 'irregular', 'level': 1, 'difficulty': 'hard'},
-    'ver': {'type': 'irregular', 'level': 1, 'difficulty': 'easy'},
-    'dar': {'type': 'irregular', 'level': 1, 'difficulty': 'easy'},
-    'saber': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
-    'querer': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
-    'poder': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
-    'venir': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
-    'hablar': {'type': 'regular-ar', 'level': 1, 'difficulty': 'easy'},
-    'vivir': {'type': 'regular-ir', 'level': 1, 'difficulty': 'easy'},
-    'comer': {'type': 'regular-er', 'level': 1, 'difficulty': 'easy'},
-    'trabajar': {'type': 'regular-ar', 'level': 1, 'difficulty': 'easy'},
-    'estudiar': {'type': 'regular-ar', 'level': 1, 'difficulty': 'easy'},
-    'llegar': {'type': 'regular-ar', 'level': 1, 'difficulty': 'easy'},
-    'pasar': {'type': 'regular-ar', 'level': 1, 'difficulty': 'easy'},
-    'encontrar': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
-    'llamar': {'type': 'regular-ar', 'level': 1, 'difficulty': 'easy'},
-    'pensar': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
-    'salir': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
-    'poner': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
-    'seguir': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
-    'llevar': {'type': 'regular-ar', 'level': 1, 'difficulty': 'easy'},
-    'dejar': {'type': 'regular-ar', 'level': 1, 'difficulty': 'easy'},
-    'parecer': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
-    'quedar': {'type': 'regular-ar', 'level': 1, 'difficulty': 'easy'},
-    'creer': {'type': 'regular-er', 'level': 1, 'difficulty': 'easy'},
-    
-    # Топ 31-50 - популярные глаголы
-    'conocer': {'type': 'irregular', 'level': 2, 'difficulty': 'medium'},
-    'sentir': {'type': 'irregular', 'level': 2, 'difficulty': 'medium'},
-    'deber': {'type': 'regular-er', 'level': 2, 'difficulty': 'easy'},
-    'entrar': {'type': 'regular-ar', 'level': 2, 'difficulty': 'easy'},
-    'escribir': {'type': 'irregular', 'level': 2, 'difficulty': 'medium'},
-    'leer': {'type': 'irregular', 'level': 2, 'difficulty': 'medium'},
-    'beber': {'type': 'regular-er', 'level': 2, 'difficulty': 'easy'},
-    'comprar': {'type': 'regular-ar', 'level': 2, 'difficulty': 'easy'},
-    'abrir': {'type': 'irregular', 'level': 2, 'difficulty': 'medium'},
-    'cerrar': {'type': 'irregular', 'level': 2, 'difficulty': 'medium'},
-    'empezar': {'type': 'irregular', 'level': 2, 'difficulty': 'medium'},
-    'terminar': {'type': 'regular-ar', 'level': 2, 'difficulty': 'easy'},
-    'buscar': {'type': 'regular-ar', 'level': 2, 'difficulty': 'easy'},
-    'entender': {'type': 'irregular', 'level': 2, 'difficulty': 'medium'},
-    'escuchar': {'type': 'regular-ar', 'level': 2, 'difficulty': 'easy'},
-    'mirar': {'type': 'regular-ar', 'level': 2, 'difficulty': 'easy'},
-    'usar': {'type': 'regular-ar', 'level': 2, 'difficulty': 'easy'},
-    'ayudar': {'type': 'regular-ar', 'level': 2, 'difficulty': 'easy'},
-    'necesitar': {'type': 'regular-ar', 'level': 2, 'difficulty': 'easy'},
-    'preguntar': {'type': 'regular-ar', 'level': 2, 'difficulty': 'easy'},
-    
-    # Топ 51-80 - дополнительные популярные глаголы
-    'responder': {'type': 'regular-er', 'level': 3, 'difficulty': 'easy'},
-    'jugar': {'type': 'irregular', 'level': 3, 'difficulty': 'medium'},
-    'dormir': {'type': 'irregular', 'level': 3, 'difficulty': 'medium'},
-    'ganar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
-    'perder': {'type': 'irregular', 'level': 3, 'difficulty': 'medium'},
-    'amar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
-    'cantar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
-    'bailar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
-    'tocar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
-    'cambiar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
-    'mover': {'type': 'irregular', 'level': 3, 'difficulty': 'medium'},
-    'caminar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
-    'correr': {'type': 'regular-er', 'level': 3, 'difficulty': 'easy'},
-    'subir': {'type': 'regular-ir', 'level': 3, 'difficulty': 'easy'},
-    'bajar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
-    'explicar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
-    'recordar': {'type': 'irregular', 'level': 3, 'difficulty': 'medium'},
-    'olvidar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
-    'aprender': {'type': 'regular-er', 'level': 3, 'difficulty': 'easy'},
-    'enseñar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
-    'viajar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
-    'volar': {'type': 'irregular', 'level': 3, 'difficulty': 'medium'},
-    'conducir': {'type': 'irregular', 'level': 3, 'difficulty': 'hard'},
-    'cocinar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
-    'lavar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
-    'limpiar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
-    'construir': {'type': 'irregular', 'level': 3, 'difficulty': 'medium'},
-    'romper': {'type': 'irregular', 'level': 3, 'difficulty': 'medium'},
-    'crear': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
-    'imaginar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
-    
-    # Топ 81-100 - расширенный словарь
-    'soñar': {'type': 'irregular', 'level': 4, 'difficulty': 'medium'},
-    'despertar': {'type': 'irregular', 'level': 4, 'difficulty': 'medium'},
-    'levantar': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
-    'sentar': {'type': 'irregular', 'level': 4, 'difficulty': 'medium'},
-    'acostar': {'type': 'irregular', 'level': 4, 'difficulty': 'medium'},
-    'vestir': {'type': 'irregular', 'level': 4, 'difficulty': 'medium'},
-    'casar': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
-    'nacer': {'type': 'irregular', 'level': 4, 'difficulty': 'medium'},
-    'morir': {'type': 'irregular', 'level': 4, 'difficulty': 'hard'},
-    'reír': {'type': 'irregular', 'level': 4, 'difficulty': 'medium'},
-    'llorar': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
-    'gritar': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
-    'susurrar': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
-    'cuidar': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
-    'odiar': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
-    'manejar': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
-    'reparar': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
-    'duchar': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
-    'divorciarse': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
-    'levantarse': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'}
-}
-
-PRONOUNS = ['yo', 'tú', 'él/ella', 'nosotros', 'vosotros', 'ellos/ellas']
-
-# Расширенные спряжения (добавлены новые глаголы)
-CONJUGATIONS = {
-    'presente': {
-        # Основные глаголы (1-30)
-        'ser': ['soy', 'eres', 'es', 'somos', 'sois', 'son'],
-        'estar': ['estoy', 'estás', 'está', 'estamos', 'estáis', 'están'],
-        'tener': ['tengo', 'tienes', 'tiene', 'tenemos', 'tenéis', 'tienen'],
-        'hacer': ['hago', 'haces', 'hace', 'hacemos', 'hacéis', 'hacen'],
-        'decir': ['digo', 'dices', 'dice', 'decimos', 'decís', 'dicen'],
-        'ir': ['voy', 'vas', 'va', 'vamos', 'vais', 'van'],
-        'ver': ['veo', 'ves', 've', 'vemos', 'veis', 'ven'],
-        'dar': ['doy', 'das', 'da', 'damos', 'dais', 'dan'],
-        'saber': ['sé', 'sabes', 'sabe', 'sabemos', 'sabéis', 'saben'],
-        'querer': ['quiero', 'quieres', 'quiere', 'queremos', 'queréis', 'quieren'],
-        'poder': ['puedo', 'puedes', 'puede', 'podemos', 'podéis', 'pueden'],
-        'venir': ['vengo', 'vienes', 'viene', 'venimos', 'venís', 'vienen'],
-        'hablar': ['hablo', 'hablas', 'habla', 'hablamos', 'habláis', 'hablan'],
-        'vivir': ['vivo', 'vives', 'vive', 'vivimos', 'vivís', 'viven'],
-        'comer': ['como', 'comes', 'come', 'comemos', 'coméis', 'comen'],
-        'trabajar': ['trabajo', 'trabajas', 'trabaja', 'trabajamos', 'trabajáis', 'trabajan'],
-        'estudiar': ['estudio', 'estudias', 'estudia', 'estudiamos', 'estudiáis', 'estudian'],
-        'llegar': ['llego', 'llegas', 'llega', 'llegamos', 'llegáis', 'llegan'],
-        'pasar': ['paso', 'pasas', 'pasa', 'pasamos', 'pasáis', 'pasan'],
-        'encontrar': ['encuentro', 'encuentras', 'encuentra', 'encontramos', 'encontráis', 'encuentran'],
-        'llamar': ['llamo', 'llamas', 'llama', 'llamamos', 'llamáis', 'llaman'],
-        'pensar': ['pienso', 'piensas', 'piensa', 'pensamos', 'pensáis', 'piensan'],
-        'salir': ['salgo', 'sales', 'sale', 'salimos', 'salís', 'salen'],
-        'poner': ['pongo', 'pones', 'pone', 'ponemos', 'ponéis', 'ponen'],
-        'seguir': ['sigo', 'sigues', 'sigue', 'seguimos', 'seguís', 'siguen'],
-        'llevar': ['llevo', 'llevas', 'lleva', 'llevamos', 'lleváis', 'llevan'],
-        'dejar': ['dejo', 'dejas', 'deja', 'dejamos', 'dejáis', 'dejan'],
-        'parecer': ['parezco', 'pareces', 'parece', 'parecemos', 'parecéis', 'parecen'],
-        'quedar': ['quedo', 'quedas', 'queda', 'quedamos', 'quedáis', 'quedan'],
-        'creer': ['creo', 'crees', 'cree', 'creemos', 'creéis', 'creen'],
-        
-        # Глаголы 31-50
-        'conocer': ['conozco', 'conoces', 'conoce', 'conocemos', 'conocéis', 'conocen'],
-        'sentir': ['siento', 'sientes', 'siente', 'sentimos', 'sentís', 'sienten'],
-        'deber': ['debo', 'debes', 'debe', 'debemos', 'debéis', 'deben'],
-        'entrar': ['entro', 'entras', 'entra', 'entramos', 'entráis', 'entran'],
-        'escribir': ['escribo', 'escribes', 'escribe', 'escribimos', 'escribís', 'escriben'],
-        'leer': ['leo', 'lees', 'lee', 'leemos', 'leéis', 'leen'],
-        'beber': ['bebo', 'bebes', 'bebe', 'bebemos', 'bebéis', 'beben'],
-        'comprar': ['compro', 'compras', 'compra', 'compramos', 'compráis', 'compran'],
-        'abrir': ['abro', 'abres', 'abre', 'abrimos', 'abrís', 'abren'],
-        'cerrar': ['cierro', 'cierras', 'cierra', 'cerramos', 'cerráis', 'cierran'],
-        'empezar': ['empiezo', 'empiezas', 'empieza', 'empezamos', 'empezáis', 'empiezan'],
-        'terminar': ['termino', 'terminas', 'termina', 'terminamos', 'termináis', 'terminan'],
-        'buscar': ['busco', 'buscas', 'busca', 'buscamos', 'buscáis', 'buscan'],
-        'entender': ['entiendo', 'entiendes', 'entiende', 'entendemos', 'entendéis', 'entienden'],
-        'escuchar': ['escucho', 'escuchas', 'escucha', 'escuchamos', 'escucháis', 'escuchan'],
-        'mirar': ['miro', 'miras', 'mira', 'miramos', 'miráis', 'miran'],
-        'usar': ['uso', 'usas', 'usa', 'usamos', 'usáis', 'usan'],
-        'ayudar': ['ayudo', 'ayudas', 'ayuda', 'ayudamos', 'ayudáis', 'ayudan'],
-        'necesitar': ['necesito', 'necesitas', 'necesita', 'necesitamos', 'necesitáis', 'necesitan'],
-        'preguntar': ['pregunto', 'preguntas', 'pregunta', 'preguntamos', 'preguntáis', 'preguntan'],
-        
-        # Глаголы 51-80
-        'responder': ['respondo', 'respondes', 'responde', 'respondemos', 'respondéis', 'responden'],
-        'jugar': ['juego', 'juegas', 'juega', 'jugamos', 'jugáis', 'juegan'],
-        'dormir': ['duermo', 'duermes', 'duerme', 'dormimos', 'dormís', 'duermen'],
-        'ganar': ['gano', 'ganas', 'gana', 'ganamos', 'ganáis', 'ganan'],
-        'perder': ['pierdo', 'pierdes', 'pierde', 'perdemos', 'perdéis', 'pierden'],
-        'amar': ['amo', 'amas', 'ama', 'amamos', 'amáis', 'aman'],
-        'cantar': ['canto', 'cantas', 'canta', 'cantamos', 'cantáis', 'cantan'],
-        'bailar': ['bailo', 'bailas', 'baila', 'bailamos', 'bailáis', 'bailan'],
-        'tocar': ['toco', 'tocas', 'toca', 'tocamos', 'tocáis', 'tocan'],
-        'cambiar': ['cambio', 'cambias', 'cambia', 'cambiamos', 'cambiáis', 'cambian'],
-        'mover': ['muevo', 'mueves', 'mueve', 'movemos', 'movéis', 'mueven'],
-        'caminar': ['camino', 'caminas', 'camina', 'caminamos', 'camináis', 'caminan'],
-        'correr': ['corro', 'corres', 'corre', 'corremos', 'corréis', 'corren'],
-        'subir': ['subo', 'subes', 'sube', 'subimos', 'subís', 'suben'],
-        'bajar': ['bajo', 'bajas', 'baja', 'bajamos', 'bajáis', 'bajan'],
-        'explicar': ['explico', 'explicas', 'explica', 'explicamos', 'explicáis', 'explican'],
-        'recordar': ['recuerdo', 'recuerdas', 'recuerda', 'recordamos', 'recordáis', 'recuerdan'],
-        'olvidar': ['olvido', 'olvidas', 'olvida', 'olvidamos', 'olvidáis', 'olvidan'],
-        'aprender': ['aprendo', 'aprendes', 'aprende', 'aprendemos', 'aprendéis', 'aprenden'],
-        'enseñar': ['enseño', 'enseñas', 'enseña', 'enseñamos', 'enseñáis', 'enseñan'],
-        'viajar': ['viajo', 'viajas', 'viaja', 'viajamos', 'viajáis', 'viajan'],
-        'volar': ['vuelo', 'vuelas', 'vuela', 'volamos', 'voláis', 'vuelan'],
-        'conducir': ['conduzco', 'conduces', 'conduce', 'conducimos', 'conducís', 'conducen'],
-        'cocinar': ['cocino', 'cocinas', 'cocina', 'cocinamos', 'cocináis', 'cocinan'],
-        'lavar': ['lavo', 'lavas', 'lava', 'lavamos', 'laváis', 'lavan'],
-        'limpiar': ['limpio', 'limpias', 'limpia', 'limpiamos', 'limpiáis', 'limpian'],
-        'construir': ['construyo', 'construyes', 'construye', 'construimos', 'construís', 'construyen'],
-        'romper': ['rompo', 'rompes', 'rompe', 'rompemos', 'rompéis', 'rompen'],
-        'crear': ['creo', 'creas', 'crea', 'creamos', 'creáis', 'crean'],
-        'imaginar': ['imagino', 'imaginas', 'imagina', 'imaginamos', 'imagináis', 'imaginan'],
-        
-        # Глаголы 81-100
-        'soñar': ['sueño', 'sueñas', 'sueña', 'soñamos', 'soñáis', 'sueñan'],
-        'despertar': ['despierto', 'despiertas', 'despierta', 'despertamos', 'despertáis', 'despiertan'],
-        'levantar': ['levanto', 'levantas', 'levanta', 'levantamos', 'levantáis', 'levantan'],
-        'sentar': ['siento', 'sientas', 'sienta', 'sentamos', 'sentáis', 'sientan'],
-        'acostar': ['acuesto', 'acuestas', 'acuesta', 'acostamos', 'acostáis', 'acuestan'],
-        'vestir': ['visto', 'vistes', 'viste', 'vestimos', 'vestís', 'visten'],
-        'casar': ['caso', 'casas', 'casa', 'casamos', 'casáis', 'casan'],
-        'nacer': ['nazco', 'naces', 'nace', 'nacemos', 'nacéis', 'nacen'],
-        'morir': ['muero', 'mueres', 'muere', 'morimos', 'morís', 'mueren'],
-        'reír': ['río', 'ríes', 'ríe', 'reímos', 'reís', 'ríen'],
-        'llorar': ['lloro', 'lloras', 'llora', 'lloramos', 'lloráis', 'lloran'],
-        'gritar': ['grito', 'gritas', 'grita', 'gritamos', 'gritáis', 'gritan'],
-        'susurrar': ['susurro', 'susurras', 'susurra', 'susurramos', 'susurráis', 'susurran'],
-        'cuidar': ['cuido', 'cuidas', 'cuida', 'cuidamos', 'cuidáis', 'cuidan'],
-        'odiar': ['odio', 'odias', 'odia', 'odiamos', 'odiáis', 'odian'],
-        'manejar': ['manejo', 'manejas', 'maneja', 'manejamos', 'manejáis', 'manejan'],
-        'reparar': ['reparo', 'reparas', 'repara', 'reparamos', 'reparáis', 'reparan'],
-        'duchar': ['ducho', 'duchas', 'ducha', 'duchamos', 'ducháis', 'duchan'],
-        'divorciarse': ['me divorcio', 'te divorcias', 'se divorcia', 'nos divorciamos', 'os divorciáis', 'se divorcian'],
-        'levantarse': ['me levanto', 'te levantas', 'se levanta', 'nos levantamos', 'os levantáis', 'se levantan']
-    },
-    'indefinido': {
-        # Основные глаголы (1-30)
-        'ser': ['fui', 'fuiste', 'fue', 'fuimos', 'fuisteis', 'fueron'],
-        'estar': ['estuve', 'estuviste', 'estuvo', 'estuvimos', 'estuvisteis', 'estuvieron'],
-        'tener': ['tuve', 'tuviste', 'tuvo', 'tuvimos', 'tuvisteis', 'tuvieron'],
-        'hacer': ['hice', 'hiciste', 'hizo', 'hicimos', 'hicisteis', 'hicieron'],
-        'decir': ['dije', 'dijiste', 'dijo', 'dijimos', 'dijisteis', 'dijeron'],
-        'ir': ['fui', 'fuiste', 'fue', 'fuimos', 'fuisteis', 'fueron'],
-        'ver': ['vi', 'viste', 'vio', 'vimos', 'visteis', 'vieron'],
-        'dar': ['di', 'diste', 'dio', 'dimos', 'disteis', 'dieron'],
-        'saber': ['supe', 'supiste', 'supo', 'supimos', 'supisteis', 'supieron'],
-        'querer': ['quise', 'quisiste', 'quiso', 'quisimos', 'quisisteis', 'quisieron'],
-        'poder': ['pude', 'pudiste', 'pudo', 'pudimos', 'pudisteis', 'pudieron'],
-        'venir': ['vine', 'viniste', 'vino', 'vinimos', 'vinisteis', 'vinieron'],
-        'hablar': ['hablé', 'hablaste', 'habló', 'hablamos', 'hablasteis', 'hablaron'],
-        'vivir': ['viví', 'viviste', 'vivió', 'vivimos', 'vivisteis', 'vivieron'],
-        'comer': ['comí', 'comiste', 'comió', 'comimos', 'comisteis', 'comieron'],
-        'trabajar': ['trabajé', 'trabajaste', 'trabajó', 'trabajamos', 'trabajasteis', 'trabajaron'],
-        'estudiar': ['estudié', 'estudiaste', 'estudió', 'estudiamos', 'estudiasteis', 'estudiaron'],
-        'llegar': ['llegué', 'llegaste', 'llegó', 'llegamos', 'llegasteis', 'llegaron'],
-        'pasar': ['pasé', 'pasaste', 'pasó', 'pasamos', 'pasasteis', 'pasaron'],
-        'encontrar': ['encontré', 'encontraste', 'encontró', 'encontramos', 'encontrasteis', 'encontraron'],
-        'llamar': ['llamé', 'llamaste', 'llamó', 'llamamos', 'llamasteis', 'llamaron'],
-        'pensar': ['pensé', 'pensaste', 'pensó', 'pensamos', 'pensasteis', 'pensaron'],
-        'salir': ['salí', 'saliste', 'salió', 'salimos', 'salisteis', 'salieron'],
-        'poner': ['puse', 'pusiste', 'puso', 'pusimos', 'pusisteis', 'pusieron'],
-        'seguir': ['seguí', 'seguiste', 'siguió', 'seguimos', 'seguisteis', 'siguieron'],
-        'llevar': ['llevé', 'llevaste', 'llevó', 'llevamos', 'llevasteis', 'llevaron'],
-        'dejar': ['dejé', 'dejaste', 'dejó', 'dejamos', 'dejasteis', 'dejaron'],
-        'parecer': ['parecí', 'pareciste', 'pareció', 'parecimos', 'parecisteis', 'parecieron'],
-        'quedar': ['quedé', 'quedaste', 'quedó', 'quedamos', 'quedasteis', 'quedaron'],
-        'creer': ['creí', 'creíste', 'creyó', 'creímos', 'creísteis', 'creyeron'],
-        
-        # Глаголы 31-50
-        'conocer': ['conocí', 'conociste', 'conoció', 'conocimos', 'conocisteis', 'conocieron'],
-        'sentir': ['sentí', 'sentiste', 'sintió', 'sentimos', 'sentisteis', 'sintieron'],
-        'deber': ['debí', 'debiste', 'debió', 'debimos', 'debisteis', 'debieron'],
-        'entrar': ['entré', 'entraste', 'entró', 'entramos', 'entrasteis', 'entraron'],
-        'escribir': ['escribí', 'escribiste', 'escribió', 'escribimos', 'escribisteis', 'escribieron'],
-        'leer': ['leí', 'leíste', 'leyó', 'leímos', 'leísteis', 'leyeron'],
-        'beber': ['bebí', 'bebiste', 'bebió', 'bebimos', 'bebisteis', 'bebieron'],
-        'comprar': ['compré', 'compraste', 'compró', 'compramos', 'comprasteis', 'compraron'],
-        'abrir': ['abrí', 'abriste', 'abrió', 'abrimos', 'abristeis', 'abrieron'],
-        'cerrar': ['cerré', 'cerraste', 'cerró', 'cerramos', 'cerrasteis', 'cerraron'],
-        'empezar': ['empecé', 'empezaste', 'empezó', 'empezamos', 'empezasteis', 'empezaron'],
-        'terminar': ['terminé', 'terminaste', 'terminó', 'terminamos', 'terminasteis', 'terminaron'],
-        'buscar': ['busqué', 'buscaste', 'buscó', 'buscamos', 'buscasteis', 'buscaron'],
-        'entender': ['entendí', 'entendiste', 'entendió', 'entendimos', 'entendisteis', 'entendieron'],
-        'escuchar': ['escuché', 'escuchaste', 'escuchó', 'escuchamos', 'escuchasteis', 'escucharon'],
-        'mirar': ['miré', 'miraste', 'miró', 'miramos', 'mirasteis', 'miraron'],
-        'usar': ['usé', 'usaste', 'usó', 'usamos', 'usasteis', 'usaron'],
-        'ayudar': ['ayudé', 'ayudaste', 'ayudó', 'ayudamos', 'ayudasteis', 'ayudaron'],
-        'necesitar': ['necesité', 'necesitaste', 'necesitó', 'necesitamos', 'necesitasteis', 'necesitaron'],
-        'preguntar': ['pregunté', 'preguntaste', 'preguntó', 'preguntamos', 'preguntasteis', 'preguntaron'],
-        
-        # Глаголы 51-80
-        'responder': ['respondí', 'respondiste', 'respondió', 'respondimos', 'respondisteis', 'respondieron'],
-        'jugar': ['jugué', 'jugaste', 'jugó', 'jugamos', 'jugasteis', 'jugaron'],
-        'dormir': ['dormí', 'dormiste', 'durmió', 'dormimos', 'dormisteis', 'durmieron'],
-        'ganar': ['gané', 'ganaste', 'ganó', 'ganamos', 'ganasteis', 'ganaron'],
-        'perder': ['perdí', 'perdiste', 'perdió', 'perdimos', 'perdisteis', 'perdieron'],
-        'amar': ['amé', 'amaste', 'amó', 'amamos', 'amasteis', 'amaron'],
-        'cantar': ['canté', 'cantaste', 'cantó', 'cantamos', 'cantasteis', 'cantaron'],
-        'bailar': ['bailé', 'bailaste', 'bailó', 'bailamos', 'bailasteis', 'bailaron'],
-        'tocar': ['toqué', 'tocaste', 'tocó', 'tocamos', 'tocasteis', 'tocaron'],
-        'cambiar': ['cambié', 'cambiaste', 'cambió', 'cambiamos', 'cambiasteis', 'cambiaron'],
-        'mover': ['moví', 'moviste', 'movió', 'movimos', 'movisteis', 'movieron'],
-        'caminar': ['caminé', 'caminaste', 'caminó', 'caminamos', 'caminasteis', 'caminaron'],
-        'correr': ['corrí', 'corriste', 'corrió', 'corrimos', 'corristeis', 'corrieron'],
-        'subir': ['subí', 'subiste', 'subió', 'subimos', 'subisteis', 'subieron'],
-        'bajar': ['bajé', 'bajaste', 'bajó', 'bajamos', 'bajasteis', 'bajaron'],
-        'explicar': ['expliqué', 'explicaste', 'explicó', 'explicamos', 'explicasteis', 'explicaron'],
-        'recordar': ['recordé', 'recordaste', 'recordó', 'recordamos', 'recordasteis', 'recordaron'],
-        'olvidar': ['olvidé', 'olvidaste', 'olvidó', 'olvidamos', 'olvidasteis', 'olvidaron'],
-        'aprender': ['aprendí', 'aprendiste', 'aprendió', 'aprendimos', 'aprendisteis', 'aprendieron'],
-        'enseñar': ['enseñé', 'enseñaste', 'enseñó', 'enseñamos', 'enseñasteis', 'enseñaron'],
-        'viajar': ['viajé', 'viajaste', 'viajó', 'viajamos', 'viajasteis', 'viajaron'],
-        'volar': ['volé', 'volaste', 'voló', 'volamos', 'volasteis', 'volaron'],
-        'conducir': ['conduje', 'condujiste', 'condujo', 'condujimos', 'condujisteis', 'condujeron'],
-        'cocinar': ['cociné', 'cocinaste', 'cocinó', 'cocinamos', 'cocinasteis', 'cocinaron'],
-        'lavar': ['lavé', 'lavaste', 'lavó', 'lavamos', 'lavasteis', 'lavaron'],
-        'limpiar': ['limpié', 'limpiaste', 'limpió', 'limpiamos', 'limpiasteis', 'limpiaron'],
-        'construir': ['construí', 'construiste', 'construyó', 'construimos', 'construisteis', 'construyeron'],
-        'romper': ['rompí', 'rompiste', 'rompió', 'rompimos', 'rompisteis', 'rompieron'],
-        'crear': ['creé', 'creaste', 'creó', 'creamos', 'creasteis', 'crearon'],
-        'imaginar': ['imaginé', 'imaginaste', 'imaginó', 'imaginamos', 'imaginasteis', 'imaginaron'],
-        
-        # Глаголы 81-100
-        'soñar': ['soñé', 'soñaste', 'soñó', 'soñamos', 'soñasteis', 'soñaron'],
-        'despertar': ['desperté', 'despertaste', 'despertó', 'despertamos', 'despertasteis', 'despertaron'],
-        'levantar': ['levanté', 'levantaste', 'levantó', 'levantamos', 'levantasteis', 'levantaron'],
-        'sentar': ['senté', 'sentaste', 'sentó', 'sentamos', 'sentasteis', 'sentaron'],
-        'acostar': ['acosté', 'acostaste', 'acostó', 'acostamos', 'acostasteis', 'acostaron'],
-        'vestir': ['vestí', 'vestiste', 'vistió', 'vestimos', 'vestisteis', 'vistieron'],
-        'casar': ['casé', 'casaste', 'casó', 'casamos', 'casasteis', 'casaron'],
-        'nacer': ['nací', 'naciste', 'nació', 'nacimos', 'nacisteis', 'nacieron'],
-        'morir': ['morí', 'moriste', 'murió', 'morimos', 'moristeis', 'murieron'],
-        'reír': ['reí', 'reíste', 'rió', 'reímos', 'reísteis', 'rieron'],
-        'llorar': ['lloré', 'lloraste', 'lloró', 'lloramos', 'llorasteis', 'lloraron'],
-        'gritar': ['grité', 'gritaste', 'gritó', 'gritamos', 'gritasteis', 'gritaron'],
-        'susurrar': ['susurré', 'susurraste', 'susurró', 'susurramos', 'susurrasteis', 'susurraron'],
-        'cuidar': ['cuidé', 'cuidaste', 'cuidó', 'cuidamos', 'cuidasteis', 'cuidaron'],
-        'odiar': ['odié', 'odiaste', 'odió', 'odiamos', 'odiasteis', 'odiaron'],
-        'manejar': ['manejé', 'manejaste', 'manejó', 'manejamos', 'manejasteis', 'manejaron'],
-        'reparar': ['reparé', 'reparaste', 'reparó', 'reparamos', 'reparasteis', 'repararon'],
-        'duchar': ['duché', 'duchaste', 'duchó', 'duchamos', 'duchasteis', 'ducharon'],
-        'divorciarse': ['me divorcié', 'te divorciaste', 'se divorció', 'nos divorciamos', 'os divorciasteis', 'se divorciaron'],
-        'levantarse': ['me levanté', 'te levantaste', 'se levantó', 'nos levantamos', 'os levantasteis', 'se levantaron']
-    },
-    'subjuntivo': {
-        'ser': ['sea', 'seas', 'sea', 'seamos', 'seáis', 'sean'],
-        'estar': ['esté', 'estés', 'esté', 'estemos', 'estéis', 'estén'],
-        'tener': ['tenga', 'tengas', 'tenga', 'tengamos', 'tengáis', 'tengan'],
-        'hacer': ['haga', 'hagas', 'haga', 'hagamos', 'hagáis', 'hagan'],
-        'hablar': ['hable', 'hables', 'hable', 'hablemos', 'habléis', 'hablen'],
-        'trabajar': ['trabaje', 'trabajes', 'trabaje', 'trabajemos', 'trabajéis', 'trabajen'],
-        'poder': ['pueda', 'puedas', 'pueda', 'podamos', 'podáis', 'puedan']
-    },
-    'imperfecto': {
-        # Основные глаголы (1-30)
-        'ser': ['era', 'eras', 'era', 'éramos', 'erais', 'eran'],
-        'estar': ['estaba', 'estabas', 'estaba', 'estábamos', 'estabais', 'estaban'],
-        'tener': ['tenía', 'tenías', 'tenía', 'teníamos', 'teníais', 'tenían'],
-        'hacer': ['hacía', 'hacías', 'hacía', 'hacíamos', 'hacíais', 'hacían'],
-        'decir': ['decía', 'decías', 'decía', 'decíamos', 'decíais', 'decían'],
-        'ir': ['iba', 'ibas', 'iba', 'íbamos', 'ibais', 'iban'],
-        'ver': ['veía', 'veías', 'veía', 'veíamos', 'veíais', 'veían'],
-        'dar': ['daba', 'dabas', 'daba', 'dábamos', 'dabais', 'daban'],
-        'saber': ['sabía', 'sabías', 'sabía', 'sabíamos', 'sabíais', 'sabían'],
-        'querer': ['quería', 'querías', 'quería', 'queríamos', 'queríais', 'querían'],
-        'poder': ['podía', 'podías', 'podía', 'podíamos', 'podíais', 'podían'],
-        'venir': ['venía', 'venías', 'venía', 'veníamos', 'veníais', 'venían'],
-        'hablar': ['hablaba', 'hablabas', 'hablaba', 'hablábamos', 'hablabais', 'hablaban'],
-        'vivir': ['vivía', 'vivías', 'vivía', 'vivíamos', 'vivíais', 'vivían'],
-        'comer': ['comía', 'comías', 'comía', 'comíamos', 'comíais', 'comían'],
-        'trabajar': ['trabajaba', 'trabajabas', 'trabajaba', 'trabajábamos', 'trabajabais', 'trabajaban'],
-        'estudiar': ['estudiaba', 'estudiabas', 'estudiaba', 'estudiábamos', 'estudiabais', 'estudiaban'],
-        'llegar': ['llegaba', 'llegabas', 'llegaba', 'llegábamos', 'llegabais', 'llegaban'],
-        'pasar': ['pasaba', 'pasabas', 'pasaba', 'pasábamos', 'pasabais', 'pasaban'],
-        'encontrar': ['encontraba', 'encontrabas', 'encontraba', 'encontrábamos', 'encontrabais', 'encontraban'],
-        'llamar': ['llamaba', 'llamabas', 'llamaba', 'llamábamos', 'llamabais', 'llamaban'],
-        'pensar': ['pensaba', 'pensabas', 'pensaba', 'pensábamos', 'pensabais', 'pensaban'],
-        'salir': ['salía', 'salías', 'salía', 'salíamos', 'salíais', 'salían'],
-        'poner': ['ponía', 'ponías', 'ponía', 'poníamos', 'poníais', 'ponían'],
-        'seguir': ['seguía', 'seguías', 'seguía', 'seguíamos', 'seguíais', 'seguían'],
-        'llevar': ['llevaba', 'llevabas', 'llevaba', 'llevábamos', 'llevabais', 'llevaban'],
-        'dejar': ['dejaba', 'dejabas', 'dejaba', 'dejábamos', 'dejabais', 'dejaban'],
-        'parecer': ['parecía', 'parecías', 'parecía', 'parecíamos', 'parecíais', 'parecían'],
-        'quedar': ['quedaba', 'quedabas', 'quedaba', 'quedábamos', 'quedabais', 'quedaban'],
-        'creer': ['creía', 'creías', 'creía', 'creíamos', 'creíais', 'creían'],
-        
-        # Глаголы 31-50
-        'conocer': ['conocía', 'conocías', 'conocía', 'conocíamos', 'conocíais', 'conocían'],
-        'sentir': ['sentía', 'sentías', 'sentía', 'sentíamos', 'sentíais', 'sentían'],
-        'deber': ['debía', 'debías', 'debía', 'debíamos', 'debíais', 'debían'],
-        'entrar': ['entraba', 'entrabas', 'entraba', 'entrábamos', 'entrabais', 'entraban'],
-        'escribir': ['escribía', 'escribías', 'escribía', 'escribíamos', 'escribíais', 'escribían'],
-        'leer': ['leía', 'leías', 'leía', 'leíamos', 'leíais', 'leían'],
-        'beber': ['bebía', 'bebías', 'bebía', 'bebíamos', 'bebíais', 'bebían'],
-        'comprar': ['compraba', 'comprabas', 'compraba', 'comprábamos', 'comprabais', 'compraban'],
-        'abrir': ['abría', 'abrías', 'abría', 'abríamos', 'abríais', 'abrían'],
-        'cerrar': ['cerraba', 'cerrabas', 'cerraba', 'cerrábamos', 'cerrabais', 'cerraban'],
-        'empezar': ['empezaba', 'empezabas', 'empezaba', 'empezábamos', 'empezabais', 'empezaban'],
-        'terminar': ['terminaba', 'terminabas', 'terminaba', 'terminábamos', 'terminabais', 'terminaban'],
-        'buscar': ['buscaba', 'buscabas', 'buscaba', 'buscábamos', 'buscabais', 'buscaban'],
-        'entender': ['entendía', 'entendías', 'entendía', 'entendíamos', 'entendíais', 'entendían'],
-        'escuchar': ['escuchaba', 'escuchabas', 'escuchaba', 'escuchábamos', 'escuchabais', 'escuchaban'],
-        'mirar': ['miraba', 'mirabas', 'miraba', 'mirábamos', 'mirabais', 'miraban'],
-        'usar': ['usaba', 'usabas', 'usaba', 'usábamos', 'usabais', 'usaban'],
-        'ayudar': ['ayudaba', 'ayudabas', 'ayudaba', 'ayudábamos', 'ayudabais', 'ayudaban'],
-        'necesitar': ['necesitaba', 'necesitabas', 'necesitaba', 'necesitábamos', 'necesitabais', 'necesitaban'],
-        'preguntar': ['preguntaba', 'preguntabas', 'preguntaba', 'preguntábamos', 'preguntabais', 'preguntaban'],
-        
-        # Глаголы 51-80
-        'responder': ['respondía', 'respondías', 'respondía', 'respondíamos', 'respondíais', 'respondían'],
-        'jugar': ['jugaba', 'jugabas', 'jugaba', 'jugábamos', 'jugabais', 'jugaban'],
-        'dormir': ['dormía', 'dormías', 'dormía', 'dormíamos', 'dormíais', 'dormían'],
-        'ganar': ['ganaba', 'ganabas', 'ganaba', 'ganábamos', 'ganabais', 'ganaban'],
-        'perder': ['perdía', 'perdías', 'perdía', 'perdíamos', 'perdíais', 'perdían'],
-        'amar': ['amaba', 'amabas', 'amaba', 'amábamos', 'amabais', 'amaban'],
-        'cantar': ['cantaba', 'cantabas', 'cantaba', 'cantábamos', 'cantabais', 'cantaban'],
-        'bailar': ['bailaba', 'bailabas', 'bailaba', 'bailábamos', 'bailabais', 'bailaban'],
-        'tocar': ['tocaba', 'tocabas', 'tocaba', 'tocábamos', 'tocabais', 'tocaban'],
-        'cambiar': ['cambiaba', 'cambiabas', 'cambiaba', 'cambiábamos', 'cambiabais', 'cambiaban'],
-        'mover': ['movía', 'movías', 'movía', 'movíamos', 'movíais', 'movían'],
-        'caminar': ['caminaba', 'caminabas', 'caminaba', 'caminábamos', 'caminabais', 'caminaban'],
-        'correr': ['corría', 'corrías', 'corría', 'corríamos', 'corríais', 'corrían'],
-        'subir': ['subía', 'subías', 'subía', 'subíamos', 'subíais', 'subían'],
-        'bajar': ['bajaba', 'bajabas', 'bajaba', 'bajábamos', 'bajabais', 'bajaban'],
-        'explicar': ['explicaba', 'explicabas', 'explicaba', 'explicábamos', 'explicabais', 'explicaban'],
-        'recordar': ['recordaba', 'recordabas', 'recordaba', 'recordábamos', 'recordabais', 'recordaban'],
-        'olvidar': ['olvidaba', 'olvidabas', 'olvidaba', 'olvidábamos', 'olvidabais', 'olvidaban'],
-        'aprender': ['aprendía', 'aprendías', 'aprendía', 'aprendíamos', 'aprendíais', 'aprendían'],
-        'enseñar': ['enseñaba', 'enseñabas', 'enseñaba', 'enseñábamos', 'enseñabais', 'enseñaban'],
-        'viajar': ['viajaba', 'viajabas', 'viajaba', 'viajábamos', 'viajabais', 'viajaban'],
-        'volar': ['volaba', 'volabas', 'volaba', 'volábamos', 'volabais', 'volaban'],
-        'conducir': ['conducía', 'conducías', 'conducía', 'conducíamos', 'conducíais', 'conducían'],
-        'cocinar': ['cocinaba', 'cocinabas', 'cocinaba', 'cocinábamos', 'cocinabais', 'cocinaban'],
-        'lavar': ['lavaba', 'lavabas', 'lavaba', 'lavábamos', 'lavabais', 'lavaban'],
-        'limpiar': ['limpiaba', 'limpiabas', 'limpiaba', 'limpiábamos', 'limpiabais', 'limpiaban'],
-        'construir': ['construía', 'construías', 'construía', 'construíamos', 'construíais', 'construían'],
-        'romper': ['rompía', 'rompías', 'rompía', 'rompíamos', 'rompíais', 'rompían'],
-        'crear': ['creaba', 'creabas', 'creaba', 'creábamos', 'creabais', 'creaban'],
-        'imaginar': ['imaginaba', 'imaginabas', 'imaginaba', 'imaginábamos', 'imaginabais', 'imaginaban'],
-        
-        # Глаголы 81-100
-        'soñar': ['soñaba', 'soñabas', 'soñaba', 'soñábamos', 'soñabais', 'soñaban'],
-        'despertar': ['despertaba', 'despertabas', 'despertaba', 'despertábamos', 'despertabais', 'despertaban'],
-        'levantar': ['levantaba', 'levantabas', 'levantaba', 'levantábamos', 'levantabais', 'levantaban'],
-        'sentar': ['sentaba', 'sentabas', 'sentaba', 'sentábamos', 'sentabais', 'sentaban'],
-        'acostar': ['acostaba', 'acostabas', 'acostaba', 'acostábamos', 'acostabais', 'acostaban'],
-        'vestir': ['vestía', 'vestías', 'vestía', 'vestíamos', 'vestíais', 'vestían'],
-        'casar': ['casaba', 'casabas', 'casaba', 'casábamos', 'casabais', 'casaban'],
-        'nacer': ['nacía', 'nacías', 'nacía', 'nacíamos', 'nacíais', 'nacían'],
-        'morir': ['moría', 'morías', 'moría', 'moríamos', 'moríais', 'morían'],
-        'reír': ['reía', 'reías', 'reía', 'reíamos', 'reíais', 'reían'],
-        'llorar': ['lloraba', 'llorabas', 'lloraba', 'llorábamos', 'llorabais', 'lloraban'],
-        'gritar': ['gritaba', 'gritabas', 'gritaba', 'gritábamos', 'gritabais', 'gritaban'],
-        'susurrar': ['susurraba', 'susurrabas', 'susurraba', 'susurrábamos', 'susurrabais', 'susurraban'],
-        'cuidar': ['cuidaba', 'cuidabas', 'cuidaba', 'cuidábamos', 'cuidabais', 'cuidaban'],
-        'odiar': ['odiaba', 'odiabas', 'odiaba', 'odiábamos', 'odiabais', 'odiaban'],
-        'manejar': ['manejaba', 'manejabas', 'manejaba', 'manejábamos', 'manejabais', 'manejaban'],
-        'reparar': ['reparaba', 'reparabas', 'reparaba', 'reparábamos', 'reparabais', 'reparaban'],
-        'duchar': ['duchaba', 'duchabas', 'duchaba', 'duchábamos', 'duchabais', 'duchaban'],
-        'divorciarse': ['me divorciaba', 'te divorciabas', 'se divorciaba', 'nos divorciábamos', 'os divorciabais', 'se divorciaban'],
-        'levantarse': ['me levantaba', 'te levantabas', 'se levantaba', 'nos levantábamos', 'os levantabais', 'se levantaban']
-    }
-}
-
-# Опции размера словаря
-VOCABULARY_SIZES = {
-    30: {'name': 'vocabulary_30', 'verbs': 30, 'description': 'vocab_30_desc'},
-    50: {'name': 'vocabulary_50', 'verbs': 50, 'description': 'vocab_50_desc'},
-    100: {'name': 'vocabulary_100', 'verbs': 100, 'description': 'vocab_100_desc'}
-}
-
-def get_verbs_for_level(vocab_size: int) -> Dict:
-    """Получить глаголы для выбранного размера словаря"""
-    all_verbs = list(VERBS.keys())
-    
-    if vocab_size == 30:
-        # Первые 30 самых популярных глаголов
-        selected_verbs = all_verbs[:30]
-    elif vocab_size == 50:
-        # Первые 50 глаголов
-        selected_verbs = all_verbs[:50]
-    else:  # 100
-        # Все 100 глаголов
-        selected_verbs = all_verbs
-    
-    return {verb: VERBS[verb] for verb in selected_verbs}
-
-# Система интервального повторения (SRS)
-class SRSManager:
-    @staticmethod
-    def calculate_next_interval(card: Card, difficulty: Difficulty) -> Tuple[int, float]:
-        """Алгоритм SM-2 для расчета следующего интервала"""
-        ef = card.easiness_factor
-        interval = card.interval
-        repetitions = card.repetitions
-        
-        if difficulty == Difficulty.AGAIN:
-            return 1, max(1.3, ef - 0.2)
-        
-        if repetitions == 0:
-            interval = 1
-        elif repetitions == 1:
-            interval = 6
-        else:
-            interval = int(interval * ef)
-        
-        # Обновляем easiness factor
-        if difficulty == Difficulty.EASY:
-            ef = ef + 0.15
-        elif difficulty == Difficulty.GOOD:
-            ef = ef + 0.1
-        elif difficulty == Difficulty.HARD:
-            ef = ef - 0.15
-        
-        ef = max(1.3, min(3.0, ef))
-        return interval, ef
-    
-    @staticmethod
-    def update_card(card: Card, difficulty: Difficulty) -> Card:
-        """Обновляет карточку после ответа"""
-        today = datetime.date.today()
-        
-        card.total_reviews += 1
-        if difficulty in [Difficulty.GOOD, Difficulty.EASY]:
-            card.correct_reviews += 1
-        
-        if difficulty == Difficulty.AGAIN:
-            card.repetitions = 0
-        else:
-            card.repetitions += 1
-        
-        new_interval, new_ef = SRSManager.calculate_next_interval(card, difficulty)
-        
-        card.interval = new_interval
-        card.easiness_factor = new_ef
-        card.last_review_date = today.isoformat()
-        card.next_review_date = (today + datetime.timedelta(days=new_interval)).isoformat()
-        
-        return card
+# Режим сохранения ответов: пачками в фоне или сразу после каждого ответа
+SAVE_DURABILITY = get_durability_mode()
+
+# Local-first: колода сессии живет в локальном SQLite и синхронизируется с основной базой
+LOCAL_CACHE_DIR = get_local_cache_dir()
+
+# Ответы показываются и оцениваются в браузере, оценки приходят пачкой (0 - кнопки Streamlit)
+CLIENT_SIDE_CARDS = os.getenv('CLIENT_SIDE_CARDS', '1').lower() not in ('0', 'false', 'no')
+
+# CSS отправляется один раз за сессию и остается в <head> страницы (0 - с каждым перезапуском)
+STYLES_ONCE_PER_SESSION = os.getenv('STYLES_ONCE_PER_SESSION', '1').lower() not in ('0', 'false', 'no')
+
+# Замеры времени и аллокаций точек входа и памяти сессий (панели - ?debug=profile и ?debug=footprint)
+RERUN_PROFILING = os.getenv('RERUN_PROFILING', '0').lower() in ('1', 'true', 'yes')
+
+@st.cache_resource(show_spinner=False)
+def get_catalog() -> Catalog:
+    """Каталог глаголов и спряжений: собирается один раз на процесс и общий для всех сессий"""
+    return build_catalog()
+
+CATALOG = get_catalog()
+VERBS = CATALOG.verbs
+PRONOUNS = CATALOG.pronouns
+CONJUGATIONS = CATALOG.conjugations
+VOCABULARY_SIZES = CATALOG.vocabulary_sizes
+
+@st.cache_resource(show_spinner=False)
+def load_vocabulary_levels() -> VocabularyLevels:
+    """Представления уровней словаря: строятся один раз и общие для всех сессий"""
+    # Уровни - префиксы VERBS: первые 30, первые 50 и все 100 глаголов
+    return VocabularyLevels(list(VERBS.keys()), VOCABULARY_SIZES, CONJUGATIONS)
+
+VOCABULARY_LEVELS = load_vocabulary_levels()
+
+@st.cache_resource(show_spinner=False)
+def load_card_codec() -> CardCodec:
+    """Таблицы порядковых номеров глаголов и времён для id карточек"""
+    # Новые глаголы и времена добавляются в конец, чтобы id не менялись
+    return CardCodec(list(VERBS.keys()), list(CONJUGATIONS.keys()))
+
+CARD_CODEC = load_card_codec()
+
+@st.cache_resource(show_spinner=False)
+def get_card_template(language: str, revealed: bool) -> CardTemplate:
+    """Разметка карточки для языка интерфейса: собирается один раз на процесс"""
+    tense_labels = {tense: get_text(tense, language) for tense in CONJUGATIONS}
+    return compile_card_template(revealed, get_text('click_to_reveal', language), tense_labels)
+
+@st.cache_resource(show_spinner=False)
+def get_grammar_rule_markdown(tense: str, language: str) -> str:
+    """Правило спряжения в markdown: собирается один раз на процесс для времени и языка"""
+    rule = get_grammar_rule(tense, language)
+    return f"**{rule['title']}**\n\n{textwrap.dedent(rule['content']).strip()}"
+
+@st.cache_resource(show_spinner=False)
+def get_database_engine() -> Engine:
+    """Движок БД с общим пулом соединений для всех сессий процесса (метрики - .pool.stats())"""
+    return create_database_engine()
+
+@st.cache_resource(show_spinner=False)
+def get_deck_repository() -> DeckRepository:
+    """Репозиторий колод поверх общего движка"""
+    repository = DeckRepository(get_database_engine(), CARD_CODEC)
+    repository.create_schema()
+    return repository
+
+@st.cache_resource(show_spinner=False)
+def get_flush_worker() -> FlushWorker:
+    """Фоновый поток отложенной записи (один на процесс)"""
+    return FlushWorker()
+
+@st.cache_resource(show_spinner=False)
+def get_deck_registry() -> DeckRegistry:
+    """Колоды пользователей, общие для всех сессий процесса (в session_state - только ключ)"""
+    max_decks, idle_seconds = get_deck_limits()
+    registry = DeckRegistry(max_decks, idle_seconds, get_flush_worker())
+    # Изменения закрытых вкладок сбрасываются по таймеру, а не на следующем перезапуске
+    registry.start_sweeper()
+    return registry
+
+def get_local_cache() -> LocalCache:
+    """Локальный кэш колоды пользователя с фоновой синхронизацией (закрывается при вытеснении колоды)"""
+    deck = get_deck()
+    with deck.lock:
+        if deck.local_cache is None:
+            deck.local_cache = LocalCache(LOCAL_CACHE_DIR, get_user_id(), CARD_CODEC)
+            # Карточки с других устройств переносятся в колоду, чтобы сессия не перезаписала их старыми значениями
+            deck.local_cache.start_periodic_sync(get_deck_repository(), on_pull=deck.merge_pulled)
+        return deck.local_cache
+
+@st.cache_resource(show_spinner=False)
+def get_process_profile() -> ProcessProfile:
+    """Замеры всех сессий процесса"""
+    return ProcessProfile()
+
+def get_rerun_profile() -> RerunProfile:
+    """Кольцевой буфер замеров сессии"""
+    if 'rerun_profile' not in st.session_state:
+        st.session_state.rerun_profile = RerunProfile()
+    return st.session_state.rerun_profile
+
+def profiled(function: Callable) -> Callable:
+    """Замеряет вызовы функции при RERUN_PROFILING (иначе возвращает ее без изменений)"""
+    if not RERUN_PROFILING:
+        return function
+    
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        with measure(function.__name__, get_rerun_profile(), get_process_profile()):
+            return function(*args, **kwargs)
+    return wrapper
+
+def get_user_repository() -> DeckRepository:
+    """Откуда сессия читает колоду и куда пишет ответы: локальный кэш или основная база"""
+    if LOCAL_CACHE_DIR:
+        return get_local_cache().repository
+    return get_deck_repository()
+
+def get_verbs_for_level(vocab_size: int) -> FrozenSet[str]:
+    """Получить глаголы для выбранного размера словаря (без аллокаций)"""
+    return VOCABULARY_LEVELS.verb_set(vocab_size)
 
 def show_language_selector():
     """Показывает селектор языка в сайдбаре"""
@@ -865,6 +355,11 @@ def show_main_app():
     """Показывает основное приложение с поддержкой языков"""
     reset_daily_stats()
     
+    # Изменения, пролежавшие в буфере дольше FLUSH_EVERY_SECONDS
+    deck = get_deck()
+    if deck.write_buffer.is_due(deck.cards, deck.review_log):
+        save_user_data()
+    
     user_info = st.session_state.user_info
     
     # Заголовок
@@ -875,10 +370,84 @@ def show_main_app():
     with st.sidebar:
         show_user_panel()
         show_sidebar_content()
+        show_profiling_panel()
+        show_footprint_panel()
     
     # Основной интерфейс
     show_learning_interface()
 
+def show_profiling_panel():
+    """Скрытая панель замеров: при RERUN_PROFILING и ?debug=profile в адресе"""
+    if not RERUN_PROFILING or st.query_params.get('debug') != 'profile':
+        return
+    
+    dump = get_profile_dump()
+    with st.expander("⏱ Rerun profile"):
+        for scope in ('session', 'process'):
+            st.caption(scope)
+            st.dataframe([{'name': name, **entry} for name, entry in dump[scope].items()], hide_index=True)
+        st.caption('gauges')
+        st.json(dump['gauges'])
+        st.download_button(
+            "profile.json",
+            json.dumps(dump, ensure_ascii=False),
+            file_name="rerun_profile.json",
+            mime="application/json",
+            on_click="ignore",
+            use_container_width=True
+        )
+
+def get_profile_dump() -> Dict:
+    """Замеры сессии и процесса с текущими показателями пула, очереди записи и колоды"""
+    deck = get_deck()
+    gauges = {
+        'flush_queue_depth': get_flush_worker().depth,
+        'dirty_cards': deck.cards.dirty_count,
+        'deck_cards': len(deck.cards),
+        'decks_in_memory': len(get_deck_registry()),
+        'deck_evictions': get_deck_registry().evictions,
+    }
+    pool = get_database_engine().pool
+    if hasattr(pool, 'stats'):
+        gauges.update({f'pool_{name}': value for name, value in asdict(pool.stats()).items()})
+    return profile_dump(get_rerun_profile(), get_process_profile(), gauges)
+
+def show_footprint_panel():
+    """Скрытая панель памяти сессий: при RERUN_PROFILING и ?debug=footprint в адресе"""
+    if not RERUN_PROFILING or st.query_params.get('debug') != 'footprint':
+        return
+    
+    report = get_footprint_report()
+    with st.expander("🧮 Session state footprint"):
+        st.caption(
+            f"{report['sessions']} sessions: {report['total_bytes']:,} B in session state | "
+            f"{report['shared_decks']['decks']} shared decks: {report['shared_decks']['bytes']:,} B"
+        )
+        st.dataframe([{'key': key, **entry} for key, entry in report['keys'].items()], hide_index=True)
+        st.download_button(
+            "footprint.json",
+            json.dumps(report, ensure_ascii=False),
+            file_name="session_footprint.json",
+            mime="application/json",
+            on_click="ignore",
+            use_container_width=True
+        )
+
+# Ресурсы процесса и файлы вне памяти колоды: на них обход размера останавливается
+FOOTPRINT_EXCLUDE = (DeckRegistry, DeckRepository, Engine, FlushWorker, LocalCache)
+
+def get_footprint_report() -> Dict:
+    """Размеры ключей session_state всех сессий процесса и общего хранилища колод"""
+    # Вне сервера (AppTest) рантайма нет - считаем только свою сессию
+    report = session_footprint(live_session_states() or [st.session_state.to_dict()], FOOTPRINT_EXCLUDE)
+    seen = set()
+    decks = get_deck_registry().decks()
+    report['shared_decks'] = {
+        'decks': len(decks),
+        'bytes': sum(deep_size(deck, seen, FOOTPRINT_EXCLUDE) for _, deck in decks)
+    }
+    return report
+
 def show_user_panel():
     """Показывает панель пользователя с поддержкой языков"""
     user_info = st.session_state.user_info
@@ -893,14 +462,15 @@ def show_user_panel():
     col1, col2 = st.columns(2)
     with col1:
         if st.button(t('sync'), use_container_width=True):
-            save_user_data()
-            st.success(t('synced'))
+            if save_user_data(durable=True) and (not LOCAL_CACHE_DIR or sync_local_cache()):
+                st.success(t('synced'))
     
     with col2:
         if st.button(t('logout'), use_container_width=True):
             logout()
             st.rerun()
 
+@profiled
 def show_sidebar_content():
     """Показывает содержимое боковой панели с поддержкой языков"""
     
@@ -960,8 +530,12 @@ def show_sidebar_content():
             st.session_state.settings['vocabulary_size'] = new_vocab_size
             
             # Сбрасываем текущую карточку чтобы обновить в соответствии с новыми настройками
-            st.session_state.current_card = None
+            st.session_state.current_card_id = None
             st.session_state.is_revealed = False
+            st.session_state.card_batch = None
+            st.session_state.card_queue.invalidate()
+            load_missing_partitions()
+            refresh_due_count()
             
             st.success(t('settings_applied'))
             st.rerun()
@@ -970,34 +544,33 @@ def show_sidebar_content():
     
     st.markdown("---")
     
-    # Статистика в боковой панели
-    st.subheader(t('stats_today'))
-    col1, col2 = st.columns(2)
-    with col1:
-        st.metric(t('reviews'), st.session_state.daily_stats['reviews_today'])
-        st.metric(t('new_cards'), st.session_state.daily_stats['new_cards_today'])
-    with col2:
-        st.metric(t('correct'), st.session_state.daily_stats['correct_today'])
-        due_count = len(get_due_cards())
-        st.metric(t('due_cards'), due_count)
-    
-    # Общая статистика
-    total_cards = len(st.session_state.cards)
-    total_reviews = sum(card.total_reviews for card in st.session_state.cards.values())
-    total_correct = sum(card.correct_reviews for card in st.session_state.cards.values())
-    accuracy = (total_correct / total_reviews * 100) if total_reviews > 0 else 0
-    
-    st.subheader(t('stats_total'))
-    st.metric(t('total_cards'), total_cards)
-    st.metric(t('accuracy'), f"{accuracy:.1f}%")
-    
     # Информация о текущем словаре
     current_vocab_size = st.session_state.settings.get('vocabulary_size', 30)
     st.markdown(f"📚 **{t('current_vocabulary')}:** {current_vocab_size} {t('verbs')}")
 
+def show_deck_stats():
+    """Счётчики дня и колоды: рисуются во фрагменте карточки, поэтому ответ не перезапускает приложение"""
+    # Счётчики поддерживаются инкрементально - без прохода по колоде
+    daily_stats = st.session_state.daily_stats
+    deck_stats = get_deck().deck_stats
+    today, total = st.columns([2, 1])
+    with today:
+        st.caption(t('stats_today'))
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric(t('reviews'), daily_stats['reviews_today'])
+        col2.metric(t('correct'), daily_stats['correct_today'])
+        col3.metric(t('new_cards'), daily_stats['new_cards_today'])
+        col4.metric(t('due_cards'), deck_stats.due_count)
+    with total:
+        st.caption(t('stats_total'))
+        col1, col2 = st.columns(2)
+        col1.metric(t('total_cards'), deck_stats.total.cards)
+        col2.metric(t('accuracy'), f"{deck_stats.total.accuracy:.1f}%")
+
+@profiled
 def show_verb_card():
     """Показывает карточку глагола с поддержкой языков"""
-    card = st.session_state.current_card
+    card = get_current_card()
     
     # Получаем доступные глаголы для текущего размера словаря
     vocab_size = st.session_state.settings.get('vocabulary_size', 30)
@@ -1010,52 +583,33 @@ def show_verb_card():
         next_card()
         return
     
-    verb_translation = get_verb_translation(card.verb)
+    current_lang = get_current_language()
+    verb_translation = get_verb_translation(card.verb, current_lang)
     is_revealed = st.session_state.is_revealed
     
     # Отображаем карточку
     if not is_revealed:
-        st.markdown(f"""
-        <div class="verb-card">
-            <div class="verb-title">{card.verb}</div>
-            <div class="verb-translation">{verb_translation}</div>
-            <div style="font-size: 1.2rem; opacity: 0.8; margin-bottom: 1rem;">
-                {t(card.tense)}
-            </div>
-            <div class="pronoun-display">
-                {PRONOUNS[card.pronoun_index]}
-            </div>
-            <div class="click-hint">
-                {t('click_to_reveal')}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        template = get_card_template(current_lang, False)
+        st.markdown(
+            template.render(card.verb, verb_translation, card.tense, PRONOUNS[card.pronoun_index]),
+            unsafe_allow_html=True
+        )
         
         # Кнопка для показа ответа
         col1, col2, col3 = st.columns([1, 3, 1])
         with col2:
             if st.button(t('show_answer'), type="primary", use_container_width=True):
                 st.session_state.is_revealed = True
-                st.rerun()
+                rerun_card_area()
     else:
         # Показываем ответ
         conjugation = CONJUGATIONS[card.tense][card.verb][card.pronoun_index]
         
-        st.markdown(f"""
-        <div class="verb-card revealed">
-            <div class="verb-title">{card.verb}</div>
-            <div class="verb-translation">{verb_translation}</div>
-            <div style="font-size: 1.2rem; opacity: 0.8; margin-bottom: 1rem;">
-                {t(card.tense)}
-            </div>
-            <div class="pronoun-display">
-                {PRONOUNS[card.pronoun_index]}
-            </div>
-            <div class="answer-display">
-                ✓ {conjugation}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        template = get_card_template(current_lang, True)
+        st.markdown(
+            template.render(card.verb, verb_translation, card.tense, PRONOUNS[card.pronoun_index], conjugation),
+            unsafe_allow_html=True
+        )
         
         # Кнопки оценки сложности
         st.subheader(t('rate_difficulty'))
@@ -1079,20 +633,35 @@ def show_verb_card():
             if st.button(t('easy'), key="easy", use_container_width=True, help=t('easy_help')):
                 process_answer(Difficulty.EASY)
     
+    show_card_footer()
+
+def show_card_footer():
+    """Правила спряжения и советы под карточкой"""
     # Правила спряжения для выбранных времен
     st.markdown("---")
     st.subheader(t('grammar_rules'))
-    
-    current_lang = get_current_language()
-    for tense in st.session_state.settings['selected_tenses']:
-        rule = get_grammar_rule(tense, current_lang)
-        with st.expander(f"{rule['title']}", expanded=False):
-            st.markdown(rule['content'])
+    show_grammar_rules()
     
     # Советы по изучению - в самом низу
     if st.button(t('study_tips'), key="study_tips", use_container_width=True):
         show_study_tips()
 
+@st.fragment
+def show_grammar_rules():
+    """Правило спряжения по запросу: текст отправляется, только когда правило выбрано"""
+    # Раньше под каждой карточкой были свернутые expander'ы со всеми правилами,
+    # и их текст уходил в браузер при каждом перезапуске
+    current_lang = get_current_language()
+    tense = st.pills(
+        t('grammar_rules'),
+        st.session_state.settings['selected_tenses'],
+        format_func=lambda tense: t(tense),
+        key="grammar_rule_tense",
+        label_visibility="collapsed"
+    )
+    if tense is not None:
+        st.markdown(get_grammar_rule_markdown(tense, current_lang))
+
 def show_study_tips():
     """Показывает советы по эффективному изучению с поддержкой языков"""
     st.header(t('study_tips'))
@@ -1118,18 +687,26 @@ def show_study_tips():
         - {t('advanced_settings')}
         """)
 
+@st.fragment
 def show_learning_interface():
-    """Показывает интерфейс изучения с поддержкой языков"""
+    """Показывает интерфейс изучения (фрагмент: ответы перезапускают только его)"""
     # Контейнер для более компактного интерфейса
-    with st.container():
+    # Перезапуск фрагмента идет без main(): колоду пользователя захватываем и здесь
+    with get_deck().lock, st.container():
         st.markdown('<div class="main-content">', unsafe_allow_html=True)
+        show_deck_stats()
+        
+        if CLIENT_SIDE_CARDS:
+            show_card_batch()
+            st.markdown('</div>', unsafe_allow_html=True)
+            return
         
         # Получаем следующую карточку
-        if not st.session_state.current_card:
-            st.session_state.current_card = get_next_card()
+        if get_current_card() is None:
+            set_current_card(get_next_card())
             st.session_state.is_revealed = False
         
-        if not st.session_state.current_card:
+        if get_current_card() is None:
             st.success(t('completed_today'))
             st.info(t('come_back_tomorrow'))
             
@@ -1143,6 +720,50 @@ def show_learning_interface():
         
         st.markdown('</div>', unsafe_allow_html=True)
 
+@profiled
+def show_card_batch():
+    """Показывает пачку карточек в компоненте браузера: ответ и оценка без перезапуска"""
+    batch = st.session_state.card_batch
+    if batch is None or batch.is_complete:
+        batch = st.session_state.card_batch = issue_card_batch()
+    
+    if batch is None:
+        st.success(t('completed_today'))
+        st.info(t('come_back_tomorrow'))
+        
+        if st.button(t('get_new_card')):
+            new_card = get_new_card()
+            if new_card:
+                card = get_or_create_card(*new_card)
+                st.session_state.card_batch = issue_card_batch([card.card_id])
+                rerun_card_area()
+        return
+    
+    card_batch(
+        batch.batch_id,
+        [get_card_payload(get_deck().cards[card_id]) for card_id in batch.card_ids],
+        {
+            name: t(name) for name in (
+                'show_answer', 'click_to_reveal', 'rate_difficulty', 'honest_evaluation',
+                'again', 'hard', 'good', 'easy', 'again_help', 'hard_help', 'good_help', 'easy_help'
+            )
+        },
+        key='card_batch_grades',
+        on_change=apply_card_batch_grades
+    )
+    show_card_footer()
+
+def get_card_payload(card: Card) -> Dict:
+    """Данные карточки для браузера: вопрос и ответ"""
+    return {
+        'id': card.card_id,
+        'verb': card.verb,
+        'translation': get_verb_translation(card.verb),
+        'tense': t(card.tense),
+        'pronoun': PRONOUNS[card.pronoun_index],
+        'answer': CONJUGATIONS[card.tense][card.verb][card.pronoun_index],
+    }
+
 def handle_oauth_callback(query_params):
     """Обрабатывает OAuth callback с поддержкой языков"""
     st.title(t('processing_auth'))
@@ -1169,35 +790,31 @@ def handle_oauth_callback(query_params):
         else:
             st.error(t('auth_error'))
 
-def get_new_cards() -> List[Tuple[str, int, str]]:
-    """Получает новые карточки с учетом размера словаря"""
-    new_cards = []
-    existing_keys = set(st.session_state.cards.keys())
-    
-    # Получаем доступные глаголы для текущего размера словаря
+def get_new_card_partitions() -> Partitions:
+    """Разделы для потока новых карточек: (время, начало диапазона словаря) -> глаголы"""
     vocab_size = st.session_state.settings.get('vocabulary_size', 30)
-    available_verbs = get_verbs_for_level(vocab_size)
-    
-    for tense in st.session_state.settings['selected_tenses']:
-        if tense not in CONJUGATIONS:
-            continue
-            
-        for verb in available_verbs:
-            if verb not in CONJUGATIONS[tense]:
-                continue
-                
-            for pronoun_index in range(6):
-                key = get_card_key(verb, pronoun_index, tense)
-                if key not in existing_keys:
-                    new_cards.append((verb, pronoun_index, tense))
-    
-    random.shuffle(new_cards)
-    return new_cards
+    return VOCABULARY_LEVELS.partitions(vocab_size, st.session_state.settings['selected_tenses'])
+
+def get_new_card_stream() -> NewCardStream:
+    """Поток новых карточек пользователя (создается при первом обращении)"""
+    if st.session_state.new_card_stream is None:
+        st.session_state.new_card_stream = NewCardStream(seed_for_user(get_user_id()))
+    return st.session_state.new_card_stream
 
+def get_new_card() -> Optional[Tuple[str, int, str]]:
+    """Получает следующую новую карточку с учетом размера словаря"""
+    cards = get_deck().cards
+    return get_new_card_stream().next_card(
+        get_new_card_partitions(),
+        lambda verb, pronoun_index, tense: get_card_id(verb, pronoun_index, tense) in cards
+    )
+
+@profiled
 def main():
     """Главная функция приложения"""
     # Инициализация
     init_session_state()
+    inject_styles()
     
     # Обрабатываем OAuth callback
     query_params = dict(st.query_params)
@@ -1205,10 +822,21 @@ def main():
     if 'code' in query_params and 'state' in query_params:
         handle_oauth_callback(query_params)
     elif st.session_state.authenticated:
-        show_main_app()
+        # Вкладки одного пользователя работают с общей колодой по очереди
+        with get_deck().lock:
+            show_main_app()
     else:
         show_welcome_page()
 
+def inject_styles():
+    """CSS приложения: при STYLES_ONCE_PER_SESSION - только в первом перезапуске сессии"""
+    if not STYLES_ONCE_PER_SESSION:
+        st.markdown(APP_CSS, unsafe_allow_html=True)
+    elif not st.session_state.styles_injected:
+        components.html(stylesheet_injector(APP_STYLESHEET), height=0)
+        st.session_state.styles_injected = True
+
+@profiled
 def init_session_state():
     """Инициализация session state"""
     # OAuth состояние
@@ -1224,10 +852,12 @@ def init_session_state():
         st.session_state.interface_language = 'en'
     
     # Состояние приложения
-    if 'cards' not in st.session_state:
-        st.session_state.cards = {}
-    if 'current_card' not in st.session_state:
-        st.session_state.current_card = None
+    # Колода, журнал и индексы живут в общем хранилище (get_deck_registry):
+    # сессия ссылается на колоду ключом пользователя и на карточку - ее id
+    if 'deck_generation' not in st.session_state:
+        st.session_state.deck_generation = None
+    if 'current_card_id' not in st.session_state:
+        st.session_state.current_card_id = None
     if 'is_revealed' not in st.session_state:
         st.session_state.is_revealed = False
     if 'daily_stats' not in st.session_state:
@@ -1247,6 +877,15 @@ def init_session_state():
         }
     if 'recent_combinations' not in st.session_state:
         st.session_state.recent_combinations = []
+    if 'new_card_stream' not in st.session_state:
+        st.session_state.new_card_stream = None
+    if 'card_queue' not in st.session_state:
+        st.session_state.card_queue = CardQueue()
+    if 'styles_injected' not in st.session_state:
+        st.session_state.styles_injected = False
+    if 'card_batch' not in st.session_state:
+        st.session_state.card_batch = None
+        st.session_state.card_batch_seq = 0
 
 # Остальные функции остаются теми же...
 def validate_state_format(state):
@@ -1271,8 +910,8 @@ def process_authorization_code(code):
         st.session_state.authenticated = True
         st.session_state.user_info = user_info
         
-        # Загружаем данные пользователя
-        load_user_data()
+        # Загружаем данные пользователя (колода в памяти могла устареть)
+        get_deck(reload=True)
         
         return True
     except Exception as e:
@@ -1298,106 +937,381 @@ def get_user_info(access_token):
     response = requests.get(GOOGLE_USERINFO_URL, headers=headers, timeout=10)
     return response.json() if response.status_code == 200 else None
 
+def get_user_id() -> str:
+    """Идентификатор пользователя для хранения колоды"""
+    user_info = st.session_state.user_info or {}
+    return user_info.get('email') or user_info.get('id') or ''
+
+def get_deck(reload: bool = False) -> UserDeck:
+    """Колода пользователя из общего хранилища; вытесненная колода загружается заново"""
+    registry = get_deck_registry()
+    handle = get_user_id()
+    deck, created = registry.acquire(handle)
+    if created:
+        # Новая колода выдана с захваченным lock: другие вкладки ждут конца загрузки
+        try:
+            load_user_data()
+        except BaseException:
+            registry.discard(handle, deck)
+            raise
+        finally:
+            deck.lock.release()
+    elif reload:
+        with deck.lock:
+            if save_user_data(durable=True):
+                load_user_data()
+    
+    if st.session_state.deck_generation != deck.generation:
+        # Колоду перечитали (после вытеснения или в другой вкладке) - карточки сессии из старой недействительны
+        st.session_state.deck_generation = deck.generation
+        st.session_state.current_card_id = None
+        st.session_state.is_revealed = False
+        st.session_state.card_batch = None
+        st.session_state.card_queue.invalidate()
+        refresh_due_count()
+    return deck
+
+def get_current_card() -> Optional[Card]:
+    """Текущая карточка сессии"""
+    card_id = st.session_state.current_card_id
+    return None if card_id is None else get_deck().cards.get(card_id)
+
+def set_current_card(card: Optional[Card]):
+    """Делает карточку текущей (в session_state - только id)"""
+    st.session_state.current_card_id = None if card is None else card.card_id
+
+def set_user_deck(cards: CardStore):
+    """Заменяет колоду пользователя и перестраивает производные структуры"""
+    deck = get_deck()
+    deck.cards = cards
+    deck.due_index.rebuild(cards)
+    deck.deck_stats = DeckStats.from_cards(cards)
+    deck.renew()
+    st.session_state.deck_generation = deck.generation
+    st.session_state.card_queue.invalidate()
+    refresh_due_count()
+
 def load_user_data():
-    """Загружает данные пользователя (заглушка для будущей базы данных)"""
-    # В будущем здесь будет загрузка из Firebase/Supabase
-    pass
+    """Загружает из базы части колоды для текущих настроек (времена и уровень словаря)"""
+    if LOCAL_CACHE_DIR and not get_local_cache().has_synced:
+        # Первый вход на этом сервере: наполняем кэш из основной базы, колода читается ниже один раз
+        sync_local_cache(reload=False)
+    
+    load_user_deck()
+    
+    # Журнал сессии продолжает нумерацию сохраненных событий
+    last_seq = get_user_repository().last_event_seq(get_user_id())
+    deck = get_deck()
+    deck.review_log = ReviewLog(first_seq=last_seq + 1)
+    deck.write_buffer = WriteBuffer(flushed_seq=last_seq)
+    deck.user_id = get_user_id()
+    deck.repository = get_user_repository()
 
-def save_user_data():
-    """Сохраняет данные пользователя (заглушка для будущей базы данных)"""
-    # В будущем здесь будет сохранение в Firebase/Supabase
-    pass
+def load_user_deck():
+    """Перечитывает колоду пользователя из хранилища для текущих настроек"""
+    get_deck().deck_coverage = DeckCoverage()
+    st.session_state.current_card_id = None
+    st.session_state.is_revealed = False
+    st.session_state.card_batch = None
+    set_user_deck(CardStore())
+    load_missing_partitions()
 
-def get_card_key(verb: str, pronoun_index: int, tense: str) -> str:
-    """Генерирует ключ для карточки"""
-    return f"{verb}_{pronoun_index}_{tense}"
+def load_missing_partitions():
+    """Догружает одним запросом карточки выбранных времён и глаголов, которых еще нет в сессии"""
+    settings = st.session_state.settings
+    deck = get_deck()
+    coverage = deck.deck_coverage
+    
+    # Уровни словаря - префиксы каталога, поэтому уровень задается числом глаголов
+    verb_count = len(get_verbs_for_level(settings.get('vocabulary_size', 30)))
+    ranges = coverage.missing(settings['selected_tenses'], verb_count)
+    if not ranges:
+        return
+    
+    cards = deck.cards
+    for card_id in get_user_repository().load_partitions(get_user_id(), ranges, cards):
+        card = cards[card_id]
+        deck.due_index.update(card_id, card)
+        deck.deck_stats.add_card(card)
+    coverage.extend(ranges)
+    
+    st.session_state.card_queue.invalidate()
+    refresh_due_count()
+
+def save_user_data(durable: bool = False) -> bool:
+    """Отправляет накопленные изменения колоды и журнала (durable - дождаться записи)"""
+    deck = get_deck()
+    buffer = deck.write_buffer
+    
+    # Ошибка фоновой записи: изменения уже вернулись в буфер
+    if buffer.error is not None:
+        st.error(f"{t('sync_error')}: {buffer.error}")
+        buffer.error = None
+    
+    try:
+        deck.flush(get_flush_worker(), durable=durable or SAVE_DURABILITY == DURABILITY_IMMEDIATE)
+        return True
+    except (SQLAlchemyError, TimeoutError) as e:
+        st.error(f"{t('sync_error')}: {e}")
+        return False
+
+def sync_local_cache(reload: bool = True) -> bool:
+    """Обменивается изменениями локального кэша с основной базой (reload - перечитать колоду, если она изменилась)"""
+    try:
+        result = get_local_cache().sync(get_deck_repository())
+    except SQLAlchemyError as e:
+        # Основная база недоступна - продолжаем работать с локальной копией
+        st.error(f"{t('sync_error')}: {e}")
+        return False
+    
+    # Пришли изменения с других устройств - перечитываем колоду из кэша
+    if reload and result.pulled_cards:
+        load_user_deck()
+    return True
+
+def get_card_id(verb: str, pronoun_index: int, tense: str) -> int:
+    """Генерирует целочисленный id карточки"""
+    return CARD_CODEC.encode(verb, pronoun_index, tense)
 
 def get_or_create_card(verb: str, pronoun_index: int, tense: str) -> Card:
     """Получает или создает карточку"""
-    key = get_card_key(verb, pronoun_index, tense)
+    card_id = get_card_id(verb, pronoun_index, tense)
+    deck = get_deck()
     
-    if key not in st.session_state.cards:
-        st.session_state.cards[key] = Card(
+    if card_id not in deck.cards:
+        card = deck.cards.add(card_id, Card(
             verb=verb,
             pronoun_index=pronoun_index,
             tense=tense
-        )
+        ))
+        deck.due_index.update(card_id, card)
+        deck.deck_stats.add_card(card)
+        refresh_due_count()
     
-    return st.session_state.cards[key]
+    return deck.cards[card_id]
 
-def get_due_cards() -> List[Card]:
-    """Получает карточки для повторения"""
+def get_due_filter() -> Tuple[str, List[str], FrozenSet[str]]:
+    """Возвращает текущую дату и фильтр карточек (времена, глаголы)"""
     today = datetime.date.today().isoformat()
     
     # Получаем доступные глаголы для текущего размера словаря
     vocab_size = st.session_state.settings.get('vocabulary_size', 30)
     available_verbs = get_verbs_for_level(vocab_size)
     
-    due_cards = []
-    for card in st.session_state.cards.values():
-        if (card.next_review_date <= today and 
-            card.tense in st.session_state.settings['selected_tenses'] and
-            card.verb in available_verbs):
-            due_cards.append(card)
+    return today, st.session_state.settings['selected_tenses'], available_verbs
+
+def get_due_cards() -> List[Card]:
+    """Получает карточки для повторения (упорядочены по дате)"""
+    deck = get_deck()
+    card_ids = deck.due_index.iter_due(*get_due_filter())
+    return [deck.cards[card_id] for card_id in card_ids]
+
+def count_due_cards() -> int:
+    """Количество карточек для повторения без прохода по колоде"""
+    return get_deck().due_index.count_due(*get_due_filter())
+
+def refresh_due_count():
+    """Обновляет количество карточек к повторению в статистике колоды"""
+    get_deck().deck_stats.due_count = count_due_cards()
+
+def get_queue_signature() -> Tuple:
+    """Дата и настройки, от которых зависит очередь следующих карточек"""
+    settings = st.session_state.settings
+    return (
+        datetime.date.today().isoformat(),
+        tuple(settings['selected_tenses']),
+        settings.get('vocabulary_size', 30),
+        settings['new_cards_per_day']
+    )
+
+def iter_upcoming_card_ids() -> Iterator[int]:
+    """Id следующих карточек: сначала для повторения, затем новые в пределах дневного лимита"""
+    yield from get_deck().due_index.iter_due(*get_due_filter())
+    
+    cards = get_deck().cards
+    queue = st.session_state.card_queue
+    
+    # Новые карточки в очереди еще не созданы, но уже занимают дневной лимит
+    allowance = (
+        st.session_state.settings['new_cards_per_day']
+        - st.session_state.daily_stats['new_cards_today']
+        - sum(1 for card_id in queue if card_id not in cards)
+    )
+    
+    def is_seen(verb: str, pronoun_index: int, tense: str) -> bool:
+        card_id = get_card_id(verb, pronoun_index, tense)
+        return card_id in cards or card_id in queue
     
-    return sorted(due_cards, key=lambda x: x.next_review_date)
+    # Заглядываем вперед по копии: курсоры потока сдвигаются только при создании карточек
+    stream = get_new_card_stream().copy()
+    partitions = get_new_card_partitions()
+    while allowance > 0:
+        new_card = stream.next_card(partitions, is_seen)
+        if new_card is None:
+            return
+        allowance -= 1
+        yield get_card_id(*new_card)
+
+def refill_card_queue():
+    """Дополняет очередь следующих карточек (сбрасывает ее при смене даты или настроек)"""
+    queue = st.session_state.card_queue
+    signature = get_queue_signature()
+    if queue.signature != signature:
+        queue.reset(signature)
+    queue.top_up(iter_upcoming_card_ids())
 
+def take_queued_card(card_id: int) -> Optional[Card]:
+    """Карточка из очереди или None, если она перестала быть актуальной"""
+    cards = get_deck().cards
+    
+    if card_id in cards:
+        # Карточку могли повторить в обход очереди (например, через force_new_card)
+        card = cards[card_id]
+        return card if card.next_review_date <= datetime.date.today().isoformat() else None
+    
+    if st.session_state.daily_stats['new_cards_today'] >= st.session_state.settings['new_cards_per_day']:
+        return None
+    
+    verb, pronoun_index, tense = CARD_CODEC.decode(card_id)
+    return get_or_create_card(verb, pronoun_index, tense)
+
+def take_card_batch() -> List[int]:
+    """Забирает из очереди предвыборки все актуальные карточки для пачки"""
+    queue = st.session_state.card_queue
+    available_verbs = get_verbs_for_level(st.session_state.settings.get('vocabulary_size', 30))
+    
+    card_ids = []
+    for attempt in range(2):
+        if attempt or not queue or queue.signature != get_queue_signature():
+            refill_card_queue()
+        while queue:
+            card = take_queued_card(queue.pop())
+            if card is not None and card.verb in available_verbs and card.verb in CONJUGATIONS.get(card.tense, {}):
+                card_ids.append(card.card_id)
+        if card_ids:
+            break
+    return card_ids
+
+def issue_card_batch(card_ids: Optional[List[int]] = None) -> Optional[CardBatch]:
+    """Новая пачка для браузера (по умолчанию - из очереди); None, если карточек нет"""
+    card_ids = take_card_batch() if card_ids is None else card_ids
+    if not card_ids:
+        return None
+    st.session_state.card_batch_seq += 1
+    return CardBatch.issue(st.session_state.card_batch_seq, get_deck().cards, card_ids)
+
+@profiled
+def apply_card_batch_grades():
+    """Принимает оценки пачки из браузера: каждая проверяется и пересчитывается через SRSManager"""
+    batch = st.session_state.card_batch
+    if batch is None:
+        return
+    # Обработчик выполняется до скрипта, поэтому колоду захватывает сам
+    deck = get_deck()
+    with deck.lock:
+        # Отклоненные оценки (чужая пачка, повтор в обход пачки) просто не применяются
+        cards = deck.cards
+        answers, _ = batch.accept(st.session_state.card_batch_grades, cards)
+        for card_id, difficulty, timestamp in answers:
+            apply_answer(cards[card_id], difficulty, timestamp)
+    
+    # Пока пачка не отвечена, ее карточки числятся к повторению и попали бы в очередь
+    if answers:
+        st.session_state.card_queue.invalidate()
+
+@profiled
 def get_next_card() -> Optional[Card]:
-    """Получает следующую карточку"""
-    # Сначала карточки для повторения
-    due_cards = get_due_cards()
-    if due_cards:
-        return due_cards[0]
-    
-    # Затем новые карточки
-    if st.session_state.daily_stats['new_cards_today'] < st.session_state.settings['new_cards_per_day']:
-        new_cards = get_new_cards()
-        if new_cards:
-            verb, pronoun_index, tense = new_cards[0]
-            return get_or_create_card(verb, pronoun_index, tense)
+    """Получает следующую карточку из очереди предвыборки"""
+    queue = st.session_state.card_queue
+    
+    # Сначала карточки для повторения, затем новые - порядок задает refill_card_queue
+    for attempt in range(2):
+        if attempt or not queue or queue.signature != get_queue_signature():
+            refill_card_queue()
+        while queue:
+            card = take_queued_card(queue.pop())
+            if card is not None:
+                return card
     
     return None
 
+@profiled
 def process_answer(difficulty: Difficulty):
     """Обрабатывает ответ пользователя"""
-    if not st.session_state.current_card:
+    card = get_current_card()
+    if card is None:
         return
     
-    is_new_card = st.session_state.current_card.total_reviews == 0
+    apply_answer(card, difficulty)
+    
+    # Готовим следующие карточки заранее
+    refill_card_queue()
+    
+    # Переходим к следующей карточке
+    next_card()
+
+def apply_answer(card: Card, difficulty: Difficulty, timestamp: Optional[float] = None):
+    """Применяет ответ к карточке: журнал, SRS, статистика, очередь и отложенная запись"""
+    timestamp = time.time() if timestamp is None else timestamp
+    is_new_card = card.total_reviews == 0
+    deck = get_deck()
+    
+    # Записываем ответ в журнал (до изменения карточки)
+    deck.review_log.append(
+        card.card_id, difficulty.value, timestamp, card.interval, card.easiness_factor
+    )
     
     # Обновляем карточку с помощью SRS
-    updated_card = SRSManager.update_card(st.session_state.current_card, difficulty)
-    card_key = get_card_key(updated_card.verb, updated_card.pronoun_index, updated_card.tense)
-    st.session_state.cards[card_key] = updated_card
+    updated_card = SRSManager.update_card(
+        card, difficulty, deck.due_index, datetime.date.fromtimestamp(timestamp)
+    )
     
     # Обновляем статистику
+    is_correct = difficulty in [Difficulty.GOOD, Difficulty.EASY]
+    deck.deck_stats.record_review(updated_card, is_correct)
+    refresh_due_count()
+    
     st.session_state.daily_stats['reviews_today'] += 1
-    if difficulty in [Difficulty.GOOD, Difficulty.EASY]:
+    if is_correct:
         st.session_state.daily_stats['correct_today'] += 1
     if is_new_card:
         st.session_state.daily_stats['new_cards_today'] += 1
     
-    # Сохраняем данные
-    save_user_data()
+    # Очередь сбрасывается, только если карточка осталась к повторению сегодня и меняет порядок
+    if updated_card.next_review_date <= datetime.date.today().isoformat():
+        st.session_state.card_queue.invalidate()
     
-    # Переходим к следующей карточке
-    next_card()
+    # Сохраняем пачкой: после N ответов или T секунд (сразу в режиме immediate).
+    # Колода сама отмечает изменившиеся карточки, в базу уходят только они
+    buffer = deck.write_buffer
+    buffer.record_answer()
+    if SAVE_DURABILITY == DURABILITY_IMMEDIATE or buffer.is_due(deck.cards, deck.review_log):
+        save_user_data()
 
 def next_card():
     """Переход к следующей карточке"""
-    st.session_state.current_card = None
+    st.session_state.current_card_id = None
     st.session_state.is_revealed = False
-    st.rerun()
+    rerun_card_area()
 
 def force_new_card():
     """Принудительно получает новую карточку"""
-    new_cards = get_new_cards()
-    if new_cards:
-        verb, pronoun_index, tense = random.choice(new_cards)
-        st.session_state.current_card = get_or_create_card(verb, pronoun_index, tense)
+    new_card = get_new_card()
+    if new_card:
+        verb, pronoun_index, tense = new_card
+        set_current_card(get_or_create_card(verb, pronoun_index, tense))
         st.session_state.is_revealed = False
+        rerun_card_area()
+
+def rerun_card_area():
+    """Перезапускает фрагмент карточки (счётчики - в нем же, см. show_deck_stats)"""
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        # Идет полный запуск приложения, а не перезапуск фрагмента
         st.rerun()
 
+@profiled
 def reset_daily_stats():
     """Сбрасывает дневную статистику"""
     today = datetime.date.today().isoformat()
@@ -1408,6 +1322,7 @@ def reset_daily_stats():
             'new_cards_today': 0,
             'last_reset': today
         })
+        refresh_due_count()
 
 def clear_url_params():
     """Очищает URL параметры"""
@@ -1424,11 +1339,16 @@ def clear_oauth_and_reload():
 
 def logout():
     """Выход из системы"""
+    save_user_data(durable=True)
+    
     st.session_state.authenticated = False
     st.session_state.user_info = None
     st.session_state.oauth_state = None
-    st.session_state.cards = {}
-    st.session_state.current_card = None
+    st.session_state.deck_generation = None
+    st.session_state.new_card_stream = None
+    st.session_state.card_queue = CardQueue()
+    st.session_state.current_card_id = None
+    st.session_state.card_batch = None
     st.session_state.daily_stats = {
         'reviews_today': 0,
         'correct_today': 0,
@@ -0,0 +1,104 @@
+# srs/card_batch.py
+"""
+Пачка карточек, которую браузер показывает и оценивает без обращений к серверу
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from srs.card_store import CardStore
+from srs.models import Difficulty
+
+# Принятый ответ: (id карточки, оценка, время ответа)
+BatchAnswer = Tuple[int, Difficulty, float]
+
+
+@dataclass
+class CardBatch:
+    """
+    Карточки, выданные браузеру одной пачкой
+
+    Браузер сам показывает ответы и возвращает оценки пачкой. Сервер
+    принимает оценку, только если карточка входит в эту пачку, еще не
+    оценена в ней и не повторялась в обход пачки после выдачи (число
+    ответов не изменилось). Расписание по-прежнему считает SRSManager на
+    сервере: от браузера приходят только оценка и время ответа.
+    """
+
+    batch_id: int
+    card_ids: Tuple[int, ...]
+    reviews_at_issue: Dict[int, int]     # id -> total_reviews на момент выдачи
+    issued_at: float
+    settled: Set[int] = field(default_factory=set)  # id, по которым оценка принята или отклонена
+
+    @classmethod
+    def issue(cls, batch_id: int, store: CardStore, card_ids: Sequence[int], now: Optional[float] = None) -> 'CardBatch':
+        """Новая пачка из карточек колоды"""
+        return cls(
+            batch_id=batch_id,
+            card_ids=tuple(card_ids),
+            reviews_at_issue={card_id: store[card_id].total_reviews for card_id in card_ids},
+            issued_at=time.time() if now is None else now
+        )
+
+    @property
+    def is_complete(self) -> bool:
+        """По всем карточкам пачки получен ответ"""
+        return len(self.settled) == len(self.card_ids)
+
+    def accept(self, payload, store: CardStore, now: Optional[float] = None) -> Tuple[List[BatchAnswer], int]:
+        """
+        Проверяет оценки, присланные браузером
+
+        Args:
+            payload: {'batch_id': ..., 'grades': [[id карточки, оценка 0-3, время в мс], ...]}
+            store: Колода сессии
+            now: Текущее время (по умолчанию time.time())
+
+        Returns:
+            (принятые ответы в порядке ответов, число отклоненных оценок)
+        """
+        now = time.time() if now is None else now
+        if not isinstance(payload, dict):
+            return [], 0
+        grades = payload.get('grades')
+        grades = grades if isinstance(grades, list) else []
+        if payload.get('batch_id') != self.batch_id:
+            # Оценки устаревшей пачки (например, настройки сменились, пока браузер отвечал)
+            return [], len(grades)
+
+        accepted, rejected = [], 0
+        for entry in grades:
+            try:
+                card_id, grade, client_ms = entry
+                if type(card_id) is not int or type(grade) is not int:
+                    raise TypeError(entry)
+                difficulty = Difficulty(grade)
+            except (TypeError, ValueError):
+                rejected += 1
+                continue
+
+            # Повтор уже учтенной оценки (пачка присылается целиком после частичной отправки)
+            if card_id in self.settled:
+                continue
+            if card_id not in self.reviews_at_issue:
+                rejected += 1
+                continue
+
+            self.settled.add(card_id)
+            if card_id not in store or store[card_id].total_reviews != self.reviews_at_issue[card_id]:
+                rejected += 1
+                continue
+
+            accepted.append((card_id, difficulty, _answer_time(client_ms, self.issued_at, now)))
+        return accepted, rejected
+
+
+def _answer_time(client_ms, issued_at: float, now: float) -> float:
+    """Время ответа по часам браузера, ограниченное временем жизни пачки"""
+    try:
+        timestamp = float(client_ms) / 1000
+    except (TypeError, ValueError):
+        return now
+    return min(max(timestamp, issued_at), now) if timestamp == timestamp else now
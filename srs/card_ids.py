@@ -0,0 +1,64 @@
+# srs/card_ids.py
+"""
+Целочисленные идентификаторы карточек
+"""
+
+from typing import Dict, Sequence, Tuple
+
+PRONOUN_BITS = 3  # до 8 местоимений
+TENSE_BITS = 3    # до 8 времён
+PRONOUN_MASK = (1 << PRONOUN_BITS) - 1
+TENSE_MASK = (1 << TENSE_BITS) - 1
+
+
+class CardCodec:
+    """
+    Упаковка (глагол, местоимение, время) в одно целое число
+
+    id = (порядковый номер глагола << 6) | (номер времени << 3) | местоимение.
+    Порядковые номера берутся из каталога один раз, поэтому кодирование - это
+    два поиска в словаре и битовые операции без построения строк. Поля
+    фиксированной ширины сохраняют id стабильными, когда в конец каталога
+    добавляются новые глаголы или времена.
+
+    Для совместимости с сохранёнными колодами поддерживается старый строковый
+    ключ вида "глагол_местоимение_время".
+    """
+
+    def __init__(self, verbs: Sequence[str], tenses: Sequence[str]):
+        if len(tenses) > TENSE_MASK + 1:
+            raise ValueError(f"at most {TENSE_MASK + 1} tenses are supported")
+
+        self.verbs: Tuple[str, ...] = tuple(verbs)
+        self.tenses: Tuple[str, ...] = tuple(tenses)
+        self._verb_ordinals: Dict[str, int] = {verb: index for index, verb in enumerate(self.verbs)}
+        self._tense_ordinals: Dict[str, int] = {tense: index for index, tense in enumerate(self.tenses)}
+
+    def encode(self, verb: str, pronoun_index: int, tense: str) -> int:
+        """(глагол, местоимение, время) -> id карточки"""
+        return (
+            (self._verb_ordinals[verb] << (TENSE_BITS + PRONOUN_BITS))
+            | (self._tense_ordinals[tense] << PRONOUN_BITS)
+            | pronoun_index
+        )
+
+    def decode(self, card_id: int) -> Tuple[str, int, str]:
+        """id карточки -> (глагол, местоимение, время)"""
+        verb = self.verbs[card_id >> (TENSE_BITS + PRONOUN_BITS)]
+        tense = self.tenses[(card_id >> PRONOUN_BITS) & TENSE_MASK]
+        return verb, card_id & PRONOUN_MASK, tense
+
+    @staticmethod
+    def first_id_of_verb(verb_ordinal: int) -> int:
+        """Наименьший id карточек глагола: карточки первых N глаголов - это id < first_id_of_verb(N)"""
+        return verb_ordinal << (TENSE_BITS + PRONOUN_BITS)
+
+    def to_legacy_key(self, card_id: int) -> str:
+        """id карточки -> старый строковый ключ"""
+        verb, pronoun_index, tense = self.decode(card_id)
+        return f"{verb}_{pronoun_index}_{tense}"
+
+    def from_legacy_key(self, key: str) -> int:
+        """Старый строковый ключ -> id карточки"""
+        verb, pronoun_index, tense = key.rsplit('_', 2)
+        return self.encode(verb, int(pronoun_index), tense)
@@ -0,0 +1,331 @@
+# srs/card_store.py
+"""
+Колоночное хранилище карточек пользователя
+"""
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from srs.models import Card, day_to_iso, iso_to_day
+
+
+def snap_easiness(value: float) -> float:
+    """
+    Привязывает EF к сетке 0.05 (а не округляет до двух знаков)
+
+    Шаги алгоритма (+0.15, +0.1, -0.15, -0.2) и границы 1.3 и 3.0 кратны
+    0.05, поэтому для EF, полученных ответами, значение не меняется -
+    убирается только погрешность float32. Но точность хранения меняется:
+    EF, импортированный или записанный извне с другим шагом (например,
+    2.37), читается как ближайшее кратное 0.05 (2.35).
+    """
+    return round(value * 20) / 20
+
+
+class _Column:
+    """Поле карточки, которое читается и пишется в колонку хранилища"""
+
+    def __init__(self, column: str, decode=None, encode=None, read_only: bool = False):
+        self.column = column
+        self.decode = decode
+        self.encode = encode
+        self.read_only = read_only
+
+    def __get__(self, view, owner):
+        if view is None:
+            return self
+        value = getattr(view._store, self.column)[view._row]
+        return self.decode(view._store, value) if self.decode else value
+
+    def __set__(self, view, value):
+        if self.read_only:
+            raise AttributeError(f"{self.column} is read-only")
+        if self.encode:
+            value = self.encode(view._store, value)
+        getattr(view._store, self.column)[view._row] = value
+        view._store._dirty_rows[view._row] = None
+
+
+class CardView:
+    """
+    Тонкое представление строки хранилища с интерфейсом Card
+
+    SRSManager и отрисовка карточки работают с ним так же, как с dataclass:
+    чтение и запись атрибутов идут напрямую в колонки хранилища. Любая
+    запись помечает карточку как изменившуюся.
+    """
+    __slots__ = ('_store', '_row')
+
+    card_id = _Column('card_id', read_only=True)
+    verb = _Column('verb_id', lambda store, value: store.verbs[value], read_only=True)
+    tense = _Column('tense_id', lambda store, value: store.tenses[value], read_only=True)
+    pronoun_index = _Column('pronoun', read_only=True)
+    easiness_factor = _Column('easiness', lambda store, value: snap_easiness(value))
+    interval = _Column('interval')
+    repetitions = _Column('repetitions')
+    next_review_day = _Column('next_day')
+    next_review_date = _Column('next_day', lambda store, value: day_to_iso(value), lambda store, value: iso_to_day(value))
+    last_review_date = _Column('last_day', lambda store, value: day_to_iso(value), lambda store, value: iso_to_day(value))
+    total_reviews = _Column('total_reviews')
+    correct_reviews = _Column('correct_reviews')
+
+    def __init__(self, store: 'CardStore', row: int):
+        self._store = store
+        self._row = row
+
+    def __eq__(self, other):
+        if isinstance(other, CardView):
+            return self._store is other._store and self._row == other._row
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((id(self._store), self._row))
+
+    def __repr__(self):
+        return f"CardView({self.to_card()!r})"
+
+    def to_card(self) -> Card:
+        """Копия карточки в виде dataclass Card"""
+        return Card(
+            verb=self.verb,
+            pronoun_index=self.pronoun_index,
+            tense=self.tense,
+            easiness_factor=self.easiness_factor,
+            interval=self.interval,
+            repetitions=self.repetitions,
+            next_review_date=self.next_review_date,
+            last_review_date=self.last_review_date,
+            total_reviews=self.total_reviews,
+            correct_reviews=self.correct_reviews
+        )
+
+
+class CardStore:
+    """
+    Колода пользователя в виде структуры массивов
+
+    Вместо словаря объектов Card каждое поле хранится в своём типизированном
+    массиве: глаголы и времена интернированы в числовые id, местоимение - int8,
+    EF - float32, интервалы, счётчики и даты (номера дней) - int32.
+    Интерфейс повторяет словарь id карточки -> карточка, значения - CardView.
+
+    Хранилище отслеживает изменившиеся карточки: добавленные через add,
+    записанные через CardView или __setitem__ и обновленные пакетно. Строки,
+    загруженные через add_row, считаются сохраненными. Слой хранения берет
+    dirty_ids() и после записи вызывает clear_dirty().
+    """
+
+    COLUMNS = (
+        'card_id', 'verb_id', 'tense_id', 'pronoun', 'easiness', 'interval',
+        'repetitions', 'next_day', 'last_day', 'total_reviews', 'correct_reviews'
+    )
+
+    def __init__(self):
+        self.verbs: List[str] = []
+        self.tenses: List[str] = []
+        self._verb_ids: Dict[str, int] = {}
+        self._tense_ids: Dict[str, int] = {}
+
+        self._rows: Dict[int, int] = {}  # id карточки -> строка
+        self._dirty_rows: Dict[int, None] = {}  # изменившиеся строки в порядке изменения
+
+        self.card_id = array('i')
+        self.verb_id = array('h')
+        self.tense_id = array('b')
+        self.pronoun = array('b')
+        self.easiness = array('f')
+        self.interval = array('i')
+        self.repetitions = array('i')
+        self.next_day = array('i')
+        self.last_day = array('i')
+        self.total_reviews = array('i')
+        self.correct_reviews = array('i')
+
+    def __len__(self) -> int:
+        return len(self.card_id)
+
+    def __contains__(self, card_id: int) -> bool:
+        return card_id in self._rows
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.card_id)
+
+    def __getitem__(self, card_id: int) -> CardView:
+        return CardView(self, self._rows[card_id])
+
+    def __setitem__(self, card_id: int, card) -> None:
+        row = self._rows.get(card_id)
+        if row is None:
+            self.add(card_id, card)
+        elif not (isinstance(card, CardView) and card._store is self and card._row == row):
+            self._write(row, card)
+
+    def get(self, card_id: int, default=None) -> Optional[CardView]:
+        row = self._rows.get(card_id)
+        return CardView(self, row) if row is not None else default
+
+    def row_of(self, card_id: int) -> int:
+        """Номер строки карточки в колонках"""
+        return self._rows[card_id]
+
+    @property
+    def dirty_count(self) -> int:
+        """Количество несохраненных карточек"""
+        return len(self._dirty_rows)
+
+    def dirty_ids(self) -> List[int]:
+        """Id несохраненных карточек"""
+        return [self.card_id[row] for row in self._dirty_rows]
+
+    def mark_dirty(self, card_id: int) -> None:
+        """Помечает карточку как изменившуюся"""
+        self._dirty_rows[self._rows[card_id]] = None
+
+    def mark_rows_dirty(self, rows: Iterable[int]) -> None:
+        """Помечает строки как изменившиеся (для пакетных обновлений колонок)"""
+        self._dirty_rows.update(dict.fromkeys(rows))
+
+    def clear_dirty(self, card_ids: Optional[Iterable[int]] = None) -> None:
+        """Снимает пометку с сохраненных карточек (по умолчанию со всех)"""
+        if card_ids is None:
+            self._dirty_rows.clear()
+            return
+        for card_id in card_ids:
+            self._dirty_rows.pop(self._rows[card_id], None)
+
+    def keys(self) -> List[int]:
+        return self.card_id.tolist()
+
+    def values(self) -> Iterator[CardView]:
+        return (CardView(self, row) for row in range(len(self.card_id)))
+
+    def items(self) -> Iterator[Tuple[int, CardView]]:
+        return ((card_id, CardView(self, row)) for row, card_id in enumerate(self.card_id))
+
+    def add(self, card_id: int, card) -> CardView:
+        """Добавляет карточку (Card или любой объект с теми же полями)"""
+        row = self.add_row(
+            card_id, card.verb, card.pronoun_index, card.tense,
+            card.easiness_factor, card.interval, card.repetitions,
+            iso_to_day(card.next_review_date), iso_to_day(card.last_review_date),
+            card.total_reviews, card.correct_reviews
+        )
+        self._dirty_rows[row] = None
+        return CardView(self, row)
+
+    def add_row(
+        self,
+        card_id: int,
+        verb: str,
+        pronoun_index: int,
+        tense: str,
+        easiness: float,
+        interval: int,
+        repetitions: int,
+        next_day: int,
+        last_day: int,
+        total_reviews: int,
+        correct_reviews: int
+    ) -> int:
+        """Добавляет карточку из значений колонок (даты - номера дней) и возвращает строку"""
+        if card_id in self._rows:
+            raise KeyError(f"card {card_id} already exists")
+
+        row = len(self.card_id)
+        self._rows[card_id] = row
+        self.card_id.append(card_id)
+
+        self.verb_id.append(self._intern(verb, self.verbs, self._verb_ids))
+        self.tense_id.append(self._intern(tense, self.tenses, self._tense_ids))
+        self.pronoun.append(pronoun_index)
+        self.easiness.append(easiness)
+        self.interval.append(interval)
+        self.repetitions.append(repetitions)
+        self.next_day.append(next_day)
+        self.last_day.append(last_day)
+        self.total_reviews.append(total_reviews)
+        self.correct_reviews.append(correct_reviews)
+        return row
+
+    def replace_row(
+        self,
+        card_id: int,
+        easiness: float,
+        interval: int,
+        repetitions: int,
+        next_day: int,
+        last_day: int,
+        total_reviews: int,
+        correct_reviews: int
+    ) -> None:
+        """Перезаписывает значения карточки из базы (как add_row, карточка считается сохраненной)"""
+        row = self._rows[card_id]
+        self.easiness[row] = easiness
+        self.interval[row] = interval
+        self.repetitions[row] = repetitions
+        self.next_day[row] = next_day
+        self.last_day[row] = last_day
+        self.total_reviews[row] = total_reviews
+        self.correct_reviews[row] = correct_reviews
+        self._dirty_rows.pop(row, None)
+
+    def intern(self, verbs: Iterable[str], tenses: Iterable[str]) -> Tuple[List[int], List[int]]:
+        """Номера глаголов и времён в таблицах колоды (недостающие добавляются)"""
+        return (
+            [self._intern(verb, self.verbs, self._verb_ids) for verb in verbs],
+            [self._intern(tense, self.tenses, self._tense_ids) for tense in tenses]
+        )
+
+    def extend_columns(self, columns: Dict[str, array]) -> None:
+        """
+        Добавляет строки сразу колонками (быстрый путь для загрузки из файла)
+
+        Args:
+            columns: Массивы для каждого имени из COLUMNS с теми же typecode и
+                одинаковой длины; verb_id и tense_id - номера из intern()
+        """
+        card_ids = columns['card_id']
+        rows = dict(zip(card_ids, range(len(self.card_id), len(self.card_id) + len(card_ids))))
+        if len(rows) != len(card_ids) or not self._rows.keys().isdisjoint(rows):
+            raise KeyError("duplicate card ids")
+
+        self._rows.update(rows)
+        for name in self.COLUMNS:
+            getattr(self, name).extend(columns[name])
+
+    def copy(self) -> 'CardStore':
+        """Независимая копия колоды (например, для снимка)"""
+        clone = CardStore()
+        clone.verbs = list(self.verbs)
+        clone.tenses = list(self.tenses)
+        clone._verb_ids = dict(self._verb_ids)
+        clone._tense_ids = dict(self._tense_ids)
+        clone._rows = dict(self._rows)
+        clone._dirty_rows = dict(self._dirty_rows)
+        for name in self.COLUMNS:
+            setattr(clone, name, getattr(self, name)[:])
+        return clone
+
+    def nbytes(self) -> int:
+        """Объём данных в колонках (без словаря id -> строка)"""
+        return sum(
+            getattr(self, name).itemsize * len(getattr(self, name)) for name in self.COLUMNS
+        )
+
+    def _write(self, row: int, card) -> None:
+        self.easiness[row] = card.easiness_factor
+        self.interval[row] = card.interval
+        self.repetitions[row] = card.repetitions
+        self.next_day[row] = iso_to_day(card.next_review_date)
+        self.last_day[row] = iso_to_day(card.last_review_date)
+        self.total_reviews[row] = card.total_reviews
+        self.correct_reviews[row] = card.correct_reviews
+        self._dirty_rows[row] = None
+
+    @staticmethod
+    def _intern(name: str, names: List[str], ids: Dict[str, int]) -> int:
+        name_id = ids.get(name)
+        if name_id is None:
+            name_id = ids[name] = len(names)
+            names.append(name)
+        return name_id
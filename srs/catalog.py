@@ -0,0 +1,496 @@
+# srs/catalog.py
+"""
+Каталог глаголов, местоимений и спряжений
+
+Данные неизменны во время работы, поэтому каталог собирается один раз
+на процесс (build_catalog) и делится всеми сессиями только для чтения.
+"""
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Tuple
+
+# Расширенная база данных глаголов (100 самых популярных)
+VERBS = {
+    # Топ 30 - самые основные
+    'ser': {'type': 'irregular', 'level': 1, 'difficulty': 'hard'},
+    'estar': {'type': 'irregular', 'level': 1, 'difficulty': 'hard'},
+    'tener': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
+    'hacer': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
+    'decir': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
+    'ir': {'type': 'irregular', 'level': 1, 'difficulty': 'hard'},
+    'ver': {'type': 'irregular', 'level': 1, 'difficulty': 'easy'},
+    'dar': {'type': 'irregular', 'level': 1, 'difficulty': 'easy'},
+    'saber': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
+    'querer': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
+    'poder': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
+    'venir': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
+    'hablar': {'type': 'regular-ar', 'level': 1, 'difficulty': 'easy'},
+    'vivir': {'type': 'regular-ir', 'level': 1, 'difficulty': 'easy'},
+    'comer': {'type': 'regular-er', 'level': 1, 'difficulty': 'easy'},
+    'trabajar': {'type': 'regular-ar', 'level': 1, 'difficulty': 'easy'},
+    'estudiar': {'type': 'regular-ar', 'level': 1, 'difficulty': 'easy'},
+    'llegar': {'type': 'regular-ar', 'level': 1, 'difficulty': 'easy'},
+    'pasar': {'type': 'regular-ar', 'level': 1, 'difficulty': 'easy'},
+    'encontrar': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
+    'llamar': {'type': 'regular-ar', 'level': 1, 'difficulty': 'easy'},
+    'pensar': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
+    'salir': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
+    'poner': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
+    'seguir': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
+    'llevar': {'type': 'regular-ar', 'level': 1, 'difficulty': 'easy'},
+    'dejar': {'type': 'regular-ar', 'level': 1, 'difficulty': 'easy'},
+    'parecer': {'type': 'irregular', 'level': 1, 'difficulty': 'medium'},
+    'quedar': {'type': 'regular-ar', 'level': 1, 'difficulty': 'easy'},
+    'creer': {'type': 'regular-er', 'level': 1, 'difficulty': 'easy'},
+    
+    # Топ 31-50 - популярные глаголы
+    'conocer': {'type': 'irregular', 'level': 2, 'difficulty': 'medium'},
+    'sentir': {'type': 'irregular', 'level': 2, 'difficulty': 'medium'},
+    'deber': {'type': 'regular-er', 'level': 2, 'difficulty': 'easy'},
+    'entrar': {'type': 'regular-ar', 'level': 2, 'difficulty': 'easy'},
+    'escribir': {'type': 'irregular', 'level': 2, 'difficulty': 'medium'},
+    'leer': {'type': 'irregular', 'level': 2, 'difficulty': 'medium'},
+    'beber': {'type': 'regular-er', 'level': 2, 'difficulty': 'easy'},
+    'comprar': {'type': 'regular-ar', 'level': 2, 'difficulty': 'easy'},
+    'abrir': {'type': 'irregular', 'level': 2, 'difficulty': 'medium'},
+    'cerrar': {'type': 'irregular', 'level': 2, 'difficulty': 'medium'},
+    'empezar': {'type': 'irregular', 'level': 2, 'difficulty': 'medium'},
+    'terminar': {'type': 'regular-ar', 'level': 2, 'difficulty': 'easy'},
+    'buscar': {'type': 'regular-ar', 'level': 2, 'difficulty': 'easy'},
+    'entender': {'type': 'irregular', 'level': 2, 'difficulty': 'medium'},
+    'escuchar': {'type': 'regular-ar', 'level': 2, 'difficulty': 'easy'},
+    'mirar': {'type': 'regular-ar', 'level': 2, 'difficulty': 'easy'},
+    'usar': {'type': 'regular-ar', 'level': 2, 'difficulty': 'easy'},
+    'ayudar': {'type': 'regular-ar', 'level': 2, 'difficulty': 'easy'},
+    'necesitar': {'type': 'regular-ar', 'level': 2, 'difficulty': 'easy'},
+    'preguntar': {'type': 'regular-ar', 'level': 2, 'difficulty': 'easy'},
+    
+    # Топ 51-80 - дополнительные популярные глаголы
+    'responder': {'type': 'regular-er', 'level': 3, 'difficulty': 'easy'},
+    'jugar': {'type': 'irregular', 'level': 3, 'difficulty': 'medium'},
+    'dormir': {'type': 'irregular', 'level': 3, 'difficulty': 'medium'},
+    'ganar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
+    'perder': {'type': 'irregular', 'level': 3, 'difficulty': 'medium'},
+    'amar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
+    'cantar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
+    'bailar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
+    'tocar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
+    'cambiar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
+    'mover': {'type': 'irregular', 'level': 3, 'difficulty': 'medium'},
+    'caminar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
+    'correr': {'type': 'regular-er', 'level': 3, 'difficulty': 'easy'},
+    'subir': {'type': 'regular-ir', 'level': 3, 'difficulty': 'easy'},
+    'bajar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
+    'explicar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
+    'recordar': {'type': 'irregular', 'level': 3, 'difficulty': 'medium'},
+    'olvidar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
+    'aprender': {'type': 'regular-er', 'level': 3, 'difficulty': 'easy'},
+    'enseñar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
+    'viajar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
+    'volar': {'type': 'irregular', 'level': 3, 'difficulty': 'medium'},
+    'conducir': {'type': 'irregular', 'level': 3, 'difficulty': 'hard'},
+    'cocinar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
+    'lavar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
+    'limpiar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
+    'construir': {'type': 'irregular', 'level': 3, 'difficulty': 'medium'},
+    'romper': {'type': 'irregular', 'level': 3, 'difficulty': 'medium'},
+    'crear': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
+    'imaginar': {'type': 'regular-ar', 'level': 3, 'difficulty': 'easy'},
+    
+    # Топ 81-100 - расширенный словарь
+    'soñar': {'type': 'irregular', 'level': 4, 'difficulty': 'medium'},
+    'despertar': {'type': 'irregular', 'level': 4, 'difficulty': 'medium'},
+    'levantar': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
+    'sentar': {'type': 'irregular', 'level': 4, 'difficulty': 'medium'},
+    'acostar': {'type': 'irregular', 'level': 4, 'difficulty': 'medium'},
+    'vestir': {'type': 'irregular', 'level': 4, 'difficulty': 'medium'},
+    'casar': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
+    'nacer': {'type': 'irregular', 'level': 4, 'difficulty': 'medium'},
+    'morir': {'type': 'irregular', 'level': 4, 'difficulty': 'hard'},
+    'reír': {'type': 'irregular', 'level': 4, 'difficulty': 'medium'},
+    'llorar': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
+    'gritar': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
+    'susurrar': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
+    'cuidar': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
+    'odiar': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
+    'manejar': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
+    'reparar': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
+    'duchar': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
+    'divorciarse': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'},
+    'levantarse': {'type': 'regular-ar', 'level': 4, 'difficulty': 'easy'}
+}
+
+PRONOUNS = ['yo', 'tú', 'él/ella', 'nosotros', 'vosotros', 'ellos/ellas']
+
+# Расширенные спряжения (добавлены новые глаголы)
+CONJUGATIONS = {
+    'presente': {
+        # Основные глаголы (1-30)
+        'ser': ['soy', 'eres', 'es', 'somos', 'sois', 'son'],
+        'estar': ['estoy', 'estás', 'está', 'estamos', 'estáis', 'están'],
+        'tener': ['tengo', 'tienes', 'tiene', 'tenemos', 'tenéis', 'tienen'],
+        'hacer': ['hago', 'haces', 'hace', 'hacemos', 'hacéis', 'hacen'],
+        'decir': ['digo', 'dices', 'dice', 'decimos', 'decís', 'dicen'],
+        'ir': ['voy', 'vas', 'va', 'vamos', 'vais', 'van'],
+        'ver': ['veo', 'ves', 've', 'vemos', 'veis', 'ven'],
+        'dar': ['doy', 'das', 'da', 'damos', 'dais', 'dan'],
+        'saber': ['sé', 'sabes', 'sabe', 'sabemos', 'sabéis', 'saben'],
+        'querer': ['quiero', 'quieres', 'quiere', 'queremos', 'queréis', 'quieren'],
+        'poder': ['puedo', 'puedes', 'puede', 'podemos', 'podéis', 'pueden'],
+        'venir': ['vengo', 'vienes', 'viene', 'venimos', 'venís', 'vienen'],
+        'hablar': ['hablo', 'hablas', 'habla', 'hablamos', 'habláis', 'hablan'],
+        'vivir': ['vivo', 'vives', 'vive', 'vivimos', 'vivís', 'viven'],
+        'comer': ['como', 'comes', 'come', 'comemos', 'coméis', 'comen'],
+        'trabajar': ['trabajo', 'trabajas', 'trabaja', 'trabajamos', 'trabajáis', 'trabajan'],
+        'estudiar': ['estudio', 'estudias', 'estudia', 'estudiamos', 'estudiáis', 'estudian'],
+        'llegar': ['llego', 'llegas', 'llega', 'llegamos', 'llegáis', 'llegan'],
+        'pasar': ['paso', 'pasas', 'pasa', 'pasamos', 'pasáis', 'pasan'],
+        'encontrar': ['encuentro', 'encuentras', 'encuentra', 'encontramos', 'encontráis', 'encuentran'],
+        'llamar': ['llamo', 'llamas', 'llama', 'llamamos', 'llamáis', 'llaman'],
+        'pensar': ['pienso', 'piensas', 'piensa', 'pensamos', 'pensáis', 'piensan'],
+        'salir': ['salgo', 'sales', 'sale', 'salimos', 'salís', 'salen'],
+        'poner': ['pongo', 'pones', 'pone', 'ponemos', 'ponéis', 'ponen'],
+        'seguir': ['sigo', 'sigues', 'sigue', 'seguimos', 'seguís', 'siguen'],
+        'llevar': ['llevo', 'llevas', 'lleva', 'llevamos', 'lleváis', 'llevan'],
+        'dejar': ['dejo', 'dejas', 'deja', 'dejamos', 'dejáis', 'dejan'],
+        'parecer': ['parezco', 'pareces', 'parece', 'parecemos', 'parecéis', 'parecen'],
+        'quedar': ['quedo', 'quedas', 'queda', 'quedamos', 'quedáis', 'quedan'],
+        'creer': ['creo', 'crees', 'cree', 'creemos', 'creéis', 'creen'],
+        
+        # Глаголы 31-50
+        'conocer': ['conozco', 'conoces', 'conoce', 'conocemos', 'conocéis', 'conocen'],
+        'sentir': ['siento', 'sientes', 'siente', 'sentimos', 'sentís', 'sienten'],
+        'deber': ['debo', 'debes', 'debe', 'debemos', 'debéis', 'deben'],
+        'entrar': ['entro', 'entras', 'entra', 'entramos', 'entráis', 'entran'],
+        'escribir': ['escribo', 'escribes', 'escribe', 'escribimos', 'escribís', 'escriben'],
+        'leer': ['leo', 'lees', 'lee', 'leemos', 'leéis', 'leen'],
+        'beber': ['bebo', 'bebes', 'bebe', 'bebemos', 'bebéis', 'beben'],
+        'comprar': ['compro', 'compras', 'compra', 'compramos', 'compráis', 'compran'],
+        'abrir': ['abro', 'abres', 'abre', 'abrimos', 'abrís', 'abren'],
+        'cerrar': ['cierro', 'cierras', 'cierra', 'cerramos', 'cerráis', 'cierran'],
+        'empezar': ['empiezo', 'empiezas', 'empieza', 'empezamos', 'empezáis', 'empiezan'],
+        'terminar': ['termino', 'terminas', 'termina', 'terminamos', 'termináis', 'terminan'],
+        'buscar': ['busco', 'buscas', 'busca', 'buscamos', 'buscáis', 'buscan'],
+        'entender': ['entiendo', 'entiendes', 'entiende', 'entendemos', 'entendéis', 'entienden'],
+        'escuchar': ['escucho', 'escuchas', 'escucha', 'escuchamos', 'escucháis', 'escuchan'],
+        'mirar': ['miro', 'miras', 'mira', 'miramos', 'miráis', 'miran'],
+        'usar': ['uso', 'usas', 'usa', 'usamos', 'usáis', 'usan'],
+        'ayudar': ['ayudo', 'ayudas', 'ayuda', 'ayudamos', 'ayudáis', 'ayudan'],
+        'necesitar': ['necesito', 'necesitas', 'necesita', 'necesitamos', 'necesitáis', 'necesitan'],
+        'preguntar': ['pregunto', 'preguntas', 'pregunta', 'preguntamos', 'preguntáis', 'preguntan'],
+        
+        # Глаголы 51-80
+        'responder': ['respondo', 'respondes', 'responde', 'respondemos', 'respondéis', 'responden'],
+        'jugar': ['juego', 'juegas', 'juega', 'jugamos', 'jugáis', 'juegan'],
+        'dormir': ['duermo', 'duermes', 'duerme', 'dormimos', 'dormís', 'duermen'],
+        'ganar': ['gano', 'ganas', 'gana', 'ganamos', 'ganáis', 'ganan'],
+        'perder': ['pierdo', 'pierdes', 'pierde', 'perdemos', 'perdéis', 'pierden'],
+        'amar': ['amo', 'amas', 'ama', 'amamos', 'amáis', 'aman'],
+        'cantar': ['canto', 'cantas', 'canta', 'cantamos', 'cantáis', 'cantan'],
+        'bailar': ['bailo', 'bailas', 'baila', 'bailamos', 'bailáis', 'bailan'],
+        'tocar': ['toco', 'tocas', 'toca', 'tocamos', 'tocáis', 'tocan'],
+        'cambiar': ['cambio', 'cambias', 'cambia', 'cambiamos', 'cambiáis', 'cambian'],
+        'mover': ['muevo', 'mueves', 'mueve', 'movemos', 'movéis', 'mueven'],
+        'caminar': ['camino', 'caminas', 'camina', 'caminamos', 'camináis', 'caminan'],
+        'correr': ['corro', 'corres', 'corre', 'corremos', 'corréis', 'corren'],
+        'subir': ['subo', 'subes', 'sube', 'subimos', 'subís', 'suben'],
+        'bajar': ['bajo', 'bajas', 'baja', 'bajamos', 'bajáis', 'bajan'],
+        'explicar': ['explico', 'explicas', 'explica', 'explicamos', 'explicáis', 'explican'],
+        'recordar': ['recuerdo', 'recuerdas', 'recuerda', 'recordamos', 'recordáis', 'recuerdan'],
+        'olvidar': ['olvido', 'olvidas', 'olvida', 'olvidamos', 'olvidáis', 'olvidan'],
+        'aprender': ['aprendo', 'aprendes', 'aprende', 'aprendemos', 'aprendéis', 'aprenden'],
+        'enseñar': ['enseño', 'enseñas', 'enseña', 'enseñamos', 'enseñáis', 'enseñan'],
+        'viajar': ['viajo', 'viajas', 'viaja', 'viajamos', 'viajáis', 'viajan'],
+        'volar': ['vuelo', 'vuelas', 'vuela', 'volamos', 'voláis', 'vuelan'],
+        'conducir': ['conduzco', 'conduces', 'conduce', 'conducimos', 'conducís', 'conducen'],
+        'cocinar': ['cocino', 'cocinas', 'cocina', 'cocinamos', 'cocináis', 'cocinan'],
+        'lavar': ['lavo', 'lavas', 'lava', 'lavamos', 'laváis', 'lavan'],
+        'limpiar': ['limpio', 'limpias', 'limpia', 'limpiamos', 'limpiáis', 'limpian'],
+        'construir': ['construyo', 'construyes', 'construye', 'construimos', 'construís', 'construyen'],
+        'romper': ['rompo', 'rompes', 'rompe', 'rompemos', 'rompéis', 'rompen'],
+        'crear': ['creo', 'creas', 'crea', 'creamos', 'creáis', 'crean'],
+        'imaginar': ['imagino', 'imaginas', 'imagina', 'imaginamos', 'imagináis', 'imaginan'],
+        
+        # Глаголы 81-100
+        'soñar': ['sueño', 'sueñas', 'sueña', 'soñamos', 'soñáis', 'sueñan'],
+        'despertar': ['despierto', 'despiertas', 'despierta', 'despertamos', 'despertáis', 'despiertan'],
+        'levantar': ['levanto', 'levantas', 'levanta', 'levantamos', 'levantáis', 'levantan'],
+        'sentar': ['siento', 'sientas', 'sienta', 'sentamos', 'sentáis', 'sientan'],
+        'acostar': ['acuesto', 'acuestas', 'acuesta', 'acostamos', 'acostáis', 'acuestan'],
+        'vestir': ['visto', 'vistes', 'viste', 'vestimos', 'vestís', 'visten'],
+        'casar': ['caso', 'casas', 'casa', 'casamos', 'casáis', 'casan'],
+        'nacer': ['nazco', 'naces', 'nace', 'nacemos', 'nacéis', 'nacen'],
+        'morir': ['muero', 'mueres', 'muere', 'morimos', 'morís', 'mueren'],
+        'reír': ['río', 'ríes', 'ríe', 'reímos', 'reís', 'ríen'],
+        'llorar': ['lloro', 'lloras', 'llora', 'lloramos', 'lloráis', 'lloran'],
+        'gritar': ['grito', 'gritas', 'grita', 'gritamos', 'gritáis', 'gritan'],
+        'susurrar': ['susurro', 'susurras', 'susurra', 'susurramos', 'susurráis', 'susurran'],
+        'cuidar': ['cuido', 'cuidas', 'cuida', 'cuidamos', 'cuidáis', 'cuidan'],
+        'odiar': ['odio', 'odias', 'odia', 'odiamos', 'odiáis', 'odian'],
+        'manejar': ['manejo', 'manejas', 'maneja', 'manejamos', 'manejáis', 'manejan'],
+        'reparar': ['reparo', 'reparas', 'repara', 'reparamos', 'reparáis', 'reparan'],
+        'duchar': ['ducho', 'duchas', 'ducha', 'duchamos', 'ducháis', 'duchan'],
+        'divorciarse': ['me divorcio', 'te divorcias', 'se divorcia', 'nos divorciamos', 'os divorciáis', 'se divorcian'],
+        'levantarse': ['me levanto', 'te levantas', 'se levanta', 'nos levantamos', 'os levantáis', 'se levantan']
+    },
+    'indefinido': {
+        # Основные глаголы (1-30)
+        'ser': ['fui', 'fuiste', 'fue', 'fuimos', 'fuisteis', 'fueron'],
+        'estar': ['estuve', 'estuviste', 'estuvo', 'estuvimos', 'estuvisteis', 'estuvieron'],
+        'tener': ['tuve', 'tuviste', 'tuvo', 'tuvimos', 'tuvisteis', 'tuvieron'],
+        'hacer': ['hice', 'hiciste', 'hizo', 'hicimos', 'hicisteis', 'hicieron'],
+        'decir': ['dije', 'dijiste', 'dijo', 'dijimos', 'dijisteis', 'dijeron'],
+        'ir': ['fui', 'fuiste', 'fue', 'fuimos', 'fuisteis', 'fueron'],
+        'ver': ['vi', 'viste', 'vio', 'vimos', 'visteis', 'vieron'],
+        'dar': ['di', 'diste', 'dio', 'dimos', 'disteis', 'dieron'],
+        'saber': ['supe', 'supiste', 'supo', 'supimos', 'supisteis', 'supieron'],
+        'querer': ['quise', 'quisiste', 'quiso', 'quisimos', 'quisisteis', 'quisieron'],
+        'poder': ['pude', 'pudiste', 'pudo', 'pudimos', 'pudisteis', 'pudieron'],
+        'venir': ['vine', 'viniste', 'vino', 'vinimos', 'vinisteis', 'vinieron'],
+        'hablar': ['hablé', 'hablaste', 'habló', 'hablamos', 'hablasteis', 'hablaron'],
+        'vivir': ['viví', 'viviste', 'vivió', 'vivimos', 'vivisteis', 'vivieron'],
+        'comer': ['comí', 'comiste', 'comió', 'comimos', 'comisteis', 'comieron'],
+        'trabajar': ['trabajé', 'trabajaste', 'trabajó', 'trabajamos', 'trabajasteis', 'trabajaron'],
+        'estudiar': ['estudié', 'estudiaste', 'estudió', 'estudiamos', 'estudiasteis', 'estudiaron'],
+        'llegar': ['llegué', 'llegaste', 'llegó', 'llegamos', 'llegasteis', 'llegaron'],
+        'pasar': ['pasé', 'pasaste', 'pasó', 'pasamos', 'pasasteis', 'pasaron'],
+        'encontrar': ['encontré', 'encontraste', 'encontró', 'encontramos', 'encontrasteis', 'encontraron'],
+        'llamar': ['llamé', 'llamaste', 'llamó', 'llamamos', 'llamasteis', 'llamaron'],
+        'pensar': ['pensé', 'pensaste', 'pensó', 'pensamos', 'pensasteis', 'pensaron'],
+        'salir': ['salí', 'saliste', 'salió', 'salimos', 'salisteis', 'salieron'],
+        'poner': ['puse', 'pusiste', 'puso', 'pusimos', 'pusisteis', 'pusieron'],
+        'seguir': ['seguí', 'seguiste', 'siguió', 'seguimos', 'seguisteis', 'siguieron'],
+        'llevar': ['llevé', 'llevaste', 'llevó', 'llevamos', 'llevasteis', 'llevaron'],
+        'dejar': ['dejé', 'dejaste', 'dejó', 'dejamos', 'dejasteis', 'dejaron'],
+        'parecer': ['parecí', 'pareciste', 'pareció', 'parecimos', 'parecisteis', 'parecieron'],
+        'quedar': ['quedé', 'quedaste', 'quedó', 'quedamos', 'quedasteis', 'quedaron'],
+        'creer': ['creí', 'creíste', 'creyó', 'creímos', 'creísteis', 'creyeron'],
+        
+        # Глаголы 31-50
+        'conocer': ['conocí', 'conociste', 'conoció', 'conocimos', 'conocisteis', 'conocieron'],
+        'sentir': ['sentí', 'sentiste', 'sintió', 'sentimos', 'sentisteis', 'sintieron'],
+        'deber': ['debí', 'debiste', 'debió', 'debimos', 'debisteis', 'debieron'],
+        'entrar': ['entré', 'entraste', 'entró', 'entramos', 'entrasteis', 'entraron'],
+        'escribir': ['escribí', 'escribiste', 'escribió', 'escribimos', 'escribisteis', 'escribieron'],
+        'leer': ['leí', 'leíste', 'leyó', 'leímos', 'leísteis', 'leyeron'],
+        'beber': ['bebí', 'bebiste', 'bebió', 'bebimos', 'bebisteis', 'bebieron'],
+        'comprar': ['compré', 'compraste', 'compró', 'compramos', 'comprasteis', 'compraron'],
+        'abrir': ['abrí', 'abriste', 'abrió', 'abrimos', 'abristeis', 'abrieron'],
+        'cerrar': ['cerré', 'cerraste', 'cerró', 'cerramos', 'cerrasteis', 'cerraron'],
+        'empezar': ['empecé', 'empezaste', 'empezó', 'empezamos', 'empezasteis', 'empezaron'],
+        'terminar': ['terminé', 'terminaste', 'terminó', 'terminamos', 'terminasteis', 'terminaron'],
+        'buscar': ['busqué', 'buscaste', 'buscó', 'buscamos', 'buscasteis', 'buscaron'],
+        'entender': ['entendí', 'entendiste', 'entendió', 'entendimos', 'entendisteis', 'entendieron'],
+        'escuchar': ['escuché', 'escuchaste', 'escuchó', 'escuchamos', 'escuchasteis', 'escucharon'],
+        'mirar': ['miré', 'miraste', 'miró', 'miramos', 'mirasteis', 'miraron'],
+        'usar': ['usé', 'usaste', 'usó', 'usamos', 'usasteis', 'usaron'],
+        'ayudar': ['ayudé', 'ayudaste', 'ayudó', 'ayudamos', 'ayudasteis', 'ayudaron'],
+        'necesitar': ['necesité', 'necesitaste', 'necesitó', 'necesitamos', 'necesitasteis', 'necesitaron'],
+        'preguntar': ['pregunté', 'preguntaste', 'preguntó', 'preguntamos', 'preguntasteis', 'preguntaron'],
+        
+        # Глаголы 51-80
+        'responder': ['respondí', 'respondiste', 'respondió', 'respondimos', 'respondisteis', 'respondieron'],
+        'jugar': ['jugué', 'jugaste', 'jugó', 'jugamos', 'jugasteis', 'jugaron'],
+        'dormir': ['dormí', 'dormiste', 'durmió', 'dormimos', 'dormisteis', 'durmieron'],
+        'ganar': ['gané', 'ganaste', 'ganó', 'ganamos', 'ganasteis', 'ganaron'],
+        'perder': ['perdí', 'perdiste', 'perdió', 'perdimos', 'perdisteis', 'perdieron'],
+        'amar': ['amé', 'amaste', 'amó', 'amamos', 'amasteis', 'amaron'],
+        'cantar': ['canté', 'cantaste', 'cantó', 'cantamos', 'cantasteis', 'cantaron'],
+        'bailar': ['bailé', 'bailaste', 'bailó', 'bailamos', 'bailasteis', 'bailaron'],
+        'tocar': ['toqué', 'tocaste', 'tocó', 'tocamos', 'tocasteis', 'tocaron'],
+        'cambiar': ['cambié', 'cambiaste', 'cambió', 'cambiamos', 'cambiasteis', 'cambiaron'],
+        'mover': ['moví', 'moviste', 'movió', 'movimos', 'movisteis', 'movieron'],
+        'caminar': ['caminé', 'caminaste', 'caminó', 'caminamos', 'caminasteis', 'caminaron'],
+        'correr': ['corrí', 'corriste', 'corrió', 'corrimos', 'corristeis', 'corrieron'],
+        'subir': ['subí', 'subiste', 'subió', 'subimos', 'subisteis', 'subieron'],
+        'bajar': ['bajé', 'bajaste', 'bajó', 'bajamos', 'bajasteis', 'bajaron'],
+        'explicar': ['expliqué', 'explicaste', 'explicó', 'explicamos', 'explicasteis', 'explicaron'],
+        'recordar': ['recordé', 'recordaste', 'recordó', 'recordamos', 'recordasteis', 'recordaron'],
+        'olvidar': ['olvidé', 'olvidaste', 'olvidó', 'olvidamos', 'olvidasteis', 'olvidaron'],
+        'aprender': ['aprendí', 'aprendiste', 'aprendió', 'aprendimos', 'aprendisteis', 'aprendieron'],
+        'enseñar': ['enseñé', 'enseñaste', 'enseñó', 'enseñamos', 'enseñasteis', 'enseñaron'],
+        'viajar': ['viajé', 'viajaste', 'viajó', 'viajamos', 'viajasteis', 'viajaron'],
+        'volar': ['volé', 'volaste', 'voló', 'volamos', 'volasteis', 'volaron'],
+        'conducir': ['conduje', 'condujiste', 'condujo', 'condujimos', 'condujisteis', 'condujeron'],
+        'cocinar': ['cociné', 'cocinaste', 'cocinó', 'cocinamos', 'cocinasteis', 'cocinaron'],
+        'lavar': ['lavé', 'lavaste', 'lavó', 'lavamos', 'lavasteis', 'lavaron'],
+        'limpiar': ['limpié', 'limpiaste', 'limpió', 'limpiamos', 'limpiasteis', 'limpiaron'],
+        'construir': ['construí', 'construiste', 'construyó', 'construimos', 'construisteis', 'construyeron'],
+        'romper': ['rompí', 'rompiste', 'rompió', 'rompimos', 'rompisteis', 'rompieron'],
+        'crear': ['creé', 'creaste', 'creó', 'creamos', 'creasteis', 'crearon'],
+        'imaginar': ['imaginé', 'imaginaste', 'imaginó', 'imaginamos', 'imaginasteis', 'imaginaron'],
+        
+        # Глаголы 81-100
+        'soñar': ['soñé', 'soñaste', 'soñó', 'soñamos', 'soñasteis', 'soñaron'],
+        'despertar': ['desperté', 'despertaste', 'despertó', 'despertamos', 'despertasteis', 'despertaron'],
+        'levantar': ['levanté', 'levantaste', 'levantó', 'levantamos', 'levantasteis', 'levantaron'],
+        'sentar': ['senté', 'sentaste', 'sentó', 'sentamos', 'sentasteis', 'sentaron'],
+        'acostar': ['acosté', 'acostaste', 'acostó', 'acostamos', 'acostasteis', 'acostaron'],
+        'vestir': ['vestí', 'vestiste', 'vistió', 'vestimos', 'vestisteis', 'vistieron'],
+        'casar': ['casé', 'casaste', 'casó', 'casamos', 'casasteis', 'casaron'],
+        'nacer': ['nací', 'naciste', 'nació', 'nacimos', 'nacisteis', 'nacieron'],
+        'morir': ['morí', 'moriste', 'murió', 'morimos', 'moristeis', 'murieron'],
+        'reír': ['reí', 'reíste', 'rió', 'reímos', 'reísteis', 'rieron'],
+        'llorar': ['lloré', 'lloraste', 'lloró', 'lloramos', 'llorasteis', 'lloraron'],
+        'gritar': ['grité', 'gritaste', 'gritó', 'gritamos', 'gritasteis', 'gritaron'],
+        'susurrar': ['susurré', 'susurraste', 'susurró', 'susurramos', 'susurrasteis', 'susurraron'],
+        'cuidar': ['cuidé', 'cuidaste', 'cuidó', 'cuidamos', 'cuidasteis', 'cuidaron'],
+        'odiar': ['odié', 'odiaste', 'odió', 'odiamos', 'odiasteis', 'odiaron'],
+        'manejar': ['manejé', 'manejaste', 'manejó', 'manejamos', 'manejasteis', 'manejaron'],
+        'reparar': ['reparé', 'reparaste', 'reparó', 'reparamos', 'reparasteis', 'repararon'],
+        'duchar': ['duché', 'duchaste', 'duchó', 'duchamos', 'duchasteis', 'ducharon'],
+        'divorciarse': ['me divorcié', 'te divorciaste', 'se divorció', 'nos divorciamos', 'os divorciasteis', 'se divorciaron'],
+        'levantarse': ['me levanté', 'te levantaste', 'se levantó', 'nos levantamos', 'os levantasteis', 'se levantaron']
+    },
+    'subjuntivo': {
+        'ser': ['sea', 'seas', 'sea', 'seamos', 'seáis', 'sean'],
+        'estar': ['esté', 'estés', 'esté', 'estemos', 'estéis', 'estén'],
+        'tener': ['tenga', 'tengas', 'tenga', 'tengamos', 'tengáis', 'tengan'],
+        'hacer': ['haga', 'hagas', 'haga', 'hagamos', 'hagáis', 'hagan'],
+        'hablar': ['hable', 'hables', 'hable', 'hablemos', 'habléis', 'hablen'],
+        'trabajar': ['trabaje', 'trabajes', 'trabaje', 'trabajemos', 'trabajéis', 'trabajen'],
+        'poder': ['pueda', 'puedas', 'pueda', 'podamos', 'podáis', 'puedan']
+    },
+    'imperfecto': {
+        # Основные глаголы (1-30)
+        'ser': ['era', 'eras', 'era', 'éramos', 'erais', 'eran'],
+        'estar': ['estaba', 'estabas', 'estaba', 'estábamos', 'estabais', 'estaban'],
+        'tener': ['tenía', 'tenías', 'tenía', 'teníamos', 'teníais', 'tenían'],
+        'hacer': ['hacía', 'hacías', 'hacía', 'hacíamos', 'hacíais', 'hacían'],
+        'decir': ['decía', 'decías', 'decía', 'decíamos', 'decíais', 'decían'],
+        'ir': ['iba', 'ibas', 'iba', 'íbamos', 'ibais', 'iban'],
+        'ver': ['veía', 'veías', 'veía', 'veíamos', 'veíais', 'veían'],
+        'dar': ['daba', 'dabas', 'daba', 'dábamos', 'dabais', 'daban'],
+        'saber': ['sabía', 'sabías', 'sabía', 'sabíamos', 'sabíais', 'sabían'],
+        'querer': ['quería', 'querías', 'quería', 'queríamos', 'queríais', 'querían'],
+        'poder': ['podía', 'podías', 'podía', 'podíamos', 'podíais', 'podían'],
+        'venir': ['venía', 'venías', 'venía', 'veníamos', 'veníais', 'venían'],
+        'hablar': ['hablaba', 'hablabas', 'hablaba', 'hablábamos', 'hablabais', 'hablaban'],
+        'vivir': ['vivía', 'vivías', 'vivía', 'vivíamos', 'vivíais', 'vivían'],
+        'comer': ['comía', 'comías', 'comía', 'comíamos', 'comíais', 'comían'],
+        'trabajar': ['trabajaba', 'trabajabas', 'trabajaba', 'trabajábamos', 'trabajabais', 'trabajaban'],
+        'estudiar': ['estudiaba', 'estudiabas', 'estudiaba', 'estudiábamos', 'estudiabais', 'estudiaban'],
+        'llegar': ['llegaba', 'llegabas', 'llegaba', 'llegábamos', 'llegabais', 'llegaban'],
+        'pasar': ['pasaba', 'pasabas', 'pasaba', 'pasábamos', 'pasabais', 'pasaban'],
+        'encontrar': ['encontraba', 'encontrabas', 'encontraba', 'encontrábamos', 'encontrabais', 'encontraban'],
+        'llamar': ['llamaba', 'llamabas', 'llamaba', 'llamábamos', 'llamabais', 'llamaban'],
+        'pensar': ['pensaba', 'pensabas', 'pensaba', 'pensábamos', 'pensabais', 'pensaban'],
+        'salir': ['salía', 'salías', 'salía', 'salíamos', 'salíais', 'salían'],
+        'poner': ['ponía', 'ponías', 'ponía', 'poníamos', 'poníais', 'ponían'],
+        'seguir': ['seguía', 'seguías', 'seguía', 'seguíamos', 'seguíais', 'seguían'],
+        'llevar': ['llevaba', 'llevabas', 'llevaba', 'llevábamos', 'llevabais', 'llevaban'],
+        'dejar': ['dejaba', 'dejabas', 'dejaba', 'dejábamos', 'dejabais', 'dejaban'],
+        'parecer': ['parecía', 'parecías', 'parecía', 'parecíamos', 'parecíais', 'parecían'],
+        'quedar': ['quedaba', 'quedabas', 'quedaba', 'quedábamos', 'quedabais', 'quedaban'],
+        'creer': ['creía', 'creías', 'creía', 'creíamos', 'creíais', 'creían'],
+        
+        # Глаголы 31-50
+        'conocer': ['conocía', 'conocías', 'conocía', 'conocíamos', 'conocíais', 'conocían'],
+        'sentir': ['sentía', 'sentías', 'sentía', 'sentíamos', 'sentíais', 'sentían'],
+        'deber': ['debía', 'debías', 'debía', 'debíamos', 'debíais', 'debían'],
+        'entrar': ['entraba', 'entrabas', 'entraba', 'entrábamos', 'entrabais', 'entraban'],
+        'escribir': ['escribía', 'escribías', 'escribía', 'escribíamos', 'escribíais', 'escribían'],
+        'leer': ['leía', 'leías', 'leía', 'leíamos', 'leíais', 'leían'],
+        'beber': ['bebía', 'bebías', 'bebía', 'bebíamos', 'bebíais', 'bebían'],
+        'comprar': ['compraba', 'comprabas', 'compraba', 'comprábamos', 'comprabais', 'compraban'],
+        'abrir': ['abría', 'abrías', 'abría', 'abríamos', 'abríais', 'abrían'],
+        'cerrar': ['cerraba', 'cerrabas', 'cerraba', 'cerrábamos', 'cerrabais', 'cerraban'],
+        'empezar': ['empezaba', 'empezabas', 'empezaba', 'empezábamos', 'empezabais', 'empezaban'],
+        'terminar': ['terminaba', 'terminabas', 'terminaba', 'terminábamos', 'terminabais', 'terminaban'],
+        'buscar': ['buscaba', 'buscabas', 'buscaba', 'buscábamos', 'buscabais', 'buscaban'],
+        'entender': ['entendía', 'entendías', 'entendía', 'entendíamos', 'entendíais', 'entendían'],
+        'escuchar': ['escuchaba', 'escuchabas', 'escuchaba', 'escuchábamos', 'escuchabais', 'escuchaban'],
+        'mirar': ['miraba', 'mirabas', 'miraba', 'mirábamos', 'mirabais', 'miraban'],
+        'usar': ['usaba', 'usabas', 'usaba', 'usábamos', 'usabais', 'usaban'],
+        'ayudar': ['ayudaba', 'ayudabas', 'ayudaba', 'ayudábamos', 'ayudabais', 'ayudaban'],
+        'necesitar': ['necesitaba', 'necesitabas', 'necesitaba', 'necesitábamos', 'necesitabais', 'necesitaban'],
+        'preguntar': ['preguntaba', 'preguntabas', 'preguntaba', 'preguntábamos', 'preguntabais', 'preguntaban'],
+        
+        # Глаголы 51-80
+        'responder': ['respondía', 'respondías', 'respondía', 'respondíamos', 'respondíais', 'respondían'],
+        'jugar': ['jugaba', 'jugabas', 'jugaba', 'jugábamos', 'jugabais', 'jugaban'],
+        'dormir': ['dormía', 'dormías', 'dormía', 'dormíamos', 'dormíais', 'dormían'],
+        'ganar': ['ganaba', 'ganabas', 'ganaba', 'ganábamos', 'ganabais', 'ganaban'],
+        'perder': ['perdía', 'perdías', 'perdía', 'perdíamos', 'perdíais', 'perdían'],
+        'amar': ['amaba', 'amabas', 'amaba', 'amábamos', 'amabais', 'amaban'],
+        'cantar': ['cantaba', 'cantabas', 'cantaba', 'cantábamos', 'cantabais', 'cantaban'],
+        'bailar': ['bailaba', 'bailabas', 'bailaba', 'bailábamos', 'bailabais', 'bailaban'],
+        'tocar': ['tocaba', 'tocabas', 'tocaba', 'tocábamos', 'tocabais', 'tocaban'],
+        'cambiar': ['cambiaba', 'cambiabas', 'cambiaba', 'cambiábamos', 'cambiabais', 'cambiaban'],
+        'mover': ['movía', 'movías', 'movía', 'movíamos', 'movíais', 'movían'],
+        'caminar': ['caminaba', 'caminabas', 'caminaba', 'caminábamos', 'caminabais', 'caminaban'],
+        'correr': ['corría', 'corrías', 'corría', 'corríamos', 'corríais', 'corrían'],
+        'subir': ['subía', 'subías', 'subía', 'subíamos', 'subíais', 'subían'],
+        'bajar': ['bajaba', 'bajabas', 'bajaba', 'bajábamos', 'bajabais', 'bajaban'],
+        'explicar': ['explicaba', 'explicabas', 'explicaba', 'explicábamos', 'explicabais', 'explicaban'],
+        'recordar': ['recordaba', 'recordabas', 'recordaba', 'recordábamos', 'recordabais', 'recordaban'],
+        'olvidar': ['olvidaba', 'olvidabas', 'olvidaba', 'olvidábamos', 'olvidabais', 'olvidaban'],
+        'aprender': ['aprendía', 'aprendías', 'aprendía', 'aprendíamos', 'aprendíais', 'aprendían'],
+        'enseñar': ['enseñaba', 'enseñabas', 'enseñaba', 'enseñábamos', 'enseñabais', 'enseñaban'],
+        'viajar': ['viajaba', 'viajabas', 'viajaba', 'viajábamos', 'viajabais', 'viajaban'],
+        'volar': ['volaba', 'volabas', 'volaba', 'volábamos', 'volabais', 'volaban'],
+        'conducir': ['conducía', 'conducías', 'conducía', 'conducíamos', 'conducíais', 'conducían'],
+        'cocinar': ['cocinaba', 'cocinabas', 'cocinaba', 'cocinábamos', 'cocinabais', 'cocinaban'],
+        'lavar': ['lavaba', 'lavabas', 'lavaba', 'lavábamos', 'lavabais', 'lavaban'],
+        'limpiar': ['limpiaba', 'limpiabas', 'limpiaba', 'limpiábamos', 'limpiabais', 'limpiaban'],
+        'construir': ['construía', 'construías', 'construía', 'construíamos', 'construíais', 'construían'],
+        'romper': ['rompía', 'rompías', 'rompía', 'rompíamos', 'rompíais', 'rompían'],
+        'crear': ['creaba', 'creabas', 'creaba', 'creábamos', 'creabais', 'creaban'],
+        'imaginar': ['imaginaba', 'imaginabas', 'imaginaba', 'imaginábamos', 'imaginabais', 'imaginaban'],
+        
+        # Глаголы 81-100
+        'soñar': ['soñaba', 'soñabas', 'soñaba', 'soñábamos', 'soñabais', 'soñaban'],
+        'despertar': ['despertaba', 'despertabas', 'despertaba', 'despertábamos', 'despertabais', 'despertaban'],
+        'levantar': ['levantaba', 'levantabas', 'levantaba', 'levantábamos', 'levantabais', 'levantaban'],
+        'sentar': ['sentaba', 'sentabas', 'sentaba', 'sentábamos', 'sentabais', 'sentaban'],
+        'acostar': ['acostaba', 'acostabas', 'acostaba', 'acostábamos', 'acostabais', 'acostaban'],
+        'vestir': ['vestía', 'vestías', 'vestía', 'vestíamos', 'vestíais', 'vestían'],
+        'casar': ['casaba', 'casabas', 'casaba', 'casábamos', 'casabais', 'casaban'],
+        'nacer': ['nacía', 'nacías', 'nacía', 'nacíamos', 'nacíais', 'nacían'],
+        'morir': ['moría', 'morías', 'moría', 'moríamos', 'moríais', 'morían'],
+        'reír': ['reía', 'reías', 'reía', 'reíamos', 'reíais', 'reían'],
+        'llorar': ['lloraba', 'llorabas', 'lloraba', 'llorábamos', 'llorabais', 'lloraban'],
+        'gritar': ['gritaba', 'gritabas', 'gritaba', 'gritábamos', 'gritabais', 'gritaban'],
+        'susurrar': ['susurraba', 'susurrabas', 'susurraba', 'susurrábamos', 'susurrabais', 'susurraban'],
+        'cuidar': ['cuidaba', 'cuidabas', 'cuidaba', 'cuidábamos', 'cuidabais', 'cuidaban'],
+        'odiar': ['odiaba', 'odiabas', 'odiaba', 'odiábamos', 'odiabais', 'odiaban'],
+        'manejar': ['manejaba', 'manejabas', 'manejaba', 'manejábamos', 'manejabais', 'manejaban'],
+        'reparar': ['reparaba', 'reparabas', 'reparaba', 'reparábamos', 'reparabais', 'reparaban'],
+        'duchar': ['duchaba', 'duchabas', 'duchaba', 'duchábamos', 'duchabais', 'duchaban'],
+        'divorciarse': ['me divorciaba', 'te divorciabas', 'se divorciaba', 'nos divorciábamos', 'os divorciabais', 'se divorciaban'],
+        'levantarse': ['me levantaba', 'te levantabas', 'se levantaba', 'nos levantábamos', 'os levantabais', 'se levantaban']
+    }
+}
+
+# Опции размера словаря
+VOCABULARY_SIZES = {
+    30: {'name': 'vocabulary_30', 'verbs': 30, 'description': 'vocab_30_desc'},
+    50: {'name': 'vocabulary_50', 'verbs': 50, 'description': 'vocab_50_desc'},
+    100: {'name': 'vocabulary_100', 'verbs': 100, 'description': 'vocab_100_desc'}
+}
+
+
+@dataclass(frozen=True)
+class Catalog:
+    verbs: Mapping[str, Mapping[str, object]]                    # глагол -> тип, уровень, сложность
+    pronouns: Tuple[str, ...]
+    conjugations: Mapping[str, Mapping[str, Tuple[str, ...]]]    # время -> глагол -> формы по местоимениям
+    vocabulary_sizes: Mapping[int, Mapping[str, object]]         # размер словаря -> ключи переводов
+
+
+def build_catalog() -> Catalog:
+    """Неизменяемые представления каталога: словари только для чтения и кортежи форм"""
+    return Catalog(
+        verbs=_read_only(VERBS),
+        pronouns=tuple(PRONOUNS),
+        conjugations=MappingProxyType({
+            tense: MappingProxyType({verb: tuple(forms) for verb, forms in verbs.items()})
+            for tense, verbs in CONJUGATIONS.items()
+        }),
+        vocabulary_sizes=_read_only(VOCABULARY_SIZES)
+    )
+
+
+def _read_only(table: dict) -> Mapping:
+    return MappingProxyType({key: MappingProxyType(dict(value)) for key, value in table.items()})
@@ -0,0 +1,143 @@
+# srs/due_index.py
+"""
+Индекс карточек по времени, дате следующего повторения и глаголу
+"""
+
+import bisect
+import heapq
+from typing import Collection, Dict, Iterator, List, Optional, Tuple
+
+from srs.models import iso_to_day
+
+COUNT_MEMO_SIZE = 8  # фильтров, для которых количество поддерживается инкрементально
+
+
+class _TenseDays:
+    """Карточки одного времени: отсортированные дни -> глагол -> id карточек"""
+
+    __slots__ = ('days', 'buckets')
+
+    def __init__(self):
+        self.days: List[int] = []
+        self.buckets: Dict[int, Dict[str, Dict[int, None]]] = {}
+
+    def due_days(self, tense: str, today_day: int) -> Iterator[Tuple[int, str]]:
+        """(день, время) для дней с карточками не позже today_day, по возрастанию"""
+        for index in range(bisect.bisect_right(self.days, today_day)):
+            yield self.days[index], tense
+
+
+class DueIndex:
+    """
+    Индекс карточек для быстрого поиска карточек к повторению
+
+    Карточки разложены по корзинам: время -> день повторения -> глагол -> id
+    карточек. Выбранные времена берутся из индекса напрямую, а их
+    отсортированные дни сливаются по возрастанию, поэтому поиск не
+    проходит ни по невыбранным временам, ни по дням после сегодняшнего.
+    Количество карточек к повторению для нескольких последних фильтров
+    поддерживается инкрементально и сбрасывается со сменой дня.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, Tuple[int, str, str]] = {}  # id карточки -> (день, время, глагол)
+        self._tenses: Dict[str, _TenseDays] = {}
+        self._count_day: Optional[str] = None  # день, для которого посчитаны количества
+        self._counts: Dict[Tuple[frozenset, frozenset], int] = {}  # (времена, глаголы) -> количество
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, card_id: int) -> bool:
+        return card_id in self._entries
+
+    def rebuild(self, cards) -> None:
+        """Перестраивает индекс по колоде (id карточки -> карточка)"""
+        self.__init__()
+        for card_id, card in cards.items():
+            self.update(card_id, card)
+
+    def update(self, card_id: int, card) -> None:
+        """Добавляет карточку или переносит её в корзину новой даты"""
+        day = iso_to_day(card.next_review_date)
+        old = self._entries.get(card_id)
+        if old is not None and old[0] == day:
+            return
+
+        if old is not None:
+            self._discard(card_id, old)
+        self._entries[card_id] = (day, card.tense, card.verb)
+
+        tense_days = self._tenses.get(card.tense)
+        if tense_days is None:
+            tense_days = self._tenses[card.tense] = _TenseDays()
+        bucket = tense_days.buckets.get(day)
+        if bucket is None:
+            bucket = tense_days.buckets[day] = {}
+            bisect.insort(tense_days.days, day)
+        bucket.setdefault(card.verb, {})[card_id] = None
+
+        self._adjust_counts(card.tense, card.verb, old[0] if old else None, day)
+
+    def remove(self, card_id: int) -> None:
+        """Удаляет карточку из индекса"""
+        old = self._entries.pop(card_id, None)
+        if old is not None:
+            self._discard(card_id, old)
+            self._adjust_counts(old[1], old[2], old[0], None)
+
+    def iter_due(self, today: str, tenses: Collection[str], verbs: Collection[str]) -> Iterator[int]:
+        """Возвращает id карточек к повторению в порядке даты (в пределах дня - по времени)"""
+        today_day = iso_to_day(today)
+        selected = sorted(tense for tense in set(tenses) if tense in self._tenses)
+        days = heapq.merge(*[self._tenses[tense].due_days(tense, today_day) for tense in selected])
+        for day, tense in days:
+            for verb, card_ids in self._tenses[tense].buckets[day].items():
+                if verb in verbs:
+                    yield from card_ids
+
+    def earliest_due(self, today: str, tenses: Collection[str], verbs: Collection[str]) -> Optional[int]:
+        """Id самой ранней карточки к повторению или None"""
+        return next(self.iter_due(today, tenses, verbs), None)
+
+    def count_due(self, today: str, tenses: Collection[str], verbs: Collection[str]) -> int:
+        """Количество карточек к повторению для текущего фильтра"""
+        if today != self._count_day:
+            self._count_day = today
+            self._counts.clear()
+        key = (frozenset(tenses), frozenset(verbs))
+        count = self._counts.pop(key, None)
+        if count is None:
+            count = sum(1 for _ in self.iter_due(today, key[0], key[1]))
+            if len(self._counts) >= COUNT_MEMO_SIZE:
+                # Самый давно запрошенный фильтр - первый в словаре
+                del self._counts[next(iter(self._counts))]
+        self._counts[key] = count
+        return count
+
+    def _discard(self, card_id: int, entry: Tuple[int, str, str]) -> None:
+        day, tense, verb = entry
+        tense_days = self._tenses[tense]
+        bucket = tense_days.buckets[day]
+        group = bucket[verb]
+        del group[card_id]
+        if not group:
+            del bucket[verb]
+        if not bucket:
+            del tense_days.buckets[day]
+            del tense_days.days[bisect.bisect_left(tense_days.days, day)]
+        if not tense_days.days:
+            del self._tenses[tense]
+
+    def _adjust_counts(self, tense: str, verb: str, old_day: Optional[int], new_day: Optional[int]) -> None:
+        """Поправляет закэшированные количества при перемещении карточки"""
+        if not self._counts:
+            return
+        today_day = iso_to_day(self._count_day)
+        was_due = old_day is not None and old_day <= today_day
+        is_due = new_day is not None and new_day <= today_day
+        if was_due == is_due:
+            return
+        for key in self._counts:
+            if tense in key[0] and verb in key[1]:
+                self._counts[key] += 1 if is_due else -1
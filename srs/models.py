@@ -0,0 +1,47 @@
+# srs/models.py
+"""
+Модель данных SRS: оценки ответа и карточка
+"""
+
+import datetime
+from dataclasses import dataclass
+from enum import Enum
+
+NO_DATE = 0  # номер дня для пустой даты (карточка ещё не повторялась)
+
+
+def iso_to_day(iso_date: str) -> int:
+    """ISO-дата -> номер дня (0 для пустой даты)"""
+    return datetime.date.fromisoformat(iso_date).toordinal() if iso_date else NO_DATE
+
+
+def day_to_iso(day: int) -> str:
+    """Номер дня -> ISO-дата (пустая строка для 0)"""
+    return datetime.date.fromordinal(day).isoformat() if day != NO_DATE else ""
+
+
+
+# Перечисления для SRS
+class Difficulty(Enum):
+    AGAIN = 0  # Повторить снова
+    HARD = 1   # Сложно
+    GOOD = 2   # Хорошо
+    EASY = 3   # Легко
+
+# Структура данных для карточки
+@dataclass
+class Card:
+    verb: str
+    pronoun_index: int
+    tense: str
+    easiness_factor: float = 2.5
+    interval: int = 1
+    repetitions: int = 0
+    next_review_date: str = ""
+    last_review_date: str = ""
+    total_reviews: int = 0
+    correct_reviews: int = 0
+    
+    def __post_init__(self):
+        if not self.next_review_date:
+            self.next_review_date = datetime.date.today().isoformat()
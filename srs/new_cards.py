@@ -0,0 +1,115 @@
+# srs/new_cards.py
+"""
+Ленивый поток новых карточек в воспроизводимом случайном порядке
+"""
+
+import hashlib
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+PRONOUN_COUNT = 6
+
+# Раздел колоды: (время, индекс первого глагола диапазона словаря)
+Partition = Tuple[str, int]
+
+
+class NewCardStream:
+    """
+    Поток ещё не изученных комбинаций (глагол, местоимение, время)
+
+    Для каждого раздела колоды хранится курсор ленивой перестановки
+    Фишера–Йетса: шаг j выбирает случайную позицию из ещё не пройденных,
+    а перемещённые значения хранятся в разреженном словаре. Случайность
+    берётся из хэша (seed, раздел, шаг), поэтому порядок воспроизводим
+    и не зависит от процесса, а курсоры переживают перезапуски скрипта
+    и смену настроек.
+    """
+
+    def __init__(self, seed: int):
+        self.seed = seed
+        self._cursors: Dict[Partition, int] = {}
+        self._swaps: Dict[Partition, Dict[int, int]] = {}
+
+    def copy(self) -> 'NewCardStream':
+        """Копия потока для заглядывания вперёд без сдвига курсоров"""
+        clone = NewCardStream(self.seed)
+        clone._cursors = dict(self._cursors)
+        clone._swaps = {partition: dict(swaps) for partition, swaps in self._swaps.items()}
+        return clone
+
+    def next_card(
+        self,
+        partitions: Dict[Partition, Sequence[str]],
+        is_seen: Callable[[str, int, str], bool]
+    ) -> Optional[Tuple[str, int, str]]:
+        """
+        Возвращает следующую новую карточку или None
+
+        Args:
+            partitions: Активные разделы и глаголы каждого из них
+            is_seen: Проверка, есть ли карточка уже в колоде
+
+        Returns:
+            Кортеж (глагол, индекс местоимения, время)
+        """
+        while True:
+            partition = self._pick_partition(partitions)
+            if partition is None:
+                return None
+
+            tense = partition[0]
+            verbs = partitions[partition]
+            verb_index, pronoun_index = divmod(self._peek(partition, len(verbs) * PRONOUN_COUNT), PRONOUN_COUNT)
+            verb = verbs[verb_index]
+
+            # Карточка остаётся на курсоре, пока её не добавят в колоду
+            if not is_seen(verb, pronoun_index, tense):
+                return verb, pronoun_index, tense
+            self._advance(partition, len(verbs) * PRONOUN_COUNT)
+
+    def _pick_partition(self, partitions: Dict[Partition, Sequence[str]]) -> Optional[Partition]:
+        """Выбирает раздел с вероятностью, пропорциональной остатку"""
+        remaining = []
+        total = 0
+        for partition in sorted(partitions):
+            left = len(partitions[partition]) * PRONOUN_COUNT - self._cursors.get(partition, 0)
+            if left > 0:
+                remaining.append((partition, left))
+                total += left
+
+        if not total:
+            return None
+
+        point = self._hash('pick', sum(self._cursors.values())) % total
+        for partition, left in remaining:
+            if point < left:
+                return partition
+            point -= left
+
+    def _target(self, partition: Partition, size: int) -> int:
+        """Позиция, которую шаг курсора меняет местами с текущей"""
+        step = self._cursors.get(partition, 0)
+        return step + self._hash(partition[0], partition[1], step) % (size - step)
+
+    def _peek(self, partition: Partition, size: int) -> int:
+        swaps = self._swaps.get(partition, {})
+        target = self._target(partition, size)
+        return swaps.get(target, target)
+
+    def _advance(self, partition: Partition, size: int) -> None:
+        swaps = self._swaps.setdefault(partition, {})
+        step = self._cursors.get(partition, 0)
+        target = self._target(partition, size)
+        # Позиция step больше не читается, её значение переезжает на target
+        moved = swaps.pop(step, step)
+        if target != step:
+            swaps[target] = moved
+        self._cursors[partition] = step + 1
+
+    def _hash(self, *parts) -> int:
+        data = ':'.join(str(part) for part in (self.seed,) + parts).encode('utf-8')
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+
+def seed_for_user(user_id: str) -> int:
+    """Стабильный seed потока новых карточек для пользователя"""
+    return int.from_bytes(hashlib.blake2b(user_id.encode('utf-8'), digest_size=8).digest(), 'big')
@@ -0,0 +1,59 @@
+# srs/prefetch.py
+"""
+Очередь предвыборки следующих карточек сессии
+"""
+
+from collections import deque
+from typing import Hashable, Iterable, Optional
+
+PREFETCH_SIZE = 5
+
+
+class CardQueue:
+    """
+    Несколько следующих карточек, вычисленных заранее
+
+    Очередь заполняется после каждого ответа, поэтому показ следующей
+    карточки сводится к извлечению id. Содержимое привязано к сигнатуре
+    (дата и настройки): при её смене очередь сбрасывается. Ответ
+    переносит карточку минимум на завтра, поэтому остальные карточки
+    в очереди остаются актуальными.
+    """
+
+    def __init__(self, size: int = PREFETCH_SIZE):
+        self.size = size
+        self.signature: Optional[Hashable] = None
+        self._card_ids = deque()
+
+    def __len__(self) -> int:
+        return len(self._card_ids)
+
+    def __contains__(self, card_id: int) -> bool:
+        return card_id in self._card_ids
+
+    def __iter__(self):
+        return iter(self._card_ids)
+
+    def reset(self, signature: Optional[Hashable] = None) -> None:
+        """Очищает очередь и запоминает новую сигнатуру"""
+        self.signature = signature
+        self._card_ids.clear()
+
+    def invalidate(self) -> None:
+        """Сбрасывает очередь: она будет заполнена заново при следующем запросе"""
+        self.reset(None)
+
+    def top_up(self, card_ids: Iterable[int]) -> None:
+        """Дополняет очередь до размера id из источника (пропуская уже стоящие в ней)"""
+        # Размер проверяется до чтения: источник ленивый, лишний id не вычисляется
+        card_ids = iter(card_ids)
+        while len(self._card_ids) < self.size:
+            card_id = next(card_ids, None)
+            if card_id is None:
+                break
+            if card_id not in self._card_ids:
+                self._card_ids.append(card_id)
+
+    def pop(self) -> Optional[int]:
+        """Следующий id карточки или None, если очередь пуста"""
+        return self._card_ids.popleft() if self._card_ids else None
@@ -0,0 +1,158 @@
+# srs/review_log.py
+"""
+Журнал ответов и восстановление состояния колоды по нему
+"""
+
+import datetime
+from array import array
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional
+
+from srs.card_ids import CardCodec
+from srs.card_store import CardStore
+from srs.models import Card
+from srs.scheduler import SRSManager
+
+REPLAY_CHUNK_SIZE = 65536
+
+
+@dataclass(frozen=True)
+class ReviewEvent:
+    seq: int
+    card_id: int
+    grade: int             # Difficulty.value
+    timestamp: float       # Unix-время ответа
+    prev_interval: int     # интервал до ответа
+    prev_ease: float       # easiness factor до ответа
+
+    @property
+    def review_day(self) -> int:
+        """Номер дня ответа (по локальному времени, как date.today())"""
+        return datetime.date.fromtimestamp(self.timestamp).toordinal()
+
+
+class ReviewLog:
+    """
+    Журнал ответов, в который можно только дописывать
+
+    События хранятся колонками и нумеруются последовательно начиная
+    с first_seq. Журнал, начатый после снимка колоды, содержит только
+    хвост событий и стартует с номера, следующего за снимком.
+    """
+
+    def __init__(self, first_seq: int = 1):
+        self.first_seq = first_seq
+        self.card_id = array('i')
+        self.grade = array('b')
+        self.timestamp = array('d')
+        self.prev_interval = array('i')
+        self.prev_ease = array('f')
+
+    def __len__(self) -> int:
+        return len(self.card_id)
+
+    def __iter__(self) -> Iterator[ReviewEvent]:
+        return self.since(self.first_seq - 1)
+
+    @property
+    def last_seq(self) -> int:
+        """Номер последнего события (first_seq - 1 для пустого журнала)"""
+        return self.first_seq + len(self.card_id) - 1
+
+    def append(self, card_id: int, grade: int, timestamp: float, prev_interval: int, prev_ease: float) -> int:
+        """Дописывает событие и возвращает его номер"""
+        self.card_id.append(card_id)
+        self.grade.append(grade)
+        self.timestamp.append(timestamp)
+        self.prev_interval.append(prev_interval)
+        self.prev_ease.append(prev_ease)
+        return self.last_seq
+
+    def since(self, seq: int) -> Iterator[ReviewEvent]:
+        """События с номером больше seq"""
+        for index in range(max(seq + 1 - self.first_seq, 0), len(self.card_id)):
+            yield ReviewEvent(
+                seq=self.first_seq + index,
+                card_id=self.card_id[index],
+                grade=self.grade[index],
+                timestamp=self.timestamp[index],
+                prev_interval=self.prev_interval[index],
+                prev_ease=self.prev_ease[index]
+            )
+
+
+@dataclass
+class DeckSnapshot:
+    seq: int           # последнее событие журнала, учтённое в снимке
+    store: CardStore
+
+
+def take_snapshot(store: CardStore, log: ReviewLog) -> DeckSnapshot:
+    """Снимок колоды на момент последнего события журнала"""
+    return DeckSnapshot(seq=log.last_seq, store=store.copy())
+
+
+def replay(
+    events: Iterable[ReviewEvent],
+    codec: CardCodec,
+    store: Optional[CardStore] = None,
+    chunk_size: int = REPLAY_CHUNK_SIZE
+) -> CardStore:
+    """
+    Восстанавливает колоду за один потоковый проход по событиям
+
+    События читаются порциями; недостающие карточки создаются по id,
+    а каждая порция применяется через SRSManager.update_many.
+
+    Args:
+        events: События журнала в порядке номеров
+        codec: Кодек id карточек для создания недостающих карточек
+        store: Колода, к которой применяются события (по умолчанию пустая)
+        chunk_size: Размер порции
+
+    Returns:
+        Колода после применения всех событий
+    """
+    store = store if store is not None else CardStore()
+
+    chunk: List[ReviewEvent] = []
+    for event in events:
+        chunk.append(event)
+        if len(chunk) >= chunk_size:
+            _apply_chunk(store, chunk, codec)
+            chunk = []
+    if chunk:
+        _apply_chunk(store, chunk, codec)
+
+    return store
+
+
+def restore(snapshot: Optional[DeckSnapshot], log: ReviewLog, codec: CardCodec) -> CardStore:
+    """
+    Колода из последнего снимка и хвоста журнала после него
+
+    Raises:
+        ValueError: если журнал начинается позже события, следующего за
+            снимком (без снимка - позже первого): пропущенные ответы
+            восстановить не из чего
+    """
+    covered = snapshot.seq if snapshot is not None else 0
+    if log.first_seq > covered + 1:
+        raise ValueError(f"review log starts at {log.first_seq}, events {covered + 1}..{log.first_seq - 1} are missing")
+    if snapshot is None:
+        return replay(log, codec)
+    return replay(log.since(snapshot.seq), codec, snapshot.store.copy())
+
+
+def _apply_chunk(store: CardStore, chunk: List[ReviewEvent], codec: CardCodec) -> None:
+    for event in chunk:
+        if event.card_id not in store:
+            verb, pronoun_index, tense = codec.decode(event.card_id)
+            store.add(event.card_id, Card(verb=verb, pronoun_index=pronoun_index, tense=tense))
+
+    SRSManager.update_many(
+        store,
+        [event.card_id for event in chunk],
+        [event.grade for event in chunk],
+        [event.review_day for event in chunk]
+    )
@@ -0,0 +1,204 @@
+# srs/scheduler.py
+"""
+Система интервального повторения (SM-2): поштучное и пакетное обновление
+"""
+
+import datetime
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from srs.card_store import CardStore
+from srs.due_index import DueIndex
+from srs.models import Card, Difficulty
+
+# Изменение easiness factor для каждой оценки (индекс - Difficulty.value)
+EASINESS_DELTAS = np.array([-0.2, -0.15, 0.1, 0.15])
+
+MAX_DAY = datetime.date.max.toordinal()
+
+
+# Система интервального повторения (SRS)
+class SRSManager:
+    @staticmethod
+    def calculate_next_interval(card: Card, difficulty: Difficulty) -> Tuple[int, float]:
+        """Алгоритм SM-2 для расчета следующего интервала"""
+        ef = card.easiness_factor
+        interval = card.interval
+        repetitions = card.repetitions
+
+        if difficulty == Difficulty.AGAIN:
+            return 1, max(1.3, ef - 0.2)
+
+        if repetitions == 0:
+            interval = 1
+        elif repetitions == 1:
+            interval = 6
+        else:
+            interval = int(interval * ef)
+
+        # Обновляем easiness factor
+        if difficulty == Difficulty.EASY:
+            ef = ef + 0.15
+        elif difficulty == Difficulty.GOOD:
+            ef = ef + 0.1
+        elif difficulty == Difficulty.HARD:
+            ef = ef - 0.15
+
+        ef = max(1.3, min(3.0, ef))
+        return interval, ef
+
+    @staticmethod
+    def update_card(
+        card: Card,
+        difficulty: Difficulty,
+        due_index: Optional[DueIndex] = None,
+        review_date: Optional[datetime.date] = None
+    ) -> Card:
+        """Обновляет карточку после ответа (и её позицию в индексе повторений)"""
+        today = review_date or datetime.date.today()
+
+        card.total_reviews += 1
+        if difficulty in [Difficulty.GOOD, Difficulty.EASY]:
+            card.correct_reviews += 1
+
+        if difficulty == Difficulty.AGAIN:
+            card.repetitions = 0
+        else:
+            card.repetitions += 1
+
+        new_interval, new_ef = SRSManager.calculate_next_interval(card, difficulty)
+
+        card.interval = new_interval
+        card.easiness_factor = new_ef
+        card.last_review_date = today.isoformat()
+        card.next_review_date = (today + datetime.timedelta(days=new_interval)).isoformat()
+
+        # Карточка из CardStore (CardView) сама помечается как изменившаяся.
+        # Индекс хранит карточки колоды по id, поэтому нужна карточка из CardStore
+        if due_index is not None:
+            due_index.update(card.card_id, card)
+
+        return card
+
+    @staticmethod
+    def update_many(
+        store: CardStore,
+        card_ids: Sequence[int],
+        grades: Sequence[Union[int, Difficulty]],
+        review_day: Union[int, Sequence[int]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Пакетное обновление SM-2 прямо в колонках CardStore
+
+        Повторяет update_card бит в бит, но считает все ответы пакета
+        векторно. Ответы по одной карточке применяются в порядке следования:
+        пакет делится на раунды, где каждая карточка встречается не больше
+        одного раза. Индекс повторений и статистику колоды после вызова
+        нужно перестроить.
+
+        Args:
+            store: Колода, которую нужно обновить
+            card_ids: Id карточек (должны быть в колоде)
+            grades: Оценки (Difficulty или их значения)
+            review_day: Номер дня ответа - один на весь пакет или для каждого ответа
+
+        Returns:
+            Интервал и EF карточки перед каждым ответом (для журнала)
+        """
+        grades = np.asarray(grades)
+        if grades.dtype == object:
+            grades = np.array([grade.value for grade in grades.tolist()])
+        grades = grades.astype(np.int8)
+        card_ids = np.asarray(card_ids, dtype=np.int64)
+        days = np.broadcast_to(np.asarray(review_day, dtype=np.int64), card_ids.shape)
+
+        if not len(card_ids):
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64)
+
+        rows = _rows_for(store, card_ids)
+
+        # Номер повторения карточки внутри пакета определяет раунд
+        order = np.argsort(rows, kind='stable')
+        sorted_rows = rows[order]
+        group_start = np.flatnonzero(np.r_[True, sorted_rows[1:] != sorted_rows[:-1]])
+        group_sizes = np.diff(np.r_[group_start, len(rows)])
+        occurrence = np.empty(len(rows), dtype=np.int64)
+        occurrence[order] = np.arange(len(rows)) - np.repeat(group_start, group_sizes)
+
+        by_round = np.argsort(occurrence, kind='stable')
+        bounds = np.searchsorted(occurrence[by_round], np.arange(occurrence.max() + 2))
+
+        # Помечаем заранее: при OverflowError часть раундов уже применена
+        store.mark_rows_dirty(sorted_rows[group_start].tolist())
+
+        columns = _numpy_columns(store)
+        prev_interval = np.empty(len(rows), dtype=np.int32)
+        prev_ease = np.empty(len(rows), dtype=np.float64)
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            batch = by_round[start:end]
+            prev_interval[batch] = columns['interval'][rows[batch]]
+            prev_ease[batch] = np.rint(columns['easiness'][rows[batch]].astype(np.float64) * 20) / 20
+            _apply_round(columns, rows[batch], grades[batch], days[batch])
+
+        return prev_interval, prev_ease
+
+
+def _rows_for(store: CardStore, card_ids: np.ndarray) -> np.ndarray:
+    """Векторное отображение id карточек в строки колонок"""
+    stored_ids = np.frombuffer(store.card_id, dtype=np.int32)
+    size = int(max(stored_ids.max(initial=-1), card_ids.max())) + 1
+    lookup = np.full(size, -1, dtype=np.int64)
+    lookup[stored_ids] = np.arange(len(stored_ids))
+
+    rows = lookup[card_ids] if card_ids.min() >= 0 else np.full(len(card_ids), -1)
+    if (rows < 0).any():
+        missing = card_ids[rows < 0][0]
+        raise KeyError(f"card {missing} is not in the store")
+    return rows
+
+
+def _numpy_columns(store: CardStore) -> dict:
+    """Представления колонок CardStore в виде массивов numpy (без копирования)"""
+    return {
+        name: np.frombuffer(getattr(store, name), dtype=dtype)
+        for name, dtype in (
+            ('easiness', np.float32),
+            ('interval', np.int32),
+            ('repetitions', np.int32),
+            ('next_day', np.int32),
+            ('last_day', np.int32),
+            ('total_reviews', np.int32),
+            ('correct_reviews', np.int32),
+        )
+    }
+
+
+def _apply_round(columns: dict, rows: np.ndarray, grades: np.ndarray, days: np.ndarray) -> None:
+    """Один раунд SM-2 для карточек без повторов"""
+    again = grades == Difficulty.AGAIN.value
+    correct = (grades == Difficulty.GOOD.value) | (grades == Difficulty.EASY.value)
+
+    repetitions = np.where(again, 0, columns['repetitions'][rows].astype(np.int64) + 1)
+
+    # То же, что snap_easiness: rint и round одинаково округляют к чётному
+    ef = np.rint(columns['easiness'][rows].astype(np.float64) * 20) / 20
+    grown = (columns['interval'][rows].astype(np.float64) * ef).astype(np.int64)
+    interval = np.where(repetitions == 0, 1, np.where(repetitions == 1, 6, grown))
+    interval[again] = 1
+
+    ef = ef + EASINESS_DELTAS[grades]
+    ef = np.where(again, np.maximum(1.3, ef), np.maximum(1.3, np.minimum(3.0, ef)))
+
+    next_day = days + interval
+    # Как и datetime в update_card: дата за пределами календаря - ошибка
+    if next_day.max() > MAX_DAY:
+        raise OverflowError("date value out of range")
+
+    columns['total_reviews'][rows] += 1
+    columns['correct_reviews'][rows] += correct
+    columns['repetitions'][rows] = repetitions
+    columns['interval'][rows] = interval
+    columns['easiness'][rows] = ef
+    columns['last_day'][rows] = days
+    columns['next_day'][rows] = next_day
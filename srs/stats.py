@@ -0,0 +1,94 @@
+# srs/stats.py
+"""
+Инкрементальная статистика колоды для боковой панели
+"""
+
+from dataclasses import dataclass, field
+from typing import Collection, Dict
+
+from srs.models import iso_to_day
+
+
+@dataclass
+class Counters:
+    cards: int = 0
+    reviews: int = 0
+    correct: int = 0
+
+    @property
+    def accuracy(self) -> float:
+        """Процент правильных ответов"""
+        return (self.correct / self.reviews * 100) if self.reviews > 0 else 0
+
+
+@dataclass
+class DeckStats:
+    """
+    Счётчики колоды, которые обновляются при каждом изменении карточки
+
+    Общие значения и разбивка по временам и глаголам поддерживаются
+    инкрементально, поэтому боковая панель не проходит по всей колоде.
+    Количество карточек к повторению зависит от фильтра и даты и
+    обновляется вызывающим кодом.
+    """
+    total: Counters = field(default_factory=Counters)
+    by_tense: Dict[str, Counters] = field(default_factory=dict)
+    by_verb: Dict[str, Counters] = field(default_factory=dict)
+    due_count: int = field(default=0, compare=False)
+
+    @classmethod
+    def from_cards(cls, cards: Dict) -> 'DeckStats':
+        """Пересчитывает счётчики с нуля по словарю карточек"""
+        stats = cls()
+        for card in cards.values():
+            stats.add_card(card)
+        return stats
+
+    def add_card(self, card) -> None:
+        """Учитывает карточку, добавленную в колоду"""
+        for counters in self._counters_for(card):
+            counters.cards += 1
+            counters.reviews += card.total_reviews
+            counters.correct += card.correct_reviews
+
+    def remove_card(self, card) -> None:
+        """Убирает вклад карточки (перед заменой её значений)"""
+        for counters in self._counters_for(card):
+            counters.cards -= 1
+            counters.reviews -= card.total_reviews
+            counters.correct -= card.correct_reviews
+
+    def record_review(self, card, correct: bool) -> None:
+        """Учитывает ответ по карточке"""
+        for counters in self._counters_for(card):
+            counters.reviews += 1
+            if correct:
+                counters.correct += 1
+
+    def is_consistent(self, cards: Dict, today: str, tenses: Collection[str], verbs: Collection[str]) -> bool:
+        """
+        Проверяет счётчики против полного пересчёта (для тестов и отладки)
+
+        due_count не участвует в сравнении dataclass, поэтому сверяется
+        отдельно: с числом карточек к повторению по тому же фильтру, что
+        передается в DueIndex.count_due.
+
+        Args:
+            cards: Колода (id карточки -> карточка)
+            today: Сегодняшняя дата (ISO)
+            tenses: Выбранные времена
+            verbs: Глаголы уровня словаря
+        """
+        today_day = iso_to_day(today)
+        due_count = sum(
+            1 for card in cards.values()
+            if card.tense in tenses and card.verb in verbs and iso_to_day(card.next_review_date) <= today_day
+        )
+        return self == DeckStats.from_cards(cards) and self.due_count == due_count
+
+    def _counters_for(self, card):
+        if card.tense not in self.by_tense:
+            self.by_tense[card.tense] = Counters()
+        if card.verb not in self.by_verb:
+            self.by_verb[card.verb] = Counters()
+        return self.total, self.by_tense[card.tense], self.by_verb[card.verb]
@@ -0,0 +1,76 @@
+# srs/vocabulary.py
+"""
+Неизменяемые представления уровней словаря
+"""
+
+from itertools import combinations
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, Mapping, Sequence, Tuple
+
+Partitions = Mapping[Tuple[str, int], Tuple[str, ...]]
+
+
+class VocabularyLevels:
+    """
+    Глаголы каждого размера словаря, вычисленные один раз
+
+    Уровни - это префиксы списка глаголов (самые популярные идут первыми),
+    поэтому каждый следующий уровень добавляет диапазон глаголов к предыдущему.
+    Для каждого уровня хранятся упорядоченный кортеж и frozenset для быстрых
+    проверок принадлежности, а для каждого времени - глаголы диапазонов
+    с готовыми спряжениями. Разделы для потока новых карточек тоже готовы
+    заранее - для каждого уровня и каждого набора времен (их 2^n на уровень,
+    при четырех временах - 16).
+    """
+
+    def __init__(self, verbs: Sequence[str], sizes: Iterable[int], conjugations: Dict[str, Dict]):
+        verbs = tuple(verbs)
+        sizes = sorted(sizes)
+
+        self.ordered: Dict[int, Tuple[str, ...]] = {}
+        self.sets: Dict[int, FrozenSet[str]] = {}
+        self.band_starts: Dict[int, Tuple[int, ...]] = {}
+        self.tense_bands: Dict[Tuple[str, int], Tuple[str, ...]] = {}
+        self.all_verbs = frozenset(verbs)
+
+        starts = []
+        band_start = 0
+        for size in sizes:
+            # Самый большой уровень включает все глаголы
+            level_verbs = verbs if size == sizes[-1] else verbs[:size]
+            self.ordered[size] = level_verbs
+            self.sets[size] = frozenset(level_verbs)
+
+            starts.append(band_start)
+            self.band_starts[size] = tuple(starts)
+            for tense, tense_conjugations in conjugations.items():
+                self.tense_bands[(tense, band_start)] = tuple(
+                    verb for verb in level_verbs[band_start:] if verb in tense_conjugations
+                )
+            band_start = len(level_verbs)
+
+        # Порядок времен не важен: поток новых карточек перебирает разделы отсортированными
+        self.tenses = frozenset(conjugations)
+        self._partitions: Dict[Tuple[int, FrozenSet[str]], Partitions] = {}
+        for size in sizes:
+            for count in range(len(conjugations) + 1):
+                for tenses in combinations(conjugations, count):
+                    self._partitions[(size, frozenset(tenses))] = MappingProxyType({
+                        (tense, start): self.tense_bands[(tense, start)]
+                        for tense in tenses
+                        for start in self.band_starts[size]
+                    })
+
+    def verb_set(self, vocab_size: int) -> FrozenSet[str]:
+        """Множество глаголов уровня (для неизвестного размера - все глаголы)"""
+        return self.sets.get(vocab_size, self.all_verbs)
+
+    def partitions(self, vocab_size: int, tenses: Iterable[str]) -> Partitions:
+        """Разделы колоды (время, начало диапазона) -> глаголы для потока новых карточек (общие, только чтение)"""
+        size = vocab_size if vocab_size in self.band_starts else max(self.band_starts)
+        tenses = frozenset(tenses)
+        partitions = self._partitions.get((size, tenses))
+        if partitions is None:
+            # Неизвестные времена пропускаются
+            partitions = self._partitions[(size, tenses & self.tenses)]
+        return partitions
@@ -0,0 +1,189 @@
+# storage/database.py
+"""
+Подключение к базе данных: общий пул соединений и его метрики
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+DEFAULT_DATABASE_URL = 'sqlite:///spanish_verbs.db'
+
+# Настройки пула (переопределяются переменными окружения)
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+DEFAULT_POOL_TIMEOUT = 30.0
+DEFAULT_POOL_RECYCLE = 1800  # секунд; меньше idle-таймаута Postgres у хостинга
+SQLITE_BUSY_TIMEOUT = 30.0
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    size: int = DEFAULT_POOL_SIZE
+    max_overflow: int = DEFAULT_MAX_OVERFLOW
+    timeout: float = DEFAULT_POOL_TIMEOUT
+    recycle: int = DEFAULT_POOL_RECYCLE
+    pre_ping: bool = True
+
+    @classmethod
+    def from_env(cls) -> 'PoolSettings':
+        """Настройки из DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE и DB_POOL_PRE_PING"""
+        return cls(
+            size=int(os.getenv('DB_POOL_SIZE', DEFAULT_POOL_SIZE)),
+            max_overflow=int(os.getenv('DB_MAX_OVERFLOW', DEFAULT_MAX_OVERFLOW)),
+            timeout=float(os.getenv('DB_POOL_TIMEOUT', DEFAULT_POOL_TIMEOUT)),
+            recycle=int(os.getenv('DB_POOL_RECYCLE', DEFAULT_POOL_RECYCLE)),
+            pre_ping=os.getenv('DB_POOL_PRE_PING', '1').lower() not in ('0', 'false', 'no')
+        )
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    checkouts: int      # выдано соединений
+    connects: int       # открыто новых соединений с базой
+    timeouts: int       # запросов, не дождавшихся соединения
+    waits: int          # выдач, которым пришлось ждать свободное соединение
+    wait_total: float   # суммарное ожидание, с
+    wait_max: float     # максимальное ожидание, с
+    in_use: int         # соединений выдано сейчас
+    peak_in_use: int    # максимум одновременно выданных
+
+    @property
+    def wait_mean(self) -> float:
+        return self.wait_total / self.checkouts if self.checkouts else 0.0
+
+
+class MeteredQueuePool(QueuePool):
+    """
+    QueuePool, который считает выдачи соединений и время ожидания
+
+    Ожидание - время получения соединения из пула; заметным оно становится,
+    когда все соединения заняты и запрос стоит в очереди.
+    """
+
+    # Ожидание короче этого считается мгновенной выдачей
+    WAIT_THRESHOLD = 0.001
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self._reset_metrics()
+
+    def stats(self) -> PoolStats:
+        """Снимок метрик пула"""
+        with self._metrics_lock:
+            return PoolStats(
+                checkouts=self._checkouts,
+                connects=self._connects,
+                timeouts=self._timeouts,
+                waits=self._waits,
+                wait_total=self._wait_total,
+                wait_max=self._wait_max,
+                in_use=self._in_use,
+                peak_in_use=self._peak_in_use
+            )
+
+    def _reset_metrics(self) -> None:
+        self._checkouts = self._connects = self._timeouts = self._waits = 0
+        self._wait_total = self._wait_max = 0.0
+        self._in_use = self._peak_in_use = 0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            with self._metrics_lock:
+                self._timeouts += 1
+            raise
+        waited = time.perf_counter() - started
+
+        with self._metrics_lock:
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+            if waited >= self.WAIT_THRESHOLD:
+                self._waits += 1
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+        return connection
+
+    def _do_return_conn(self, record) -> None:
+        with self._metrics_lock:
+            self._in_use -= 1
+        super()._do_return_conn(record)
+
+    def _create_connection(self):
+        with self._metrics_lock:
+            self._connects += 1
+        return super()._create_connection()
+
+
+def get_database_url() -> str:
+    """URL базы из DATABASE_URL (по умолчанию локальный файл SQLite)"""
+    url = os.getenv('DATABASE_URL', DEFAULT_DATABASE_URL)
+    # Railway и Heroku выдают postgres://, SQLAlchemy 2 принимает только postgresql://
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
+def create_database_engine(url: str = None, pool: PoolSettings = None) -> Engine:
+    """
+    Создает движок SQLAlchemy с общим пулом соединений
+
+    Движок рассчитан на один экземпляр на процесс: все сессии Streamlit
+    берут соединения из одного пула, а не открывают свои.
+
+    Args:
+        url: URL базы (по умолчанию get_database_url())
+        pool: Настройки пула (по умолчанию из переменных окружения)
+
+    Returns:
+        Движок с пулом MeteredQueuePool (метрики - engine.pool.stats());
+        для SQLite в памяти - пул из одного соединения, общего для всех потоков
+    """
+    url = url or get_database_url()
+    pool = pool or PoolSettings.from_env()
+    is_sqlite = url.startswith('sqlite')
+
+    if is_sqlite and (url in ('sqlite://', 'sqlite:///:memory:') or 'mode=memory' in url):
+        # База в памяти живет в одном соединении. Пул из него одного выдает его потокам по очереди:
+        # по умолчанию (SingletonThreadPool) поток отложенной записи получил бы свою пустую базу,
+        # а StaticPool отдал бы соединение двум потокам сразу, смешав их транзакции
+        return create_engine(
+            url,
+            poolclass=MeteredQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=pool.timeout,
+            pool_recycle=-1,
+            connect_args={'check_same_thread': False}
+        )
+
+    engine = create_engine(
+        url,
+        poolclass=MeteredQueuePool,
+        pool_size=pool.size,
+        max_overflow=pool.max_overflow,
+        pool_timeout=pool.timeout,
+        pool_recycle=pool.recycle,
+        pool_pre_ping=pool.pre_ping,
+        connect_args={'timeout': SQLITE_BUSY_TIMEOUT, 'check_same_thread': False} if is_sqlite else {}
+    )
+
+    if is_sqlite:
+        # WAL: читатели не блокируют писателя при параллельных сессиях
+        @event.listens_for(engine, 'connect')
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.close()
+
+    return engine
@@ -0,0 +1,300 @@
+# storage/deck_format.py
+"""
+Компактный двоичный формат колод и журналов ответов
+
+Файл начинается с заголовка (сигнатура, версия формата, сжатие), за ним
+идет тело - как есть или сжатое zlib/zstd. Тело колоды: таблицы глаголов
+и времён, затем блоки записей фиксированной ширины; тело журнала: номер
+первого события и блоки событий. Блок - число записей (uint32) и сами
+записи, блок из нуля записей завершает поток. Числа - little-endian,
+даты - номера дней (ordinal), строки - UTF-8 с длиной uint16.
+"""
+
+import io
+import struct
+import zlib
+from array import array
+from typing import BinaryIO, Iterator, List
+
+import numpy as np
+
+from srs.card_store import CardStore
+from srs.review_log import ReviewEvent, ReviewLog
+
+try:
+    import zstandard
+except ImportError:  # zstd необязателен
+    zstandard = None
+
+FORMAT_VERSION = 1
+DECK_MAGIC = b'SVDK'
+LOG_MAGIC = b'SVLG'
+
+COMPRESSION_NONE = 'none'
+COMPRESSION_ZLIB = 'zlib'
+COMPRESSION_ZSTD = 'zstd'
+COMPRESSION_CODES = {COMPRESSION_NONE: 0, COMPRESSION_ZLIB: 1, COMPRESSION_ZSTD: 2}
+
+CHUNK_ROWS = 65536
+READ_SIZE = 1 << 16
+
+HEADER = struct.Struct('<4sBBH')  # сигнатура, версия, сжатие, резерв
+COUNT = struct.Struct('<I')
+NAME_LENGTH = struct.Struct('<H')
+FIRST_SEQ = struct.Struct('<q')
+
+# Запись карточки: 36 байт, поля и порядок - как колонки CardStore
+DECK_RECORD = np.dtype([
+    ('card_id', '<i4'),
+    ('verb_id', '<i2'),
+    ('tense_id', 'i1'),
+    ('pronoun', 'i1'),
+    ('easiness', '<f4'),
+    ('interval', '<i4'),
+    ('repetitions', '<i4'),
+    ('next_day', '<i4'),
+    ('last_day', '<i4'),
+    ('total_reviews', '<i4'),
+    ('correct_reviews', '<i4'),
+])
+
+# Запись события журнала: 21 байт, номер события - first_seq + позиция
+LOG_RECORD = np.dtype([
+    ('card_id', '<i4'),
+    ('grade', 'i1'),
+    ('timestamp', '<f8'),
+    ('prev_interval', '<i4'),
+    ('prev_ease', '<f4'),
+])
+LOG_COLUMNS = LOG_RECORD.names
+
+
+def write_deck(
+    store: CardStore,
+    stream: BinaryIO,
+    compression: str = COMPRESSION_ZLIB,
+    chunk_rows: int = CHUNK_ROWS
+) -> None:
+    """
+    Записывает колоду в поток блоками
+
+    Args:
+        store: Колода
+        stream: Двоичный поток для записи
+        compression: none, zlib или zstd
+        chunk_rows: Записей в блоке
+    """
+    sink = _Sink(stream, DECK_MAGIC, compression)
+    _write_names(sink, store.verbs)
+    _write_names(sink, store.tenses)
+
+    columns = {
+        name: np.frombuffer(getattr(store, name), dtype=DECK_RECORD[name].newbyteorder('='))
+        for name in DECK_RECORD.names
+    }
+    for start in range(0, len(store), chunk_rows):
+        records = np.empty(min(chunk_rows, len(store) - start), dtype=DECK_RECORD)
+        for name, column in columns.items():
+            records[name] = column[start:start + len(records)]
+        sink.write(COUNT.pack(len(records)) + records.tobytes())
+    sink.write(COUNT.pack(0))
+    sink.close()
+
+
+def read_deck(stream: BinaryIO) -> CardStore:
+    """Читает колоду из потока, добавляя записи в CardStore поблочно"""
+    source = _Source(stream, DECK_MAGIC)
+    store = CardStore()
+    verb_ids, tense_ids = store.intern(_read_names(source), _read_names(source))
+    verb_map = np.array(verb_ids, dtype=np.int16)
+    tense_map = np.array(tense_ids, dtype=np.int8)
+
+    for records in _read_chunks(source, DECK_RECORD):
+        columns = {}
+        for name in CardStore.COLUMNS:
+            values = records[name]
+            if name == 'verb_id':
+                values = verb_map[values]
+            elif name == 'tense_id':
+                values = tense_map[values]
+            column = array(getattr(store, name).typecode)
+            column.frombytes(values.astype(values.dtype.newbyteorder('=')).tobytes())
+            columns[name] = column
+        store.extend_columns(columns)
+    return store
+
+
+def write_log(
+    log: ReviewLog,
+    stream: BinaryIO,
+    compression: str = COMPRESSION_ZLIB,
+    chunk_rows: int = CHUNK_ROWS
+) -> None:
+    """Записывает журнал ответов в поток блоками (параметры - как у write_deck)"""
+    sink = _Sink(stream, LOG_MAGIC, compression)
+    sink.write(FIRST_SEQ.pack(log.first_seq))
+
+    columns = {
+        name: np.frombuffer(getattr(log, name), dtype=LOG_RECORD[name].newbyteorder('='))
+        for name in LOG_COLUMNS
+    }
+    for start in range(0, len(log), chunk_rows):
+        records = np.empty(min(chunk_rows, len(log) - start), dtype=LOG_RECORD)
+        for name, column in columns.items():
+            records[name] = column[start:start + len(records)]
+        sink.write(COUNT.pack(len(records)) + records.tobytes())
+    sink.write(COUNT.pack(0))
+    sink.close()
+
+
+def read_log(stream: BinaryIO) -> ReviewLog:
+    """Читает журнал ответов из потока целиком"""
+    source = _Source(stream, LOG_MAGIC)
+    log = ReviewLog(first_seq=FIRST_SEQ.unpack(source.read(FIRST_SEQ.size))[0])
+    for records in _read_chunks(source, LOG_RECORD):
+        for name in LOG_COLUMNS:
+            values = records[name]
+            getattr(log, name).frombytes(values.astype(values.dtype.newbyteorder('=')).tobytes())
+    return log
+
+
+def iter_log(stream: BinaryIO) -> Iterator[ReviewEvent]:
+    """События журнала по одному, не держа весь журнал в памяти (например, для replay)"""
+    source = _Source(stream, LOG_MAGIC)
+    seq = FIRST_SEQ.unpack(source.read(FIRST_SEQ.size))[0]
+    for records in _read_chunks(source, LOG_RECORD):
+        for card_id, grade, timestamp, prev_interval, prev_ease in records.tolist():
+            yield ReviewEvent(seq, card_id, grade, timestamp, prev_interval, prev_ease)
+            seq += 1
+
+
+def encode_deck(store: CardStore, compression: str = COMPRESSION_ZLIB) -> bytes:
+    """Колода в виде bytes"""
+    buffer = io.BytesIO()
+    write_deck(store, buffer, compression)
+    return buffer.getvalue()
+
+
+def decode_deck(data: bytes) -> CardStore:
+    """Колода из bytes"""
+    return read_deck(io.BytesIO(data))
+
+
+def encode_log(log: ReviewLog, compression: str = COMPRESSION_ZLIB) -> bytes:
+    """Журнал ответов в виде bytes"""
+    buffer = io.BytesIO()
+    write_log(log, buffer, compression)
+    return buffer.getvalue()
+
+
+def decode_log(data: bytes) -> ReviewLog:
+    """Журнал ответов из bytes"""
+    return read_log(io.BytesIO(data))
+
+
+class _Sink:
+    """Запись тела с заголовком и необязательным сжатием"""
+
+    def __init__(self, stream: BinaryIO, magic: bytes, compression: str):
+        if compression not in COMPRESSION_CODES:
+            raise ValueError(f"unknown compression: {compression}")
+        self.stream = stream
+        self.compressor = _compressor(compression)
+        stream.write(HEADER.pack(magic, FORMAT_VERSION, COMPRESSION_CODES[compression], 0))
+
+    def write(self, data: bytes) -> None:
+        self.stream.write(self.compressor.compress(data) if self.compressor else data)
+
+    def close(self) -> None:
+        if self.compressor:
+            self.stream.write(self.compressor.flush())
+
+
+class _Source:
+    """Чтение тела после проверки заголовка с распаковкой на лету"""
+
+    def __init__(self, stream: BinaryIO, magic: bytes):
+        header = stream.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError("truncated header")
+        file_magic, version, code, _ = HEADER.unpack(header)
+        if file_magic != magic:
+            raise ValueError(f"not a {magic.decode()} file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported format version {version}")
+        compression = {value: name for name, value in COMPRESSION_CODES.items()}.get(code)
+        if compression is None:
+            raise ValueError(f"unknown compression code {code}")
+
+        self.stream = stream
+        self.decompressor = _decompressor(compression)
+        self._buffer = bytearray()
+
+    def read(self, size: int) -> bytes:
+        """Ровно size байт тела"""
+        while len(self._buffer) < size:
+            data = self.stream.read(READ_SIZE)
+            if not data:
+                raise ValueError("truncated body")
+            self._buffer += self.decompressor.decompress(data) if self.decompressor else data
+        chunk = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return chunk
+
+    def close(self) -> None:
+        """Проверяет, что сжатое тело дочитано до конца: без хвоста потока данные могут быть неполными"""
+        if self.decompressor is None:
+            return
+        while not self.decompressor.eof:
+            data = self.stream.read(READ_SIZE)
+            if not data:
+                raise ValueError("truncated body")
+            self._buffer += self.decompressor.decompress(data)
+
+
+def _compressor(compression: str):
+    if compression == COMPRESSION_ZLIB:
+        return zlib.compressobj(6)
+    if compression == COMPRESSION_ZSTD:
+        return _require_zstandard().ZstdCompressor().compressobj()
+    return None
+
+
+def _decompressor(compression: str):
+    if compression == COMPRESSION_ZLIB:
+        return zlib.decompressobj()
+    if compression == COMPRESSION_ZSTD:
+        return _require_zstandard().ZstdDecompressor().decompressobj()
+    return None
+
+
+def _require_zstandard():
+    if zstandard is None:
+        raise RuntimeError("zstd compression requires the zstandard package")
+    return zstandard
+
+
+def _write_names(sink: _Sink, names: List[str]) -> None:
+    parts = [COUNT.pack(len(names))]
+    for name in names:
+        encoded = name.encode('utf-8')
+        parts.append(NAME_LENGTH.pack(len(encoded)) + encoded)
+    sink.write(b''.join(parts))
+
+
+def _read_names(source: _Source) -> List[str]:
+    count = COUNT.unpack(source.read(COUNT.size))[0]
+    names = []
+    for _ in range(count):
+        length = NAME_LENGTH.unpack(source.read(NAME_LENGTH.size))[0]
+        names.append(source.read(length).decode('utf-8'))
+    return names
+
+
+def _read_chunks(source: _Source, record: np.dtype) -> Iterator[np.ndarray]:
+    while True:
+        count = COUNT.unpack(source.read(COUNT.size))[0]
+        if not count:
+            source.close()
+            return
+        yield np.frombuffer(source.read(count * record.itemsize), dtype=record)
@@ -0,0 +1,201 @@
+# storage/local_cache.py
+"""
+Локальный кэш колоды (local-first) и обмен изменениями с основной базой
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, select
+from sqlalchemy.dialects.sqlite import insert
+
+from srs.card_ids import CardCodec
+from storage.database import PoolSettings, create_database_engine
+from storage.repository import DeckRepository
+
+DEFAULT_SYNC_INTERVAL = 300.0  # секунд между фоновыми синхронизациями
+
+logger = logging.getLogger(__name__)
+
+# Состояние синхронизации хранится только в локальном файле
+sync_metadata = MetaData()
+sync_state = Table(
+    'sync_state',
+    sync_metadata,
+    Column('user_id', String(255), primary_key=True),
+    Column('pushed_seq', Integer, nullable=False),   # последнее отправленное локальное событие
+    Column('pulled_seq', Integer, nullable=False),   # последнее учтенное событие основной базы
+    Column('synced_at', Float, nullable=False),
+)
+
+
+def get_local_cache_dir() -> Optional[str]:
+    """Каталог локальных кэшей из LOCAL_CACHE_DIR (None - режим local-first выключен)"""
+    return os.getenv('LOCAL_CACHE_DIR') or None
+
+
+def get_sync_interval() -> float:
+    """Период фоновой синхронизации из LOCAL_SYNC_INTERVAL, секунд"""
+    return float(os.getenv('LOCAL_SYNC_INTERVAL', DEFAULT_SYNC_INTERVAL))
+
+
+@dataclass(frozen=True)
+class SyncResult:
+    pulled_cards: int    # карточек обновлено из основной базы
+    pushed_events: int   # событий отправлено в основную базу
+    pushed_cards: int    # карточек отправлено в основную базу
+    pulled_ids: Tuple[int, ...] = ()  # id карточек, обновленных из основной базы
+
+
+class LocalCache:
+    """
+    Колода пользователя в отдельном файле SQLite рядом с приложением
+
+    Сессия читает и пишет только в локальный файл, поэтому вход и ответы
+    не ждут основную базу. sync() обменивается с ней изменениями:
+
+    1. pull - события основной базы после pulled_seq указывают, какие
+       карточки изменились на других устройствах; их строки копируются
+       в кэш (при первом входе - вся колода);
+    2. push - локальные события после pushed_seq дописываются в конец
+       журнала основной базы вместе со строками затронутых карточек.
+
+    Каждая карточка разрешается по updated_at: побеждает более поздняя запись.
+    Колода в памяти не видит, что pull обновил файл, поэтому фоновая
+    синхронизация сообщает id пришедших карточек в on_pull.
+    """
+
+    def __init__(self, directory: str, user_id: str, codec: CardCodec):
+        os.makedirs(directory, exist_ok=True)
+        file_name = hashlib.sha256(user_id.encode('utf-8')).hexdigest()[:32] + '.db'
+        self.path = os.path.join(directory, file_name)
+        self.user_id = user_id
+
+        engine = create_database_engine(f"sqlite:///{self.path}", PoolSettings(size=2, max_overflow=2))
+        self.repository = DeckRepository(engine, codec)
+        self.repository.create_schema()
+        sync_metadata.create_all(engine)
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sync_thread: Optional[threading.Thread] = None
+        self._primary: Optional[DeckRepository] = None
+        self._on_pull: Optional[Callable[[List[int]], None]] = None
+
+    @property
+    def has_synced(self) -> bool:
+        """Была ли хотя бы одна успешная синхронизация"""
+        return self._state() is not None
+
+    def sync(self, primary: DeckRepository) -> SyncResult:
+        """Обменивается изменениями с основной базой (ошибки SQLAlchemy пробрасываются)"""
+        with self._lock:
+            state = self._state()
+            if state is None:
+                # Первая синхронизация на этом сервере - копируем колоду целиком
+                state = {'pushed_seq': 0, 'pulled_seq': None}
+            pulled_ids, pulled_seq = self._pull(primary, state['pulled_seq'])
+
+            local_events = self.repository.events_since(self.user_id, state['pushed_seq'])
+            pushed_seq = local_events[-1].seq if local_events else state['pushed_seq']
+            card_ids = sorted({event.card_id for event in local_events})
+            card_rows = self.repository.card_rows_by_id(self.user_id, card_ids)
+            if local_events or card_rows:
+                before, after = primary.append_events(self.user_id, local_events, card_rows)
+                # Свои события забирать обратно не нужно, если между pull и push никто не писал
+                if before == pulled_seq:
+                    pulled_seq = after
+
+            self._save_state(pushed_seq, pulled_seq)
+            return SyncResult(len(pulled_ids), len(local_events), len(card_rows), tuple(pulled_ids))
+
+    def start_periodic_sync(
+        self,
+        primary: DeckRepository,
+        interval: Optional[float] = None,
+        on_pull: Optional[Callable[[List[int]], None]] = None
+    ) -> None:
+        """
+        Запускает фоновую синхронизацию раз в interval секунд
+
+        Args:
+            primary: Основная база
+            interval: Период, секунд (по умолчанию LOCAL_SYNC_INTERVAL)
+            on_pull: Вызывается с id карточек, пришедших из основной базы
+                (вне lock кэша, чтобы не ждать сессию, которая сама синхронизируется)
+        """
+        if self._sync_thread is not None:
+            return
+        interval = get_sync_interval() if interval is None else interval
+        self._primary = primary
+        self._on_pull = on_pull
+        self._sync_thread = threading.Thread(
+            target=self._sync_periodically, args=(primary, interval), name='local-sync', daemon=True
+        )
+        self._sync_thread.start()
+
+    def stop_periodic_sync(self) -> None:
+        """Останавливает фоновую синхронизацию"""
+        self._stop.set()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Останавливает фоновую синхронизацию и закрывает соединения с файлом
+
+        Перед закрытием изменения последний раз отправляются в основную
+        базу; если она недоступна, они останутся в файле до следующего входа.
+
+        Args:
+            timeout: Сколько ждать завершения текущей синхронизации, секунд
+        """
+        self.stop_periodic_sync()
+        if self._sync_thread is not None:
+            self._sync_thread.join(timeout)
+        if self._primary is not None:
+            try:
+                self.sync(self._primary)
+            except Exception as e:  # noqa: BLE001 - основная база может быть недоступна
+                logger.warning("final sync failed for %s: %s", self.path, e)
+        self.repository.engine.dispose()
+
+    def _pull(self, primary: DeckRepository, pulled_seq: Optional[int]):
+        if pulled_seq is None:
+            last_seq = primary.last_event_seq(self.user_id)
+            rows = primary.card_rows_by_id(self.user_id)
+        else:
+            events = primary.events_since(self.user_id, pulled_seq)
+            last_seq = events[-1].seq if events else pulled_seq
+            rows = primary.card_rows_by_id(self.user_id, sorted({event.card_id for event in events}))
+        self.repository.write(rows, [])
+        return [row['card_id'] for row in rows], last_seq
+
+    def _sync_periodically(self, primary: DeckRepository, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                result = self.sync(primary)
+            except Exception as e:  # noqa: BLE001 - основная база может быть недоступна
+                logger.warning("background sync failed for %s: %s", self.path, e)
+                continue
+            if result.pulled_ids and self._on_pull is not None:
+                try:
+                    self._on_pull(list(result.pulled_ids))
+                except Exception:  # noqa: BLE001 - синхронизация не должна останавливаться
+                    logger.exception("merging pulled cards failed for %s", self.path)
+
+    def _state(self) -> Optional[dict]:
+        query = select(sync_state).where(sync_state.c.user_id == self.user_id)
+        with self.repository.engine.connect() as connection:
+            row = connection.execute(query).mappings().first()
+        return dict(row) if row else None
+
+    def _save_state(self, pushed_seq: int, pulled_seq: int) -> None:
+        values = {'pushed_seq': pushed_seq, 'pulled_seq': pulled_seq, 'synced_at': time.time()}
+        statement = insert(sync_state).values(user_id=self.user_id, **values)
+        statement = statement.on_conflict_do_update(index_elements=[sync_state.c.user_id], set_=values)
+        with self.repository.engine.begin() as connection:
+            connection.execute(statement)
@@ -0,0 +1,150 @@
+# storage/migrations.py
+"""
+Миграции схемы базы данных
+
+Каждая миграция - шаг с номером версии. Примененные версии записываются
+в таблицу schema_version, migrate() выполняет недостающие по порядку,
+каждую в своей транзакции. Шаги идемпотентны (checkfirst), поэтому базы,
+созданные до появления миграций через create_all, доводятся до текущей
+версии без ошибок.
+
+Шаг описывает схему такой, какой она была в его версии, а не текущие
+таблицы из storage.schema: иначе первая миграция сразу создала бы
+столбцы и индексы из следующих. Процессы, стартующие одновременно,
+применяют миграции по очереди: под advisory lock в Postgres и под
+блокировкой записи (BEGIN IMMEDIATE) в SQLite.
+"""
+
+import time
+from typing import Callable, List, NamedTuple
+
+from sqlalchemy import Column, Float, Index, Integer, MetaData, String, Table, func, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+
+from storage.schema import schema_version
+
+MIGRATION_LOCK_ID = 0x53564d47  # ключ pg_advisory_xact_lock для миграций
+
+# Таблицы версии 1 (без updated_at и без индекса)
+_v1_metadata = MetaData()
+_v1_cards = Table(
+    'cards',
+    _v1_metadata,
+    Column('user_id', String(255), primary_key=True),
+    Column('card_id', Integer, primary_key=True, autoincrement=False),
+    Column('tense', String(32), nullable=False),
+    Column('easiness', Float, nullable=False),
+    Column('interval', Integer, nullable=False),
+    Column('repetitions', Integer, nullable=False),
+    Column('next_review_day', Integer, nullable=False),
+    Column('last_review_day', Integer, nullable=False),
+    Column('total_reviews', Integer, nullable=False),
+    Column('correct_reviews', Integer, nullable=False),
+)
+_v1_review_events = Table(
+    'review_events',
+    _v1_metadata,
+    Column('user_id', String(255), primary_key=True),
+    Column('seq', Integer, primary_key=True, autoincrement=False),
+    Column('card_id', Integer, nullable=False),
+    Column('grade', Integer, nullable=False),
+    Column('timestamp', Float, nullable=False),
+    Column('prev_interval', Integer, nullable=False),
+    Column('prev_ease', Float, nullable=False),
+)
+
+# Индекс версии 2 - на копии таблицы, чтобы create() версии 1 его не создавал
+_v2_cards = _v1_cards.to_metadata(MetaData())
+_v2_due_index = Index('ix_cards_user_due', _v2_cards.c.user_id, _v2_cards.c.next_review_day, _v2_cards.c.tense)
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+def _create_tables(connection: Connection) -> None:
+    _v1_cards.create(connection, checkfirst=True)
+    _v1_review_events.create(connection, checkfirst=True)
+
+
+def _create_due_index(connection: Connection) -> None:
+    _v2_due_index.create(connection, checkfirst=True)
+
+
+def _add_card_updated_at(connection: Connection) -> None:
+    if 'updated_at' not in {column['name'] for column in inspect(connection).get_columns('cards')}:
+        column_type = Float().compile(connection.dialect)
+        connection.execute(text(f"ALTER TABLE cards ADD COLUMN updated_at {column_type} NOT NULL DEFAULT 0"))
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, 'cards and review_events tables', _create_tables),
+    Migration(2, 'cards due index (user_id, next_review_day, tense)', _create_due_index),
+    Migration(3, 'cards.updated_at for last-writer-wins sync', _add_card_updated_at),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(engine: Engine) -> int:
+    """Последняя примененная версия схемы (0 для пустой базы)"""
+    with engine.begin() as connection:
+        _lock(connection)
+        schema_version.create(connection, checkfirst=True)
+        return _applied_version(connection)
+
+
+def migrate(engine: Engine, target: int = LATEST_VERSION) -> List[int]:
+    """
+    Доводит схему базы до версии target
+
+    Args:
+        engine: Движок базы
+        target: Целевая версия (по умолчанию последняя)
+
+    Returns:
+        Номера примененных миграций
+    """
+    applied = []
+    version = current_version(engine)
+    for migration in MIGRATIONS:
+        if not version < migration.version <= target:
+            continue
+        try:
+            with engine.begin() as connection:
+                _lock(connection)
+                # Пока ждали блокировку, миграцию мог применить другой процесс
+                version = _applied_version(connection)
+                if version >= migration.version:
+                    continue
+                migration.apply(connection)
+                connection.execute(schema_version.insert().values(
+                    version=migration.version,
+                    description=migration.description,
+                    applied_at=time.time()
+                ))
+        except IntegrityError:
+            # База без блокировки миграций: версию одновременно записал другой процесс
+            version = current_version(engine)
+            if version < migration.version:
+                raise
+            continue
+        version = migration.version
+        applied.append(migration.version)
+    return applied
+
+
+def _lock(connection: Connection) -> None:
+    """Блокировка миграций до конца транзакции; вызывается первой командой транзакции"""
+    if connection.dialect.name == 'postgresql':
+        connection.execute(text("SELECT pg_advisory_xact_lock(:lock_id)"), {'lock_id': MIGRATION_LOCK_ID})
+    elif connection.dialect.name == 'sqlite':
+        # pysqlite не открывает транзакцию перед DDL - берем блокировку записи сразу
+        connection.exec_driver_sql('BEGIN IMMEDIATE')
+
+
+def _applied_version(connection: Connection) -> int:
+    return connection.execute(select(func.max(schema_version.c.version))).scalar() or 0
@@ -0,0 +1,440 @@
+# storage/repository.py
+"""
+Репозиторий колод: загрузка одним запросом и сохранение изменений одним upsert
+"""
+
+import csv
+import io
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+
+from srs.card_ids import CardCodec
+from srs.card_store import CardStore
+from srs.review_log import ReviewEvent
+from storage.migrations import migrate
+from storage.schema import cards, review_events
+
+CARD_VALUE_COLUMNS = (
+    'tense', 'easiness', 'interval', 'repetitions', 'next_review_day',
+    'last_review_day', 'total_reviews', 'correct_reviews'
+)
+
+# Максимум id в одном IN (...): меньше лимита параметров любого драйвера
+ID_BATCH_SIZE = 1000
+
+# Событие для потоковой записи: (card_id, grade, timestamp, prev_interval, prev_ease)
+EventTuple = Tuple[int, int, float, int, float]
+
+# Части колоды к загрузке: время -> диапазон порядковых номеров глаголов [от, до)
+VerbRanges = Dict[str, Tuple[int, int]]
+
+
+class DeckCoverage:
+    """
+    Какие части колоды уже загружены в сессию
+
+    Уровни словаря - префиксы каталога, поэтому для каждого времени хватает
+    числа загруженных глаголов: карточки первых N глаголов - это id ниже
+    CardCodec.first_id_of_verb(N).
+    """
+
+    def __init__(self):
+        self.verb_counts: Dict[str, int] = {}
+
+    def missing(self, tenses: Iterable[str], verb_count: int) -> VerbRanges:
+        """Диапазоны, которых не хватает для выбранных времён и уровня словаря"""
+        ranges = {}
+        for tense in tenses:
+            loaded = self.verb_counts.get(tense, 0)
+            if loaded < verb_count:
+                ranges[tense] = (loaded, verb_count)
+        return ranges
+
+    def extend(self, ranges: VerbRanges) -> None:
+        """Отмечает диапазоны загруженными"""
+        for tense, (_, end) in ranges.items():
+            self.verb_counts[tense] = max(self.verb_counts.get(tense, 0), end)
+
+
+class DeckRepository:
+    """
+    Хранение колод пользователей в SQL-базе (SQLite локально, Postgres в продакшене)
+
+    Колода загружается одним SELECT по user_id прямо в колонки CardStore,
+    целиком или только нужными частями (времена и диапазоны глаголов).
+    Сохраняются только переданные карточки: один INSERT ... ON CONFLICT
+    DO UPDATE со всеми строками в одной транзакции. На Postgres SQLAlchemy
+    отправляет его многострочными VALUES (insertmanyvalues), на SQLite -
+    через executemany; запрос компилируется один раз и кэшируется.
+    События журнала ответов дописываются в той же транзакции.
+
+    Конфликты записи карточки решаются по updated_at (last writer wins):
+    строка в базе заменяется, только если пришедшая записана не раньше.
+    """
+
+    def __init__(self, engine: Engine, codec: CardCodec):
+        self.engine = engine
+        self.codec = codec
+
+    def create_schema(self) -> None:
+        """Доводит схему базы до последней версии (storage.migrations)"""
+        migrate(self.engine)
+
+    def load_deck(self, user_id: str) -> CardStore:
+        """Загружает всю колоду пользователя одним запросом"""
+        store = CardStore()
+        self._load_into(store, self._card_query(user_id))
+        return store
+
+    def load_partitions(self, user_id: str, ranges: VerbRanges, store: Optional[CardStore] = None) -> List[int]:
+        """
+        Догружает в колоду карточки указанных частей одним запросом
+
+        Карточки, которые уже есть в колоде, не перезаписываются: в сессии
+        они не старше, чем в базе.
+
+        Args:
+            user_id: Пользователь
+            ranges: Время -> диапазон порядковых номеров глаголов [от, до)
+            store: Колода сессии (по умолчанию новая)
+
+        Returns:
+            Id добавленных карточек
+        """
+        if not ranges:
+            return []
+
+        query = self._card_query(user_id).where(or_(*[
+            and_(
+                cards.c.tense == tense,
+                cards.c.card_id >= self.codec.first_id_of_verb(start),
+                cards.c.card_id < self.codec.first_id_of_verb(end)
+            )
+            for tense, (start, end) in ranges.items()
+        ]))
+        return self._load_into(store if store is not None else CardStore(), query)
+
+    def refresh_cards(self, user_id: str, store: CardStore, card_ids: Sequence[int]) -> List[int]:
+        """
+        Перечитывает из базы значения карточек, которые уже есть в колоде
+
+        Args:
+            user_id: Пользователь
+            store: Колода сессии
+            card_ids: Id карточек, изменившихся в базе
+
+        Returns:
+            Id перечитанных карточек
+        """
+        refreshed = []
+        with self.engine.connect() as connection:
+            for start in range(0, len(card_ids), ID_BATCH_SIZE):
+                query = self._card_query(user_id).where(cards.c.card_id.in_(card_ids[start:start + ID_BATCH_SIZE]))
+                for card_id, *values in connection.execute(query):
+                    if card_id in store:
+                        store.replace_row(card_id, *values)
+                        refreshed.append(card_id)
+        return refreshed
+
+    def count_due(
+        self,
+        user_id: str,
+        today: int,
+        tenses: Optional[Iterable[str]] = None,
+        verb_count: Optional[int] = None
+    ) -> int:
+        """
+        Количество карточек к повторению, посчитанное в базе
+
+        Тот же фильтр, что у get_due_cards, без загрузки колоды: запрос
+        проходит по индексу ix_cards_user_due.
+
+        Args:
+            user_id: Пользователь
+            today: Номер дня (ordinal)
+            tenses: Выбранные времена (по умолчанию все)
+            verb_count: Уровень словаря - число первых глаголов каталога (по умолчанию все)
+        """
+        query = select(func.count()).select_from(cards).where(
+            cards.c.user_id == user_id, *self._due_filter(today, tenses, verb_count)
+        )
+        with self.engine.connect() as connection:
+            return connection.execute(query).scalar()
+
+    def fetch_due(
+        self,
+        user_id: str,
+        today: int,
+        limit: int,
+        tenses: Optional[Iterable[str]] = None,
+        verb_count: Optional[int] = None
+    ) -> CardStore:
+        """
+        Первые limit карточек к повторению (самые просроченные первыми)
+
+        Параметры - как у count_due. Карточки возвращаются в CardStore
+        в порядке повторения.
+        """
+        query = (
+            self._card_query(user_id)
+            .where(*self._due_filter(today, tenses, verb_count))
+            .order_by(cards.c.next_review_day, cards.c.card_id)
+            .limit(limit)
+        )
+        store = CardStore()
+        self._load_into(store, query)
+        return store
+
+    def last_event_seq(self, user_id: str) -> int:
+        """Номер последнего сохраненного события журнала (0, если журнал пуст)"""
+        query = select(func.max(review_events.c.seq)).where(review_events.c.user_id == user_id)
+        with self.engine.connect() as connection:
+            return connection.execute(query).scalar() or 0
+
+    def events_since(self, user_id: str, seq: int) -> List[ReviewEvent]:
+        """События журнала с номером больше seq"""
+        query = select(
+            review_events.c.seq, review_events.c.card_id, review_events.c.grade, review_events.c.timestamp,
+            review_events.c.prev_interval, review_events.c.prev_ease
+        ).where(review_events.c.user_id == user_id, review_events.c.seq > seq).order_by(review_events.c.seq)
+        with self.engine.connect() as connection:
+            return [ReviewEvent(*row) for row in connection.execute(query)]
+
+    def card_rows_by_id(self, user_id: str, card_ids: Optional[Sequence[int]] = None) -> List[Dict]:
+        """Строки таблицы cards как есть (вместе с updated_at); по умолчанию вся колода"""
+        query = select(cards).where(cards.c.user_id == user_id)
+        with self.engine.connect() as connection:
+            if card_ids is None:
+                return [dict(row) for row in connection.execute(query).mappings()]
+            rows = []
+            for start in range(0, len(card_ids), ID_BATCH_SIZE):
+                batch = query.where(cards.c.card_id.in_(card_ids[start:start + ID_BATCH_SIZE]))
+                rows.extend(dict(row) for row in connection.execute(batch).mappings())
+            return rows
+
+    def append_events(self, user_id: str, events: Sequence[ReviewEvent], card_rows: List[Dict]) -> Tuple[int, int]:
+        """
+        Дописывает события в конец журнала и карточки одной транзакцией
+
+        События получают номера после последнего сохраненного, поэтому
+        журналы разных устройств не пересекаются. Если другое устройство
+        успело дописать те же номера, транзакция откатывается с ошибкой.
+
+        Returns:
+            (номер последнего события до записи, номер последнего после)
+        """
+        with self.engine.begin() as connection:
+            last_seq = connection.execute(
+                select(func.max(review_events.c.seq)).where(review_events.c.user_id == user_id)
+            ).scalar() or 0
+            if events:
+                renumbered = [
+                    ReviewEvent(last_seq + offset, event.card_id, event.grade, event.timestamp,
+                                event.prev_interval, event.prev_ease)
+                    for offset, event in enumerate(events, 1)
+                ]
+                connection.execute(review_events.insert(), self.event_rows(user_id, renumbered))
+            if card_rows:
+                self._upsert(connection, card_rows)
+        return last_seq, last_seq + len(events)
+
+    def bulk_append_events(
+        self,
+        user_id: str,
+        chunks: Iterable[Sequence[EventTuple]],
+        card_rows: List[Dict]
+    ) -> Tuple[int, int]:
+        """
+        Потоково дописывает большой журнал и карточки одной транзакцией
+
+        Для импорта истории: события приходят порциями и получают номера
+        после последнего сохраненного, как в append_events. В Postgres
+        (psycopg2) порции грузятся через COPY FROM STDIN, в остальных
+        базах - executemany. При ошибке не остается ни одной порции.
+
+        Args:
+            user_id: ID пользователя
+            chunks: Порции событий в порядке записи
+            card_rows: Строки карточек, записываемые после событий
+
+        Returns:
+            (номер последнего события до записи, номер последнего после)
+        """
+        with self.engine.begin() as connection:
+            last_seq = connection.execute(
+                select(func.max(review_events.c.seq)).where(review_events.c.user_id == user_id)
+            ).scalar() or 0
+            use_copy = connection.dialect.driver == 'psycopg2'
+            names = [column.name for column in review_events.columns]
+            statement = str(review_events.insert().compile(dialect=connection.dialect, column_keys=names))
+            seq = last_seq
+            for chunk in chunks:
+                rows = [(user_id, seq + offset, *event) for offset, event in enumerate(chunk, 1)]
+                seq += len(rows)
+                if not rows:
+                    continue
+                if use_copy:
+                    _copy_rows(connection, review_events, rows)
+                elif connection.dialect.positional:
+                    connection.exec_driver_sql(statement, rows)
+                else:
+                    connection.exec_driver_sql(statement, [dict(zip(names, row)) for row in rows])
+            if card_rows:
+                self._upsert(connection, card_rows)
+        return last_seq, seq
+
+    def save_cards(self, user_id: str, store: CardStore, card_ids: Iterable[int]) -> int:
+        """
+        Сохраняет указанные карточки колоды
+
+        Args:
+            user_id: Пользователь
+            store: Колода
+            card_ids: Id изменившихся карточек
+
+        Returns:
+            Количество записанных строк
+        """
+        rows = self.card_rows(user_id, store, card_ids)
+        self.write(rows, [])
+        return len(rows)
+
+    def save_deck(self, user_id: str, store: CardStore) -> int:
+        """Сохраняет всю колоду"""
+        return self.save_cards(user_id, store, store.keys())
+
+    def write(self, card_rows: List[Dict], event_rows: List[Dict]) -> None:
+        """
+        Записывает строки карточек и события журнала одной транзакцией
+
+        События получают номера после последнего сохраненного, как в
+        append_events: номера из строк задают только порядок. Если другая
+        транзакция успела занять те же номера, запись падает с IntegrityError
+        и откатывается целиком - пачку повторяют, и номера назначаются заново.
+        """
+        if not card_rows and not event_rows:
+            return
+
+        with self.engine.begin() as connection:
+            if card_rows:
+                self._upsert(connection, card_rows)
+            if event_rows:
+                self._insert_events(connection, event_rows)
+
+    def card_rows(self, user_id: str, store: CardStore, card_ids: Iterable[int]) -> List[Dict]:
+        """Строки таблицы cards для указанных карточек колоды (updated_at - сейчас)"""
+        now = time.time()
+        rows = []
+        for card_id in card_ids:
+            row = store.row_of(card_id)
+            rows.append({
+                'user_id': user_id,
+                'card_id': card_id,
+                'tense': store.tenses[store.tense_id[row]],
+                'easiness': store.easiness[row],
+                'interval': store.interval[row],
+                'repetitions': store.repetitions[row],
+                'next_review_day': store.next_day[row],
+                'last_review_day': store.last_day[row],
+                'total_reviews': store.total_reviews[row],
+                'correct_reviews': store.correct_reviews[row],
+                # Новая карточка без ответов не должна перетирать чужой прогресс
+                'updated_at': now if store.total_reviews[row] else 0.0,
+            })
+        return rows
+
+    @staticmethod
+    def event_rows(user_id: str, events: Iterable[ReviewEvent]) -> List[Dict]:
+        """Строки таблицы review_events для событий журнала"""
+        return [
+            {
+                'user_id': user_id,
+                'seq': event.seq,
+                'card_id': event.card_id,
+                'grade': event.grade,
+                'timestamp': event.timestamp,
+                'prev_interval': event.prev_interval,
+                'prev_ease': event.prev_ease,
+            }
+            for event in events
+        ]
+
+    def _due_filter(self, today: int, tenses: Optional[Iterable[str]], verb_count: Optional[int]) -> List:
+        conditions = [cards.c.next_review_day <= today]
+        if tenses is not None:
+            conditions.append(cards.c.tense.in_(list(tenses)))
+        if verb_count is not None:
+            conditions.append(cards.c.card_id < self.codec.first_id_of_verb(verb_count))
+        return conditions
+
+    @staticmethod
+    def _card_query(user_id: str):
+        return select(cards.c.card_id, *[cards.c[name] for name in CARD_VALUE_COLUMNS[1:]]).where(
+            cards.c.user_id == user_id
+        )
+
+    def _load_into(self, store: CardStore, query) -> List[int]:
+        added = []
+        with self.engine.connect() as connection:
+            for card_id, *values in connection.execute(query):
+                if card_id in store:
+                    continue
+                verb, pronoun_index, tense = self.codec.decode(card_id)
+                store.add_row(card_id, verb, pronoun_index, tense, *values)
+                added.append(card_id)
+        return added
+
+    def _upsert(self, connection: Connection, rows: List[Dict]) -> None:
+        """Многострочный upsert в рамках текущей транзакции"""
+        statement = _dialect_insert(connection)(cards)
+        statement = statement.on_conflict_do_update(
+            index_elements=[cards.c.user_id, cards.c.card_id],
+            set_={name: statement.excluded[name] for name in CARD_VALUE_COLUMNS + ('updated_at',)},
+            where=cards.c.updated_at <= statement.excluded.updated_at
+        )
+        connection.execute(statement, rows)
+
+    def _insert_events(self, connection: Connection, rows: List[Dict]) -> None:
+        """Дописывает события в конец журналов пользователей в рамках текущей транзакции"""
+        last_seqs: Dict[str, int] = {}
+        renumbered = []
+        for row in sorted(rows, key=lambda row: row['seq']):
+            user_id = row['user_id']
+            if user_id not in last_seqs:
+                last_seqs[user_id] = connection.execute(
+                    select(func.max(review_events.c.seq)).where(review_events.c.user_id == user_id)
+                ).scalar() or 0
+            last_seqs[user_id] += 1
+            renumbered.append({**row, 'seq': last_seqs[user_id]})
+        # Обычный INSERT: конфликт номеров - ошибка, а не молча потерянные события
+        connection.execute(review_events.insert(), renumbered)
+
+
+def _dialect_insert(connection: Connection):
+    """insert() с поддержкой ON CONFLICT для диалекта соединения"""
+    dialect = connection.dialect.name
+    if dialect == 'postgresql':
+        return postgresql.insert
+    if dialect == 'sqlite':
+        return sqlite.insert
+    raise NotImplementedError(f"upsert is not supported for {dialect}")
+
+
+def _copy_rows(connection: Connection, table, rows: List[Tuple]) -> None:
+    """COPY FROM STDIN порции строк (в порядке столбцов таблицы) в рамках текущей транзакции"""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+
+    preparer = connection.dialect.identifier_preparer
+    columns = ', '.join(preparer.format_column(column) for column in table.columns)
+    statement = f"COPY {preparer.format_table(table)} ({columns}) FROM STDIN WITH (FORMAT csv)"
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(statement, buffer)
+    finally:
+        cursor.close()
@@ -0,0 +1,342 @@
+# storage/review_import.py
+"""
+Импорт истории повторений из других программ (CSV или NDJSON)
+
+Каждая строка истории - один ответ с полями verb, tense, pronoun, grade и
+timestamp. Глаголы и времена сопоставляются с ключами каталога (VERBS и
+CONJUGATIONS), местоимения - со списком PRONOUNS. Строки, которые не удалось
+сопоставить, пропускаются и считаются по причинам.
+
+Импорт идет в три этапа:
+
+1. read - потоковый разбор файла в столбцы (id карточки, оценка, время);
+2. rebuild - ответы упорядочиваются по времени и применяются к колоде
+   пользователя через SRSManager.update_many порциями; заодно для журнала
+   запоминаются интервал и EF перед каждым ответом;
+3. write - журнал и измененные карточки записываются одной транзакцией
+   через DeckRepository.bulk_append_events (COPY FROM STDIN в Postgres).
+
+Запуск: python -m storage.review_import FILE --user EMAIL [--format csv|ndjson]
+[--database-url URL] (по умолчанию - база из DATABASE_URL)
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import os
+import sys
+import time
+import unicodedata
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, Optional, Sequence, TextIO, Tuple
+
+import numpy as np
+
+from srs.card_ids import CardCodec
+from srs.card_store import CardStore
+from srs.catalog import CONJUGATIONS, PRONOUNS, VERBS
+from srs.models import Card, Difficulty
+from srs.scheduler import SRSManager
+from storage.database import create_database_engine
+from storage.repository import DeckRepository
+
+IMPORT_CHUNK_SIZE = 50_000
+
+# Допустимое время ответа: с 1970 года до 9999 года (unix-время, с)
+MIN_TIMESTAMP = 0.0
+MAX_TIMESTAMP = 253_370_764_800.0
+
+FORMAT_CSV = 'csv'
+FORMAT_NDJSON = 'ndjson'
+FORMAT_BY_EXTENSION = {'.csv': FORMAT_CSV, '.ndjson': FORMAT_NDJSON, '.jsonl': FORMAT_NDJSON}
+
+# Названия времён в других программах -> ключи CONJUGATIONS (без ударений, в нижнем регистре)
+TENSE_ALIASES = {
+    'present': 'presente',
+    'present indicative': 'presente',
+    'presente de indicativo': 'presente',
+    'preterite': 'indefinido',
+    'preterito': 'indefinido',
+    'preterito indefinido': 'indefinido',
+    'preterito perfecto simple': 'indefinido',
+    'imperfect': 'imperfecto',
+    'preterito imperfecto': 'imperfecto',
+    'subjunctive': 'subjuntivo',
+    'present subjunctive': 'subjuntivo',
+    'presente de subjuntivo': 'subjuntivo',
+}
+
+# Формы местоимений, которых нет в PRONOUNS -> местоимение из PRONOUNS
+PRONOUN_ALIASES = {
+    'usted': 'él/ella',
+    'nosotras': 'nosotros',
+    'vosotras': 'vosotros',
+    'ustedes': 'ellos/ellas',
+}
+
+# Обратный вызов прогресса: (этап, обработано строк, строк в секунду)
+ProgressCallback = Callable[[str, int, float], None]
+
+
+@dataclass(frozen=True)
+class ImportReport:
+    read: int                    # строк в файле
+    imported: int                # ответов записано в журнал
+    cards: int                   # карточек пересчитано
+    first_seq: int               # номер первого записанного события
+    last_seq: int                # номер последнего записанного события
+    seconds: float               # общее время импорта
+    skipped: Dict[str, int] = field(default_factory=dict)  # причина -> строк пропущено
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.seconds if self.seconds else 0.0
+
+
+class ReviewMapper:
+    """Сопоставляет поля строки истории с id карточки, оценкой и временем ответа"""
+
+    def __init__(self, codec: CardCodec, pronouns: Sequence[str]):
+        self.codec = codec
+        self._verbs = {_fold(verb): verb for verb in codec.verbs}
+        self._tenses = {_fold(tense): tense for tense in codec.tenses}
+        self._tenses.update({
+            alias: tense for alias, tense in TENSE_ALIASES.items()
+            if tense in codec.tenses and alias not in self._tenses
+        })
+
+        self._pronouns: Dict[str, int] = {str(index): index for index in range(len(pronouns))}
+        for index, pronoun in enumerate(pronouns):
+            for form in [pronoun, *pronoun.split('/')]:
+                self._pronouns.setdefault(_fold(form), index)
+        for alias, pronoun in PRONOUN_ALIASES.items():
+            if pronoun in pronouns:
+                self._pronouns.setdefault(_fold(alias), pronouns.index(pronoun))
+        self._grades = {str(grade.value): grade.value for grade in Difficulty}
+        self._grades.update({grade.name.lower(): grade.value for grade in Difficulty})
+
+    def map(self, record: Dict) -> Tuple[int, int, float]:
+        """
+        Строка истории -> (id карточки, оценка, время ответа)
+
+        Raises:
+            ValueError: если поле не удалось сопоставить (args[0] - причина)
+        """
+        verb = _lookup(self._verbs, record.get('verb'))
+        if verb is None:
+            raise ValueError('unknown verb')
+        tense = _lookup(self._tenses, record.get('tense'))
+        if tense is None:
+            raise ValueError('unknown tense')
+        pronoun_index = _lookup(self._pronouns, record.get('pronoun'))
+        if pronoun_index is None:
+            raise ValueError('unknown pronoun')
+        grade = _lookup(self._grades, record.get('grade'))
+        if grade is None:
+            raise ValueError('unknown grade')
+        return self.codec.encode(verb, pronoun_index, tense), grade, _timestamp(record.get('timestamp'))
+
+
+def detect_format(path: str) -> str:
+    """Формат файла истории по расширению"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMAT_BY_EXTENSION:
+        raise ValueError(f"unsupported history file: {path}")
+    return FORMAT_BY_EXTENSION[extension]
+
+
+def read_history(stream: TextIO, fmt: str) -> Iterator[Dict]:
+    """Потоково читает строки истории как словари полей"""
+    if fmt == FORMAT_CSV:
+        yield from csv.DictReader(stream)
+    elif fmt == FORMAT_NDJSON:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        raise ValueError(f"unsupported history format: {fmt}")
+
+
+def import_history(
+    repository: DeckRepository,
+    user_id: str,
+    stream: TextIO,
+    fmt: str,
+    pronouns: Sequence[str],
+    progress: Optional[ProgressCallback] = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE
+) -> ImportReport:
+    """
+    Импортирует историю повторений и пересчитывает по ней колоду
+
+    Ответы применяются к текущей колоде пользователя в порядке времени и
+    дописываются в конец его журнала, поэтому импорт рассчитан на переход
+    из другой программы, а не на слияние с уже пройденными здесь карточками.
+
+    Args:
+        repository: Репозиторий основной базы
+        user_id: ID пользователя
+        stream: Текстовый поток файла истории
+        fmt: FORMAT_CSV или FORMAT_NDJSON
+        pronouns: Список местоимений каталога (PRONOUNS)
+        progress: Обратный вызов прогресса для каждой порции
+        chunk_size: Размер порции
+
+    Returns:
+        Отчет об импорте
+    """
+    started = time.perf_counter()
+    stage_started = {}
+
+    def report(stage: str, done: int) -> None:
+        if progress is not None:
+            elapsed = time.perf_counter() - stage_started.setdefault(stage, started)
+            progress(stage, done, done / elapsed if elapsed else 0.0)
+
+    # 1. read
+    mapper = ReviewMapper(repository.codec, pronouns)
+    card_ids, grades, timestamps = array('i'), array('b'), array('d')
+    skipped: Counter = Counter()
+    read = 0
+    for record in read_history(stream, fmt):
+        read += 1
+        try:
+            card_id, grade, timestamp = mapper.map(record)
+        except ValueError as e:
+            skipped[e.args[0]] += 1
+        except AttributeError:
+            skipped['malformed row'] += 1  # строка NDJSON - не объект
+        else:
+            card_ids.append(card_id)
+            grades.append(grade)
+            timestamps.append(timestamp)
+        if read % chunk_size == 0:
+            report('read', read)
+    report('read', read)
+
+    # 2. rebuild
+    stage_started['rebuild'] = time.perf_counter()
+    order = np.argsort(np.frombuffer(timestamps, dtype=np.float64), kind='stable')
+    card_ids = np.frombuffer(card_ids, dtype=np.int32)[order]
+    grades = np.frombuffer(grades, dtype=np.int8)[order]
+    timestamps = np.frombuffer(timestamps, dtype=np.float64)[order]
+    prev_intervals = np.empty(len(order), dtype=np.int32)
+    prev_eases = np.empty(len(order), dtype=np.float64)
+
+    store = repository.load_deck(user_id)
+    for start in range(0, len(order), chunk_size):
+        end = start + chunk_size
+        _add_missing(store, np.unique(card_ids[start:end]), repository.codec)
+        days = [datetime.date.fromtimestamp(timestamp).toordinal() for timestamp in timestamps[start:end].tolist()]
+        prev_intervals[start:end], prev_eases[start:end] = SRSManager.update_many(
+            store, card_ids[start:end], grades[start:end], days
+        )
+        report('rebuild', min(end, len(order)))
+
+    # 3. write
+    stage_started['write'] = time.perf_counter()
+    def event_chunks():
+        for start in range(0, len(order), chunk_size):
+            end = start + chunk_size
+            yield list(zip(
+                card_ids[start:end].tolist(), grades[start:end].tolist(), timestamps[start:end].tolist(),
+                prev_intervals[start:end].tolist(), prev_eases[start:end].tolist()
+            ))
+            report('write', min(end, len(order)))
+
+    changed = store.dirty_ids()
+    before, after = repository.bulk_append_events(
+        user_id, event_chunks(), repository.card_rows(user_id, store, changed)
+    )
+
+    return ImportReport(
+        read=read,
+        imported=after - before,
+        cards=len(changed),
+        first_seq=before + 1,
+        last_seq=after,
+        seconds=time.perf_counter() - started,
+        skipped=dict(skipped)
+    )
+
+
+def _add_missing(store: CardStore, card_ids: np.ndarray, codec: CardCodec) -> None:
+    for card_id in card_ids.tolist():
+        if card_id not in store:
+            verb, pronoun_index, tense = codec.decode(card_id)
+            store.add(card_id, Card(verb=verb, pronoun_index=pronoun_index, tense=tense))
+
+
+def _lookup(table: Dict, value):
+    """
+    Поиск по таблице, ключи которой прошли _fold
+
+    Найденное написание запоминается в таблице как есть, поэтому _fold
+    вызывается один раз на каждое новое написание, а не на каждую строку.
+    """
+    key = value if isinstance(value, str) else str(value)
+    found = table.get(key)
+    if found is None:
+        found = table.get(_fold(key))
+        if found is not None:
+            table[key] = found
+    return found
+
+
+def _fold(value) -> str:
+    """Текст без ударений, в нижнем регистре и без лишних пробелов"""
+    text = unicodedata.normalize('NFKD', str(value if value is not None else '')).strip().lower()
+    return ' '.join(''.join(char for char in text if not unicodedata.combining(char)).split())
+
+
+def _timestamp(value) -> float:
+    """Время ответа: unix-время в секундах или ISO 8601 (без пояса - местное)"""
+    try:
+        timestamp = float(value)
+    except (TypeError, ValueError):
+        try:
+            timestamp = datetime.datetime.fromisoformat(str(value).strip()).timestamp()
+        except ValueError:
+            raise ValueError('bad timestamp') from None
+    if isinstance(value, bool) or not MIN_TIMESTAMP <= timestamp <= MAX_TIMESTAMP:
+        raise ValueError('bad timestamp')
+    return timestamp
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Импорт истории из командной строки; код возврата 0 - успех"""
+    parser = argparse.ArgumentParser(description="Import review history into a user's deck")
+    parser.add_argument('path', help="history file (.csv, .ndjson or .jsonl)")
+    parser.add_argument('--user', required=True, help="user id (Google e-mail)")
+    parser.add_argument('--format', choices=[FORMAT_CSV, FORMAT_NDJSON], help="default: by file extension")
+    parser.add_argument('--database-url', help="default: DATABASE_URL")
+    parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    try:
+        fmt = args.format or detect_format(args.path)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Те же таблицы id карточек, что у приложения (load_card_codec)
+    repository = DeckRepository(create_database_engine(args.database_url), CardCodec(list(VERBS), list(CONJUGATIONS)))
+    repository.create_schema()
+
+    def print_progress(stage: str, rows: int, rate: float) -> None:
+        print(f"\r{stage:<8} {rows:>12,} rows | {rate:>12,.0f} rows/s", end='', file=sys.stderr, flush=True)
+
+    with open(args.path, encoding='utf-8', newline='') as stream:
+        report = import_history(repository, args.user, stream, fmt, PRONOUNS, print_progress, args.chunk_size)
+    print(file=sys.stderr)
+    print(f"imported {report.imported:,} of {report.read:,} rows into {report.cards:,} cards "
+          f"(events {report.first_seq}-{report.last_seq}) in {report.seconds:.2f} s")
+    for reason, count in sorted(report.skipped.items()):
+        print(f"skipped {count:,}: {reason}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
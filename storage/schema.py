@@ -0,0 +1,53 @@
+# storage/schema.py
+"""
+Схема таблиц для хранения колод и журналов ответов пользователей
+"""
+
+from sqlalchemy import Column, Float, Index, Integer, MetaData, String, Table
+
+metadata = MetaData()
+
+# Одна строка - одна карточка пользователя. card_id - упакованный id из
+# srs.card_ids (глагол, время, местоимение), даты - номера дней (ordinal).
+# updated_at - Unix-время записи для разрешения конфликтов (last writer wins).
+cards = Table(
+    'cards',
+    metadata,
+    Column('user_id', String(255), primary_key=True),
+    Column('card_id', Integer, primary_key=True, autoincrement=False),
+    Column('tense', String(32), nullable=False),
+    Column('easiness', Float, nullable=False),
+    Column('interval', Integer, nullable=False),
+    Column('repetitions', Integer, nullable=False),
+    Column('next_review_day', Integer, nullable=False),
+    Column('last_review_day', Integer, nullable=False),
+    Column('total_reviews', Integer, nullable=False),
+    Column('correct_reviews', Integer, nullable=False),
+    Column('updated_at', Float, nullable=False, server_default='0'),
+)
+
+# Карточки к повторению ищутся в базе: user_id = ? AND next_review_day <= ?
+# с фильтром по времени прямо по индексу, без чтения строк таблицы
+cards_due_index = Index('ix_cards_user_due', cards.c.user_id, cards.c.next_review_day, cards.c.tense)
+
+# Версия схемы, до которой доведена база (см. storage.migrations)
+schema_version = Table(
+    'schema_version',
+    metadata,
+    Column('version', Integer, primary_key=True, autoincrement=False),
+    Column('description', String(255), nullable=False),
+    Column('applied_at', Float, nullable=False),
+)
+
+# Журнал ответов: seq продолжает нумерацию ReviewLog между сессиями
+review_events = Table(
+    'review_events',
+    metadata,
+    Column('user_id', String(255), primary_key=True),
+    Column('seq', Integer, primary_key=True, autoincrement=False),
+    Column('card_id', Integer, nullable=False),
+    Column('grade', Integer, nullable=False),
+    Column('timestamp', Float, nullable=False),
+    Column('prev_interval', Integer, nullable=False),
+    Column('prev_ease', Float, nullable=False),
+)
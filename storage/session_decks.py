@@ -0,0 +1,300 @@
+# storage/session_decks.py
+"""
+Колоды пользователей в памяти процесса: одна на пользователя, сессии хранят только ключ
+"""
+
+import itertools
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from srs.card_store import CardStore
+from srs.due_index import DueIndex
+from srs.review_log import ReviewLog
+from srs.stats import DeckStats
+from sqlalchemy.exc import SQLAlchemyError
+
+from storage.local_cache import LocalCache
+from storage.repository import DeckCoverage, DeckRepository
+from storage.write_behind import FlushWorker, WriteBuffer
+
+DEFAULT_MAX_DECKS = 200
+DEFAULT_IDLE_SECONDS = 900.0   # колода без обращений дольше этого может быть вытеснена
+SWEEP_INTERVAL = 30.0          # период фонового сброса и вытеснения колод
+
+# Поколения колод уникальны в процессе: колода, перечитанная после вытеснения, - новое поколение
+_generations = itertools.count(1)
+
+logger = logging.getLogger(__name__)
+
+
+def get_deck_limits() -> Tuple[int, float]:
+    """Лимиты из DECK_POOL_SIZE (колод в памяти) и DECK_IDLE_SECONDS"""
+    return (
+        int(os.getenv('DECK_POOL_SIZE', DEFAULT_MAX_DECKS)),
+        float(os.getenv('DECK_IDLE_SECONDS', DEFAULT_IDLE_SECONDS))
+    )
+
+
+@dataclass
+class UserDeck:
+    """
+    Колода пользователя и структуры, которые из нее строятся
+
+    Все вкладки пользователя работают с одной колодой и одним журналом,
+    поэтому вкладки не расходятся между собой и не дублируют колоду в
+    памяти. Сессия держит lock, пока меняет колоду: скрипты вкладок
+    Streamlit выполняются в разных потоках. Пользователь и репозиторий
+    хранятся в колоде, чтобы ее изменения можно было сбросить и без сессии.
+    """
+
+    cards: CardStore = field(default_factory=CardStore)
+    review_log: ReviewLog = field(default_factory=ReviewLog)
+    write_buffer: WriteBuffer = field(default_factory=WriteBuffer)
+    deck_coverage: DeckCoverage = field(default_factory=DeckCoverage)
+    due_index: DueIndex = field(default_factory=DueIndex)
+    deck_stats: DeckStats = field(default_factory=DeckStats)
+    generation: int = field(default_factory=lambda: next(_generations))
+    lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+    last_used: float = field(default_factory=time.monotonic)
+    user_id: str = ''
+    repository: Optional[DeckRepository] = None  # куда пишутся изменения (задается при загрузке)
+    local_cache: Optional[LocalCache] = None     # в режиме local-first; закрывается вместе с колодой
+
+    def renew(self) -> None:
+        """Новое поколение: колода заменена, карточки сессий из старой недействительны"""
+        self.generation = next(_generations)
+
+    def is_clean(self) -> bool:
+        """Все изменения отправлены в базу, и ошибок записи нет"""
+        buffer = self.write_buffer
+        return buffer.error is None and not buffer.in_flight and not buffer.has_changes(self.cards, self.review_log)
+
+    def flush(self, worker: FlushWorker, durable: bool = False) -> None:
+        """Отправляет накопленные изменения (вызывается под lock колоды; см. WriteBuffer.flush)"""
+        if self.repository is None:
+            return
+        self.write_buffer.flush(self.user_id, self.cards, self.review_log, self.repository, worker, durable)
+
+    def merge_pulled(self, card_ids: Sequence[int]) -> List[int]:
+        """
+        Переносит в колоду карточки, которые фоновая синхронизация обновила в локальном кэше
+
+        Без этого колода в памяти оставалась бы со старыми значениями, и
+        следующий ответ по такой карточке записал бы их поверх пришедших.
+        Карточки с еще не записанными изменениями сессии пропускаются: при
+        записи они получат более поздний updated_at и все равно победят.
+
+        Args:
+            card_ids: Id карточек, пришедших из основной базы
+
+        Returns:
+            Id перечитанных карточек
+        """
+        if self.repository is None:
+            return []
+        with self.lock:
+            unsaved = self.write_buffer.unsaved_ids(self.cards)
+            stale = [card_id for card_id in card_ids if card_id in self.cards and card_id not in unsaved]
+            for card_id in stale:
+                self.deck_stats.remove_card(self.cards[card_id])
+            merged = self.repository.refresh_cards(self.user_id, self.cards, stale)
+            for card_id in stale:
+                card = self.cards[card_id]
+                self.deck_stats.add_card(card)
+                self.due_index.update(card_id, card)
+            if merged:
+                # Карточки и очереди сессий построены по старым значениям
+                self.renew()
+            return merged
+
+    def close(self) -> None:
+        """Освобождает ресурсы колоды вне памяти процесса (поток и файл локального кэша)"""
+        if self.local_cache is not None:
+            self.local_cache.close()
+            self.local_cache = None
+
+
+class DeckRegistry:
+    """
+    Общее для процесса хранилище колод по ключу пользователя
+
+    Колоду можно перечитать из базы, поэтому хранилище вытесняет давно
+    не используемые колоды и самые старые сверх лимита. Перед вытеснением
+    изменения колоды записываются в базу; колода, которую сейчас держит
+    сессия или которую не удалось сохранить, остается в памяти. Фоновый
+    таймер (start_sweeper) раз в SWEEP_INTERVAL отправляет изменения,
+    пролежавшие в буферах дольше FLUSH_EVERY_SECONDS, - в том числе колод,
+    вкладки которых уже закрыты, - и вытесняет простаивающие колоды.
+    """
+
+    def __init__(
+        self,
+        max_decks: int = DEFAULT_MAX_DECKS,
+        idle_seconds: float = DEFAULT_IDLE_SECONDS,
+        flush_worker: Optional[FlushWorker] = None
+    ):
+        self.max_decks = max_decks
+        self.idle_seconds = idle_seconds
+        self._flush_worker = flush_worker
+        self._decks: Dict[str, UserDeck] = {}
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+        self._stop = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._decks)
+
+    def __contains__(self, handle: str) -> bool:
+        return handle in self._decks
+
+    def decks(self) -> List[Tuple[str, UserDeck]]:
+        """Снимок (ключ, колода)"""
+        with self._lock:
+            return list(self._decks.items())
+
+    def acquire(self, handle: str, now: Optional[float] = None) -> Tuple[UserDeck, bool]:
+        """
+        Колода пользователя; пустая, если ее нет в памяти
+
+        Args:
+            handle: Ключ пользователя
+            now: time.monotonic() (для тестов)
+
+        Returns:
+            (колода, создана ли она сейчас). Новая колода возвращается с уже
+            захваченным lock: вызывающий загружает ее и отпускает lock, а
+            другие вкладки ждут, пока загрузка закончится.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            deck = self._decks.get(handle)
+            created = deck is None
+            if created:
+                deck = self._decks[handle] = UserDeck()
+                deck.lock.acquire()
+            deck.last_used = now
+        if created or now - self._last_sweep >= SWEEP_INTERVAL:
+            # В потоке сессии вытесняются только уже сохраненные колоды - без записи в базу
+            self.evict(now, keep=handle, flush=False)
+        return deck, created
+
+    def discard(self, handle: str, deck: UserDeck) -> None:
+        """Убирает колоду (например, не загрузившуюся), если ее еще не заменили"""
+        with self._lock:
+            if self._decks.get(handle) is not deck:
+                return
+            del self._decks[handle]
+        deck.close()
+
+    def start_sweeper(self, interval: float = SWEEP_INTERVAL) -> None:
+        """Запускает фоновый таймер: раз в interval секунд вызывает sweep()"""
+        if self._sweeper is not None:
+            return
+        self._sweeper = threading.Thread(
+            target=self._sweep_periodically, args=(interval,), name='deck-sweeper', daemon=True
+        )
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        """Останавливает фоновый таймер"""
+        self._stop.set()
+
+    def sweep(self, now: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Сбрасывает просроченные буферы и вытесняет простаивающие колоды
+
+        Returns:
+            (колод, чьи изменения отправлены в очередь записи, вытеснено колод)
+        """
+        # Сначала вытеснение: пачки, только что поставленные в очередь, отложили бы его до следующего раза
+        evicted = self.evict(now)
+        return self.flush_due(now), evicted
+
+    def flush_due(self, now: Optional[float] = None) -> int:
+        """
+        Отправляет в фоновую запись изменения колод, которые пора сбросить
+
+        Срабатывает тот же порог, что и в сессии (N ответов или T секунд),
+        поэтому изменения не ждут следующего перезапуска скрипта.
+
+        Returns:
+            Число колод, чьи изменения поставлены в очередь
+        """
+        if self._flush_worker is None:
+            return 0
+        now = time.monotonic() if now is None else now
+        flushed = 0
+        for _, deck in self.decks():
+            if not deck.lock.acquire(blocking=False):
+                continue
+            try:
+                if deck.write_buffer.is_due(deck.cards, deck.review_log, now):
+                    deck.flush(self._flush_worker)
+                    flushed += 1
+            finally:
+                deck.lock.release()
+        return flushed
+
+    def evict(self, now: Optional[float] = None, keep: Optional[str] = None, flush: bool = True) -> int:
+        """
+        Вытесняет простаивающие колоды и самые старые сверх лимита
+
+        Args:
+            now: time.monotonic() (для тестов)
+            keep: Ключ, который не вытесняется (колода, выданная этому же потоку)
+            flush: Записать несохраненные изменения перед вытеснением
+                (иначе такие колоды и колоды с локальным кэшем пропускаются)
+
+        Returns:
+            Число вытесненных колод
+        """
+        now = time.monotonic() if now is None else now
+        self._last_sweep = now
+        # Пачка в очереди уже снята с колоды, но еще может вернуться в ее буфер
+        if self._flush_worker is not None and not self._flush_worker.drain(0):
+            return 0
+
+        with self._lock:
+            by_age = sorted(self._decks.items(), key=lambda item: item[1].last_used)
+        excess = len(by_age) - self.max_decks
+        evicted = 0
+        for handle, deck in by_age:
+            if evicted >= excess and now - deck.last_used < self.idle_seconds:
+                break
+            # Колоду держит другая сессия - пропускаем, без ожидания
+            if handle == keep or not deck.lock.acquire(blocking=False):
+                continue
+            try:
+                # Закрытие локального кэша синхронизирует его с основной базой - тоже только с flush
+                if not flush and deck.local_cache is not None:
+                    continue
+                if flush and self._flush_worker is not None and not deck.is_clean():
+                    deck.write_buffer.error = None
+                    deck.flush(self._flush_worker, durable=True)
+                with self._lock:
+                    if not deck.is_clean() or self._decks.get(handle) is not deck:
+                        continue
+                    del self._decks[handle]
+                    evicted += 1
+                deck.close()
+            except (SQLAlchemyError, TimeoutError) as e:
+                # Изменения вернулись в буфер - колода дождется следующей попытки
+                logger.warning("could not save deck before eviction: %s", e)
+            finally:
+                deck.lock.release()
+        with self._lock:
+            self.evictions += evicted
+        return evicted
+
+    def _sweep_periodically(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.sweep()
+            except Exception:  # noqa: BLE001 - таймер не должен останавливаться из-за одной колоды
+                logger.exception("deck sweep failed")
@@ -0,0 +1,285 @@
+# storage/write_behind.py
+"""
+Отложенная запись: изменения сессии копятся и сохраняются пачками
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from srs.card_store import CardStore
+from srs.review_log import ReviewLog
+from storage.repository import DeckRepository
+
+FLUSH_EVERY_ANSWERS = 10
+FLUSH_EVERY_SECONDS = 30.0
+MAX_QUEUED_BATCHES = 16
+DRAIN_TIMEOUT = 10.0
+
+DURABILITY_BATCHED = 'batched'      # пачками в фоновом потоке
+DURABILITY_IMMEDIATE = 'immediate'  # каждый ответ сразу, в потоке сессии
+
+logger = logging.getLogger(__name__)
+
+
+def get_durability_mode() -> str:
+    """Режим сохранения из SAVE_DURABILITY (по умолчанию batched)"""
+    mode = os.getenv('SAVE_DURABILITY', DURABILITY_BATCHED)
+    if mode not in (DURABILITY_BATCHED, DURABILITY_IMMEDIATE):
+        raise ValueError(f"unknown SAVE_DURABILITY: {mode}")
+    return mode
+
+
+@dataclass
+class WriteBatch:
+    buffer: 'WriteBuffer'
+    repository: DeckRepository  # куда писать: основная база или локальный кэш
+    card_ids: List[int]
+    first_seq: int          # первое событие журнала в пачке
+    card_rows: List[Dict]
+    event_rows: List[Dict]
+
+
+class WriteBuffer:
+    """
+    Изменения одной сессии, еще не отправленные в базу
+
+    Изменившиеся карточки отмечает сама колода (CardStore.dirty_ids), буфер
+    хранит номер последнего сохраненного события журнала. Строки пачки
+    снимаются с колоды в потоке сессии, поэтому фоновый поток не трогает
+    CardStore, пока тот меняется. Если пачку записать не удалось, её карточки
+    и события возвращаются в буфер и уйдут со следующей.
+
+    Пачки буфера пишутся строго по одной: пока предыдущая не записана или
+    не возвращена, take() новую не выдает. База нумерует события заново
+    при каждой записи, поэтому пачка, отправленная после незаписанной,
+    легла бы раньше нее, а затем ушла бы в базу второй раз при повторе.
+    """
+
+    def __init__(
+        self,
+        flushed_seq: int = 0,
+        every_answers: int = FLUSH_EVERY_ANSWERS,
+        every_seconds: float = FLUSH_EVERY_SECONDS
+    ):
+        self.flushed_seq = flushed_seq
+        self.every_answers = every_answers
+        self.every_seconds = every_seconds
+        self.error: Optional[Exception] = None
+        self._rejected: Dict[int, None] = {}  # карточки из незаписанных пачек
+        self._in_flight: Optional[List[int]] = None  # карточки пачки, отправленной, но еще не записанной
+        self._answers = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record_answer(self) -> None:
+        """Учитывает ответ для порога FLUSH_EVERY_ANSWERS"""
+        self._answers += 1
+
+    def has_changes(self, store: CardStore, log: ReviewLog) -> bool:
+        """Есть ли несохраненные карточки или события"""
+        return bool(store.dirty_count or self._rejected or log.last_seq > self.flushed_seq)
+
+    def is_due(self, store: CardStore, log: ReviewLog, now: Optional[float] = None) -> bool:
+        """Пора ли сбросить буфер: набралось N ответов или прошло T секунд"""
+        if not self.has_changes(store, log):
+            return False
+        now = time.monotonic() if now is None else now
+        return self._answers >= self.every_answers or now - self._last_flush >= self.every_seconds
+
+    @property
+    def in_flight(self) -> bool:
+        """Есть ли отправленная, но еще не записанная пачка"""
+        return self._in_flight is not None
+
+    def unsaved_ids(self, store: CardStore) -> Set[int]:
+        """Id карточек, изменения которых еще не записаны: в колоде, в возвращенных и в отправленной пачке"""
+        with self._lock:
+            return set(store.dirty_ids()) | self._rejected.keys() | set(self._in_flight or ())
+
+    def take(self, user_id: str, store: CardStore, log: ReviewLog, repository: DeckRepository) -> Optional[WriteBatch]:
+        """Забирает накопленные изменения в пачку (None, если изменений нет или предыдущая пачка не записана)"""
+        with self._lock:
+            if self._in_flight is not None:
+                return None
+            for card_id in self._rejected:
+                if card_id in store:
+                    store.mark_dirty(card_id)
+            self._rejected.clear()
+
+            card_ids = store.dirty_ids()
+            first_seq = self.flushed_seq + 1
+            if not card_ids and log.last_seq < first_seq:
+                return None
+            store.clear_dirty()
+            self.flushed_seq = log.last_seq
+            self._in_flight = card_ids
+            self._answers = 0
+            self._last_flush = time.monotonic()
+
+        return WriteBatch(
+            buffer=self,
+            repository=repository,
+            card_ids=card_ids,
+            first_seq=first_seq,
+            card_rows=repository.card_rows(user_id, store, card_ids),
+            event_rows=repository.event_rows(user_id, log.since(first_seq - 1))
+        )
+
+    def complete(self, batch: WriteBatch) -> None:
+        """Отмечает пачку записанной: можно выдавать следующую"""
+        with self._lock:
+            self._in_flight = None
+
+    def reject(self, batch: WriteBatch, error: Optional[Exception] = None) -> None:
+        """Возвращает в буфер изменения пачки, которую не удалось записать"""
+        with self._lock:
+            for card_id in batch.card_ids:
+                self._rejected[card_id] = None
+            self.flushed_seq = min(self.flushed_seq, batch.first_seq - 1)
+            self._in_flight = None
+            if error is not None:
+                self.error = error
+
+    def flush(
+        self,
+        user_id: str,
+        store: CardStore,
+        log: ReviewLog,
+        repository: DeckRepository,
+        worker: 'FlushWorker',
+        durable: bool = False
+    ) -> None:
+        """
+        Отправляет накопленные изменения
+
+        Args:
+            user_id: Пользователь
+            store: Колода сессии
+            log: Журнал ответов сессии
+            repository: Куда записать пачку
+            worker: Фоновый поток записи
+            durable: Записать сразу и дождаться транзакции (ошибки пробрасываются)
+        """
+        # Более ранние пачки должны лечь в базу раньше этой
+        if durable and not worker.drain(DRAIN_TIMEOUT):
+            raise TimeoutError("background writes did not finish in time")
+
+        batch = self.take(user_id, store, log, repository)
+        if batch is None:
+            return
+
+        if not durable:
+            # Очередь переполнена - изменения дождутся следующего сброса
+            if not worker.submit(batch):
+                self.reject(batch)
+            return
+
+        try:
+            repository.write(batch.card_rows, batch.event_rows)
+        except Exception:
+            self.reject(batch)
+            raise
+        self.complete(batch)
+
+
+class FlushWorker:
+    """
+    Фоновый поток, записывающий пачки по одной транзакции
+
+    Очередь ограничена: если база не успевает, submit возвращает False, и
+    изменения остаются в буфере сессии. Пачка повторяется несколько раз
+    с нарастающей паузой, после чего возвращается в свой буфер с ошибкой.
+    Любая другая ошибка сразу возвращает пачку в буфер; если поток все же
+    завершился, submit и drain запускают его заново.
+    """
+
+    def __init__(
+        self,
+        max_queued: int = MAX_QUEUED_BATCHES,
+        retry_attempts: int = 3,
+        retry_delay: float = 0.5
+    ):
+        self.retry_attempts = retry_attempts
+        self.retry_delay = retry_delay
+        self._queue: 'queue.Queue[WriteBatch]' = queue.Queue(maxsize=max_queued)
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._ensure_running()
+        atexit.register(self.drain, DRAIN_TIMEOUT)
+
+    @property
+    def depth(self) -> int:
+        """Количество пачек в очереди"""
+        return self._queue.qsize()
+
+    def submit(self, batch: WriteBatch) -> bool:
+        """Ставит пачку в очередь; False, если очередь заполнена"""
+        self._ensure_running()
+        try:
+            self._queue.put_nowait(batch)
+            return True
+        except queue.Full:
+            return False
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Ждет записи всех поставленных пачек; False по истечении timeout"""
+        self._ensure_running()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    @property
+    def is_alive(self) -> bool:
+        """Работает ли фоновый поток"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _ensure_running(self) -> None:
+        """Запускает фоновый поток заново, если он завершился"""
+        if self.is_alive:
+            return
+        with self._thread_lock:
+            if self.is_alive:
+                return
+            if self._thread is not None:
+                logger.error("write-behind thread died, restarting")
+            self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = self._queue.get()
+            try:
+                self._write(batch)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, batch: WriteBatch) -> None:
+        for attempt in range(self.retry_attempts):
+            try:
+                batch.repository.write(batch.card_rows, batch.event_rows)
+                batch.buffer.complete(batch)
+                return
+            except SQLAlchemyError as e:
+                logger.warning("write-behind attempt %d failed: %s", attempt + 1, e)
+                if attempt + 1 < self.retry_attempts:
+                    time.sleep(self.retry_delay * 2 ** attempt)
+                else:
+                    batch.buffer.reject(batch, e)
+            except Exception as e:  # noqa: BLE001 - поток записи не должен умирать из-за одной пачки
+                # Ошибка не в базе (драйвер, данные пачки) - повтор не поможет
+                logger.exception("write-behind batch failed")
+                batch.buffer.reject(batch, e)
+                return
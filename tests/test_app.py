@@ -0,0 +1,103 @@
+# tests/test_app.py
+"""
+Сессия приложения через streamlit AppTest: очередь карточек и ответы кнопками
+"""
+
+import datetime
+import random
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from localization.translations import get_text
+from srs.prefetch import PREFETCH_SIZE
+
+USER = 'user@example.com'
+
+
+def app_script():
+    import spanish_verbs_srs
+    spanish_verbs_srs.main()
+
+
+@pytest.fixture(scope='module')
+def app_module(tmp_path_factory):
+    # Настройки читаются при импорте приложения, а импортирует его первый запуск скрипта
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv('DATABASE_URL', 'sqlite:///' + str(tmp_path_factory.mktemp('app') / 'app.db'))
+        monkeypatch.setenv('CLIENT_SIDE_CARDS', '0')
+        monkeypatch.delenv('LOCAL_CACHE_DIR', raising=False)
+        start_session(USER)
+        import spanish_verbs_srs
+        yield spanish_verbs_srs
+
+
+def start_session(user: str) -> AppTest:
+    at = AppTest.from_function(app_script, default_timeout=60)
+    at.session_state['authenticated'] = True
+    at.session_state['user_info'] = {'name': 'Test', 'email': user}
+    return run(at)
+
+
+def run(at: AppTest) -> AppTest:
+    at.run()
+    assert not at.exception, at.exception
+    return at
+
+
+def click(at: AppTest, label_key: str) -> bool:
+    """Нажимает кнопку с переводом label_key; False, если ее нет"""
+    label = get_text(label_key, 'en')
+    for button in at.button:
+        if button.label == label:
+            button.click()
+            run(at)
+            return True
+    return False
+
+
+def user_deck(app_module, user: str):
+    return dict(app_module.get_deck_registry().decks())[user]
+
+
+def test_queue_is_refilled_for_new_settings(app_module):
+    at = start_session('settings@example.com')
+    queue = at.session_state['card_queue']
+    assert queue.signature[1] == ('presente',)
+    assert len(queue) == PREFETCH_SIZE - 1  # первая карточка уже показана
+
+    at.checkbox(key='tense_presente').uncheck()
+    at.checkbox(key='tense_subjuntivo').check()
+    run(at)
+    assert click(at, 'apply_settings')
+
+    queue = at.session_state['card_queue']
+    assert queue.signature[0] == datetime.date.today().isoformat()
+    assert queue.signature[1] == ('subjuntivo',)
+    current = user_deck(app_module, 'settings@example.com').cards[at.session_state['current_card_id']]
+    assert current.tense == 'subjuntivo'
+    assert len(queue) == PREFETCH_SIZE - 1
+    assert all(app_module.CARD_CODEC.decode(card_id)[2] == 'subjuntivo' for card_id in queue)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_deck_stats_stay_consistent_after_random_answers(app_module, seed):
+    rng = random.Random(seed)
+    user = f'answers{seed}@example.com'
+    at = start_session(user)
+    grades = ['again', 'hard', 'good', 'easy']
+
+    for _ in range(40):
+        if click(at, 'show_answer'):
+            # Кнопки оценки вызывают process_answer
+            at.button(key=rng.choice(grades)).click()
+            run(at)
+        else:
+            # Дневной лимит новых карточек исчерпан
+            assert click(at, 'get_new_card')
+
+    deck = user_deck(app_module, user)
+    settings = at.session_state['settings']
+    verbs = app_module.get_verbs_for_level(settings['vocabulary_size'])
+    assert deck.deck_stats.total.reviews == at.session_state['daily_stats']['reviews_today'] > 0
+    assert deck.deck_stats.is_consistent(deck.cards, datetime.date.today().isoformat(), settings['selected_tenses'], verbs)
@@ -0,0 +1,121 @@
+# tests/test_card_batch.py
+"""
+Оценки пачки из браузера: что принимается, что отклоняется, и время ответа
+"""
+
+import pytest
+
+from srs.card_batch import CardBatch
+from srs.card_ids import CardCodec
+from srs.card_store import CardStore
+from srs.models import Card, Difficulty
+
+CODEC = CardCodec(['hablar', 'comer', 'vivir'], ['presente'])
+HABLAR, COMER, VIVIR = (CODEC.encode(verb, 0, 'presente') for verb in ('hablar', 'comer', 'vivir'))
+ISSUED_AT = 1_700_000_000.0
+NOW = ISSUED_AT + 600
+
+
+@pytest.fixture
+def store():
+    store = CardStore()
+    for card_id in (HABLAR, COMER, VIVIR):
+        verb, pronoun_index, tense = CODEC.decode(card_id)
+        store.add(card_id, Card(verb=verb, pronoun_index=pronoun_index, tense=tense))
+    return store
+
+
+@pytest.fixture
+def batch(store):
+    return CardBatch.issue(7, store, [HABLAR, COMER], now=ISSUED_AT)
+
+
+def ms(timestamp: float) -> int:
+    return int(timestamp * 1000)
+
+
+def test_accepts_grades_in_answer_order(batch, store):
+    payload = {'batch_id': 7, 'grades': [[COMER, 3, ms(ISSUED_AT + 5)], [HABLAR, 0, ms(ISSUED_AT + 9)]]}
+
+    accepted, rejected = batch.accept(payload, store, now=NOW)
+
+    assert accepted == [(COMER, Difficulty.EASY, ISSUED_AT + 5), (HABLAR, Difficulty.AGAIN, ISSUED_AT + 9)]
+    assert rejected == 0 and batch.is_complete
+
+
+def test_rejects_grades_of_another_batch(batch, store):
+    payload = {'batch_id': 6, 'grades': [[HABLAR, 2, ms(ISSUED_AT)], [COMER, 2, ms(ISSUED_AT)]]}
+
+    assert batch.accept(payload, store, now=NOW) == ([], 2)
+    assert not batch.settled
+
+
+@pytest.mark.parametrize('payload', [None, [], 'grades', {'batch_id': 7}, {'batch_id': 7, 'grades': 'x'}])
+def test_ignores_malformed_payload(batch, store, payload):
+    assert batch.accept(payload, store, now=NOW) == ([], 0)
+
+
+@pytest.mark.parametrize('entry', [
+    [str(HABLAR), 2, 0],          # id строкой
+    [HABLAR, '2', 0],             # оценка строкой
+    [HABLAR, 2.0, 0],             # оценка float
+    [HABLAR, True, 0],            # bool - не int
+    [HABLAR, 4, 0],               # нет такой оценки
+    [HABLAR, -1, 0],
+    [HABLAR, 2],                  # не хватает поля
+    {'id': HABLAR, 'grade': 2},
+    None,
+])
+def test_rejects_grade_of_wrong_type(batch, store, entry):
+    accepted, rejected = batch.accept({'batch_id': 7, 'grades': [entry]}, store, now=NOW)
+
+    assert (accepted, rejected) == ([], 1)
+    assert HABLAR not in batch.settled
+
+
+def test_rejects_card_outside_the_batch(batch, store):
+    accepted, rejected = batch.accept({'batch_id': 7, 'grades': [[VIVIR, 2, ms(ISSUED_AT)]]}, store, now=NOW)
+
+    assert (accepted, rejected) == ([], 1)
+    assert VIVIR not in batch.settled
+
+
+def test_rejects_card_reviewed_after_issue(batch, store):
+    # Карточку оценили в обход пачки (в другой вкладке): число ответов изменилось
+    store[HABLAR].total_reviews += 1
+
+    accepted, rejected = batch.accept({'batch_id': 7, 'grades': [[HABLAR, 2, ms(ISSUED_AT)]]}, store, now=NOW)
+
+    assert (accepted, rejected) == ([], 1)
+    assert HABLAR in batch.settled  # повторно ее уже не принять
+
+
+def test_rejects_card_missing_from_deck(batch):
+    accepted, rejected = batch.accept({'batch_id': 7, 'grades': [[HABLAR, 2, ms(ISSUED_AT)]]}, CardStore(), now=NOW)
+
+    assert (accepted, rejected) == ([], 1)
+
+
+def test_replayed_grade_is_not_applied_twice(batch, store):
+    first = {'batch_id': 7, 'grades': [[HABLAR, 2, ms(ISSUED_AT + 1)]]}
+    assert batch.accept(first, store, now=NOW) == ([(HABLAR, Difficulty.GOOD, ISSUED_AT + 1)], 0)
+
+    # Браузер прислал пачку целиком: уже учтенная оценка пропускается молча
+    full = {'batch_id': 7, 'grades': [[HABLAR, 0, ms(ISSUED_AT + 1)], [COMER, 1, ms(ISSUED_AT + 2)]]}
+    assert batch.accept(full, store, now=NOW) == ([(COMER, Difficulty.HARD, ISSUED_AT + 2)], 0)
+    assert batch.accept(full, store, now=NOW) == ([], 0)
+
+
+@pytest.mark.parametrize('client_ms, expected', [
+    (ms(ISSUED_AT - 3600), ISSUED_AT),     # часы браузера отстают
+    (ms(NOW + 3600), NOW),                 # часы браузера спешат
+    (ms(ISSUED_AT + 30), ISSUED_AT + 30),
+    (float('nan'), NOW),
+    (float('inf'), NOW),
+    ('soon', NOW),
+    (None, NOW),
+])
+def test_answer_time_is_clamped_to_batch_lifetime(batch, store, client_ms, expected):
+    accepted, _ = batch.accept({'batch_id': 7, 'grades': [[HABLAR, 2, client_ms]]}, store, now=NOW)
+
+    assert accepted == [(HABLAR, Difficulty.GOOD, expected)]
@@ -0,0 +1,60 @@
+# tests/test_database.py
+"""
+Общий пул соединений: одновременные сессии и база SQLite в памяти
+"""
+
+import pytest
+
+from benchmarks.engine_pool import CODEC, run_sessions
+from srs.card_store import CardStore
+from srs.models import Card
+from srs.review_log import ReviewLog
+from storage.database import PoolSettings, create_database_engine
+from storage.repository import DeckRepository
+from storage.write_behind import FlushWorker, WriteBuffer
+
+HABLAR = CODEC.encode('verb0', 0, 'presente')
+
+
+def make_repository(url: str, pool: PoolSettings = None) -> DeckRepository:
+    repository = DeckRepository(create_database_engine(url, pool or PoolSettings(size=2, max_overflow=3)), CODEC)
+    repository.create_schema()
+    return repository
+
+
+def test_concurrent_sessions_share_the_pool(tmp_path):
+    repository = make_repository('sqlite:///' + str(tmp_path / 'pool.db'), PoolSettings(size=2, max_overflow=3, timeout=60.0))
+
+    run_sessions(repository, 40)
+
+    stats = repository.engine.pool.stats()
+    assert stats.in_use == 0 and stats.timeouts == 0
+    assert 1 < stats.peak_in_use <= 5
+
+
+@pytest.mark.parametrize('url', ['sqlite://', 'sqlite:///:memory:'])
+def test_in_memory_database_is_shared_by_threads(url):
+    repository = make_repository(url)
+    store = CardStore()
+    store.add(HABLAR, Card(verb='verb0', pronoun_index=0, tense='presente'))
+    log = ReviewLog()
+    log.append(HABLAR, 2, 0.0, 0, 2.5)
+    worker = FlushWorker(retry_delay=0)
+    buffer = WriteBuffer()
+
+    # Поток отложенной записи пишет в ту же базу, где создана схема
+    buffer.flush('user@x', store, log, repository, worker)
+    assert worker.drain(5)
+
+    assert buffer.error is None
+    assert [event.card_id for event in repository.events_since('user@x', 0)] == [HABLAR]
+    assert list(repository.load_deck('user@x')) == [HABLAR]
+
+
+def test_in_memory_database_serves_one_thread_at_a_time():
+    repository = make_repository('sqlite://')
+
+    run_sessions(repository, 10)
+
+    stats = repository.engine.pool.stats()
+    assert stats.peak_in_use == 1 and stats.connects == 1 and stats.in_use == 0
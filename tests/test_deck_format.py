@@ -0,0 +1,139 @@
+# tests/test_deck_format.py
+"""
+Двоичный формат колод и журналов: round-trip, заголовок и обрезанные данные
+"""
+
+import io
+import random
+
+import pytest
+
+from srs.card_ids import CardCodec
+from srs.card_store import CardStore
+from srs.review_log import ReviewLog
+from storage.deck_format import (
+    COMPRESSION_NONE, COMPRESSION_ZLIB, COMPRESSION_ZSTD, DECK_MAGIC, FORMAT_VERSION, HEADER, LOG_MAGIC,
+    COMPRESSION_CODES, decode_deck, decode_log, encode_deck, encode_log, iter_log, zstandard
+)
+
+TENSES = ['presente', 'indefinido', 'subjuntivo', 'imperfecto']
+CODEC = CardCodec([f"verb{verb_index}" for verb_index in range(100)], TENSES)
+ALL_IDS = [
+    CODEC.encode(verb, pronoun_index, tense)
+    for verb in CODEC.verbs for tense in TENSES for pronoun_index in range(6)
+]
+COMPRESSIONS = [
+    COMPRESSION_NONE,
+    COMPRESSION_ZLIB,
+    pytest.param(COMPRESSION_ZSTD, marks=pytest.mark.skipif(zstandard is None, reason="zstandard is not installed")),
+]
+
+
+def random_deck(rng: random.Random, card_ids) -> CardStore:
+    store = CardStore()
+    start_day = 738_000
+    for card_id in card_ids:
+        verb, pronoun_index, tense = CODEC.decode(card_id)
+        last_day = start_day + rng.randrange(1000)
+        interval = rng.randrange(1, 400)
+        store.add_row(
+            card_id, verb, pronoun_index, tense,
+            rng.randrange(26, 61) / 20, interval, rng.randrange(10),
+            last_day + interval, last_day, rng.randrange(50), rng.randrange(25)
+        )
+    return store
+
+
+def random_log(rng: random.Random, count: int) -> ReviewLog:
+    log = ReviewLog(first_seq=rng.randrange(1, 1000))
+    timestamp = 1_700_000_000.0
+    for _ in range(count):
+        timestamp += rng.random() * 60
+        log.append(rng.choice(ALL_IDS), rng.randrange(4), timestamp, rng.randrange(400), rng.randrange(26, 61) / 20)
+    return log
+
+
+def with_header(data: bytes, **fields) -> bytes:
+    """Данные с подмененными полями заголовка (magic, version, code)"""
+    magic, version, code, reserved = HEADER.unpack(data[:HEADER.size])
+    header = HEADER.pack(
+        fields.get('magic', magic), fields.get('version', version), fields.get('code', code), reserved
+    )
+    return header + data[HEADER.size:]
+
+
+@pytest.mark.parametrize('compression', COMPRESSIONS)
+@pytest.mark.parametrize('seed', range(20))
+def test_deck_round_trip(seed, compression):
+    rng = random.Random(seed)
+    deck = random_deck(rng, rng.sample(ALL_IDS, rng.randrange(0, 300)))
+
+    decoded = decode_deck(encode_deck(deck, compression))
+
+    assert decoded.keys() == deck.keys()
+    assert all(decoded[card_id].to_card() == deck[card_id].to_card() for card_id in deck)
+
+
+@pytest.mark.parametrize('compression', COMPRESSIONS)
+@pytest.mark.parametrize('seed', range(20))
+def test_log_round_trip(seed, compression):
+    rng = random.Random(seed)
+    log = random_log(rng, rng.randrange(0, 300))
+
+    data = encode_log(log, compression)
+
+    decoded = decode_log(data)
+    assert decoded.first_seq == log.first_seq
+    assert list(decoded) == list(log)
+    assert list(iter_log(io.BytesIO(data))) == list(log)
+
+
+def test_rejects_wrong_magic():
+    deck = encode_deck(random_deck(random.Random(0), ALL_IDS[:10]))
+    log = encode_log(random_log(random.Random(0), 10))
+
+    with pytest.raises(ValueError, match="not a SVLG file"):
+        decode_log(deck)
+    with pytest.raises(ValueError, match="not a SVDK file"):
+        decode_deck(log)
+    with pytest.raises(ValueError, match="not a SVDK file"):
+        decode_deck(with_header(deck, magic=b'JUNK'))
+    assert HEADER.unpack(deck[:HEADER.size])[0] == DECK_MAGIC
+    assert HEADER.unpack(log[:HEADER.size])[0] == LOG_MAGIC
+
+
+def test_rejects_unsupported_version():
+    deck = encode_deck(random_deck(random.Random(0), ALL_IDS[:10]))
+
+    with pytest.raises(ValueError, match="unsupported format version"):
+        decode_deck(with_header(deck, version=FORMAT_VERSION + 1))
+
+
+def test_rejects_unknown_compression():
+    deck = encode_deck(random_deck(random.Random(0), ALL_IDS[:10]))
+
+    with pytest.raises(ValueError, match="unknown compression code"):
+        decode_deck(with_header(deck, code=max(COMPRESSION_CODES.values()) + 1))
+    with pytest.raises(ValueError, match="unknown compression"):
+        encode_deck(CardStore(), 'lz4')
+
+
+def test_rejects_truncated_header():
+    with pytest.raises(ValueError, match="truncated header"):
+        decode_deck(DECK_MAGIC)
+
+
+@pytest.mark.parametrize('compression', COMPRESSIONS)
+def test_rejects_truncated_payload(compression):
+    rng = random.Random(0)
+    deck = encode_deck(random_deck(rng, ALL_IDS[:200]), compression)
+    log = encode_log(random_log(rng, 200), compression)
+
+    for cut in (HEADER.size, HEADER.size + 1, len(deck) // 2, len(deck) - 1):
+        with pytest.raises(ValueError, match="truncated body"):
+            decode_deck(deck[:cut])
+    for cut in (HEADER.size + 4, len(log) // 2, len(log) - 1):
+        with pytest.raises(ValueError, match="truncated body"):
+            decode_log(log[:cut])
+        with pytest.raises(ValueError, match="truncated body"):
+            list(iter_log(io.BytesIO(log[:cut])))
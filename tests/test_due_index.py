@@ -0,0 +1,123 @@
+# tests/test_due_index.py
+"""
+DueIndex против полного перебора: случайные обновления, смена дня и вытеснение закэшированных количеств
+"""
+
+import random
+
+import pytest
+
+from srs.card_ids import CardCodec
+from srs.card_store import CardStore
+from srs.due_index import COUNT_MEMO_SIZE, DueIndex
+from srs.models import Card, day_to_iso
+
+TENSES = ['presente', 'indefinido', 'subjuntivo', 'imperfecto']
+CODEC = CardCodec([f"verb{verb_index}" for verb_index in range(12)], TENSES)
+TODAY = 739_000
+
+
+def random_filter(rng: random.Random):
+    return rng.sample(TENSES, rng.randrange(1, len(TENSES) + 1)), frozenset(rng.sample(CODEC.verbs, rng.randrange(1, 13)))
+
+
+def brute_force(store: CardStore, today: str, tenses, verbs):
+    """Карточки к повторению полным проходом по колоде"""
+    return [
+        card_id for card_id, card in store.items()
+        if card.tense in tenses and card.verb in verbs and card.next_review_date <= today
+    ]
+
+
+def check(index: DueIndex, store: CardStore, today: str, tenses, verbs) -> None:
+    expected = brute_force(store, today, tenses, verbs)
+    found = list(index.iter_due(today, tenses, verbs))
+    assert sorted(found) == sorted(expected)
+    assert len(found) == len(set(found))
+    # Порядок: по дню, в пределах дня - по времени
+    keys = [(store[card_id].next_review_day, store[card_id].tense) for card_id in found]
+    assert keys == sorted(keys)
+    assert index.count_due(today, tenses, verbs) == len(expected)
+    assert index.earliest_due(today, tenses, verbs) == (found[0] if found else None)
+
+
+def random_store(rng: random.Random) -> CardStore:
+    store = CardStore()
+    for verb in CODEC.verbs:
+        for tense in TENSES:
+            for pronoun_index in range(6):
+                if rng.random() < 0.4:
+                    store.add(CODEC.encode(verb, pronoun_index, tense), Card(
+                        verb=verb, pronoun_index=pronoun_index, tense=tense,
+                        next_review_date=day_to_iso(TODAY + rng.randrange(-10, 10))
+                    ))
+    return store
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_brute_force_after_random_updates(seed):
+    rng = random.Random(seed)
+    store = random_store(rng)
+    index = DueIndex()
+    index.rebuild(store)
+    filters = [random_filter(rng) for _ in range(COUNT_MEMO_SIZE + 4)]
+    today = day_to_iso(TODAY)
+
+    for step in range(400):
+        card_id = rng.choice(list(store))
+        if rng.random() < 0.1:
+            index.remove(card_id)
+            store[card_id].next_review_date = day_to_iso(TODAY + 10_000)  # вне индекса и не к повторению
+        else:
+            store[card_id].next_review_date = day_to_iso(TODAY + rng.randrange(-10, 10))
+            index.update(card_id, store[card_id])
+        # Количества часто запрашиваемых фильтров поддерживаются инкрементально, остальные вытесняются
+        tenses, verbs = filters[rng.randrange(3)] if rng.random() < 0.7 else rng.choice(filters)
+        if step % 50 == 0:
+            # Смена дня: закэшированные количества сбрасываются
+            today = day_to_iso(TODAY + rng.randrange(-3, 4))
+        check(index, store, today, tenses, verbs)
+
+    assert len(index._counts) <= COUNT_MEMO_SIZE
+    for tenses, verbs in filters:
+        check(index, store, today, tenses, verbs)
+
+
+def test_evicted_filter_is_recounted():
+    rng = random.Random(10)
+    store = random_store(rng)
+    index = DueIndex()
+    index.rebuild(store)
+    today = day_to_iso(TODAY)
+    first = (['presente'], frozenset(CODEC.verbs))
+    index.count_due(today, *first)
+    # Первый фильтр вытесняется из памяти количеств
+    for verb in CODEC.verbs[:COUNT_MEMO_SIZE]:
+        index.count_due(today, TENSES, frozenset([verb]))
+    assert (frozenset(first[0]), first[1]) not in index._counts
+
+    # Изменение, которое не попадет в количество вытесненного фильтра
+    card_id = next(card_id for card_id, card in store.items()
+                   if card.tense == 'presente' and card.next_review_date > today)
+    store[card_id].next_review_date = today
+    index.update(card_id, store[card_id])
+
+    check(index, store, today, *first)
+
+
+def test_count_memo_survives_moves_within_and_across_today():
+    store = CardStore()
+    card_id = CODEC.encode('verb0', 0, 'presente')
+    store.add(card_id, Card(verb='verb0', pronoun_index=0, tense='presente', next_review_date=day_to_iso(TODAY + 5)))
+    index = DueIndex()
+    index.rebuild(store)
+    today = day_to_iso(TODAY)
+    tenses, verbs = ['presente'], frozenset(['verb0'])
+
+    assert index.count_due(today, tenses, verbs) == 0
+    for day, expected in [(TODAY - 1, 1), (TODAY, 1), (TODAY + 1, 0), (TODAY - 3, 1)]:
+        store[card_id].next_review_date = day_to_iso(day)
+        index.update(card_id, store[card_id])
+        assert index.count_due(today, tenses, verbs) == expected
+    index.remove(card_id)
+    assert index.count_due(today, tenses, verbs) == 0 and card_id not in index
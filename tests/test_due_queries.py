@@ -0,0 +1,158 @@
+# tests/test_due_queries.py
+"""
+Карточки к повторению в SQL: миграции схемы, сверка с DueIndex и план запроса
+"""
+
+import random
+import threading
+
+import pytest
+from sqlalchemy import event, inspect, select, text
+
+from srs.card_ids import CardCodec
+from srs.card_store import CardStore
+from srs.due_index import DueIndex
+from srs.models import day_to_iso
+from storage.database import create_database_engine
+from storage.migrations import LATEST_VERSION, current_version, migrate
+from storage.repository import DeckRepository
+from storage.schema import schema_version
+
+TENSES = ['presente', 'indefinido', 'subjuntivo', 'imperfecto']
+CODEC = CardCodec([f"verb{verb_index}" for verb_index in range(100)], TENSES)
+LEVELS = (30, 50, 100)
+USERS = 10
+TODAY = 739_000
+
+
+def random_deck(rng: random.Random) -> CardStore:
+    store = CardStore()
+    for verb in CODEC.verbs:
+        for tense in TENSES:
+            for pronoun_index in range(6):
+                if rng.random() < 0.6:
+                    interval = rng.randrange(1, 60)
+                    next_day = TODAY + rng.randrange(-30, 30)
+                    store.add_row(CODEC.encode(verb, pronoun_index, tense), verb, pronoun_index, tense,
+                                  2.5, interval, 2, next_day, next_day - interval, 3, 2)
+    return store
+
+
+def column_names(engine, table: str):
+    return {column['name'] for column in inspect(engine).get_columns(table)}
+
+
+def index_names(engine, table: str):
+    return {index['name'] for index in inspect(engine).get_indexes(table)}
+
+
+@pytest.fixture(scope='module')
+def decks():
+    rng = random.Random(0)
+    return {f"user-{index}": random_deck(rng) for index in range(USERS)}
+
+
+@pytest.fixture(scope='module')
+def repository(tmp_path_factory, decks):
+    url = 'sqlite:///' + str(tmp_path_factory.mktemp('due') / 'due.db')
+    repository = DeckRepository(create_database_engine(url), CODEC)
+    repository.create_schema()
+    for user_id, deck in decks.items():
+        repository.save_deck(user_id, deck)
+    with repository.engine.begin() as connection:
+        connection.exec_driver_sql('ANALYZE')
+    return repository
+
+
+def test_first_migration_creates_version_one_tables(tmp_path):
+    engine = create_database_engine('sqlite:///' + str(tmp_path / 'v1.db'))
+
+    assert migrate(engine, target=1) == [1]
+
+    assert 'updated_at' not in column_names(engine, 'cards')
+    assert 'ix_cards_user_due' not in index_names(engine, 'cards')
+    assert current_version(engine) == 1
+
+
+def test_pre_migration_database_is_upgraded(tmp_path):
+    engine = create_database_engine('sqlite:///' + str(tmp_path / 'legacy.db'))
+    # База из create_all до появления миграций: таблицы версии 1, но без schema_version
+    migrate(engine, target=1)
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE schema_version"))
+    assert current_version(engine) == 0
+
+    assert migrate(engine) == list(range(1, LATEST_VERSION + 1))
+    assert migrate(engine) == []
+    assert current_version(engine) == LATEST_VERSION
+    assert 'updated_at' in column_names(engine, 'cards')
+    assert 'ix_cards_user_due' in index_names(engine, 'cards')
+
+
+def test_concurrent_startups_apply_each_migration_once(tmp_path):
+    url = 'sqlite:///' + str(tmp_path / 'race.db')
+    engines = [create_database_engine(url) for _ in range(4)]
+    # Файл базы уже создан (и переведен в WAL) - гонка только за миграции
+    engines[0].connect().close()
+    barrier = threading.Barrier(len(engines))
+    results, errors = [], []
+
+    def start(engine):
+        barrier.wait()
+        try:
+            results.append(migrate(engine))
+        except Exception as e:  # noqa: BLE001 - ошибка любого потока проваливает тест
+            errors.append(e)
+
+    threads = [threading.Thread(target=start, args=(engine,)) for engine in engines]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(version for applied in results for version in applied) == list(range(1, LATEST_VERSION + 1))
+    with engines[0].connect() as connection:
+        versions = connection.execute(select(schema_version.c.version)).scalars().all()
+    assert sorted(versions) == list(range(1, LATEST_VERSION + 1))
+
+
+def test_sql_matches_due_index(repository, decks):
+    rng = random.Random(1)
+    for user_id, deck in decks.items():
+        due_index = DueIndex()
+        due_index.rebuild(deck)
+        for _ in range(4):
+            tenses = rng.sample(TENSES, rng.randrange(1, len(TENSES) + 1))
+            level = rng.choice(LEVELS)
+            today = TODAY + rng.randrange(-10, 10)
+            verbs = frozenset(CODEC.verbs[:level])
+
+            expected = list(due_index.iter_due(day_to_iso(today), tenses, verbs))
+            assert repository.count_due(user_id, today, tenses, level) == len(expected)
+
+            limit = rng.randrange(1, 50)
+            fetched = repository.fetch_due(user_id, today, limit, tenses, level)
+            expected_days = sorted(deck[card_id].next_review_day for card_id in expected)[:limit]
+            assert [card.next_review_day for card in fetched.values()] == expected_days
+            assert set(fetched) <= set(expected)
+
+
+def test_due_queries_use_the_due_index(repository):
+    statements = []
+
+    def capture(connection, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(repository.engine, 'before_cursor_execute', capture)
+    try:
+        repository.count_due('user-0', TODAY, ['presente'], 30)
+        repository.fetch_due('user-0', TODAY, 20, ['presente', 'subjuntivo'], 50)
+    finally:
+        event.remove(repository.engine, 'before_cursor_execute', capture)
+
+    assert len(statements) == 2
+    with repository.engine.connect() as connection:
+        for statement, parameters in statements:
+            plan = ' | '.join(row[-1] for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters))
+            assert 'USING INDEX ix_cards_user_due' in plan or 'USING COVERING INDEX ix_cards_user_due' in plan, plan
@@ -0,0 +1,69 @@
+# tests/test_footprint.py
+"""
+Размер колоды в памяти: обход останавливается на общих ресурсах
+"""
+
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+from srs.card_ids import CardCodec
+from srs.models import Card
+from storage.local_cache import LocalCache
+from storage.repository import DeckRepository
+from storage.session_decks import UserDeck
+from ui.footprint import deep_size, session_footprint
+
+CODEC = CardCodec([f"verb{verb_index}" for verb_index in range(20)], ['presente', 'indefinido'])
+USER = 'user@example.com'
+EXCLUDE = (DeckRepository, Engine, LocalCache)
+
+
+def make_deck() -> UserDeck:
+    deck = UserDeck(user_id=USER)
+    for verb in CODEC.verbs:
+        card_id = CODEC.encode(verb, 0, 'presente')
+        deck.cards.add(card_id, Card(verb=verb, pronoun_index=0, tense='presente'))
+        deck.due_index.update(card_id, deck.cards[card_id])
+    return deck
+
+
+@pytest.fixture
+def connected_deck(tmp_path):
+    """Колода, подключенная как в приложении: репозиторий и локальный кэш с фоновой синхронизацией"""
+    primary = DeckRepository(create_engine('sqlite:///' + str(tmp_path / 'primary.db')), CODEC)
+    primary.create_schema()
+    deck = make_deck()
+    deck.repository = primary
+    deck.local_cache = LocalCache(str(tmp_path / 'cache'), USER, CODEC)
+    deck.local_cache.start_periodic_sync(primary, interval=3600, on_pull=deck.merge_pulled)
+    yield deck
+    deck.close()
+
+
+def test_walk_stops_at_shared_resources(connected_deck):
+    detached = make_deck()
+
+    connected = deep_size(connected_deck, exclude=EXCLUDE)
+
+    # Репозиторий, движок и кэш не входят в размер: остается только сама колода
+    assert abs(connected - deep_size(detached)) <= 256
+    assert deep_size(connected_deck) > 2 * connected
+
+
+def test_excluded_object_is_not_counted():
+    deck = make_deck()
+
+    assert deep_size(deck, exclude=(UserDeck,)) == 0
+    assert deep_size([deck], exclude=(UserDeck,)) == sys.getsizeof([deck])
+
+
+def test_session_footprint_passes_exclude(connected_deck):
+    state = {'deck': connected_deck, 'queue': [1, 2, 3]}
+
+    report = session_footprint([state], EXCLUDE)
+
+    assert report['keys']['deck']['total_bytes'] == deep_size(connected_deck, exclude=EXCLUDE)
+    assert report['total_bytes'] <= deep_size(connected_deck, exclude=EXCLUDE) + deep_size([1, 2, 3])
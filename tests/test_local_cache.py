@@ -0,0 +1,213 @@
+# tests/test_local_cache.py
+"""
+Локальный кэш: pull и push с основной базой, last writer wins по updated_at
+"""
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine
+
+from srs.card_ids import CardCodec
+from srs.models import Card
+from srs.review_log import ReviewLog
+from srs.stats import DeckStats
+from storage.local_cache import LocalCache, SyncResult
+from storage.repository import DeckRepository
+from storage.session_decks import UserDeck
+from storage.write_behind import FlushWorker, WriteBuffer
+
+CODEC = CardCodec(['hablar', 'comer'], ['presente'])
+USER = 'user@example.com'
+HABLAR = CODEC.encode('hablar', 0, 'presente')
+COMER = CODEC.encode('comer', 0, 'presente')
+
+
+@pytest.fixture
+def primary(tmp_path):
+    primary = DeckRepository(create_engine('sqlite:///' + str(tmp_path / 'primary.db')), CODEC)
+    primary.create_schema()
+    return primary
+
+
+@pytest.fixture
+def worker():
+    worker = FlushWorker(retry_delay=0)
+    yield worker
+    assert worker.drain(5)
+
+
+def make_cache(tmp_path, device: str) -> LocalCache:
+    return LocalCache(str(tmp_path / device), USER, CODEC)
+
+
+def card_row(card_id: int, total_reviews: int, updated_at: float) -> dict:
+    return {
+        'user_id': USER, 'card_id': card_id, 'tense': 'presente', 'easiness': 2.5, 'interval': total_reviews,
+        'repetitions': total_reviews, 'next_review_day': 0, 'last_review_day': 0,
+        'total_reviews': total_reviews, 'correct_reviews': total_reviews, 'updated_at': updated_at,
+    }
+
+
+def total_reviews(repository: DeckRepository, card_id: int) -> int:
+    return repository.card_rows_by_id(USER, [card_id])[0]['total_reviews']
+
+
+def open_deck(cache: LocalCache) -> UserDeck:
+    """Колода устройства, загруженная из кэша так же, как load_user_data"""
+    repository = cache.repository
+    deck = UserDeck(user_id=USER, repository=repository)
+    for card_id in (HABLAR, COMER):
+        if not repository.card_rows_by_id(USER, [card_id]):
+            verb, pronoun_index, tense = CODEC.decode(card_id)
+            deck.cards.add(card_id, Card(verb=verb, pronoun_index=pronoun_index, tense=tense))
+    repository.save_deck(USER, deck.cards)
+    deck.cards = repository.load_deck(USER)
+    last_seq = repository.last_event_seq(USER)
+    deck.review_log = ReviewLog(first_seq=last_seq + 1)
+    deck.write_buffer = WriteBuffer(flushed_seq=last_seq)
+    deck.due_index.rebuild(deck.cards)
+    deck.deck_stats = DeckStats.from_cards(deck.cards)
+    return deck
+
+
+def answer(deck: UserDeck, card_id: int) -> None:
+    with deck.lock:
+        card = deck.cards[card_id]
+        deck.review_log.append(card_id, 2, time.time(), card.interval, card.easiness_factor)
+        card.total_reviews += 1
+        card.correct_reviews += 1
+        card.interval += 1
+        deck.deck_stats.record_review(card, True)
+        deck.due_index.update(card_id, card)
+
+
+def test_first_sync_copies_the_whole_deck(tmp_path, primary):
+    primary.write([card_row(HABLAR, 3, 100.0), card_row(COMER, 1, 100.0)], [])
+    cache = make_cache(tmp_path, 'phone')
+
+    result = cache.sync(primary)
+
+    assert cache.has_synced
+    assert result.pulled_cards == 2 and sorted(result.pulled_ids) == sorted([HABLAR, COMER])
+    assert total_reviews(cache.repository, HABLAR) == 3
+
+
+def test_push_appends_local_events_after_the_primary_log(tmp_path, primary, worker):
+    cache = make_cache(tmp_path, 'phone')
+    cache.sync(primary)
+    deck = open_deck(cache)
+    answer(deck, HABLAR)
+    answer(deck, COMER)
+    deck.flush(worker, durable=True)
+
+    result = cache.sync(primary)
+
+    assert (result.pushed_events, result.pushed_cards) == (2, 2)
+    assert [event.card_id for event in primary.events_since(USER, 0)] == [HABLAR, COMER]
+    assert total_reviews(primary, HABLAR) == 1
+    # Повторная синхронизация ничего не отправляет и не забирает свои же события
+    assert cache.sync(primary) == SyncResult(0, 0, 0)
+
+
+@pytest.mark.parametrize('local_at, primary_at, winner', [(200.0, 100.0, 5), (100.0, 200.0, 7)])
+def test_card_conflict_is_resolved_by_updated_at(tmp_path, primary, local_at, primary_at, winner):
+    cache = make_cache(tmp_path, 'phone')
+    cache.sync(primary)
+    cache.repository.write([card_row(HABLAR, 5, local_at)], [])
+    log = ReviewLog()
+    log.append(HABLAR, 2, 0.0, 0, 2.5)
+    cache.repository.write([], cache.repository.event_rows(USER, log.since(0)))
+    # Другое устройство уже записало ту же карточку в основную базу
+    primary.append_events(USER, [], [card_row(HABLAR, 7, primary_at)])
+    log = ReviewLog()
+    log.append(HABLAR, 1, 0.0, 0, 2.5)
+    primary.write([], primary.event_rows(USER, log.since(0)))
+
+    cache.sync(primary)
+
+    assert total_reviews(primary, HABLAR) == winner
+    assert total_reviews(cache.repository, HABLAR) == winner
+
+
+def test_two_devices_editing_the_same_card(tmp_path, primary, worker):
+    phone, laptop = make_cache(tmp_path, 'phone'), make_cache(tmp_path, 'laptop')
+    phone.sync(primary)
+    laptop.sync(primary)
+    phone_deck, laptop_deck = open_deck(phone), open_deck(laptop)
+    phone.sync(primary)
+    laptop.sync(primary)
+
+    # Телефон дважды отвечает по карточке, ноутбук в это время открыт со старой колодой
+    answer(phone_deck, HABLAR)
+    answer(phone_deck, HABLAR)
+    phone_deck.flush(worker, durable=True)
+    phone.sync(primary)
+
+    result = laptop.sync(primary)
+    assert HABLAR in result.pulled_ids
+    assert laptop_deck.cards[HABLAR].total_reviews == 0
+    generation = laptop_deck.generation
+    assert laptop_deck.merge_pulled(list(result.pulled_ids)) == [HABLAR]
+    assert laptop_deck.cards[HABLAR].total_reviews == 2
+    assert laptop_deck.generation != generation
+    assert laptop_deck.cards.dirty_count == 0
+
+    # Ответ ноутбука продолжает прогресс телефона, а не перетирает его старыми значениями
+    answer(laptop_deck, HABLAR)
+    laptop_deck.flush(worker, durable=True)
+    laptop.sync(primary)
+    phone.sync(primary)
+
+    assert total_reviews(primary, HABLAR) == 3
+    assert total_reviews(phone.repository, HABLAR) == 3
+    assert len(primary.events_since(USER, 0)) == 3
+    assert laptop_deck.deck_stats.is_consistent(laptop_deck.cards, '1970-01-01', ['presente'], set())
+
+
+def test_merge_keeps_unsaved_local_changes(tmp_path, primary, worker):
+    phone, laptop = make_cache(tmp_path, 'phone'), make_cache(tmp_path, 'laptop')
+    phone.sync(primary)
+    laptop.sync(primary)
+    phone_deck, laptop_deck = open_deck(phone), open_deck(laptop)
+    phone.sync(primary)
+    laptop.sync(primary)
+
+    answer(phone_deck, HABLAR)
+    phone_deck.flush(worker, durable=True)
+    phone.sync(primary)
+    # Ноутбук ответил, но еще не записал ответ: его изменение новее пришедшего
+    answer(laptop_deck, HABLAR)
+    answer(laptop_deck, HABLAR)
+    result = laptop.sync(primary)
+
+    assert laptop_deck.merge_pulled(list(result.pulled_ids)) == []
+    assert laptop_deck.cards[HABLAR].total_reviews == 2
+    laptop_deck.flush(worker, durable=True)
+    laptop.sync(primary)
+    assert total_reviews(primary, HABLAR) == 2
+
+
+def test_periodic_sync_reports_pulled_cards(tmp_path, primary):
+    cache = make_cache(tmp_path, 'phone')
+    cache.sync(primary)
+    pulled = []
+    merged = threading.Event()
+
+    def on_pull(card_ids):
+        pulled.extend(card_ids)
+        merged.set()
+
+    primary.append_events(USER, [], [card_row(HABLAR, 4, time.time())])
+    log = ReviewLog()
+    log.append(HABLAR, 2, 0.0, 0, 2.5)
+    primary.write([], primary.event_rows(USER, log.since(0)))
+    cache.start_periodic_sync(primary, interval=0.01, on_pull=on_pull)
+    try:
+        assert merged.wait(5)
+    finally:
+        cache.close()
+
+    assert pulled == [HABLAR]
+    assert total_reviews(cache.repository, HABLAR) == 4
@@ -0,0 +1,112 @@
+# tests/test_new_cards.py
+"""
+Поток новых карточек: воспроизводимость, без повторов, пропуск изученных, все разделы
+"""
+
+import random
+
+import pytest
+
+from srs.new_cards import PRONOUN_COUNT, NewCardStream, seed_for_user
+
+VERBS = [f"verb{verb_index}" for verb_index in range(12)]
+# Уровни словаря - префиксы: первые 4 глагола и следующие 8
+PARTITIONS = {
+    ('presente', 0): tuple(VERBS[:4]),
+    ('presente', 4): tuple(VERBS[4:]),
+    ('indefinido', 0): tuple(VERBS[:4]),
+    ('indefinido', 4): tuple(VERBS[4:]),
+}
+
+
+def all_cards(partitions):
+    return {(verb, pronoun_index, tense) for (tense, _), verbs in partitions.items()
+            for verb in verbs for pronoun_index in range(PRONOUN_COUNT)}
+
+
+def drain(stream: NewCardStream, partitions, seen=None, limit=None):
+    """Берет карточки, как сессия: каждая выданная добавляется в колоду"""
+    seen = set() if seen is None else seen
+    taken = []
+    while limit is None or len(taken) < limit:
+        card = stream.next_card(partitions, lambda *card: card in seen)
+        if card is None:
+            break
+        taken.append(card)
+        seen.add(card)
+    return taken
+
+
+def test_same_seed_gives_same_order():
+    first = drain(NewCardStream(42), PARTITIONS)
+    second = drain(NewCardStream(42), PARTITIONS)
+
+    assert first == second
+    assert drain(NewCardStream(43), PARTITIONS) != first
+    # Порядок не зависит от процесса (хэш blake2b, а не hash())
+    assert first[:3] == [('verb0', 1, 'presente'), ('verb0', 1, 'indefinido'), ('verb1', 1, 'indefinido')]
+
+
+def test_card_stays_on_cursor_until_it_is_added():
+    stream = NewCardStream(1)
+
+    card = stream.next_card(PARTITIONS, lambda *card: False)
+
+    assert stream.next_card(PARTITIONS, lambda *card: False) == card
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_never_repeats_and_covers_every_partition(seed):
+    taken = drain(NewCardStream(seed), PARTITIONS)
+
+    assert len(taken) == len(set(taken)) == len(all_cards(PARTITIONS))
+    assert set(taken) == all_cards(PARTITIONS)
+    # Разделы выбираются пропорционально остатку: уже в начале потока встречаются все
+    early = taken[:len(taken) // 3]
+    for (tense, _), verbs in PARTITIONS.items():
+        assert any(card_tense == tense and verb in verbs for verb, _, card_tense in early)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_skips_cards_already_seen(seed):
+    rng = random.Random(seed)
+    seen = set(rng.sample(sorted(all_cards(PARTITIONS)), 60))
+    already = set(seen)
+
+    taken = drain(NewCardStream(seed), PARTITIONS, seen)
+
+    assert not already & set(taken)
+    assert set(taken) == all_cards(PARTITIONS) - already
+
+
+def test_copy_does_not_move_cursors():
+    stream = NewCardStream(7)
+    seen = set()
+    drain(stream, PARTITIONS, seen, limit=10)
+
+    ahead = drain(stream.copy(), PARTITIONS, set(seen), limit=5)
+
+    assert drain(stream, PARTITIONS, seen, limit=5) == ahead
+
+
+def test_new_partition_continues_without_repeats():
+    stream = NewCardStream(3)
+    seen = set()
+    small = {partition: verbs for partition, verbs in PARTITIONS.items() if partition[1] == 0}
+    before = drain(stream, small, seen, limit=20)
+
+    # Пользователь повысил уровень словаря: курсоры старых разделов сохраняются
+    after = drain(stream, PARTITIONS, seen)
+
+    assert not set(before) & set(after)
+    assert set(before) | set(after) == all_cards(PARTITIONS)
+
+
+def test_empty_partitions():
+    assert NewCardStream(0).next_card({}, lambda *card: False) is None
+    assert drain(NewCardStream(0), {('presente', 0): ()}) == []
+
+
+def test_seed_for_user_is_stable():
+    assert seed_for_user('user@example.com') == 16173368552542385224
+    assert seed_for_user('user@example.com') != seed_for_user('other@example.com')
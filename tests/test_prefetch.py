@@ -0,0 +1,133 @@
+# tests/test_prefetch.py
+"""
+Очередь предвыборки: заполнение до размера, порядок и сброс при смене сигнатуры
+"""
+
+from srs.card_ids import CardCodec
+from srs.card_store import CardStore
+from srs.due_index import DueIndex
+from srs.models import Card, day_to_iso
+from srs.prefetch import PREFETCH_SIZE, CardQueue
+
+TENSES = ['presente', 'indefinido']
+CODEC = CardCodec([f"verb{verb_index}" for verb_index in range(6)], TENSES)
+VERBS = frozenset(CODEC.verbs)
+TODAY = 739_000
+
+
+def due_store() -> CardStore:
+    """Колода, в которой к повторению сегодня все карточки, по одной на день просрочки"""
+    store = CardStore()
+    for position, (verb, tense) in enumerate((verb, tense) for verb in CODEC.verbs for tense in TENSES):
+        store.add(CODEC.encode(verb, 0, tense), Card(
+            verb=verb, pronoun_index=0, tense=tense, next_review_date=day_to_iso(TODAY - 20 + position)
+        ))
+    return store
+
+
+def refill(queue: CardQueue, index: DueIndex, signature) -> None:
+    """Правило сессии: очередь сбрасывается при смене сигнатуры, затем дополняется"""
+    today, tenses = signature
+    if queue.signature != signature:
+        queue.reset(signature)
+    queue.top_up(index.iter_due(today, tenses, VERBS))
+
+
+def test_top_up_fills_to_size_and_skips_duplicates():
+    queue = CardQueue()
+
+    queue.top_up([1, 2, 2, 3])
+    assert list(queue) == [1, 2, 3]
+
+    queue.top_up(range(10))
+    assert list(queue) == [1, 2, 3, 0, 4] and len(queue) == PREFETCH_SIZE
+
+    queue.top_up([99])
+    assert 99 not in queue
+
+
+def test_pop_returns_ids_in_order_and_none_when_empty():
+    queue = CardQueue(size=3)
+    queue.top_up([5, 6, 7])
+
+    assert [queue.pop() for _ in range(4)] == [5, 6, 7, None]
+    assert not queue
+
+
+def test_top_up_does_not_consume_source_beyond_size():
+    queue = CardQueue()
+    source = iter(range(100))
+
+    queue.top_up(source)
+
+    # Источник ленивый (индекс повторений, поток новых карточек): лишнее не вычисляется
+    assert next(source) == PREFETCH_SIZE
+
+
+def test_refills_to_size_after_answers():
+    store = due_store()
+    index = DueIndex()
+    index.rebuild(store)
+    queue = CardQueue()
+    signature = (day_to_iso(TODAY), ('presente', 'indefinido'))
+    refill(queue, index, signature)
+    expected = list(index.iter_due(*signature, VERBS))
+
+    for answered in range(4):
+        card_id = queue.pop()
+        assert card_id == expected[answered]
+        # Ответ переносит карточку на завтра: остальные в очереди остаются актуальными
+        store[card_id].next_review_date = day_to_iso(TODAY + 1)
+        index.update(card_id, store[card_id])
+        refill(queue, index, signature)
+        assert list(queue) == expected[answered + 1:answered + 1 + PREFETCH_SIZE]
+
+
+def test_signature_change_drops_stale_cards():
+    store = due_store()
+    index = DueIndex()
+    index.rebuild(store)
+    queue = CardQueue()
+    refill(queue, index, (day_to_iso(TODAY), ('presente', 'indefinido')))
+    assert {CODEC.decode(card_id)[2] for card_id in queue} == {'presente', 'indefinido'}
+
+    # Пользователь оставил одно время
+    signature = (day_to_iso(TODAY), ('indefinido',))
+    refill(queue, index, signature)
+
+    assert queue.signature == signature and len(queue) == PREFETCH_SIZE
+    assert list(queue) == list(index.iter_due(*signature, VERBS))[:PREFETCH_SIZE]
+
+
+def test_new_day_resets_queue():
+    store = due_store()
+    index = DueIndex()
+    index.rebuild(store)
+    queue = CardQueue()
+    refill(queue, index, (day_to_iso(TODAY - 18), ('presente', 'indefinido')))
+    assert len(queue) < PREFETCH_SIZE  # к повторению пока мало карточек
+
+    refill(queue, index, (day_to_iso(TODAY), ('presente', 'indefinido')))
+
+    assert queue.signature[0] == day_to_iso(TODAY) and len(queue) == PREFETCH_SIZE
+
+
+def test_invalidate_forces_refill_with_current_order():
+    store = due_store()
+    index = DueIndex()
+    index.rebuild(store)
+    queue = CardQueue()
+    signature = (day_to_iso(TODAY), ('presente', 'indefinido'))
+    refill(queue, index, signature)
+    # Набор к повторению изменился в обход очереди (другая вкладка, синхронизация):
+    # карточка с конца стала самой просроченной
+    last = list(index.iter_due(*signature, VERBS))[-1]
+    store[last].next_review_date = day_to_iso(TODAY - 100)
+    index.update(last, store[last])
+
+    queue.invalidate()
+    assert queue.signature is None and not queue
+    refill(queue, index, signature)
+
+    assert queue.pop() == last
+    assert len(queue) == PREFETCH_SIZE - 1
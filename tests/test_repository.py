@@ -0,0 +1,160 @@
+# tests/test_repository.py
+"""
+Репозиторий колод: сохранение и загрузка, запись только изменившихся карточек, last writer wins
+"""
+
+import random
+
+import pytest
+from sqlalchemy import create_engine, event
+
+from srs.card_ids import CardCodec
+from srs.card_store import CardStore
+from srs.models import Card, Difficulty, day_to_iso
+from srs.review_log import ReviewLog
+from srs.scheduler import SRSManager
+from storage.repository import DeckCoverage, DeckRepository
+from storage.write_behind import WriteBuffer
+
+TENSES = ['presente', 'indefinido', 'subjuntivo']
+CODEC = CardCodec([f"verb{verb_index}" for verb_index in range(30)], TENSES)
+USER = 'user@example.com'
+TODAY = 739_000
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = DeckRepository(create_engine('sqlite:///' + str(tmp_path / 'decks.db')), CODEC)
+    repository.create_schema()
+    return repository
+
+
+def random_deck(rng: random.Random, count: int = 200) -> CardStore:
+    store = CardStore()
+    card_ids = rng.sample([
+        CODEC.encode(verb, pronoun_index, tense)
+        for verb in CODEC.verbs for tense in TENSES for pronoun_index in range(6)
+    ], count)
+    for card_id in card_ids:
+        verb, pronoun_index, tense = CODEC.decode(card_id)
+        interval = rng.randrange(0, 90)
+        next_day = TODAY + rng.randrange(-30, 30)
+        store.add(card_id, Card(
+            verb=verb, pronoun_index=pronoun_index, tense=tense,
+            easiness_factor=rng.choice([1.3, 1.85, 2.5, 2.75]), interval=interval,
+            repetitions=rng.randrange(0, 10), next_review_date=day_to_iso(next_day),
+            last_review_date=day_to_iso(next_day - interval), total_reviews=rng.randrange(1, 50),
+            correct_reviews=0
+        ))
+    return store
+
+
+def as_cards(store: CardStore):
+    return {card_id: card.to_card() for card_id, card in store.items()}
+
+
+def card_row(card_id: int, total_reviews: int, updated_at: float) -> dict:
+    return {
+        'user_id': USER, 'card_id': card_id, 'tense': CODEC.decode(card_id)[2], 'easiness': 2.5,
+        'interval': 1, 'repetitions': 1, 'next_review_day': TODAY, 'last_review_day': TODAY - 1,
+        'total_reviews': total_reviews, 'correct_reviews': 0, 'updated_at': updated_at,
+    }
+
+
+def count_statements(repository: DeckRepository):
+    """Список, в который попадают параметры каждого выполненного запроса"""
+    executed = []
+    event.listen(repository.engine, 'before_cursor_execute',
+                 lambda conn, cursor, statement, parameters, context, many: executed.append((statement, parameters)))
+    return executed
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_save_then_load_round_trip(repository, seed):
+    store = random_deck(random.Random(seed))
+
+    assert repository.save_deck(USER, store) == len(store)
+
+    assert as_cards(repository.load_deck(USER)) == as_cards(store)
+    assert repository.load_deck('other@example.com').keys() == []
+
+
+def test_load_partitions_loads_only_missing_cards(repository):
+    store = random_deck(random.Random(3))
+    repository.save_deck(USER, store)
+    coverage = DeckCoverage()
+    ranges = coverage.missing(['presente'], 10)
+
+    session = CardStore()
+    added = repository.load_partitions(USER, ranges, session)
+    coverage.extend(ranges)
+
+    expected = {card_id for card_id in store if CODEC.decode(card_id)[2] == 'presente'
+                and CODEC.verbs.index(CODEC.decode(card_id)[0]) < 10}
+    assert set(added) == expected and set(session) == expected
+    assert coverage.missing(['presente'], 10) == {}
+    # Карточки сессии не перезаписываются: в памяти они не старше базы
+    some_id = next(iter(expected))
+    session[some_id].total_reviews = 999
+    assert repository.load_partitions(USER, coverage.missing(['presente'], 30), session)
+    assert session[some_id].total_reviews == 999
+
+
+def test_only_dirty_cards_are_saved(repository):
+    store = random_deck(random.Random(4))
+    repository.save_deck(USER, store)
+    store = repository.load_deck(USER)
+    assert store.dirty_count == 0
+    changed = list(store)[:3]
+    for card_id in changed:
+        SRSManager.update_card(store[card_id], Difficulty.GOOD)
+    log = ReviewLog()
+    executed = count_statements(repository)
+
+    batch = WriteBuffer().take(USER, store, log, repository)
+    repository.write(batch.card_rows, batch.event_rows)
+
+    assert sorted(batch.card_ids) == sorted(changed)
+    written = [parameters for statement, parameters in executed if statement.lstrip().upper().startswith('INSERT')]
+    assert len(written) == 1 and len(written[0]) == len(changed)
+    assert as_cards(repository.load_deck(USER)) == as_cards(store)
+
+
+def test_newer_row_wins_and_older_row_is_ignored(repository):
+    card_id = CODEC.encode('verb1', 0, 'presente')
+    repository.write([card_row(card_id, 5, 200.0)], [])
+
+    repository.write([card_row(card_id, 3, 100.0)], [])
+    assert repository.card_rows_by_id(USER, [card_id])[0]['total_reviews'] == 5
+
+    repository.write([card_row(card_id, 7, 200.0)], [])  # та же отметка - побеждает последняя запись
+    assert repository.card_rows_by_id(USER, [card_id])[0]['total_reviews'] == 7
+
+    repository.write([card_row(card_id, 9, 300.0)], [])
+    row = repository.card_rows_by_id(USER, [card_id])[0]
+    assert (row['total_reviews'], row['updated_at']) == (9, 300.0)
+
+
+def test_new_card_without_answers_does_not_overwrite_progress(repository):
+    card_id = CODEC.encode('verb2', 1, 'indefinido')
+    repository.write([card_row(card_id, 4, 100.0)], [])
+    fresh = CardStore()
+    verb, pronoun_index, tense = CODEC.decode(card_id)
+    fresh.add(card_id, Card(verb=verb, pronoun_index=pronoun_index, tense=tense))
+
+    repository.save_cards(USER, fresh, [card_id])
+
+    assert repository.card_rows_by_id(USER, [card_id])[0]['total_reviews'] == 4
+
+
+def test_refresh_cards_replaces_values_without_marking_dirty(repository):
+    store = random_deck(random.Random(5), count=20)
+    repository.save_deck(USER, store)
+    session = repository.load_deck(USER)
+    card_id = list(session)[0]
+    not_loaded = next(other for other in random_deck(random.Random(6), count=40) if other not in session)
+    repository.write([card_row(card_id, 77, 10 ** 10), card_row(not_loaded, 1, 10 ** 10)], [])
+
+    assert repository.refresh_cards(USER, session, [card_id, not_loaded]) == [card_id]
+
+    assert session[card_id].total_reviews == 77 and session.dirty_count == 0
@@ -0,0 +1,111 @@
+# tests/test_review_import.py
+"""
+Импорт истории: колода и журнал совпадают с поштучным update_card (SQLite и Postgres COPY)
+"""
+
+import io
+import os
+import random
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from benchmarks.review_import import BAD_ROWS, CODEC, PRONOUNS, random_history, scalar_import, to_csv, to_ndjson
+from storage import review_import
+from storage.database import create_database_engine
+from storage.repository import DeckRepository
+from storage.review_import import FORMAT_CSV, FORMAT_NDJSON, import_history
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = DeckRepository(create_database_engine('sqlite:///' + str(tmp_path / 'import.db')), CODEC)
+    repository.create_schema()
+    return repository
+
+
+@pytest.fixture
+def postgres_repository():
+    """Репозиторий в Postgres из TEST_POSTGRES_URL; тест пропускается без psycopg2 или базы"""
+    pytest.importorskip('psycopg2')
+    url = os.getenv('TEST_POSTGRES_URL')
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    repository = DeckRepository(create_database_engine(url), CODEC)
+    try:
+        repository.create_schema()
+    except SQLAlchemyError as e:
+        pytest.skip(f"Postgres is not available: {e}")
+    yield repository
+    repository.engine.dispose()
+
+
+def check_matches_update_card(repository: DeckRepository, seed: int, user_id: str) -> None:
+    """Колода и журнал после импорта совпадают с поштучным update_card по времени ответов"""
+    rng = random.Random(seed)
+    records = random_history(rng, rng.randrange(1, 3000))
+    expected_deck, expected_events = scalar_import(records)
+    fmt = rng.choice([FORMAT_CSV, FORMAT_NDJSON])
+    text = to_csv(records) if fmt == FORMAT_CSV else to_ndjson(records)
+
+    report = import_history(repository, user_id, io.StringIO(text), fmt, PRONOUNS, chunk_size=rng.randrange(50, 1000))
+
+    assert report.read == len(records) and sum(report.skipped.values()) == len(BAD_ROWS)
+    assert report.imported == len(expected_events) and report.cards == len(expected_deck)
+    saved = repository.load_deck(user_id)
+    assert {card_id: card.to_card() for card_id, card in saved.items()} == expected_deck
+    events = repository.events_since(user_id, 0)
+    assert [(event.card_id, event.grade, event.timestamp, event.prev_interval, event.prev_ease)
+            for event in events] == expected_events
+    assert [event.seq for event in events] == list(range(1, len(expected_events) + 1))
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_import_matches_update_card(repository, seed):
+    check_matches_update_card(repository, seed, f"user-{seed}")
+
+
+def test_postgres_copy_matches_update_card(postgres_repository):
+    with postgres_repository.engine.connect() as connection:
+        assert connection.dialect.driver == 'psycopg2'  # события грузятся через COPY FROM STDIN
+    user_id = f"import-test-{os.getpid()}"
+    try:
+        check_matches_update_card(postgres_repository, 0, user_id)
+    finally:
+        with postgres_repository.engine.begin() as connection:
+            for table in ('review_events', 'cards'):
+                connection.exec_driver_sql(f"DELETE FROM {table} WHERE user_id = %s", (user_id,))
+
+
+def test_import_appends_after_existing_events(repository):
+    history = to_ndjson(random_history(random.Random(1), 20))
+    first = import_history(repository, 'user@x', io.StringIO(history), FORMAT_NDJSON, PRONOUNS)
+
+    second = import_history(repository, 'user@x', io.StringIO(history), FORMAT_NDJSON, PRONOUNS)
+
+    assert (second.first_seq, second.last_seq) == (first.last_seq + 1, 2 * first.last_seq)
+    assert repository.last_event_seq('user@x') == 2 * first.imported
+
+
+def test_command_line_import(tmp_path, capsys):
+    path = tmp_path / 'history.csv'
+    path.write_text(
+        "verb,tense,pronoun,grade,timestamp\n"
+        "hablar,Present,yo,good,2024-01-01T10:00:00\n"
+        "hablar,presente,tú,again,1704103200\n"
+        "hablarse,presente,yo,2,1704103200\n",
+        encoding='utf-8'
+    )
+    url = 'sqlite:///' + str(tmp_path / 'cli.db')
+
+    assert review_import.main([str(path), '--user', 'user@x', '--database-url', url]) == 0
+
+    output = capsys.readouterr().out
+    assert 'imported 2 of 3 rows into 2 cards' in output and 'skipped 1: unknown verb' in output
+    repository = DeckRepository(create_database_engine(url), CODEC)
+    assert repository.last_event_seq('user@x') == 2
+
+
+def test_command_line_rejects_unknown_extension(tmp_path):
+    with pytest.raises(SystemExit):
+        review_import.main([str(tmp_path / 'history.txt'), '--user', 'user@x'])
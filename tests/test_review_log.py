@@ -0,0 +1,108 @@
+# tests/test_review_log.py
+"""
+Журнал ответов: колода, восстановленная из журнала и снимка, совпадает с живой
+"""
+
+import datetime
+import random
+
+import pytest
+
+from srs.card_ids import CardCodec
+from srs.card_store import CardStore
+from srs.models import Card, Difficulty
+from srs.review_log import ReviewLog, replay, restore, take_snapshot
+from srs.scheduler import SRSManager
+
+TENSES = ['presente', 'indefinido', 'subjuntivo']
+CODEC = CardCodec([f"verb{verb_index}" for verb_index in range(20)], TENSES)
+START = datetime.datetime(2024, 1, 1).timestamp()
+
+
+def answer(store: CardStore, log: ReviewLog, rng: random.Random, timestamp: float) -> None:
+    """Ответ, как в сессии: событие с интервалом и EF до ответа, затем update_card"""
+    verb = rng.choice(CODEC.verbs[:8])
+    card_id = CODEC.encode(verb, rng.randrange(6), rng.choice(TENSES))
+    if card_id not in store:
+        _, pronoun_index, tense = CODEC.decode(card_id)
+        store.add(card_id, Card(verb=verb, pronoun_index=pronoun_index, tense=tense))
+    card = store[card_id]
+    grade = rng.choice(list(Difficulty))
+    log.append(card_id, grade.value, timestamp, card.interval, card.easiness_factor)
+    SRSManager.update_card(card, grade, review_date=datetime.date.fromtimestamp(timestamp))
+
+
+def play(store: CardStore, log: ReviewLog, rng: random.Random, count: int, start: float) -> float:
+    """count ответов в случайные моменты за несколько дней; возвращает время последнего"""
+    timestamp = start
+    for _ in range(count):
+        timestamp += rng.random() * 86400 * 0.7
+        answer(store, log, rng, timestamp)
+    return timestamp
+
+
+def as_cards(store: CardStore):
+    return {card_id: card.to_card() for card_id, card in store.items()}
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_replay_matches_live_deck(seed):
+    rng = random.Random(seed)
+    store, log = CardStore(), ReviewLog()
+    play(store, log, rng, rng.randrange(1, 400), START)
+
+    rebuilt = replay(log, CODEC, chunk_size=rng.randrange(1, 64))
+
+    assert as_cards(rebuilt) == as_cards(store)
+    assert list(rebuilt) == list(store)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_restore_from_snapshot_matches_live_deck(seed):
+    rng = random.Random(seed)
+    store, log = CardStore(), ReviewLog()
+    count = rng.randrange(0, 200)
+    last = play(store, log, rng, count, START)
+    snapshot = take_snapshot(store, log)
+    snapshot_cards = as_cards(snapshot.store)
+
+    play(store, log, rng, rng.randrange(1, 200), last)
+
+    assert snapshot.seq == count
+    assert as_cards(snapshot.store) == snapshot_cards  # снимок не меняется вместе с колодой
+    assert as_cards(restore(snapshot, log, CODEC)) == as_cards(store)
+    assert as_cards(restore(None, log, CODEC)) == as_cards(store)
+    assert as_cards(snapshot.store) == snapshot_cards  # и при восстановлении
+
+
+def test_restore_from_log_started_after_snapshot():
+    rng = random.Random(7)
+    store, log = CardStore(), ReviewLog()
+    last = play(store, log, rng, 50, START)
+    snapshot = take_snapshot(store, log)
+    tail = ReviewLog(first_seq=snapshot.seq + 1)
+
+    play(store, tail, rng, 50, last)
+
+    assert [event.seq for event in tail][:1] == [51]
+    assert as_cards(restore(snapshot, tail, CODEC)) == as_cards(store)
+
+
+def test_restore_rejects_gap_between_snapshot_and_log():
+    rng = random.Random(8)
+    store, log = CardStore(), ReviewLog()
+    last = play(store, log, rng, 20, START)
+    snapshot = take_snapshot(store, log)
+    tail = ReviewLog(first_seq=snapshot.seq + 3)
+    play(store, tail, rng, 5, last)
+
+    with pytest.raises(ValueError, match=r'events 21\.\.22 are missing'):
+        restore(snapshot, tail, CODEC)
+    with pytest.raises(ValueError, match=r'events 1\.\.22 are missing'):
+        restore(None, tail, CODEC)
+
+
+def test_snapshot_of_empty_log():
+    snapshot = take_snapshot(CardStore(), ReviewLog())
+
+    assert snapshot.seq == 0 and len(restore(snapshot, ReviewLog(), CODEC)) == 0
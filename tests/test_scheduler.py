@@ -0,0 +1,73 @@
+# tests/test_scheduler.py
+"""
+Пакетное SM-2 (SRSManager.update_many) против поштучного update_card
+"""
+
+import datetime
+import random
+
+import pytest
+
+from srs.card_ids import CardCodec
+from srs.card_store import CardStore
+from srs.models import Card, Difficulty, day_to_iso
+from srs.scheduler import SRSManager
+
+TENSES = ['presente', 'indefinido', 'subjuntivo', 'imperfecto']
+CODEC = CardCodec([f"verb{verb_index}" for verb_index in range(100)], TENSES)
+ALL_IDS = [
+    CODEC.encode(verb, pronoun_index, tense)
+    for verb in CODEC.verbs for tense in TENSES for pronoun_index in range(6)
+]
+COLUMNS = ('easiness', 'interval', 'repetitions', 'next_day', 'last_day', 'total_reviews', 'correct_reviews')
+START_DAY = datetime.date(2024, 1, 1).toordinal()
+
+
+def make_store(card_ids) -> CardStore:
+    store = CardStore()
+    for card_id in card_ids:
+        verb, pronoun_index, tense = CODEC.decode(card_id)
+        store.add(card_id, Card(verb=verb, pronoun_index=pronoun_index, tense=tense))
+    return store
+
+
+def random_reviews(rng: random.Random, card_ids, count: int):
+    """Случайная история ответов с повторами карточек и растущими датами"""
+    ids = [rng.choice(card_ids) for _ in range(count)]
+    grades = [rng.choice(list(Difficulty)) for _ in range(count)]
+    days = sorted(START_DAY + rng.randrange(365) for _ in range(count))
+    return ids, grades, days
+
+
+def apply_scalar(store: CardStore, ids, grades, days) -> None:
+    for card_id, grade, day in zip(ids, grades, days):
+        review_date = datetime.date.fromisoformat(day_to_iso(day))
+        SRSManager.update_card(store[card_id], grade, review_date=review_date)
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_update_many_matches_update_card(seed):
+    rng = random.Random(seed)
+    card_ids = rng.sample(ALL_IDS, rng.randrange(1, 60))
+    ids, grades, days = random_reviews(rng, card_ids, rng.randrange(1, 400))
+
+    scalar = make_store(card_ids)
+    apply_scalar(scalar, ids, grades, days)
+    vector = make_store(card_ids)
+    SRSManager.update_many(vector, ids, grades, days)
+
+    for column in COLUMNS:
+        assert getattr(vector, column).tobytes() == getattr(scalar, column).tobytes(), column
+
+
+def test_update_many_leaves_unreviewed_cards_alone():
+    rng = random.Random(0)
+    card_ids = rng.sample(ALL_IDS, 20)
+    ids, grades, days = random_reviews(rng, card_ids[:5], 30)
+
+    untouched = make_store(card_ids)
+    store = make_store(card_ids)
+    SRSManager.update_many(store, ids, grades, days)
+
+    for card_id in card_ids[5:]:
+        assert store[card_id].to_card() == untouched[card_id].to_card()
@@ -0,0 +1,189 @@
+# tests/test_session_decks.py
+"""
+Общее хранилище колод: одна колода на пользователя, сброс и вытеснение
+"""
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine
+
+from srs.card_ids import CardCodec
+from srs.models import Card
+from storage.repository import DeckRepository
+from storage.session_decks import DeckRegistry, UserDeck
+from storage.write_behind import FlushWorker
+
+CODEC = CardCodec(['hablar', 'comer'], ['presente'])
+HABLAR = CODEC.encode('hablar', 0, 'presente')
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = DeckRepository(create_engine('sqlite:///' + str(tmp_path / 'decks.db')), CODEC)
+    repository.create_schema()
+    return repository
+
+
+@pytest.fixture
+def worker():
+    worker = FlushWorker(retry_delay=0)
+    yield worker
+    assert worker.drain(5)
+
+
+def load(registry: DeckRegistry, handle: str, repository: DeckRepository, now: float) -> UserDeck:
+    """Колода, загруженная так же, как load_user_data: с пользователем и репозиторием"""
+    deck, created = registry.acquire(handle, now)
+    if created:
+        deck.user_id = handle
+        deck.repository = repository
+        deck.cards.add(HABLAR, Card(verb='hablar', pronoun_index=0, tense='presente'))
+        deck.cards.clear_dirty()
+        deck.lock.release()
+    return deck
+
+
+def answer(deck: UserDeck) -> None:
+    with deck.lock:
+        card = deck.cards[HABLAR]
+        deck.review_log.append(HABLAR, 2, time.time(), card.interval, card.easiness_factor)
+        card.total_reviews += 1
+        deck.write_buffer.record_answer()
+
+
+def test_sessions_of_one_user_share_a_deck(repository, worker):
+    registry = DeckRegistry(flush_worker=worker)
+
+    first = load(registry, 'user@x', repository, now=0)
+    second, created = registry.acquire('user@x', now=1)
+
+    assert second is first and not created
+    assert len(registry) == 1
+    answer(first)
+    assert second.cards[HABLAR].total_reviews == 1
+
+
+def test_new_deck_is_locked_until_loaded(repository, worker):
+    registry = DeckRegistry(flush_worker=worker)
+    deck, created = registry.acquire('user@x', now=0)
+    acquired = []
+
+    other = threading.Thread(target=lambda: acquired.append(deck.lock.acquire(timeout=0.05)))
+    other.start()
+    other.join()
+
+    assert created and acquired == [False]
+    deck.lock.release()
+
+
+def test_dirty_deck_is_flushed_before_it_is_dropped(repository, worker):
+    registry = DeckRegistry(idle_seconds=10, flush_worker=worker)
+    deck = load(registry, 'user@x', repository, now=0)
+    answer(deck)
+
+    assert registry.evict(now=100) == 1
+
+    assert 'user@x' not in registry
+    assert [event.card_id for event in repository.events_since('user@x', 0)] == [HABLAR]
+    assert repository.card_rows_by_id('user@x', [HABLAR])[0]['total_reviews'] == 1
+
+
+def test_session_thread_eviction_skips_dirty_decks(repository, worker):
+    registry = DeckRegistry(idle_seconds=10, flush_worker=worker)
+    deck = load(registry, 'user@x', repository, now=0)
+    answer(deck)
+
+    assert registry.evict(now=100, flush=False) == 0
+    assert 'user@x' in registry and repository.events_since('user@x', 0) == []
+
+
+def test_deck_with_a_batch_in_flight_is_not_evicted(repository, worker):
+    registry = DeckRegistry(idle_seconds=10, flush_worker=worker)
+    deck = load(registry, 'user@x', repository, now=0)
+    answer(deck)
+    batch = deck.write_buffer.take(deck.user_id, deck.cards, deck.review_log, repository)
+
+    assert not deck.is_clean()
+    assert registry.evict(now=100, flush=False) == 0
+
+    repository.write(batch.card_rows, batch.event_rows)
+    deck.write_buffer.complete(batch)
+    assert registry.evict(now=100, flush=False) == 1
+
+
+def test_eviction_waits_for_the_write_queue(repository, worker):
+    registry = DeckRegistry(idle_seconds=10, flush_worker=worker)
+    load(registry, 'user@x', repository, now=0)
+    release = threading.Event()
+    worker._queue.put(_BlockingBatch(release))
+
+    assert registry.evict(now=100) == 0
+    release.set()
+    assert worker.drain(5)
+    assert registry.evict(now=100) == 1
+
+
+def test_deck_in_use_is_not_evicted(repository, worker):
+    registry = DeckRegistry(idle_seconds=10, flush_worker=worker)
+    deck = load(registry, 'user@x', repository, now=0)
+    answer(deck)
+
+    with deck.lock:
+        # Другой поток (таймер) не ждет lock и пропускает колоду
+        result = []
+        sweeper = threading.Thread(target=lambda: result.append(registry.sweep(now=100)))
+        sweeper.start()
+        sweeper.join()
+        assert result == [(0, 0)]
+        assert 'user@x' in registry
+
+    assert registry.sweep(now=100) == (0, 1)
+
+
+def test_sweeper_flushes_due_decks_and_leaves_active_ones(repository, worker):
+    registry = DeckRegistry(idle_seconds=3600, flush_worker=worker)
+    deck = load(registry, 'user@x', repository, now=time.monotonic())
+    deck.write_buffer.every_seconds = 0
+    answer(deck)
+
+    registry.start_sweeper(interval=0.01)
+    try:
+        deadline = time.monotonic() + 5
+        while deck.write_buffer.has_changes(deck.cards, deck.review_log) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert worker.drain(5)
+    finally:
+        registry.stop_sweeper()
+
+    assert [event.card_id for event in repository.events_since('user@x', 0)] == [HABLAR]
+    assert 'user@x' in registry and registry.evictions == 0
+
+
+def test_oldest_decks_over_the_limit_are_evicted_first(repository, worker):
+    registry = DeckRegistry(max_decks=2, idle_seconds=3600, flush_worker=worker)
+    for now, handle in enumerate(['a@x', 'b@x', 'c@x']):
+        load(registry, handle, repository, now=now)
+
+    assert sorted(handle for handle, _ in registry.decks()) == ['b@x', 'c@x']
+    assert registry.evictions == 1
+
+
+class _BlockingBatch:
+    """Пачка, запись которой ждет release: очередь записи остается непустой"""
+
+    def __init__(self, release: threading.Event):
+        self.release = release
+        self.buffer = self
+        self.repository = self
+        self.card_rows = self.event_rows = []
+
+    def write(self, card_rows, event_rows):
+        self.release.wait(5)
+
+    def complete(self, batch):
+        pass
+
+    def reject(self, batch, error=None):
+        pass
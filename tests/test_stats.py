@@ -0,0 +1,42 @@
+# tests/test_stats.py
+"""
+Инкрементальные счетчики колоды против полного пересчета
+"""
+
+from srs.due_index import DueIndex
+from srs.models import Card
+from srs.stats import DeckStats
+
+TODAY = '2024-03-10'
+
+
+def make_cards():
+    return {
+        1: Card('hablar', 0, 'presente', next_review_date='2024-03-01', total_reviews=2, correct_reviews=1),
+        2: Card('comer', 1, 'presente', next_review_date='2024-03-20', total_reviews=1, correct_reviews=1),
+        3: Card('vivir', 2, 'indefinido', next_review_date='2024-03-10'),
+        4: Card('hablar', 3, 'indefinido', next_review_date='2024-03-05'),
+    }
+
+
+def test_due_count_is_checked_against_the_rebuilt_value():
+    cards = make_cards()
+    tenses, verbs = ['presente', 'indefinido'], {'hablar', 'vivir'}
+    due_index = DueIndex()
+    due_index.rebuild(cards)
+    stats = DeckStats.from_cards(cards)
+    stats.due_count = due_index.count_due(TODAY, tenses, verbs)
+
+    assert stats.due_count == 3
+    assert stats.is_consistent(cards, TODAY, tenses, verbs)
+
+    stats.due_count += 1
+    assert not stats.is_consistent(cards, TODAY, tenses, verbs)
+
+
+def test_counters_are_checked_against_the_rebuilt_value():
+    cards = make_cards()
+    stats = DeckStats.from_cards(cards)
+    stats.record_review(cards[1], correct=True)
+
+    assert not stats.is_consistent(cards, TODAY, [], [])
@@ -0,0 +1,57 @@
+# tests/test_vocabulary.py
+"""
+Уровни словаря: готовые разделы для потока новых карточек
+"""
+
+from itertools import combinations
+
+import pytest
+
+from srs.vocabulary import VocabularyLevels
+
+VERBS = [f"verb{verb_index}" for verb_index in range(10)]
+SIZES = [4, 7, 10]
+# Для subjuntivo спряжения есть не у всех глаголов
+CONJUGATIONS = {
+    'presente': {verb: [] for verb in VERBS},
+    'indefinido': {verb: [] for verb in VERBS},
+    'subjuntivo': {verb: [] for verb in VERBS[::2]},
+}
+
+
+@pytest.fixture(scope='module')
+def levels():
+    return VocabularyLevels(VERBS, SIZES, CONJUGATIONS)
+
+
+def expected_partitions(size, tenses):
+    """Разделы напрямую: диапазоны глаголов между соседними уровнями"""
+    bounds = [0] + [bound for bound in SIZES if bound <= size]
+    return {
+        (tense, start): tuple(verb for verb in VERBS[start:end] if verb in CONJUGATIONS[tense])
+        for tense in tenses
+        for start, end in zip(bounds, bounds[1:])
+    }
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_partitions_for_every_tense_set(levels, size):
+    for count in range(len(CONJUGATIONS) + 1):
+        for tenses in combinations(CONJUGATIONS, count):
+            assert dict(levels.partitions(size, list(tenses))) == expected_partitions(size, tenses)
+            # Порядок времен в настройках не важен
+            assert levels.partitions(size, reversed(tenses)) == levels.partitions(size, tenses)
+
+
+def test_partitions_are_cached_and_read_only(levels):
+    partitions = levels.partitions(7, ['presente', 'subjuntivo'])
+
+    assert levels.partitions(7, ['subjuntivo', 'presente']) is partitions
+    with pytest.raises(TypeError):
+        partitions[('indefinido', 0)] = ()
+
+
+def test_unknown_size_and_tense(levels):
+    assert levels.partitions(500, ['presente']) is levels.partitions(10, ['presente'])
+    assert levels.partitions(4, ['presente', 'futuro']) is levels.partitions(4, ['presente'])
+    assert levels.verb_set(500) == frozenset(VERBS)
@@ -0,0 +1,227 @@
+# tests/test_write_behind.py
+"""
+Отложенная запись: пороги сброса, повтор и возврат пачек, режим durable, очередь
+"""
+
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
+from srs.card_ids import CardCodec
+from srs.card_store import CardStore
+from srs.models import Card
+from srs.review_log import ReviewLog
+from storage.repository import DeckRepository
+from storage.write_behind import FlushWorker, WriteBuffer
+
+TENSES = ['presente', 'indefinido']
+CODEC = CardCodec(['hablar', 'comer', 'vivir'], TENSES)
+USER = 'user@example.com'
+HABLAR = CODEC.encode('hablar', 0, 'presente')
+COMER = CODEC.encode('comer', 0, 'presente')
+
+
+class FlakyRepository:
+    """Репозиторий, запись в который падает заданное число раз и может ждать разрешения"""
+
+    def __init__(self, repository: DeckRepository, failures: int = 0, error: Exception = None):
+        self.repository = repository
+        self.failures = failures
+        self.error = error or OperationalError('INSERT', {}, Exception('database is locked'))
+        self.attempts = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def card_rows(self, *args):
+        return self.repository.card_rows(*args)
+
+    def event_rows(self, *args):
+        return self.repository.event_rows(*args)
+
+    def write(self, card_rows, event_rows):
+        self.attempts += 1
+        self.started.set()
+        self.release.wait(5)
+        if self.failures:
+            self.failures -= 1
+            raise self.error
+        self.repository.write(card_rows, event_rows)
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = DeckRepository(create_engine('sqlite:///' + str(tmp_path / 'deck.db')), CODEC)
+    repository.create_schema()
+    return repository
+
+
+@pytest.fixture
+def worker():
+    worker = FlushWorker(retry_attempts=3, retry_delay=0)
+    yield worker
+    assert worker.drain(5)
+
+
+def make_deck():
+    store = CardStore()
+    for card_id in (HABLAR, COMER):
+        verb, pronoun_index, tense = CODEC.decode(card_id)
+        store.add(card_id, Card(verb=verb, pronoun_index=pronoun_index, tense=tense))
+    store.clear_dirty()
+    return store, ReviewLog()
+
+
+def answer(store: CardStore, log: ReviewLog, buffer: WriteBuffer, card_id: int) -> None:
+    """Ответ: карточка меняется, в журнал пишется событие"""
+    card = store[card_id]
+    log.append(card_id, 2, 1_700_000_000.0 + log.last_seq, card.interval, card.easiness_factor)
+    card.total_reviews += 1
+    buffer.record_answer()
+
+
+def stored_events(repository: DeckRepository):
+    return [(event.seq, CODEC.decode(event.card_id)[0]) for event in repository.events_since(USER, 0)]
+
+
+def test_is_due_after_answers():
+    store, log = make_deck()
+    buffer = WriteBuffer(every_answers=2, every_seconds=1000)
+
+    assert not buffer.is_due(store, log)
+    answer(store, log, buffer, HABLAR)
+    assert not buffer.is_due(store, log)
+    answer(store, log, buffer, COMER)
+    assert buffer.is_due(store, log)
+
+
+def test_is_due_after_seconds_only_with_changes():
+    store, log = make_deck()
+    buffer = WriteBuffer(every_answers=100, every_seconds=30)
+    now = buffer._last_flush
+
+    assert not buffer.is_due(store, log, now + 60)
+    answer(store, log, buffer, HABLAR)
+    assert not buffer.is_due(store, log, now + 10)
+    assert buffer.is_due(store, log, now + 30)
+
+
+def test_take_resets_thresholds_and_dirty_cards(repository):
+    store, log = make_deck()
+    buffer = WriteBuffer(every_answers=1)
+    answer(store, log, buffer, HABLAR)
+
+    batch = buffer.take(USER, store, log, repository)
+
+    assert batch.card_ids == [HABLAR] and batch.first_seq == 1 and len(batch.event_rows) == 1
+    assert store.dirty_count == 0 and buffer.flushed_seq == 1
+    assert not buffer.is_due(store, log)
+
+
+def test_failed_batch_is_retried_then_rejected_and_taken_again(repository, worker):
+    store, log = make_deck()
+    buffer = WriteBuffer()
+    flaky = FlakyRepository(repository, failures=3)
+    answer(store, log, buffer, HABLAR)
+
+    buffer.flush(USER, store, log, flaky, worker)
+    assert worker.drain(5)
+
+    assert flaky.attempts == 3
+    assert isinstance(buffer.error, OperationalError)
+    assert buffer.has_changes(store, log) and not buffer.in_flight
+    batch = buffer.take(USER, store, log, repository)
+    assert batch.card_ids == [HABLAR] and batch.first_seq == 1
+
+
+def test_later_batch_waits_for_failed_batch_without_duplicating_events(repository, worker):
+    store, log = make_deck()
+    buffer = WriteBuffer()
+    flaky = FlakyRepository(repository, failures=3)
+    flaky.release.clear()
+
+    answer(store, log, buffer, HABLAR)
+    buffer.flush(USER, store, log, flaky, worker)
+    assert flaky.started.wait(5)
+    # Первая пачка еще пишется - вторая не уходит в очередь раньше нее
+    answer(store, log, buffer, COMER)
+    buffer.flush(USER, store, log, flaky, worker)
+    assert worker.depth == 0
+
+    flaky.release.set()
+    assert worker.drain(5)
+    assert buffer.error is not None and stored_events(repository) == []
+
+    buffer.error = None
+    buffer.flush(USER, store, log, flaky, worker)
+    assert worker.drain(5)
+    buffer.flush(USER, store, log, flaky, worker)
+    assert worker.drain(5)
+
+    assert stored_events(repository) == [(1, 'hablar'), (2, 'comer')]
+    assert not buffer.has_changes(store, log)
+
+
+def test_durable_flush_writes_immediately(repository, worker):
+    store, log = make_deck()
+    buffer = WriteBuffer()
+    answer(store, log, buffer, HABLAR)
+
+    buffer.flush(USER, store, log, repository, worker, durable=True)
+
+    assert stored_events(repository) == [(1, 'hablar')]
+    assert repository.card_rows_by_id(USER, [HABLAR])[0]['total_reviews'] == 1
+    assert not buffer.has_changes(store, log) and not buffer.in_flight
+
+
+@pytest.mark.parametrize('error', [OperationalError('INSERT', {}, Exception('locked')), ValueError('bad row')])
+def test_durable_flush_rejects_on_any_error(repository, worker, error):
+    store, log = make_deck()
+    buffer = WriteBuffer()
+    answer(store, log, buffer, HABLAR)
+
+    with pytest.raises(type(error)):
+        buffer.flush(USER, store, log, FlakyRepository(repository, failures=1, error=error), worker, durable=True)
+
+    assert buffer.has_changes(store, log) and not buffer.in_flight
+    buffer.flush(USER, store, log, repository, worker, durable=True)
+    assert stored_events(repository) == [(1, 'hablar')]
+
+
+def test_full_queue_returns_batch_to_buffer(repository):
+    worker = FlushWorker(max_queued=1, retry_delay=0)
+    blocked = FlakyRepository(repository)
+    blocked.release.clear()
+    decks = [make_deck() for _ in range(3)]
+    buffers = [WriteBuffer() for _ in decks]
+    for (store, log), buffer in zip(decks, buffers):
+        answer(store, log, buffer, HABLAR)
+
+    # Первую пачку забирает поток (и ждет), вторая занимает очередь, третьей места нет
+    buffers[0].flush(USER, *decks[0], blocked, worker)
+    assert blocked.started.wait(5)
+    buffers[1].flush(USER, *decks[1], blocked, worker)
+    buffers[2].flush(USER, *decks[2], blocked, worker)
+
+    assert worker.depth == 1
+    assert buffers[2].has_changes(*decks[2]) and not buffers[2].in_flight and buffers[2].error is None
+    blocked.release.set()
+    assert worker.drain(5)
+    assert not buffers[1].has_changes(*decks[1])
+
+
+def test_drain_waits_for_queued_batches(repository, worker):
+    store, log = make_deck()
+    buffer = WriteBuffer()
+    blocked = FlakyRepository(repository)
+    blocked.release.clear()
+    answer(store, log, buffer, HABLAR)
+
+    buffer.flush(USER, store, log, blocked, worker)
+
+    assert not worker.drain(0.05)
+    blocked.release.set()
+    assert worker.drain(5)
+    assert stored_events(repository) == [(1, 'hablar')]
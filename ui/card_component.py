@@ -0,0 +1,40 @@
+# ui/card_component.py
+"""
+Компонент Streamlit для показа и оценки пачки карточек в браузере
+"""
+
+import os
+from typing import Callable, Dict, List, Optional
+
+import streamlit.components.v1 as components
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frontend', 'card_batch')
+
+_card_batch = components.declare_component('card_batch', path=FRONTEND_DIR)
+
+
+def card_batch(
+    batch_id: int,
+    cards: List[Dict],
+    labels: Dict[str, str],
+    key: str,
+    on_change: Optional[Callable[[], None]] = None
+) -> Optional[Dict]:
+    """
+    Показывает пачку карточек; ответы открываются в браузере без перезапуска
+
+    Компонент отправляет оценки, когда отвечена вся пачка (или раньше,
+    если пользователь уходит со страницы), поэтому на пачку приходится
+    один перезапуск вместо двух на каждую карточку.
+
+    Args:
+        batch_id: Номер пачки; пока он не меняется, браузер сохраняет свое состояние
+        cards: Карточки: id, verb, translation, tense, pronoun, answer
+        labels: Подписи кнопок и подсказок на языке интерфейса
+        key: Ключ виджета (значение - в st.session_state[key])
+        on_change: Вызывается перед перезапуском, когда пришли новые оценки
+
+    Returns:
+        {'batch_id': ..., 'grades': [[id карточки, оценка, время в мс], ...]} или None
+    """
+    return _card_batch(batch_id=batch_id, cards=cards, labels=labels, key=key, on_change=on_change, default=None)
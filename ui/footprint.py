@@ -0,0 +1,96 @@
+# ui/footprint.py
+"""
+Память, которую занимает st.session_state живых сессий
+"""
+
+import gc
+import sys
+import types
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+# Код и классы общие для всех сессий - по ним обход не идет
+_SHARED_TYPES = (
+    type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+    types.MethodType, types.CodeType
+)
+
+
+def deep_size(obj, seen: set = None, exclude: Tuple[type, ...] = ()) -> int:
+    """
+    Размер объекта вместе со всем, на что он ссылается
+
+    Args:
+        obj: Объект
+        seen: id уже учтенных объектов; общий набор не дает посчитать
+            дважды то, на что ссылаются несколько объектов
+        exclude: Типы общих ресурсов (репозиторий, движок БД, локальный
+            кэш): такие объекты не учитываются, и обход на них
+            останавливается, иначе в размер колоды попал бы пул соединений
+
+    Returns:
+        Байты по sys.getsizeof (массивы numpy - вместе с данными)
+    """
+    seen = set() if seen is None else seen
+    skip = _SHARED_TYPES + tuple(exclude)
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, skip):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        stack.extend(gc.get_referents(item))
+    return total
+
+
+def live_session_states() -> List[Mapping]:
+    """
+    Состояния всех подключенных сессий процесса
+
+    Использует внутренний API Streamlit (менеджер сессий рантайма); вне
+    запущенного сервера (AppTest, скрипты) возвращает пустой список.
+    """
+    try:
+        from streamlit.runtime import Runtime
+        if not Runtime.exists():
+            return []
+        sessions = Runtime.instance()._session_mgr.list_active_sessions()
+        return [info.session.session_state.filtered_state for info in sessions]
+    except (AttributeError, ImportError):
+        return []
+
+
+def session_footprint(states: Iterable[Mapping], exclude: Tuple[type, ...] = ()) -> Dict:
+    """
+    Размеры ключей session_state по сессиям
+
+    Каждый ключ считается отдельно; total сессии считается одним обходом,
+    поэтому общие для нескольких ключей объекты входят в него один раз.
+
+    Args:
+        states: Состояния сессий (ключ -> значение)
+        exclude: Типы общих ресурсов, на которых обход останавливается (см. deep_size)
+
+    Returns:
+        {sessions, total_bytes, max_session_bytes,
+         keys: {ключ: {sessions, total_bytes, max_bytes}}} - ключи по убыванию total_bytes
+    """
+    keys: Dict[str, Dict[str, int]] = {}
+    session_totals = []
+    for state in states:
+        seen: set = set()
+        session_totals.append(sum(deep_size(value, seen, exclude) for value in state.values()))
+        for key, value in state.items():
+            size = deep_size(value, exclude=exclude)
+            entry = keys.setdefault(key, {'sessions': 0, 'total_bytes': 0, 'max_bytes': 0})
+            entry['sessions'] += 1
+            entry['total_bytes'] += size
+            entry['max_bytes'] = max(entry['max_bytes'], size)
+
+    return {
+        'sessions': len(session_totals),
+        'total_bytes': sum(session_totals),
+        'max_session_bytes': max(session_totals, default=0),
+        'keys': dict(sorted(keys.items(), key=lambda item: -item[1]['total_bytes'])),
+    }
@@ -0,0 +1,173 @@
+# ui/profiling.py
+"""
+Замеры времени и аллокаций точек входа скрипта на каждом перезапуске
+"""
+
+import math
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Deque, Dict, Iterable, Iterator, List
+
+SESSION_CAPACITY = 500    # замеров в кольцевом буфере сессии
+PROCESS_WINDOW = 2000     # последних замеров каждой точки для перцентилей процесса
+
+
+@dataclass(frozen=True)
+class Sample:
+    name: str           # точка входа
+    started: float      # time.time() начала
+    wall_ms: float      # время выполнения, мс (вложенные вызовы входят во внешние)
+    blocks: int         # прирост выделенных блоков памяти (sys.getallocatedblocks)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Перцентиль методом ближайшего ранга; values должен быть отсортирован"""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[rank - 1]
+
+
+def summarize(samples: Iterable[Sample]) -> Dict[str, Dict[str, float]]:
+    """
+    Сводка по точкам входа
+
+    Args:
+        samples: Замеры
+
+    Returns:
+        {точка входа: {count, p50_ms, p99_ms, max_ms, mean_ms, p50_blocks}}
+    """
+    grouped: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        grouped.setdefault(sample.name, []).append(sample)
+
+    summary = {}
+    for name, group in sorted(grouped.items()):
+        wall = sorted(sample.wall_ms for sample in group)
+        blocks = sorted(sample.blocks for sample in group)
+        summary[name] = {
+            'count': len(group),
+            'p50_ms': round(percentile(wall, 50), 3),
+            'p99_ms': round(percentile(wall, 99), 3),
+            'max_ms': round(wall[-1], 3),
+            'mean_ms': round(sum(wall) / len(wall), 3),
+            'p50_blocks': percentile(blocks, 50),
+        }
+    return summary
+
+
+class RerunProfile:
+    """
+    Кольцевой буфер замеров одной сессии
+
+    Хранится в st.session_state; старые замеры вытесняются новыми.
+    """
+
+    def __init__(self, capacity: int = SESSION_CAPACITY):
+        self._samples: Deque[Sample] = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, sample: Sample) -> None:
+        self._samples.append(sample)
+
+    def samples(self) -> List[Sample]:
+        """Замеры от старых к новым"""
+        return list(self._samples)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return summarize(self._samples)
+
+
+class ProcessProfile:
+    """
+    Замеры всех сессий процесса
+
+    Общий объект (st.cache_resource), в который пишут потоки разных
+    сессий. Для перцентилей хранится окно последних замеров каждой
+    точки входа, общее число вызовов считается отдельно.
+    """
+
+    def __init__(self, window: int = PROCESS_WINDOW):
+        self._window = window
+        self._lock = threading.Lock()
+        self._recent: Dict[str, Deque[Sample]] = {}
+        self._counts: Dict[str, int] = {}
+        self.started = time.time()
+
+    def record(self, sample: Sample) -> None:
+        with self._lock:
+            recent = self._recent.get(sample.name)
+            if recent is None:
+                recent = self._recent[sample.name] = deque(maxlen=self._window)
+            recent.append(sample)
+            self._counts[sample.name] = self._counts.get(sample.name, 0) + 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Сводка по окну последних замеров; total - все вызовы с запуска процесса"""
+        with self._lock:
+            samples = [sample for recent in self._recent.values() for sample in recent]
+            counts = dict(self._counts)
+        summary = summarize(samples)
+        for name, entry in summary.items():
+            entry['total'] = counts[name]
+        return summary
+
+
+@contextmanager
+def measure(name: str, session: RerunProfile, process: ProcessProfile) -> Iterator[None]:
+    """
+    Замеряет блок кода и записывает результат в профиль сессии и процесса
+
+    Замер записывается и тогда, когда блок прерван исключением: st.rerun()
+    и st.stop() завершают обработчики именно так.
+
+    Args:
+        name: Точка входа
+        session: Профиль сессии
+        process: Профиль процесса
+    """
+    # Счетчик блоков общий для процесса: параллельные сессии и фоновые
+    # потоки тоже в него попадают, поэтому это оценка, а не точный подсчет
+    blocks = sys.getallocatedblocks()
+    started = time.time()
+    counter = time.perf_counter()
+    try:
+        yield
+    finally:
+        sample = Sample(
+            name=name,
+            started=started,
+            wall_ms=(time.perf_counter() - counter) * 1000,
+            blocks=sys.getallocatedblocks() - blocks
+        )
+        session.record(sample)
+        process.record(sample)
+
+
+def profile_dump(session: RerunProfile, process: ProcessProfile, gauges: Dict[str, float]) -> Dict:
+    """
+    Замеры в виде словаря для JSON
+
+    Args:
+        session: Профиль сессии
+        process: Профиль процесса
+        gauges: Текущие показатели (пул соединений, очередь записи и т.д.)
+
+    Returns:
+        {generated_at, process_started, session, process, gauges, samples}
+    """
+    return {
+        'generated_at': time.time(),
+        'process_started': process.started,
+        'session': session.summary(),
+        'process': process.summary(),
+        'gauges': dict(gauges),
+        'samples': [asdict(sample) for sample in session.samples()],
+    }
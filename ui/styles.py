@@ -0,0 +1,142 @@
+# ui/styles.py
+"""
+Стили интерфейса
+"""
+
+import json
+
+# Id тега <style> в документе страницы: по нему стили добавляются только один раз
+APP_STYLESHEET_ID = 'spanish-verbs-styles'
+
+# CSS стили
+APP_STYLESHEET = """
+    .main > div {
+        max-width: 1200px;
+        padding-left: 2rem;
+        padding-right: 2rem;
+    }
+    
+    .main-content {
+        max-width: 600px;
+        margin: 0 auto;
+        padding: 0 1rem;
+    }
+    
+    .verb-card {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        padding: 3rem 2rem;
+        border-radius: 1rem;
+        text-align: center;
+        margin: 2rem 0;
+        box-shadow: 0 12px 40px rgba(102, 126, 234, 0.3);
+        transition: all 0.3s ease;
+        cursor: pointer;
+    }
+    
+    .verb-card:hover {
+        transform: translateY(-3px);
+        box-shadow: 0 15px 45px rgba(102, 126, 234, 0.4);
+    }
+    
+    .verb-card.revealed {
+        background: linear-gradient(135deg, #48ca8b 0%, #2dd4bf 100%);
+        box-shadow: 0 12px 40px rgba(72, 202, 139, 0.3);
+    }
+    
+    .verb-title {
+        font-size: 3.5rem;
+        font-weight: bold;
+        margin-bottom: 0.5rem;
+    }
+    
+    .verb-translation {
+        font-size: 1.4rem;
+        opacity: 0.9;
+        margin-bottom: 1.5rem;
+    }
+    
+    .pronoun-display {
+        font-size: 2.2rem;
+        font-weight: bold;
+        margin: 1.5rem 0;
+        background: rgba(255,255,255,0.2);
+        padding: 1rem 2rem;
+        border-radius: 0.5rem;
+        display: inline-block;
+    }
+    
+    .answer-display {
+        font-size: 2.8rem;
+        font-weight: bold;
+        background: rgba(255,255,255,0.9);
+        color: #2d5e3e;
+        padding: 1.5rem 2rem;
+        border-radius: 0.5rem;
+        margin: 1.5rem 0;
+        display: inline-block;
+    }
+    
+    .user-panel {
+        background: rgba(255,255,255,0.1);
+        padding: 1rem;
+        border-radius: 0.5rem;
+        margin-bottom: 1rem;
+        text-align: center;
+    }
+    
+    .click-hint {
+        font-size: 1.2rem;
+        margin-top: 1rem;
+        opacity: 0.8;
+        animation: pulse-gentle 2s infinite;
+    }
+    
+    @keyframes pulse-gentle {
+        0% { opacity: 0.6; }
+        50% { opacity: 1; }
+        100% { opacity: 0.6; }
+    }
+    
+    .vocab-size-info {
+        background: #f0f9ff;
+        border: 1px solid #0ea5e9;
+        border-radius: 0.5rem;
+        padding: 0.75rem;
+        margin: 0.5rem 0;
+        font-size: 0.9rem;
+        color: #0c4a6e;
+    }
+"""
+
+APP_CSS = f"<style>{APP_STYLESHEET}</style>"
+
+
+def stylesheet_injector(stylesheet: str, style_id: str = APP_STYLESHEET_ID) -> str:
+    """
+    HTML для components.html, который добавляет стили в <head> страницы
+
+    Элементы Streamlit живут до следующего перезапуска, а тег <style> в
+    <head> остается, пока открыта вкладка: стили достаточно отправить
+    один раз за сессию, а не с каждым перезапуском.
+
+    Args:
+        stylesheet: CSS без тега <style>
+        style_id: Id тега; если он уже есть на странице, стили не добавляются
+
+    Returns:
+        Документ с одним скриптом для iframe компонента
+    """
+    # </ внутри строки закрыл бы <script>
+    css = json.dumps(stylesheet).replace('</', '<\\/')
+    return (
+        '<script>'
+        'const doc = window.parent.document;'
+        f'if (!doc.getElementById({json.dumps(style_id)})) {{'
+        'const style = doc.createElement("style");'
+        f'style.id = {json.dumps(style_id)};'
+        f'style.textContent = {css};'
+        'doc.head.appendChild(style);'
+        '}'
+        '</script>'
+    )
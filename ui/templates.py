@@ -0,0 +1,76 @@
+# ui/templates.py
+"""
+Заранее собранные HTML-шаблоны карточки
+"""
+
+from html import escape
+from string import Formatter
+from typing import Dict, List, Mapping, Tuple
+
+# Разметка в одну строку: без отступов markdown не примет её за блок кода
+CARD_MARKUP = (
+    '<div class="verb-card{revealed_class}">'
+    '<div class="verb-title">{verb}</div>'
+    '<div class="verb-translation">{translation}</div>'
+    '<div style="font-size: 1.2rem; opacity: 0.8; margin-bottom: 1rem;">{tense}</div>'
+    '<div class="pronoun-display">{pronoun}</div>'
+    '{footer}'
+    '</div>'
+)
+QUESTION_FOOTER = '<div class="click-hint">{click_to_reveal}</div>'
+ANSWER_FOOTER = '<div class="answer-display">✓ {answer}</div>'
+
+
+class CardTemplate:
+    """
+    Разметка карточки для одного языка и состояния (вопрос или ответ)
+
+    Подписи интерфейса и названия времён подставляются и экранируются при
+    сборке, а сама разметка заранее разбита на куски между вставками.
+    Показ карточки - это экранирование её значений и одно соединение строк.
+    """
+
+    def __init__(self, markup: str, tense_labels: Mapping[str, str]):
+        self._parts: List[Tuple[str, str]] = [
+            (literal, field or '') for literal, field, _, _ in Formatter().parse(markup)
+        ]
+        self._tense_labels: Dict[str, str] = {tense: escape(label) for tense, label in tense_labels.items()}
+
+    def render(self, verb: str, translation: str, tense: str, pronoun: str, answer: str = '') -> str:
+        """HTML карточки; tense - ключ времени, его название уже переведено"""
+        values = {
+            'verb': escape(verb),
+            'translation': escape(translation),
+            'tense': self._tense_labels.get(tense) or escape(tense),
+            'pronoun': escape(pronoun),
+            'answer': escape(answer),
+            '': '',
+        }
+        return ''.join(literal + values[field] for literal, field in self._parts)
+
+
+def compile_card_template(revealed: bool, click_to_reveal: str, tense_labels: Mapping[str, str]) -> CardTemplate:
+    """
+    Собирает шаблон карточки
+
+    Args:
+        revealed: Шаблон ответа (иначе - вопроса)
+        click_to_reveal: Подсказка под вопросом на языке интерфейса
+        tense_labels: Ключ времени -> название на языке интерфейса
+
+    Returns:
+        Шаблон, которому при показе нужны только значения карточки
+    """
+    if revealed:
+        footer = ANSWER_FOOTER
+    else:
+        # Подпись - не вставка: экранируем и фиксируем ее при сборке
+        footer = QUESTION_FOOTER.replace('{click_to_reveal}', _literal(escape(click_to_reveal)))
+    markup = CARD_MARKUP.replace('{footer}', footer)
+    markup = markup.replace('{revealed_class}', ' revealed' if revealed else '')
+    return CardTemplate(markup, tense_labels)
+
+
+def _literal(text: str) -> str:
+    """Текст как литерал шаблона (фигурные скобки не должны стать вставками)"""
+    return text.replace('{', '{{').replace('}', '}}')